@@ -0,0 +1,25 @@
+import asyncio
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+_VIVO = {"status": "ok"}
+
+@router.get("/live")
+async def vivo():
+    return _VIVO
+
+@router.get("/ready")
+async def pronto(request: Request):
+    verificador = request.app.state.verificador_prontidao
+    relatorio = await asyncio.get_running_loop().run_in_executor(None, verificador.avaliar)
+    return JSONResponse(
+        status_code=200 if relatorio.pronto else 503,
+        content={
+            "status": "ok" if relatorio.pronto else "indisponivel",
+            "verificado_em": relatorio.verificado_em.isoformat(),
+            "sondas": {sonda.nome: sonda._asdict() for sonda in relatorio.sondas},
+        },
+    )
@@ -0,0 +1,22 @@
+import sys
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.infrastructure.observabilidade.metricas import REGISTRO
+
+router = APIRouter(tags=["metricas"])
+
+# Formato de exposição texto do Prometheus
+_TIPO_CONTEUDO = "text/plain; version=0.0.4; charset=utf-8"
+
+# Contadores dos repositórios legados, presentes quando carregados no processo
+_MODULO_LEGADO = "sistema_frota.infrastructure.metricas"
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metricas():
+    texto = REGISTRO.exportar()
+    legado = sys.modules.get(_MODULO_LEGADO)
+    if legado is not None:
+        texto += legado.exportar_prometheus()
+    return PlainTextResponse(texto, media_type=_TIPO_CONTEUDO)
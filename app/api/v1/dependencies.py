@@ -1,11 +1,163 @@
+import asyncio
+from typing import Callable, Iterator, Optional, TypeVar
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from app.application.services.concorrencia_service import executar_com_retentativa
+from app.application.services.configuracao_cache_service import CacheConfiguracoes
+from app.application.services.manutencao_service import PrevisaoManutencaoService
+from app.application.services.relatorio_job_service import GerenciadorRelatorios
+from app.application.services.trilha_service import CacheTrilhas, TelemetriaTenants
+from app.application.services.usuario_cache_service import CacheUsuarios, UsuarioAutenticado
+from app.domain.entities.tenant_config import TENANT_PADRAO
+from app.domain.events import BusinessRuleViolation, ConcurrencyConflict
+from app.infrastructure.agendamento.agendador import Agendador
+from app.infrastructure.auth.jwt_service import TokenInvalido
+from app.infrastructure.auth.password_service import ServicoSenhas
+from app.infrastructure.messaging.event_dispatcher import EventDispatcher
+from app.infrastructure.observabilidade.perfil_consultas import PerfilConsultas
+from app.infrastructure.persistence.sqlalchemy.database import SessionLocal
+from app.infrastructure.persistence.sqlalchemy.tenant_router import TenantDesconhecido
+from app.infrastructure.telemetria.armazem import ArmazemPosicoes
+
+T = TypeVar("T")
 
 security = HTTPBearer()
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
-    # Validar token JWT
-    # Retornar usuário
-    pass
+# Usuário autenticado pelo token Bearer. As claims e o usuário vêm de caches
+# em memória; o banco só é consultado, fora do loop, quando o usuário não
+# está em cache.
+async def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> UsuarioAutenticado:
+    nao_autorizado = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Credenciais inválidas",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        claims = request.app.state.verificador_tokens.verificar(credentials.credentials)
+        usuario_id = int(claims["sub"])
+    except (TokenInvalido, KeyError, TypeError, ValueError):
+        raise nao_autorizado
+    cache: CacheUsuarios = request.app.state.cache_usuarios
+    encontrado, usuario = cache.obter_em_cache(usuario_id)
+    if not encontrado:
+        usuario = await asyncio.get_running_loop().run_in_executor(None, cache.obter, usuario_id)
+    if usuario is None:
+        raise nao_autorizado
+    return usuario
+
+# Dependência que exige todas as permissões indicadas
+def exigir_permissao(*permissoes: str) -> Callable[..., UsuarioAutenticado]:
+    async def verificar(usuario: UsuarioAutenticado = Depends(get_current_user)) -> UsuarioAutenticado:
+        if not usuario.pode(*permissoes):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permissão insuficiente")
+        return usuario
+    return verificar
+
+def get_event_dispatcher(request: Request) -> EventDispatcher:
+    return request.app.state.event_dispatcher
+
+def get_gerenciador_relatorios(request: Request) -> GerenciadorRelatorios:
+    return request.app.state.gerenciador_relatorios
+
+def get_agendador(request: Request) -> Optional[Agendador]:
+    return getattr(request.app.state, "agendador", None)
+
+def get_perfil_consultas(request: Request) -> Optional[PerfilConsultas]:
+    return getattr(request.app.state, "perfil_consultas", None)
+
+def get_servico_senhas(request: Request) -> ServicoSenhas:
+    return request.app.state.servico_senhas
+
+def get_cache_configuracoes(request: Request) -> CacheConfiguracoes:
+    return request.app.state.cache_configuracoes
+
+# Tenant da requisição, informado no cabeçalho X-Tenant-ID. Com bancos por
+# tenant, só os tenants registrados no roteador são aceitos, de modo que uma
+# requisição nunca cria um banco novo.
+def get_tenant_id(request: Request, x_tenant_id: Optional[str] = Header(None)) -> str:
+    if x_tenant_id is None:
+        return TENANT_PADRAO
+    tenant_id = x_tenant_id.strip()
+    if not tenant_id or len(tenant_id) > 50:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="X-Tenant-ID inválido")
+    roteador = getattr(request.app.state, "roteador_tenants", None)
+    if roteador is not None and not roteador.registrado(tenant_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant desconhecido")
+    return tenant_id
+
+# Sessão no banco do tenant; sem roteador, todos os tenants usam o banco principal
+def get_tenant_db(request: Request, tenant_id: str = Depends(get_tenant_id)) -> Iterator[Session]:
+    roteador = getattr(request.app.state, "roteador_tenants", None)
+    if roteador is None:
+        db = SessionLocal()
+    else:
+        try:
+            db = roteador.sessao(tenant_id)
+        except TenantDesconhecido as erro:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(erro))
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Agenda de manutenções; é carregada do banco principal, por isso só as
+# leituras do tenant padrão a alimentam
+def get_previsao_manutencao(
+    request: Request,
+    tenant_id: str = Depends(get_tenant_id),
+) -> Optional[PrevisaoManutencaoService]:
+    if tenant_id != TENANT_PADRAO:
+        return None
+    return getattr(request.app.state, "previsao_manutencao", None)
+
+# Posições de GPS abertas; os tenants com banco próprio têm armazém próprio
+def get_armazem_posicoes(request: Request, tenant_id: str = Depends(get_tenant_id)) -> ArmazemPosicoes:
+    tenants: Optional[TelemetriaTenants] = getattr(request.app.state, "telemetria_tenants", None)
+    if tenant_id == TENANT_PADRAO or tenants is None:
+        return request.app.state.armazem_posicoes
+    return tenants.obter(tenant_id)[0]
+
+# Análises das trilhas, separadas por tenant como o armazém
+def get_cache_trilhas(request: Request, tenant_id: str = Depends(get_tenant_id)) -> Optional[CacheTrilhas]:
+    tenants: Optional[TelemetriaTenants] = getattr(request.app.state, "telemetria_tenants", None)
+    if tenant_id == TENANT_PADRAO or tenants is None:
+        return getattr(request.app.state, "cache_trilhas", None)
+    return tenants.obter(tenant_id)[1]
+
+# ETag de um registro versionado
+def formatar_etag(versao: int) -> str:
+    return f'"{versao}"'
+
+# Versão esperada informada no cabeçalho If-Match ("3", W/"3" ou *)
+def get_versao_esperada(if_match: Optional[str] = Header(None)) -> Optional[int]:
+    if if_match is None or if_match.strip() == "*":
+        return None
+    valor = if_match.strip()
+    if valor.startswith("W/"):
+        valor = valor[2:]
+    try:
+        return int(valor.strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="If-Match inválido")
+
+# Executa uma escrita versionada, traduzindo as falhas para respostas HTTP.
+# Sem If-Match a operação é repetida sobre a versão mais recente; com If-Match
+# um conflito é devolvido ao cliente como 412 para que ele releia o registro.
+def executar_escrita(operacao: Callable[[], T], versao_esperada: Optional[int]) -> T:
+    try:
+        if versao_esperada is None:
+            return executar_com_retentativa(operacao)
+        return operacao()
+    except LookupError as erro:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(erro))
+    except BusinessRuleViolation as erro:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(erro))
+    except ConcurrencyConflict as erro:
+        codigo = status.HTTP_409_CONFLICT if versao_esperada is None else status.HTTP_412_PRECONDITION_FAILED
+        raise HTTPException(status_code=codigo, detail=str(erro))
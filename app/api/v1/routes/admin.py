@@ -0,0 +1,34 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.api.v1.dependencies import exigir_permissao, get_perfil_consultas
+from app.api.v1.schemas.admin_schema import EstatisticaConsultaResponse
+from app.infrastructure.observabilidade.perfil_consultas import ORDENS, PerfilConsultas
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+def _exigir_perfil(perfil: Optional[PerfilConsultas] = Depends(get_perfil_consultas)) -> PerfilConsultas:
+    if perfil is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Perfil de consultas desabilitado")
+    return perfil
+
+@router.get(
+    "/consultas",
+    response_model=List[EstatisticaConsultaResponse],
+    dependencies=[Depends(exigir_permissao("consultas:ler"))],
+)
+def listar_consultas_custosas(
+    top: int = Query(10, ge=1, le=500),
+    ordem: str = Query("total", pattern=f"^({'|'.join(ORDENS)})$"),
+    perfil: PerfilConsultas = Depends(_exigir_perfil),
+):
+    return perfil.mais_custosas(top, ordem)
+
+@router.delete(
+    "/consultas",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(exigir_permissao("consultas:limpar"))],
+)
+def limpar_perfil_consultas(perfil: PerfilConsultas = Depends(_exigir_perfil)):
+    perfil.limpar()
@@ -0,0 +1,19 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends
+
+from app.api.v1.dependencies import exigir_permissao, get_agendador
+from app.api.v1.schemas.agendador_schema import MetricasTarefaResponse
+from app.infrastructure.agendamento.agendador import Agendador
+
+router = APIRouter(prefix="/agendador", tags=["agendador"])
+
+@router.get(
+    "/tarefas",
+    response_model=List[MetricasTarefaResponse],
+    dependencies=[Depends(exigir_permissao("agendador:ler"))],
+)
+def listar_tarefas_agendadas(agendador: Optional[Agendador] = Depends(get_agendador)):
+    if agendador is None:
+        return []
+    return agendador.metricas()
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.v1.dependencies import get_servico_senhas
+from app.api.v1.schemas.auth_schema import LoginRequest, TokenResponse
+from app.application.use_cases.usuario.autenticar_usuario import AutenticarUsuarioUseCase
+from app.infrastructure.auth.jwt_service import create_access_token
+from app.infrastructure.auth.password_service import ServicoSenhas, TentativasExcedidas
+from app.infrastructure.persistence.sqlalchemy.database import SessionLocal
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+@router.post("/login", response_model=TokenResponse)
+async def login(dados: LoginRequest, servico_senhas: ServicoSenhas = Depends(get_servico_senhas)):
+    try:
+        usuario = await AutenticarUsuarioUseCase(SessionLocal, servico_senhas).executar(dados.email, dados.senha)
+    except TentativasExcedidas as erro:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(erro),
+            headers={"Retry-After": str(int(erro.espera) + 1)},
+        )
+    if usuario is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="E-mail ou senha inválidos",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    token = create_access_token({"sub": str(usuario.id), "perfil": usuario.perfil})
+    return TokenResponse(access_token=token)
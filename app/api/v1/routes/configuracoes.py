@@ -0,0 +1,85 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import exigir_permissao, get_cache_configuracoes, get_tenant_db, get_tenant_id
+from app.api.v1.schemas.configuracao_schema import (
+    ConfiguracaoAtualizar,
+    ConfiguracaoCriar,
+    ConfiguracaoResponse,
+    EstatisticasCacheResponse,
+)
+from app.application.dto.tenant_config_dto import AtualizarConfiguracaoDTO, CriarConfiguracaoDTO
+from app.application.services.configuracao_cache_service import CacheConfiguracoes
+from app.application.use_cases.configuracao.atualizar_configuracao import AtualizarConfiguracaoUseCase
+from app.application.use_cases.configuracao.criar_configuracao import CriarConfiguracaoUseCase
+from app.application.use_cases.configuracao.obter_configuracao import ObterConfiguracaoUseCase
+from app.domain.events import BusinessRuleViolation
+
+router = APIRouter(prefix="/configuracoes", tags=["configuracoes"])
+
+@router.get("", response_model=List[ConfiguracaoResponse])
+def listar_configuracoes(
+    tenant_id: str = Depends(get_tenant_id),
+    cache: CacheConfiguracoes = Depends(get_cache_configuracoes),
+):
+    return ObterConfiguracaoUseCase(cache).listar(tenant_id)
+
+@router.get("/cache/estatisticas", response_model=EstatisticasCacheResponse)
+def estatisticas_cache(cache: CacheConfiguracoes = Depends(get_cache_configuracoes)):
+    estatisticas = cache.estatisticas()
+    return EstatisticasCacheResponse(**estatisticas._asdict(), taxa_acerto=estatisticas.taxa_acerto)
+
+@router.get("/{chave}", response_model=ConfiguracaoResponse)
+def obter_configuracao(
+    chave: str,
+    tenant_id: str = Depends(get_tenant_id),
+    cache: CacheConfiguracoes = Depends(get_cache_configuracoes),
+):
+    try:
+        return ObterConfiguracaoUseCase(cache).executar(tenant_id, chave)
+    except LookupError as erro:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(erro))
+
+@router.post(
+    "",
+    response_model=ConfiguracaoResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(exigir_permissao("configuracoes:editar"))],
+)
+def criar_configuracao(
+    dados: ConfiguracaoCriar,
+    tenant_id: str = Depends(get_tenant_id),
+    cache: CacheConfiguracoes = Depends(get_cache_configuracoes),
+    db: Session = Depends(get_tenant_db),
+):
+    try:
+        return CriarConfiguracaoUseCase(db, cache).executar(
+            CriarConfiguracaoDTO(tenant_id=tenant_id, **dados.model_dump())
+        )
+    except ValueError as erro:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(erro))
+    except BusinessRuleViolation as erro:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(erro))
+
+@router.put(
+    "/{chave}",
+    response_model=ConfiguracaoResponse,
+    dependencies=[Depends(exigir_permissao("configuracoes:editar"))],
+)
+def atualizar_configuracao(
+    chave: str,
+    dados: ConfiguracaoAtualizar,
+    tenant_id: str = Depends(get_tenant_id),
+    cache: CacheConfiguracoes = Depends(get_cache_configuracoes),
+    db: Session = Depends(get_tenant_db),
+):
+    try:
+        return AtualizarConfiguracaoUseCase(db, cache).executar(
+            tenant_id, chave, AtualizarConfiguracaoDTO(**dados.model_dump())
+        )
+    except LookupError as erro:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(erro))
+    except ValueError as erro:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(erro))
@@ -0,0 +1,28 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import get_tenant_db
+from app.api.v1.schemas.motorista_schema import AlertaCNHResponse
+from app.application.use_cases.motorista.alertas_cnh import AlertasCNHUseCase
+
+router = APIRouter(prefix="/motoristas", tags=["motoristas"])
+
+@router.get("/alertas-cnh", response_model=List[AlertaCNHResponse])
+def listar_cnh_vencendo(
+    dias: int = Query(30, ge=0, le=3650),
+    db: Session = Depends(get_tenant_db),
+):
+    return AlertasCNHUseCase(db).vencendo_em(dias)
+
+@router.post("/alertas-cnh/executar", response_model=List[AlertaCNHResponse])
+def executar_alertas_cnh(
+    antecedencias: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_tenant_db),
+):
+    try:
+        caso_de_uso = AlertasCNHUseCase(db, antecedencias) if antecedencias else AlertasCNHUseCase(db)
+    except ValueError as erro:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(erro))
+    return caso_de_uso.executar()
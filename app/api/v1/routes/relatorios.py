@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.api.v1.dependencies import get_gerenciador_relatorios, get_tenant_id
+from app.api.v1.schemas.relatorio_schema import SolicitarRelatorioViagens, TarefaRelatorioResponse
+from app.application.services.relatorio_job_service import STATUS_CONCLUIDO, GerenciadorRelatorios
+from app.infrastructure.relatorios.escritores import EscritorCSV, EscritorPDF, EscritorXLSX
+
+router = APIRouter(prefix="/relatorios", tags=["relatórios"])
+
+_TIPOS_MIDIA = {escritor.extensao: escritor.tipo_midia for escritor in (EscritorCSV, EscritorXLSX, EscritorPDF)}
+
+@router.post("/viagens-cliente", response_model=TarefaRelatorioResponse, status_code=status.HTTP_202_ACCEPTED)
+def solicitar_relatorio_viagens(
+    dados: SolicitarRelatorioViagens,
+    gerenciador: GerenciadorRelatorios = Depends(get_gerenciador_relatorios),
+    tenant_id: str = Depends(get_tenant_id),
+):
+    try:
+        return gerenciador.enviar(dados.cliente_id, dados.formato, dados.inicio, dados.fim, tenant_id)
+    except ValueError as erro:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(erro))
+
+@router.get("/{tarefa_id}", response_model=TarefaRelatorioResponse)
+def obter_tarefa_relatorio(
+    tarefa_id: str,
+    gerenciador: GerenciadorRelatorios = Depends(get_gerenciador_relatorios),
+    tenant_id: str = Depends(get_tenant_id),
+):
+    tarefa = gerenciador.obter(tarefa_id, tenant_id)
+    if tarefa is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarefa de relatório não encontrada")
+    return tarefa
+
+@router.get("/{tarefa_id}/arquivo")
+def baixar_relatorio(
+    tarefa_id: str,
+    gerenciador: GerenciadorRelatorios = Depends(get_gerenciador_relatorios),
+    tenant_id: str = Depends(get_tenant_id),
+):
+    tarefa = gerenciador.obter(tarefa_id, tenant_id)
+    if tarefa is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarefa de relatório não encontrada")
+    if tarefa.status != STATUS_CONCLUIDO:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Relatório ainda não disponível ({tarefa.status})")
+    return FileResponse(
+        tarefa.caminho,
+        media_type=_TIPOS_MIDIA[tarefa.formato],
+        filename=f"viagens_cliente_{tarefa.cliente_id}.{tarefa.formato}",
+    )
@@ -0,0 +1,66 @@
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import exigir_permissao, get_tenant_db
+from app.api.v1.schemas.sync_schema import (
+    EnvioAlteracoes,
+    LoteAlteracoesResponse,
+    ResultadoEnvioResponse,
+)
+from app.infrastructure.sync.sync_service import AlteracaoCliente, SyncService
+
+router = APIRouter(prefix="/sync", tags=["sincronização"])
+
+@router.get(
+    "/alteracoes",
+    response_model=LoteAlteracoesResponse,
+    dependencies=[Depends(exigir_permissao("sync:ler"))],
+)
+def puxar_alteracoes(
+    token: Optional[str] = None,
+    limite: int = Query(500, ge=1, le=5000),
+    dispositivo_id: Optional[str] = None,
+    db: Session = Depends(get_tenant_db),
+):
+    try:
+        lote = SyncService(db).puxar(token, limite, dispositivo_id)
+    except ValueError as erro:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(erro))
+    return LoteAlteracoesResponse(
+        alteracoes=lote.alteracoes,
+        removidos=lote.removidos,
+        token=lote.token,
+        tem_mais=lote.tem_mais,
+    )
+
+@router.post(
+    "/alteracoes",
+    response_model=ResultadoEnvioResponse,
+    dependencies=[Depends(exigir_permissao("sync:enviar"))],
+)
+def enviar_alteracoes(envio: EnvioAlteracoes, db: Session = Depends(get_tenant_db)):
+    alteracoes = [
+        AlteracaoCliente(
+            tabela=item.tabela,
+            registro_id=item.registro_id,
+            campos=item.campos,
+            data_alteracao=item.data_alteracao,
+            operacao=item.operacao,
+            vetor_base=item.vetor_base,
+        )
+        for item in envio.alteracoes
+    ]
+    try:
+        resultado = SyncService(db).enviar(alteracoes, envio.token, envio.dispositivo_id)
+    except ValueError as erro:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(erro))
+    return ResultadoEnvioResponse(
+        status=resultado.status.value,
+        aplicadas=resultado.aplicadas,
+        mescladas=resultado.mescladas,
+        rejeitadas=resultado.rejeitadas,
+        erros=resultado.erros,
+    )
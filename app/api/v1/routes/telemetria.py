@@ -0,0 +1,123 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import get_armazem_posicoes, get_cache_trilhas, get_tenant_db
+from app.api.v1.schemas.telemetria_schema import (
+    LotePosicoes,
+    ParadaResponse,
+    ResultadoPosicoesResponse,
+    ResumoTrilhaResponse,
+    TrilhaResponse,
+)
+from app.application.services.trilha_service import CacheTrilhas, amostrar, distancia_km, divergencia_km
+from app.infrastructure.persistence.sqlalchemy.models import StatusViagem, Viagem as ViagemModel
+from app.infrastructure.telemetria.armazem import ArmazemPosicoes
+
+router = APIRouter(prefix="/telemetria", tags=["telemetria"])
+
+Metodo = Literal["douglas_peucker", "visvalingam"]
+
+@router.post("/posicoes", response_model=ResultadoPosicoesResponse)
+def registrar_posicoes(
+    lote: LotePosicoes,
+    armazem: ArmazemPosicoes = Depends(get_armazem_posicoes),
+    db: Session = Depends(get_tenant_db),
+):
+    viagens = {trecho.viagem_id for trecho in lote.trechos}
+    em_andamento = set(
+        db.scalars(
+            select(ViagemModel.id).where(
+                ViagemModel.id.in_(viagens),
+                ViagemModel.status == StatusViagem.EM_ANDAMENTO,
+            )
+        )
+    )
+    aceitos = descartados = 0
+    for trecho in lote.trechos:
+        if trecho.viagem_id not in em_andamento:
+            continue
+        registrados = armazem.registrar(db, trecho.viagem_id, trecho.instantes, trecho.latitudes, trecho.longitudes)
+        aceitos += registrados
+        descartados += len(trecho.instantes) - registrados
+    db.commit()
+    return ResultadoPosicoesResponse(
+        aceitos=aceitos,
+        descartados=descartados,
+        viagens_rejeitadas=sorted(viagens - em_andamento),
+    )
+
+@router.get("/viagens/{viagem_id}/trilha", response_model=TrilhaResponse)
+def obter_trilha(
+    viagem_id: int,
+    max_pontos: int = Query(1000, ge=2, le=100_000),
+    zoom: Optional[float] = Query(None, ge=0, le=22),
+    metodo: Metodo = Query("douglas_peucker"),
+    armazem: ArmazemPosicoes = Depends(get_armazem_posicoes),
+    trilhas: Optional[CacheTrilhas] = Depends(get_cache_trilhas),
+    db: Session = Depends(get_tenant_db),
+):
+    viagem = _obter_viagem(db, viagem_id)
+    analise = trilhas.analisar(db, viagem_id) if trilhas is not None else None
+    if analise is not None:
+        total, km_rastreado = analise.quantidade, analise.distancia_km
+        exibida = analise.simplificar(metodo, zoom, max_pontos)
+    else:
+        # Sem NumPy ou com menos de dois pontos: amostragem uniforme
+        trilha = armazem.trilha(db, viagem_id)
+        total, km_rastreado = len(trilha), distancia_km(trilha)
+        exibida, metodo = amostrar(trilha, max_pontos), "amostragem"
+    if viagem.km_rastreado is not None:
+        km_rastreado = viagem.km_rastreado
+    return TrilhaResponse(
+        viagem_id=viagem_id,
+        total_pontos=total,
+        km_rastreado=km_rastreado,
+        metodo=metodo,
+        instantes=exibida.instantes.tolist(),
+        latitudes=exibida.latitudes.tolist(),
+        longitudes=exibida.longitudes.tolist(),
+    )
+
+@router.get("/viagens/{viagem_id}/resumo", response_model=ResumoTrilhaResponse)
+def resumir_trilha(
+    viagem_id: int,
+    trilhas: Optional[CacheTrilhas] = Depends(get_cache_trilhas),
+    db: Session = Depends(get_tenant_db),
+):
+    if trilhas is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Análise das trilhas indisponível: instale o extra analytics",
+        )
+    viagem = _obter_viagem(db, viagem_id)
+    analise = trilhas.analisar(db, viagem_id)
+    if analise is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Viagem sem trilha de GPS")
+    return ResumoTrilhaResponse(
+        viagem_id=viagem_id,
+        total_pontos=analise.quantidade,
+        km_rastreado=analise.distancia_km,
+        km_total=viagem.km_total,
+        km_divergencia=divergencia_km(viagem.km_total, analise.distancia_km),
+        duracao_minutos=analise.duracao_segundos / 60,
+        tempo_parado_minutos=analise.tempo_parado_segundos / 60,
+        paradas=[
+            ParadaResponse(
+                instante_inicial=parada.instante_inicial,
+                instante_final=parada.instante_final,
+                latitude=parada.latitude,
+                longitude=parada.longitude,
+                duracao_minutos=parada.duracao_segundos / 60,
+            )
+            for parada in analise.paradas
+        ],
+    )
+
+def _obter_viagem(db: Session, viagem_id: int) -> ViagemModel:
+    viagem = db.get(ViagemModel, viagem_id)
+    if viagem is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Viagem não encontrada")
+    return viagem
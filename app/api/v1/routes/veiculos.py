@@ -0,0 +1,37 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import executar_escrita, formatar_etag, get_previsao_manutencao, get_tenant_db, get_versao_esperada
+from app.api.v1.schemas.veiculo_schema import AtualizarQuilometragem, VeiculoResponse
+from app.application.services.manutencao_service import PrevisaoManutencaoService
+from app.application.use_cases.veiculo.atualizar_veiculo import AtualizarVeiculoUseCase
+from app.infrastructure.persistence.sqlalchemy.models import Veiculo as VeiculoModel
+
+router = APIRouter(prefix="/veiculos", tags=["veículos"])
+
+@router.get("/{veiculo_id}", response_model=VeiculoResponse)
+def obter_veiculo(veiculo_id: int, response: Response, db: Session = Depends(get_tenant_db)):
+    veiculo = db.get(VeiculoModel, veiculo_id)
+    if veiculo is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Veículo não encontrado")
+    response.headers["ETag"] = formatar_etag(veiculo.versao)
+    return veiculo
+
+@router.patch("/{veiculo_id}/quilometragem", response_model=VeiculoResponse)
+def atualizar_quilometragem(
+    veiculo_id: int,
+    dados: AtualizarQuilometragem,
+    response: Response,
+    versao_esperada: Optional[int] = Depends(get_versao_esperada),
+    manutencoes: Optional[PrevisaoManutencaoService] = Depends(get_previsao_manutencao),
+    db: Session = Depends(get_tenant_db),
+):
+    caso_de_uso = AtualizarVeiculoUseCase(db, manutencoes)
+    veiculo = executar_escrita(
+        lambda: caso_de_uso.atualizar_quilometragem(veiculo_id, dados.quilometragem, versao_esperada),
+        versao_esperada,
+    )
+    response.headers["ETag"] = formatar_etag(veiculo.versao)
+    return veiculo
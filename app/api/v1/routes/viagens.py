@@ -0,0 +1,101 @@
+from datetime import date
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import (
+    executar_escrita,
+    formatar_etag,
+    get_armazem_posicoes,
+    get_cache_trilhas,
+    get_previsao_manutencao,
+    get_tenant_db,
+    get_versao_esperada,
+)
+from app.api.v1.schemas.viagem_schema import (
+    EncerrarViagem,
+    IniciarViagem,
+    ResumoCustoResponse,
+    TotalCustoResponse,
+    ViagemResponse,
+)
+from app.application.services.manutencao_service import PrevisaoManutencaoService
+from app.application.services.trilha_service import CacheTrilhas
+from app.application.use_cases.viagem.encerrar_viagem import EncerrarViagemUseCase
+from app.application.use_cases.viagem.iniciar_viagem import IniciarViagemUseCase
+from app.application.use_cases.viagem.relatorio_viagem import RelatorioCustosUseCase
+from app.infrastructure.persistence.sqlalchemy.models import Viagem as ViagemModel
+from app.infrastructure.telemetria.armazem import ArmazemPosicoes
+
+router = APIRouter(prefix="/viagens", tags=["viagens"])
+
+Dimensao = Literal["veiculo", "motorista", "cliente"]
+
+@router.get("/relatorios/custos", response_model=List[ResumoCustoResponse])
+def relatorio_custos_mensais(
+    dimensao: Dimensao = Query("veiculo"),
+    inicio: date = Query(...),
+    fim: date = Query(...),
+    entidade_id: Optional[int] = Query(None),
+    db: Session = Depends(get_tenant_db),
+):
+    return RelatorioCustosUseCase(db).executar(dimensao, inicio, fim, entidade_id)
+
+@router.get("/relatorios/custos/totais", response_model=List[TotalCustoResponse])
+def relatorio_custos_totais(
+    dimensao: Dimensao = Query("veiculo"),
+    inicio: date = Query(...),
+    fim: date = Query(...),
+    db: Session = Depends(get_tenant_db),
+):
+    return RelatorioCustosUseCase(db).totalizar(dimensao, inicio, fim)
+
+@router.get("/{viagem_id}", response_model=ViagemResponse)
+def obter_viagem(viagem_id: int, response: Response, db: Session = Depends(get_tenant_db)):
+    viagem = db.get(ViagemModel, viagem_id)
+    if viagem is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Viagem não encontrada")
+    response.headers["ETag"] = formatar_etag(viagem.versao)
+    return viagem
+
+@router.post("/{viagem_id}/iniciar", response_model=ViagemResponse)
+def iniciar_viagem(
+    viagem_id: int,
+    dados: IniciarViagem,
+    response: Response,
+    versao_esperada: Optional[int] = Depends(get_versao_esperada),
+    db: Session = Depends(get_tenant_db),
+):
+    caso_de_uso = IniciarViagemUseCase(db)
+    viagem = executar_escrita(
+        lambda: caso_de_uso.executar(viagem_id, dados.km_inicial, versao_esperada),
+        versao_esperada,
+    )
+    response.headers["ETag"] = formatar_etag(viagem.versao)
+    return viagem
+
+@router.post("/{viagem_id}/encerrar", response_model=ViagemResponse)
+def encerrar_viagem(
+    viagem_id: int,
+    dados: EncerrarViagem,
+    response: Response,
+    versao_esperada: Optional[int] = Depends(get_versao_esperada),
+    armazem: ArmazemPosicoes = Depends(get_armazem_posicoes),
+    trilhas: Optional[CacheTrilhas] = Depends(get_cache_trilhas),
+    manutencoes: Optional[PrevisaoManutencaoService] = Depends(get_previsao_manutencao),
+    db: Session = Depends(get_tenant_db),
+):
+    caso_de_uso = EncerrarViagemUseCase(db, armazem, trilhas, manutencoes)
+    viagem = executar_escrita(
+        lambda: caso_de_uso.executar(
+            viagem_id,
+            dados.km_final,
+            dados.combustivel_consumido,
+            dados.custo_combustivel,
+            versao_esperada,
+        ),
+        versao_esperada,
+    )
+    response.headers["ETag"] = formatar_etag(viagem.versao)
+    return viagem
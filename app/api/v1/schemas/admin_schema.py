@@ -0,0 +1,12 @@
+from pydantic import BaseModel, ConfigDict
+
+class EstatisticaConsultaResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    impressao: str
+    sql: str
+    chamadas: int
+    total_ms: float
+    media_ms: float
+    maximo_ms: float
+    lentas: int
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional
+
+class MetricasTarefaResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    nome: str
+    execucoes: int
+    falhas: int
+    duracao_media: float
+    duracao_max: float
+    ultima_duracao: float
+    atraso_ultimo: float
+    atraso_max: float
+    em_execucao: bool
+    ultima_execucao: Optional[datetime] = None
+    proxima_execucao: Optional[datetime] = None
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+class LoginRequest(BaseModel):
+    email: str = Field(..., min_length=3, max_length=100)
+    senha: str = Field(..., min_length=1, max_length=128)
+
+class TokenResponse(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
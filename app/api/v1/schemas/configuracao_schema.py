@@ -0,0 +1,36 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Literal, Optional
+
+TipoConfiguracao = Literal["string", "integer", "float", "boolean", "json", "date"]
+
+class ConfiguracaoCriar(BaseModel):
+    chave: str = Field(..., min_length=1, max_length=50)
+    valor: Any = None
+    tipo: TipoConfiguracao = "string"
+    descricao: Optional[str] = None
+    categoria: Optional[str] = Field(None, max_length=50)
+
+class ConfiguracaoAtualizar(BaseModel):
+    valor: Any = None
+    tipo: Optional[TipoConfiguracao] = None
+    descricao: Optional[str] = None
+    categoria: Optional[str] = Field(None, max_length=50)
+
+class ConfiguracaoResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    tenant_id: str
+    chave: str
+    valor: Any = None
+    tipo: str
+    descricao: Optional[str] = None
+    categoria: Optional[str] = None
+
+class EstatisticasCacheResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    acertos: int
+    falhas: int
+    carregamentos: int
+    invalidacoes: int
+    taxa_acerto: float
@@ -21,4 +21,10 @@ class MotoristaCreate(BaseModel):
         if v.upper() not in categorias_validas:
             raise ValueError('Categoria de CNH inválida')
         return v.upper()
-    
\ No newline at end of file
+    
+class AlertaCNHResponse(BaseModel):
+    motorista_id: int
+    nome: str
+    cnh_validade: date
+    antecedencia: int
+    dias_restantes: int
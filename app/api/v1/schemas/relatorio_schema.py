@@ -0,0 +1,23 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import date, datetime
+from typing import Literal, Optional
+
+class SolicitarRelatorioViagens(BaseModel):
+    cliente_id: int
+    inicio: date
+    fim: date
+    formato: Literal["csv", "xlsx", "pdf"] = "xlsx"
+
+class TarefaRelatorioResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    cliente_id: int
+    formato: str
+    status: str
+    total: Optional[int] = None
+    processadas: int
+    progresso: float = Field(..., ge=0, le=1)
+    erro: Optional[str] = None
+    criada_em: datetime
+    concluida_em: Optional[datetime] = None
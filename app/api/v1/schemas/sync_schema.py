@@ -0,0 +1,30 @@
+
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+class AlteracaoClienteSchema(BaseModel):
+    tabela: str
+    registro_id: Optional[int] = None
+    operacao: str = Field("upsert", pattern="^(upsert|delete)$")
+    campos: Dict[str, Any] = Field(default_factory=dict)
+    data_alteracao: datetime
+    vetor_base: Optional[str] = None
+
+class EnvioAlteracoes(BaseModel):
+    dispositivo_id: str
+    token: Optional[str] = None
+    alteracoes: List[AlteracaoClienteSchema]
+
+class LoteAlteracoesResponse(BaseModel):
+    alteracoes: Dict[str, List[Dict[str, Any]]]
+    removidos: Dict[str, List[int]]
+    token: str
+    tem_mais: bool
+
+class ResultadoEnvioResponse(BaseModel):
+    status: str
+    aplicadas: List[int]
+    mescladas: List[int]
+    rejeitadas: List[int]
+    erros: List[str]
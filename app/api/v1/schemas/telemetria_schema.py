@@ -0,0 +1,53 @@
+from pydantic import BaseModel, Field, confloat, conint, model_validator
+from typing import List, Optional
+
+Latitude = confloat(ge=-90, le=90)
+Longitude = confloat(ge=-180, le=180)
+# Epoch em milissegundos; o limite mantém a diferença entre instantes em int64
+Instante = conint(ge=0, lt=2**62)
+
+class TrechoPosicoes(BaseModel):
+    viagem_id: int
+    instantes: List[Instante] = Field(..., min_length=1)  # crescentes
+    latitudes: List[Latitude]
+    longitudes: List[Longitude]
+
+    @model_validator(mode="after")
+    def validar_colunas(self):
+        if not len(self.instantes) == len(self.latitudes) == len(self.longitudes):
+            raise ValueError("instantes, latitudes e longitudes devem ter o mesmo tamanho")
+        return self
+
+class LotePosicoes(BaseModel):
+    trechos: List[TrechoPosicoes] = Field(..., min_length=1)
+
+class ResultadoPosicoesResponse(BaseModel):
+    aceitos: int
+    descartados: int
+    viagens_rejeitadas: List[int]
+
+class TrilhaResponse(BaseModel):
+    viagem_id: int
+    total_pontos: int
+    km_rastreado: float
+    metodo: str
+    instantes: List[int]
+    latitudes: List[float]
+    longitudes: List[float]
+
+class ParadaResponse(BaseModel):
+    instante_inicial: int
+    instante_final: int
+    latitude: float
+    longitude: float
+    duracao_minutos: float
+
+class ResumoTrilhaResponse(BaseModel):
+    viagem_id: int
+    total_pontos: int
+    km_rastreado: float
+    km_total: Optional[float] = None
+    km_divergencia: Optional[float] = None
+    duracao_minutos: float
+    tempo_parado_minutos: float
+    paradas: List[ParadaResponse]
@@ -0,0 +1,17 @@
+
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
+
+class VeiculoResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    placa: str
+    marca: str
+    modelo: str
+    quilometragem_atual: Optional[float] = None
+    status: str
+    versao: int
+
+class AtualizarQuilometragem(BaseModel):
+    quilometragem: float = Field(..., ge=0)
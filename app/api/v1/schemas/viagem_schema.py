@@ -0,0 +1,59 @@
+
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import date, datetime
+from typing import Optional
+
+class ViagemResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    motorista_id: int
+    veiculo_id: int
+    origem: str
+    destino: str
+    status: str
+    data_saida_real: Optional[datetime] = None
+    data_chegada_real: Optional[datetime] = None
+    km_inicial: Optional[float] = None
+    km_final: Optional[float] = None
+    km_total: Optional[float] = None
+    km_rastreado: Optional[float] = None
+    km_divergencia: Optional[float] = None
+    km_divergente: Optional[bool] = None
+    tempo_parado_minutos: Optional[float] = None
+    custo_total: Optional[float] = None
+    versao: int
+
+class IniciarViagem(BaseModel):
+    km_inicial: Optional[float] = Field(None, ge=0)
+
+class EncerrarViagem(BaseModel):
+    km_final: Optional[float] = Field(None, ge=0)  # se omitido, vem da trilha de GPS
+    combustivel_consumido: Optional[float] = Field(None, ge=0)
+    custo_combustivel: Optional[float] = Field(None, ge=0)
+
+class ResumoCustoResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    dimensao: str
+    entidade_id: int
+    mes: date
+    quantidade_viagens: int
+    km_total: float
+    custo_combustivel: float
+    pedagio: float
+    alimentacao: float
+    hospedagem: float
+    outros_custos: float
+    custo_total: float
+    valor_frete: float
+
+class TotalCustoResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    entidade_id: int
+    quantidade_viagens: int
+    km_total: float
+    custo_total: float
+    valor_frete: float
+    custo_km: Optional[float] = None
@@ -0,0 +1,47 @@
+"""
+Módulo de DTOs das configurações por tenant.
+
+Define os dados de entrada dos casos de uso de criação e atualização de
+configurações.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+@dataclass
+class CriarConfiguracaoDTO:
+    """
+    Dados de criação de uma configuração.
+
+    Attributes:
+        tenant_id (str): Identificador do tenant.
+        chave (str): Chave da configuração.
+        valor (Any): Valor, já tipado ou em texto.
+        tipo (str): Tipo declarado (string, integer, float, boolean, json ou date).
+        descricao (Optional[str]): Descrição da configuração.
+        categoria (Optional[str]): Categoria da configuração.
+    """
+
+    tenant_id: str
+    chave: str
+    valor: Any
+    tipo: str = "string"
+    descricao: Optional[str] = None
+    categoria: Optional[str] = None
+
+@dataclass
+class AtualizarConfiguracaoDTO:
+    """
+    Dados de atualização de uma configuração; campos nulos são mantidos.
+
+    Attributes:
+        valor (Any): Novo valor, já tipado ou em texto.
+        tipo (Optional[str]): Novo tipo declarado.
+        descricao (Optional[str]): Nova descrição.
+        categoria (Optional[str]): Nova categoria.
+    """
+
+    valor: Any
+    tipo: Optional[str] = None
+    descricao: Optional[str] = None
+    categoria: Optional[str] = None
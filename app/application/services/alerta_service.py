@@ -0,0 +1,159 @@
+"""
+Módulo de serviço de alertas de vencimento de documentos.
+
+Reúne em um único feed, ordenado por data, os vencimentos de documentos dos
+motoristas, documentos dos veículos (CRLV, IPVA, licenciamento) e seguros dos
+veículos. Cada origem é lida em streaming, já ordenada pela coluna de validade
+indexada, e as três são intercaladas com um merge de k vias, sem carregar ou
+reordenar os documentos em memória.
+"""
+
+import heapq
+from datetime import date, timedelta
+from typing import Iterator, NamedTuple, Optional
+
+from sqlalchemy import literal, select
+from sqlalchemy.orm import Session
+
+from app.application.services.checkpoint_service import gravar_checkpoint, ler_checkpoint
+from app.infrastructure.persistence.sqlalchemy.models import (
+    DocumentoMotorista,
+    DocumentoVeiculo,
+    Veiculo,
+)
+
+# Origens do feed de vencimentos
+ORIGEM_DOCUMENTO_MOTORISTA = "documento_motorista"
+ORIGEM_DOCUMENTO_VEICULO = "documento_veiculo"
+ORIGEM_SEGURO = "seguro"
+
+# Chave do checkpoint em configuracoes_sistema
+CHAVE_CHECKPOINT = "alertas_documentos.ultima_execucao"
+
+class VencimentoDocumento(NamedTuple):
+    """
+    Vencimento de um documento no feed unificado.
+
+    A ordem dos campos define a ordem do feed: data de validade, origem e
+    identificador do registro.
+
+    Attributes:
+        data_validade (date): Data de vencimento.
+        origem (str): Origem do documento (ver ORIGEM_*).
+        registro_id (int): Identificador do documento, ou do veículo no caso do seguro.
+        titular_id (int): Motorista ou veículo a que o documento pertence.
+        tipo (str): Tipo do documento.
+    """
+    data_validade: date
+    origem: str
+    registro_id: int
+    titular_id: int
+    tipo: str
+
+class AlertaService:
+    """
+    Serviço de varredura dos vencimentos de documentos da frota.
+    """
+
+    def __init__(self, session: Session, tamanho_lote: int = 1000) -> None:
+        """
+        Inicializa o serviço.
+
+        Args:
+            session (Session): Sessão do banco.
+            tamanho_lote (int): Linhas buscadas por vez em cada origem.
+        """
+        self.session = session
+        self.tamanho_lote = tamanho_lote
+
+    # Feed unificado de vencimentos
+    def vencimentos(self, apos: Optional[date], ate: date) -> Iterator[VencimentoDocumento]:
+        """
+        Percorre, em ordem de data, os documentos que vencem em (apos, ate].
+
+        Args:
+            apos (Optional[date]): Limite inferior, exclusivo. None não limita.
+            ate (date): Limite superior, inclusivo.
+
+        Yields:
+            VencimentoDocumento: Vencimentos em ordem de data, origem e id.
+        """
+        fontes = (
+            self._ler(
+                DocumentoMotorista.data_validade,
+                ORIGEM_DOCUMENTO_MOTORISTA,
+                DocumentoMotorista.id,
+                DocumentoMotorista.motorista_id,
+                DocumentoMotorista.tipo,
+                apos,
+                ate,
+            ),
+            self._ler(
+                DocumentoVeiculo.data_validade,
+                ORIGEM_DOCUMENTO_VEICULO,
+                DocumentoVeiculo.id,
+                DocumentoVeiculo.veiculo_id,
+                DocumentoVeiculo.tipo,
+                apos,
+                ate,
+            ),
+            self._ler(
+                Veiculo.vencimento_seguro,
+                ORIGEM_SEGURO,
+                Veiculo.id,
+                Veiculo.id,
+                literal("Seguro"),
+                apos,
+                ate,
+            ),
+        )
+        return heapq.merge(*fontes)
+
+    # Varredura incremental desde a última execução
+    def varrer(self, antecedencia: int = 30, hoje: Optional[date] = None) -> Iterator[VencimentoDocumento]:
+        """
+        Percorre os documentos que entraram na janela de antecedência desde a
+        última varredura.
+
+        Uma varredura em `hoje`, sendo `d0` a anterior, lê apenas as validades
+        em (d0 + antecedencia, hoje + antecedencia]. A primeira varredura lê
+        apenas (hoje - antecedencia, hoje + antecedencia], sem reemitir os
+        documentos vencidos há mais tempo que a antecedência. O checkpoint só
+        é gravado quando o feed é consumido até o fim; uma varredura
+        interrompida é repetida por completo na próxima execução.
+
+        Args:
+            antecedencia (int): Antecedência dos alertas, em dias.
+            hoje (Optional[date]): Data de referência. Padrão: date.today().
+
+        Yields:
+            VencimentoDocumento: Vencimentos novos, em ordem de data.
+        """
+        hoje = hoje or date.today()
+        ultima = ler_checkpoint(self.session, CHAVE_CHECKPOINT)
+        if ultima is not None and ultima >= hoje:
+            return
+        if ultima is None:
+            apos = hoje - timedelta(days=antecedencia)
+        else:
+            apos = ultima + timedelta(days=antecedencia)
+
+        yield from self.vencimentos(apos, hoje + timedelta(days=antecedencia))
+
+        gravar_checkpoint(
+            self.session, CHAVE_CHECKPOINT, hoje, "Última varredura de vencimento de documentos"
+        )
+        self.session.commit()
+
+    def _ler(self, coluna_data, origem, coluna_id, coluna_titular, coluna_tipo, apos, ate):
+        """Lê uma origem em streaming, ordenada pela coluna de validade."""
+        consulta = (
+            select(coluna_data, literal(origem), coluna_id, coluna_titular, coluna_tipo)
+            .where(coluna_data.is_not(None), coluna_data <= ate)
+            .order_by(coluna_data, coluna_id)
+            .execution_options(yield_per=self.tamanho_lote)
+        )
+        if apos is not None:
+            consulta = consulta.where(coluna_data > apos)
+        for linha in self.session.execute(consulta):
+            yield VencimentoDocumento(*linha)
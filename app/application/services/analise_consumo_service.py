@@ -0,0 +1,279 @@
+"""
+Módulo de serviço de análise de consumo de combustível.
+
+Calcula, em lote e de forma vetorizada com NumPy, o consumo entre
+abastecimentos (km/l), a média móvel por veículo, o custo por km e o desvio
+em relação ao consumo de referência do veículo. Os abastecimentos da frota
+inteira são carregados em arrays colunares, ordenados por veículo e data, e
+processados sem laços por registro.
+
+Requer o extra opcional `analytics` (NumPy).
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional
+    np = None
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.persistence.sqlalchemy.models import Abastecimento, Veiculo
+
+@dataclass
+class DadosAbastecimento:
+    """
+    Abastecimentos em formato colunar, ordenados por veículo e data.
+
+    Attributes:
+        veiculo_id (np.ndarray): Veículo de cada abastecimento (int64).
+        quilometragem (np.ndarray): Hodômetro no abastecimento (float64).
+        litros (np.ndarray): Litros abastecidos (float64).
+        valor_litro (np.ndarray): Preço por litro (float64).
+        consumo_referencia (Dict[int, float]): Consumo médio de referência
+            (Veiculo.consumo_medio), em km/l, por veículo.
+    """
+    veiculo_id: "np.ndarray"
+    quilometragem: "np.ndarray"
+    litros: "np.ndarray"
+    valor_litro: "np.ndarray"
+    consumo_referencia: Dict[int, float]
+
+    # Carrega os abastecimentos do banco
+    @classmethod
+    def carregar(
+        cls,
+        session: Session,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+    ) -> "DadosAbastecimento":
+        """
+        Carrega os abastecimentos do período em arrays colunares.
+
+        A data só ordena e filtra os abastecimentos no banco; não é lida,
+        pois os indicadores dependem apenas da ordem. As linhas são lidas
+        direto do cursor do driver, sem montar um Row por abastecimento, e
+        convertidas de uma vez em uma matriz.
+
+        Args:
+            session (Session): Sessão do banco.
+            inicio (Optional[datetime]): Início do período, inclusivo.
+            fim (Optional[datetime]): Fim do período, exclusivo.
+
+        Returns:
+            DadosAbastecimento: Abastecimentos ordenados por veículo e data.
+        """
+        _exigir_numpy()
+        consulta = select(
+            Abastecimento.veiculo_id,
+            Abastecimento.quilometragem,
+            Abastecimento.litros,
+            Abastecimento.valor_litro,
+        ).order_by(Abastecimento.veiculo_id, Abastecimento.data, Abastecimento.id)
+        if inicio is not None:
+            consulta = consulta.where(Abastecimento.data >= inicio)
+        if fim is not None:
+            consulta = consulta.where(Abastecimento.data < fim)
+        resultado = session.connection().execute(consulta)
+        try:
+            linhas = resultado.cursor.fetchall()
+        finally:
+            resultado.close()
+
+        matriz = np.array(linhas, dtype=np.float64).reshape(-1, 4)
+        referencias = {
+            veiculo_id: consumo
+            for veiculo_id, consumo in session.execute(
+                select(Veiculo.id, Veiculo.consumo_medio).where(Veiculo.consumo_medio > 0)
+            )
+        }
+        return cls(
+            veiculo_id=matriz[:, 0].astype(np.int64),
+            quilometragem=np.ascontiguousarray(matriz[:, 1]),
+            litros=np.ascontiguousarray(matriz[:, 2]),
+            valor_litro=np.ascontiguousarray(matriz[:, 3]),
+            consumo_referencia=referencias,
+        )
+
+    def __len__(self) -> int:
+        return len(self.veiculo_id)
+
+@dataclass
+class ConsumoAbastecimentos:
+    """
+    Indicadores de cada abastecimento, alinhados aos arrays de entrada.
+
+    O primeiro abastecimento de cada veículo, e os trechos com hodômetro que
+    não avançou ou sem litros, não têm consumo e ficam com NaN.
+
+    Attributes:
+        km_rodados (np.ndarray): Km desde o abastecimento anterior do veículo.
+        consumo_km_l (np.ndarray): Consumo do trecho, em km/l (tanque cheio a
+            tanque cheio: km do trecho dividido pelos litros que o repuseram).
+        media_movel_km_l (np.ndarray): Consumo dos últimos `janela` trechos
+            válidos do veículo, ponderado pela distância.
+        custo_km (np.ndarray): Custo do combustível por km do trecho.
+    """
+    km_rodados: "np.ndarray"
+    consumo_km_l: "np.ndarray"
+    media_movel_km_l: "np.ndarray"
+    custo_km: "np.ndarray"
+
+@dataclass(frozen=True)
+class ResumoConsumoVeiculo:
+    """
+    Indicadores consolidados de um veículo no período.
+
+    Attributes:
+        veiculo_id (int): Identificador do veículo.
+        abastecimentos (int): Quantidade de abastecimentos.
+        km_rodados (float): Km dos trechos válidos.
+        litros (float): Litros dos trechos válidos.
+        consumo_km_l (float): Consumo médio do período, em km/l.
+        custo_km (float): Custo médio do combustível por km.
+        consumo_referencia (Optional[float]): Veiculo.consumo_medio.
+        desvio_percentual (Optional[float]): Desvio do consumo do período em
+            relação à referência (negativo indica consumo pior).
+    """
+    veiculo_id: int
+    abastecimentos: int
+    km_rodados: float
+    litros: float
+    consumo_km_l: float
+    custo_km: float
+    consumo_referencia: Optional[float]
+    desvio_percentual: Optional[float]
+
+class AnaliseConsumoService:
+    """
+    Serviço de análise vetorizada do consumo de combustível da frota.
+    """
+
+    def __init__(self, janela_media: int = 5) -> None:
+        """
+        Inicializa o serviço.
+
+        Args:
+            janela_media (int): Quantidade de trechos da média móvel.
+
+        Raises:
+            ImportError: Se o NumPy não estiver instalado.
+        """
+        _exigir_numpy()
+        if janela_media < 1:
+            raise ValueError("A janela da média móvel deve ser maior que zero")
+        self.janela_media = janela_media
+
+    # Indicadores por abastecimento
+    def calcular(self, dados: DadosAbastecimento) -> ConsumoAbastecimentos:
+        """
+        Calcula os indicadores de cada abastecimento.
+
+        Args:
+            dados (DadosAbastecimento): Abastecimentos ordenados por veículo e data.
+
+        Returns:
+            ConsumoAbastecimentos: Indicadores alinhados aos abastecimentos.
+        """
+        n = len(dados)
+        inicio_grupo = self._inicios_de_grupo(dados.veiculo_id)
+
+        km_rodados = np.full(n, np.nan)
+        if n > 1:
+            km_rodados[1:] = np.diff(dados.quilometragem)
+        km_rodados[inicio_grupo] = np.nan
+        valido = (km_rodados > 0) & (dados.litros > 0)
+        km_rodados[~valido] = np.nan
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            consumo = km_rodados / dados.litros
+            custo_km = dados.litros * dados.valor_litro / km_rodados
+
+        # Média móvel por razão de somas, com janelas que não cruzam veículos
+        indices = np.arange(n)
+        primeiro_do_grupo = np.maximum.accumulate(np.where(inicio_grupo, indices, 0))
+        soma_km = np.concatenate(([0.0], np.cumsum(np.where(valido, km_rodados, 0.0))))
+        soma_litros = np.concatenate(([0.0], np.cumsum(np.where(valido, dados.litros, 0.0))))
+        # Quantidade de trechos válidos antes de cada posição
+        contagem = np.concatenate(([0], np.cumsum(valido)))
+        fim = indices + 1
+        inicio = self._inicio_janela(contagem, fim, primeiro_do_grupo)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            media = (soma_km[fim] - soma_km[inicio]) / (soma_litros[fim] - soma_litros[inicio])
+        media[~valido] = np.nan
+
+        return ConsumoAbastecimentos(km_rodados, consumo, media, custo_km)
+
+    # Indicadores consolidados por veículo
+    def resumir(
+        self,
+        dados: DadosAbastecimento,
+        consumo: Optional[ConsumoAbastecimentos] = None,
+    ) -> List[ResumoConsumoVeiculo]:
+        """
+        Consolida os indicadores do período por veículo.
+
+        Args:
+            dados (DadosAbastecimento): Abastecimentos ordenados por veículo e data.
+            consumo (Optional[ConsumoAbastecimentos]): Indicadores já calculados.
+
+        Returns:
+            List[ResumoConsumoVeiculo]: Resumo de cada veículo, em ordem de id.
+        """
+        if len(dados) == 0:
+            return []
+        consumo = consumo or self.calcular(dados)
+        valido = ~np.isnan(consumo.km_rodados)
+        inicios = np.flatnonzero(self._inicios_de_grupo(dados.veiculo_id))
+
+        quantidade = np.diff(np.append(inicios, len(dados)))
+        km = np.add.reduceat(np.where(valido, consumo.km_rodados, 0.0), inicios)
+        litros = np.add.reduceat(np.where(valido, dados.litros, 0.0), inicios)
+        valor = np.add.reduceat(np.where(valido, dados.litros * dados.valor_litro, 0.0), inicios)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            km_l = km / litros
+            custo_km = valor / km
+
+        resumos = []
+        for posicao, veiculo_id in enumerate(dados.veiculo_id[inicios].tolist()):
+            referencia = dados.consumo_referencia.get(veiculo_id)
+            desvio = None
+            if referencia and not np.isnan(km_l[posicao]):
+                desvio = float((km_l[posicao] - referencia) / referencia * 100)
+            resumos.append(ResumoConsumoVeiculo(
+                veiculo_id=veiculo_id,
+                abastecimentos=int(quantidade[posicao]),
+                km_rodados=float(km[posicao]),
+                litros=float(litros[posicao]),
+                consumo_km_l=float(km_l[posicao]),
+                custo_km=float(custo_km[posicao]),
+                consumo_referencia=referencia,
+                desvio_percentual=desvio,
+            ))
+        return resumos
+
+    def _inicio_janela(self, contagem, fim, primeiro_do_grupo):
+        """
+        Calcula o início de cada janela da média móvel: a posição do
+        `janela_media`-ésimo trecho válido anterior, limitada ao veículo.
+        """
+        alvo = np.maximum(contagem[fim] - self.janela_media, 0)
+        inicio = np.searchsorted(contagem, alvo, side="right") - 1
+        return np.maximum(inicio, primeiro_do_grupo)
+
+    @staticmethod
+    def _inicios_de_grupo(veiculo_id):
+        """Máscara do primeiro abastecimento de cada veículo."""
+        inicio = np.ones(len(veiculo_id), dtype=bool)
+        if len(veiculo_id) > 1:
+            inicio[1:] = veiculo_id[1:] != veiculo_id[:-1]
+        return inicio
+
+def _exigir_numpy() -> None:
+    """Falha com uma mensagem clara quando o extra `analytics` não está instalado."""
+    if np is None:
+        raise ImportError("A análise de consumo requer o NumPy: pip install sistema_frota[analytics]")
@@ -0,0 +1,528 @@
+"""
+Módulo de serviço de detecção de anomalias em abastecimentos.
+
+Analisa o fluxo de abastecimentos, um a um, em busca de indícios de fraude ou
+erro de digitação: litros acima da capacidade do tanque, hodômetro que regrediu
+ou não avançou, combustível incompatível com o veículo, consumo fora do padrão
+do veículo e preço por litro fora do padrão da cidade.
+
+O estado mantido é constante por veículo (último hodômetro e estatística
+acumulada do consumo, pelo algoritmo de Welford) e por cidade e combustível
+(estatística acumulada do preço), de modo que o mesmo detector serve tanto
+para os abastecimentos recém-incluídos quanto para a varredura do histórico.
+Os tenants com banco próprio têm detectores separados.
+"""
+
+import enum
+import math
+import threading
+import weakref
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, event, select, update
+from sqlalchemy.orm import Session
+
+from app.domain.entities.tenant_config import TENANT_PADRAO
+from app.infrastructure.persistence.sqlalchemy.models import Abastecimento, TipoCombustivel, Veiculo
+from app.infrastructure.persistence.sqlalchemy.tenant_router import CHAVE_TENANT
+
+# Sessões e fábricas de sessão com a detecção ativa
+_ALVOS_ANALISADOS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+# Chave, em Session.info, do estado alterado pela transação em andamento
+_CHAVE_RASCUNHO = "rascunho_anomalias"
+
+class CodigoAnomalia(str, enum.Enum):
+    """Motivos pelos quais um abastecimento é considerado suspeito."""
+    TANQUE_EXCEDIDO = "tanque_excedido"
+    HODOMETRO_REGREDIU = "hodometro_regrediu"
+    HODOMETRO_PARADO = "hodometro_parado"
+    COMBUSTIVEL_INCOMPATIVEL = "combustivel_incompativel"
+    CONSUMO_ATIPICO = "consumo_atipico"
+    PRECO_ATIPICO = "preco_atipico"
+
+class AnomaliaAbastecimento(NamedTuple):
+    """
+    Abastecimento sinalizado pelo detector.
+
+    Attributes:
+        abastecimento_id (Optional[int]): Identificador do abastecimento.
+        veiculo_id (int): Veículo abastecido.
+        motivos (Tuple[CodigoAnomalia, ...]): Motivos da sinalização.
+    """
+    abastecimento_id: Optional[int]
+    veiculo_id: int
+    motivos: Tuple[CodigoAnomalia, ...]
+
+    # Códigos no formato gravado em Abastecimento.anomalias
+    def codificar(self) -> str:
+        """
+        Retorna os motivos separados por vírgula.
+
+        Returns:
+            str: Códigos dos motivos, na ordem em que foram detectados.
+        """
+        return ",".join(motivo.value for motivo in self.motivos)
+
+class EstatisticaAcumulada:
+    """
+    Média e desvio padrão acumulados em uma passada (algoritmo de Welford).
+    """
+    __slots__ = ("n", "media", "m2")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+
+    # Inclui uma observação
+    def adicionar(self, valor: float) -> None:
+        """
+        Inclui uma observação na estatística.
+
+        Args:
+            valor (float): Valor observado.
+        """
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+
+    def copiar(self) -> "EstatisticaAcumulada":
+        """Retorna uma cópia independente da estatística."""
+        copia = EstatisticaAcumulada()
+        copia.n, copia.media, copia.m2 = self.n, self.media, self.m2
+        return copia
+
+    @property
+    def desvio_padrao(self) -> float:
+        """Desvio padrão amostral das observações."""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+class _EstadoVeiculo:
+    """Dados de referência e estado acumulado de um veículo."""
+    __slots__ = ("capacidade_tanque", "combustiveis", "ultimo_km", "consumo")
+
+    def __init__(self, capacidade_tanque: Optional[float], combustiveis: Optional[frozenset]) -> None:
+        self.capacidade_tanque = capacidade_tanque
+        self.combustiveis = combustiveis
+        self.ultimo_km: Optional[float] = None
+        self.consumo = EstatisticaAcumulada()
+
+    def copiar(self) -> "_EstadoVeiculo":
+        """Retorna uma cópia independente do estado."""
+        copia = _EstadoVeiculo(self.capacidade_tanque, self.combustiveis)
+        copia.ultimo_km = self.ultimo_km
+        copia.consumo = self.consumo.copiar()
+        return copia
+
+class _Rascunho:
+    """
+    Estado alterado por uma transação ainda não confirmada.
+
+    Guarda cópias do estado dos veículos e cidades tocados, para que os
+    flushes seguintes da mesma transação as enxerguem, e as observações a
+    aplicar ao detector no commit.
+    """
+    __slots__ = ("detector", "veiculos", "precos", "observacoes")
+
+    def __init__(self, detector: "DetectorAnomaliasAbastecimento") -> None:
+        self.detector = detector
+        self.veiculos: Dict[int, _EstadoVeiculo] = {}
+        self.precos: Dict[Tuple[Optional[str], Any], EstatisticaAcumulada] = {}
+        self.observacoes: List[Tuple[str, Any, float]] = []
+
+class DetectorAnomaliasAbastecimento:
+    """
+    Detector de anomalias em abastecimentos, com estado O(1) por veículo.
+
+    Os abastecimentos de cada veículo devem ser processados em ordem
+    cronológica. Os valores sinalizados não entram nas estatísticas, para que
+    uma sequência de fraudes não desloque o padrão de referência.
+    """
+
+    def __init__(
+        self,
+        limite_desvio: float = 3.5,
+        amostras_minimas: int = 8,
+        tolerancia_tanque: float = 0.05,
+        variacao_minima: float = 0.02,
+    ) -> None:
+        """
+        Inicializa o detector.
+
+        Args:
+            limite_desvio (float): Distância máxima da média, em desvios
+                padrão, para consumo e preço.
+            amostras_minimas (int): Observações necessárias antes de avaliar
+                consumo ou preço.
+            tolerancia_tanque (float): Fração tolerada acima da capacidade do
+                tanque (o bocal e a mangueira comportam alguns litros).
+            variacao_minima (float): Desvio padrão mínimo, como fração da
+                média, para que séries quase constantes não sinalizem
+                qualquer centavo de diferença.
+        """
+        if amostras_minimas < 2:
+            raise ValueError("São necessárias ao menos duas amostras")
+        self.limite_desvio = limite_desvio
+        self.amostras_minimas = amostras_minimas
+        self.tolerancia_tanque = tolerancia_tanque
+        self.variacao_minima = variacao_minima
+        self._veiculos: Dict[int, _EstadoVeiculo] = {}
+        self._precos: Dict[Tuple[Optional[str], Any], EstatisticaAcumulada] = {}
+
+    # Cadastra os dados de referência de um veículo
+    def registrar_veiculo(
+        self,
+        veiculo_id: int,
+        capacidade_tanque: Optional[float] = None,
+        tipo_combustivel: Optional[TipoCombustivel] = None,
+    ) -> None:
+        """
+        Cadastra (ou atualiza) a capacidade do tanque e o combustível do veículo.
+
+        Args:
+            veiculo_id (int): Identificador do veículo.
+            capacidade_tanque (Optional[float]): Capacidade em litros.
+            tipo_combustivel (Optional[TipoCombustivel]): Combustível do veículo.
+        """
+        combustiveis = _combustiveis_aceitos(tipo_combustivel)
+        estado = self._veiculos.get(veiculo_id)
+        if estado is None:
+            self._veiculos[veiculo_id] = _EstadoVeiculo(capacidade_tanque, combustiveis)
+        else:
+            estado.capacidade_tanque = capacidade_tanque
+            estado.combustiveis = combustiveis
+
+    # Carrega os dados de referência de todos os veículos
+    def carregar_veiculos(self, session: Session) -> None:
+        """
+        Cadastra os dados de referência de todos os veículos do banco.
+
+        Args:
+            session (Session): Sessão do banco.
+        """
+        consulta = select(Veiculo.id, Veiculo.capacidade_tanque, Veiculo.tipo_combustivel)
+        for veiculo_id, capacidade, combustivel in session.execute(consulta):
+            self.registrar_veiculo(veiculo_id, capacidade, combustivel)
+
+    def conhece_veiculo(self, veiculo_id: int) -> bool:
+        """Indica se o veículo já tem dados de referência ou estado."""
+        return veiculo_id in self._veiculos
+
+    # Processa um abastecimento
+    def processar(
+        self,
+        abastecimento: Any,
+        rascunho: Optional[_Rascunho] = None,
+    ) -> Optional[AnomaliaAbastecimento]:
+        """
+        Avalia um abastecimento e atualiza o estado do veículo e da cidade.
+
+        Args:
+            abastecimento (Any): Objeto com os atributos de `Abastecimento`
+                (id, veiculo_id, quilometragem, litros, valor_litro,
+                tipo_combustivel e cidade): modelo ORM, linha de consulta ou
+                tupla nomeada.
+            rascunho (Optional[_Rascunho]): Estado da transação em andamento;
+                quando informado, o detector só é alterado em `_confirmar`.
+
+        Returns:
+            Optional[AnomaliaAbastecimento]: Motivos da sinalização, ou None se
+                o abastecimento não for suspeito.
+        """
+        veiculo_id = abastecimento.veiculo_id
+        estado = self._estado_veiculo(veiculo_id, rascunho)
+
+        motivos = []
+        litros = abastecimento.litros
+        km = abastecimento.quilometragem
+        combustivel = abastecimento.tipo_combustivel
+
+        capacidade = estado.capacidade_tanque
+        if capacidade and litros > capacidade * (1 + self.tolerancia_tanque):
+            motivos.append(CodigoAnomalia.TANQUE_EXCEDIDO)
+
+        if combustivel is not None and estado.combustiveis is not None and combustivel not in estado.combustiveis:
+            motivos.append(CodigoAnomalia.COMBUSTIVEL_INCOMPATIVEL)
+
+        observacoes = rascunho.observacoes if rascunho is not None else None
+        ultimo_km = estado.ultimo_km
+        if ultimo_km is not None and km < ultimo_km:
+            # Mantém a última leitura válida como referência
+            motivos.append(CodigoAnomalia.HODOMETRO_REGREDIU)
+        elif km == ultimo_km:
+            motivos.append(CodigoAnomalia.HODOMETRO_PARADO)
+        else:
+            estado.ultimo_km = km
+            if observacoes is not None:
+                observacoes.append(("km", veiculo_id, km))
+            if ultimo_km is not None and litros > 0:
+                consumo = (km - ultimo_km) / litros
+                if self._atipico(estado.consumo, consumo):
+                    motivos.append(CodigoAnomalia.CONSUMO_ATIPICO)
+                else:
+                    estado.consumo.adicionar(consumo)
+                    if observacoes is not None:
+                        observacoes.append(("consumo", veiculo_id, consumo))
+
+        chave = (abastecimento.cidade, combustivel)
+        precos = self._estatistica_preco(chave, rascunho)
+        valor_litro = abastecimento.valor_litro
+        if self._atipico(precos, valor_litro):
+            motivos.append(CodigoAnomalia.PRECO_ATIPICO)
+        else:
+            precos.adicionar(valor_litro)
+            if observacoes is not None:
+                observacoes.append(("preco", chave, valor_litro))
+
+        if not motivos:
+            return None
+        return AnomaliaAbastecimento(abastecimento.id, veiculo_id, tuple(motivos))
+
+    # Processa uma sequência de abastecimentos
+    def processar_lote(self, abastecimentos: Iterable[Any]) -> Iterator[AnomaliaAbastecimento]:
+        """
+        Processa abastecimentos em sequência, produzindo apenas os suspeitos.
+
+        Args:
+            abastecimentos (Iterable[Any]): Abastecimentos em ordem cronológica.
+
+        Yields:
+            AnomaliaAbastecimento: Cada abastecimento sinalizado.
+        """
+        processar = self.processar
+        for abastecimento in abastecimentos:
+            anomalia = processar(abastecimento)
+            if anomalia is not None:
+                yield anomalia
+
+    # Varre o histórico do banco
+    def varrer_historico(
+        self,
+        session: Session,
+        gravar: bool = True,
+        tamanho_lote: int = 5000,
+    ) -> List[AnomaliaAbastecimento]:
+        """
+        Processa todos os abastecimentos do banco em ordem cronológica.
+
+        Carrega antes os dados de referência dos veículos. Com `gravar`,
+        atualiza `Abastecimento.anomalias` apenas nos registros cuja
+        sinalização mudou (inclusive limpando as que deixaram de valer) e
+        confirma a transação. Ao final, o detector fica pronto para seguir
+        com os abastecimentos novos.
+
+        Args:
+            session (Session): Sessão do banco.
+            gravar (bool): Se deve gravar os códigos nos registros.
+            tamanho_lote (int): Linhas lidas e atualizadas por vez.
+
+        Returns:
+            List[AnomaliaAbastecimento]: Abastecimentos sinalizados.
+        """
+        self.carregar_veiculos(session)
+        consulta = select(
+            Abastecimento.id,
+            Abastecimento.veiculo_id,
+            Abastecimento.quilometragem,
+            Abastecimento.litros,
+            Abastecimento.valor_litro,
+            Abastecimento.tipo_combustivel,
+            Abastecimento.cidade,
+            Abastecimento.anomalias,
+        ).order_by(Abastecimento.data, Abastecimento.id).execution_options(yield_per=tamanho_lote)
+
+        processar = self.processar
+        anomalias = []
+        alteracoes = []
+        for linha in session.execute(consulta):
+            anomalia = processar(linha)
+            codigos = None
+            if anomalia is not None:
+                anomalias.append(anomalia)
+                codigos = anomalia.codificar()
+            if gravar and codigos != linha.anomalias:
+                alteracoes.append({"_id": linha.id, "anomalias": codigos})
+
+        if gravar:
+            comando = (
+                update(Abastecimento.__table__)
+                .where(Abastecimento.__table__.c.id == bindparam("_id"))
+                .values(anomalias=bindparam("anomalias"))
+            )
+            for inicio in range(0, len(alteracoes), tamanho_lote):
+                session.execute(comando, alteracoes[inicio:inicio + tamanho_lote])
+            session.commit()
+        return anomalias
+
+    def _estado_veiculo(self, veiculo_id: int, rascunho: Optional[_Rascunho]) -> _EstadoVeiculo:
+        """Estado do veículo; com rascunho, uma cópia feita no primeiro acesso da transação."""
+        if rascunho is not None:
+            estado = rascunho.veiculos.get(veiculo_id)
+            if estado is None:
+                base = self._veiculos.get(veiculo_id)
+                estado = base.copiar() if base is not None else _EstadoVeiculo(None, None)
+                rascunho.veiculos[veiculo_id] = estado
+            return estado
+        estado = self._veiculos.get(veiculo_id)
+        if estado is None:
+            estado = self._veiculos[veiculo_id] = _EstadoVeiculo(None, None)
+        return estado
+
+    def _estatistica_preco(
+        self, chave: Tuple[Optional[str], Any], rascunho: Optional[_Rascunho]
+    ) -> EstatisticaAcumulada:
+        """Estatística de preço da cidade; com rascunho, uma cópia como em `_estado_veiculo`."""
+        if rascunho is not None:
+            precos = rascunho.precos.get(chave)
+            if precos is None:
+                base = self._precos.get(chave)
+                precos = rascunho.precos[chave] = base.copiar() if base is not None else EstatisticaAcumulada()
+            return precos
+        precos = self._precos.get(chave)
+        if precos is None:
+            precos = self._precos[chave] = EstatisticaAcumulada()
+        return precos
+
+    def _confirmar(self, rascunho: _Rascunho) -> None:
+        """
+        Aplica as observações de uma transação confirmada.
+
+        As observações são reaplicadas sobre o estado atual, e não copiadas
+        do rascunho, para não perder as de transações confirmadas no meio
+        tempo.
+        """
+        for tipo, chave, valor in rascunho.observacoes:
+            if tipo == "preco":
+                self._estatistica_preco(chave, None).adicionar(valor)
+                continue
+            estado = self._estado_veiculo(chave, None)
+            if tipo == "consumo":
+                estado.consumo.adicionar(valor)
+            elif estado.ultimo_km is None or valor > estado.ultimo_km:
+                estado.ultimo_km = valor
+
+    def _atipico(self, estatistica: EstatisticaAcumulada, valor: float) -> bool:
+        """Indica se o valor está além do limite de desvios da média."""
+        if estatistica.n < self.amostras_minimas:
+            return False
+        media = estatistica.media
+        desvio = max(estatistica.desvio_padrao, abs(media) * self.variacao_minima)
+        return abs(valor - media) > self.limite_desvio * desvio
+
+class DetectoresTenants:
+    """
+    Detector de anomalias de cada tenant com banco próprio.
+
+    Os identificadores dos veículos se repetem entre os bancos dos tenants,
+    por isso cada tenant tem o próprio hodômetro e padrão de consumo e de
+    preço, criados no primeiro abastecimento e sem o histórico anterior.
+    """
+
+    def __init__(self, criar: Callable[[], DetectorAnomaliasAbastecimento] = DetectorAnomaliasAbastecimento) -> None:
+        """
+        Inicializa o conjunto vazio.
+
+        Args:
+            criar (Callable[[], DetectorAnomaliasAbastecimento]): Fábrica do
+                detector de um tenant.
+        """
+        self.criar = criar
+        self._tenants: Dict[str, DetectorAnomaliasAbastecimento] = {}
+        self._trava = threading.Lock()
+
+    # Detector do tenant
+    def obter(self, tenant_id: str) -> DetectorAnomaliasAbastecimento:
+        """
+        Obtém o detector do tenant, criando-o no primeiro acesso.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+
+        Returns:
+            DetectorAnomaliasAbastecimento: Detector do tenant.
+        """
+        with self._trava:
+            detector = self._tenants.get(tenant_id)
+            if detector is None:
+                detector = self._tenants[tenant_id] = self.criar()
+            return detector
+
+# Ativa a detecção nos abastecimentos incluídos por uma fábrica de sessões
+def ativar_deteccao_anomalias(
+    alvo: Any,
+    detector: DetectorAnomaliasAbastecimento,
+    tenants: Optional[DetectoresTenants] = None,
+) -> None:
+    """
+    Registra o listener que avalia os abastecimentos novos antes do flush.
+
+    Os códigos detectados são gravados em `Abastecimento.anomalias` no mesmo
+    flush da inclusão. Veículos ainda desconhecidos pelo detector têm os dados
+    de referência lidos do banco na primeira ocorrência. As alterações no
+    estado do detector ficam em `Session.info` até o commit; uma transação
+    desfeita não desloca o padrão de referência.
+
+    Args:
+        alvo (Any): Session, sessionmaker ou classe Session cujos flushes
+            devem ser analisados.
+        detector (DetectorAnomaliasAbastecimento): Detector do tenant padrão.
+        tenants (Optional[DetectoresTenants]): Detectores das sessões abertas
+            no banco de outro tenant; sem eles, todas usam `detector`.
+    """
+    if alvo in _ALVOS_ANALISADOS:
+        return
+    trava = threading.Lock()
+
+    def _analisar(session: Session, flush_context: Any, instancias: Any) -> None:
+        novos = [obj for obj in session.new if isinstance(obj, Abastecimento)]
+        if not novos:
+            return
+        # Sem data, o abastecimento recebe o horário da inclusão: vai para o fim
+        novos.sort(key=lambda obj: (obj.data is None, obj.data or datetime.min))
+        rascunho = session.info.get(_CHAVE_RASCUNHO)
+        if rascunho is None:
+            tenant_id = session.info.get(CHAVE_TENANT, TENANT_PADRAO)
+            do_tenant = detector if tenants is None or tenant_id == TENANT_PADRAO else tenants.obter(tenant_id)
+            rascunho = session.info[_CHAVE_RASCUNHO] = _Rascunho(do_tenant)
+        do_tenant = rascunho.detector
+        with trava:
+            for obj in novos:
+                if not do_tenant.conhece_veiculo(obj.veiculo_id):
+                    with session.no_autoflush:
+                        veiculo = session.get(Veiculo, obj.veiculo_id)
+                    if veiculo is not None:
+                        do_tenant.registrar_veiculo(veiculo.id, veiculo.capacidade_tanque, veiculo.tipo_combustivel)
+                anomalia = do_tenant.processar(obj, rascunho)
+                obj.anomalias = anomalia.codificar() if anomalia is not None else None
+
+    def _apos_commit(session: Session) -> None:
+        rascunho = session.info.pop(_CHAVE_RASCUNHO, None)
+        if rascunho is not None:
+            with trava:
+                rascunho.detector._confirmar(rascunho)
+
+    def _apos_rollback(session: Session, _transacao: Any) -> None:
+        session.info.pop(_CHAVE_RASCUNHO, None)
+
+    def _apos_transacao(session: Session, transacao: Any) -> None:
+        # Session.close() encerra a transação sem disparar after_soft_rollback
+        if transacao.parent is None:
+            session.info.pop(_CHAVE_RASCUNHO, None)
+
+    event.listen(alvo, "before_flush", _analisar)
+    event.listen(alvo, "after_commit", _apos_commit)
+    event.listen(alvo, "after_soft_rollback", _apos_rollback)
+    event.listen(alvo, "after_transaction_end", _apos_transacao)
+    _ALVOS_ANALISADOS.add(alvo)
+
+def _combustiveis_aceitos(tipo_combustivel: Optional[TipoCombustivel]) -> Optional[frozenset]:
+    """Combustíveis que o veículo pode receber; veículos flex aceitam gasolina e etanol."""
+    if tipo_combustivel is None:
+        return None
+    tipo = TipoCombustivel(tipo_combustivel)
+    if tipo is TipoCombustivel.FLEX:
+        return frozenset((TipoCombustivel.FLEX, TipoCombustivel.GASOLINA, TipoCombustivel.ETANOL))
+    return frozenset((tipo,))
@@ -0,0 +1,62 @@
+"""
+Módulo de serviço de checkpoints.
+
+Persiste em `configuracoes_sistema` a data da última execução de rotinas
+incrementais (alertas, varreduras de vencimento), para que a próxima execução
+processe apenas o intervalo ainda não coberto. Os checkpoints pertencem ao
+tenant padrão, das configurações globais do sistema.
+"""
+
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domain.entities.tenant_config import TENANT_PADRAO
+from app.infrastructure.persistence.sqlalchemy.models import ConfiguracaoSistema
+
+CATEGORIA_CHECKPOINT = "checkpoint"
+
+# Lê a data do checkpoint
+def ler_checkpoint(session: Session, chave: str) -> Optional[date]:
+    """
+    Lê a data registrada no checkpoint.
+
+    Args:
+        session (Session): Sessão do banco.
+        chave (str): Chave do checkpoint em `configuracoes_sistema`.
+
+    Returns:
+        Optional[date]: Data registrada, ou None se a rotina nunca executou.
+    """
+    valor = session.execute(
+        select(ConfiguracaoSistema.valor).where(
+            ConfiguracaoSistema.tenant_id == TENANT_PADRAO, ConfiguracaoSistema.chave == chave
+        )
+    ).scalar()
+    return date.fromisoformat(valor) if valor else None
+
+# Grava a data do checkpoint
+def gravar_checkpoint(session: Session, chave: str, data: date, descricao: Optional[str] = None) -> None:
+    """
+    Registra a data no checkpoint, sem realizar commit.
+
+    Args:
+        session (Session): Sessão do banco.
+        chave (str): Chave do checkpoint em `configuracoes_sistema`.
+        data (date): Data coberta pela execução.
+        descricao (Optional[str]): Descrição usada quando o checkpoint é criado.
+    """
+    configuracao = session.execute(
+        select(ConfiguracaoSistema).where(
+            ConfiguracaoSistema.tenant_id == TENANT_PADRAO, ConfiguracaoSistema.chave == chave
+        )
+    ).scalar()
+    if configuracao is None:
+        configuracao = ConfiguracaoSistema(
+            tenant_id=TENANT_PADRAO, chave=chave, tipo="date",
+            categoria=CATEGORIA_CHECKPOINT, descricao=descricao,
+        )
+        session.add(configuracao)
+    configuracao.valor = data.isoformat()
@@ -0,0 +1,102 @@
+"""
+Módulo de serviço de concorrência otimista.
+
+Contém a verificação da versão esperada pelo cliente e os utilitários de
+nova tentativa para operações de escrita que podem colidir com outra
+transação sobre o mesmo registro.
+"""
+
+import random
+import time
+from functools import wraps
+from typing import Any, Callable, Optional, Tuple, Type, TypeVar
+
+from app.domain.events import ConcurrencyConflict
+
+T = TypeVar("T")
+
+# Verifica a versão informada pelo cliente
+def verificar_versao(registro: Any, versao_esperada: Optional[int]) -> None:
+    """
+    Confere se o registro ainda está na versão que o cliente leu.
+
+    A verificação evita aplicar uma alteração baseada em dados antigos. A
+    corrida entre esta leitura e a gravação é coberta pela coluna de versão
+    do modelo, verificada no UPDATE.
+
+    Args:
+        registro (Any): Registro com o atributo `versao`.
+        versao_esperada (Optional[int]): Versão lida pelo cliente. None
+            dispensa a verificação.
+
+    Raises:
+        ConcurrencyConflict: Se a versão atual for diferente da esperada.
+    """
+    if versao_esperada is not None and registro.versao != versao_esperada:
+        raise ConcurrencyConflict(
+            f"Versão esperada {versao_esperada}, versão atual {registro.versao}"
+        )
+
+# Executa uma operação repetindo-a em caso de conflito
+def executar_com_retentativa(
+    operacao: Callable[[], T],
+    tentativas: int = 3,
+    espera_base: float = 0.01,
+    excecoes: Tuple[Type[BaseException], ...] = (ConcurrencyConflict,),
+) -> T:
+    """
+    Executa a operação, repetindo-a quando ela colidir com outra transação.
+
+    A operação deve reler o registro a cada chamada, para reaplicar a
+    alteração sobre a versão mais recente. Entre as tentativas aguarda um
+    intervalo exponencial com jitter, para que escritores concorrentes não
+    voltem a colidir no mesmo instante.
+
+    Args:
+        operacao (Callable[[], T]): Operação de leitura e escrita.
+        tentativas (int): Quantidade máxima de execuções.
+        espera_base (float): Espera antes da segunda tentativa, em segundos.
+        excecoes (Tuple[Type[BaseException], ...]): Exceções que provocam
+            nova tentativa.
+
+    Returns:
+        T: Resultado da operação.
+
+    Raises:
+        ConcurrencyConflict: Se todas as tentativas colidirem.
+    """
+    for tentativa in range(1, tentativas + 1):
+        try:
+            return operacao()
+        except excecoes:
+            if tentativa == tentativas:
+                raise
+            time.sleep(espera_base * (2 ** (tentativa - 1)) * random.uniform(0.5, 1.5))
+    raise ValueError("A quantidade de tentativas deve ser maior que zero")
+
+# Decorador de nova tentativa
+def com_retentativa(
+    tentativas: int = 3,
+    espera_base: float = 0.01,
+    excecoes: Tuple[Type[BaseException], ...] = (ConcurrencyConflict,),
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorador que aplica `executar_com_retentativa` à função decorada.
+
+    Args:
+        tentativas (int): Quantidade máxima de execuções.
+        espera_base (float): Espera antes da segunda tentativa, em segundos.
+        excecoes (Tuple[Type[BaseException], ...]): Exceções que provocam
+            nova tentativa.
+
+    Returns:
+        Callable: Decorador.
+    """
+    def decorador(funcao: Callable[..., T]) -> Callable[..., T]:
+        @wraps(funcao)
+        def executar(*args: Any, **kwargs: Any) -> T:
+            return executar_com_retentativa(
+                lambda: funcao(*args, **kwargs), tentativas, espera_base, excecoes
+            )
+        return executar
+    return decorador
@@ -0,0 +1,358 @@
+"""
+Módulo de cache das configurações por tenant.
+
+Mantém em memória as configurações de cada tenant já convertidas pelo `tipo`,
+de modo que a leitura de uma configuração no caminho das requisições não
+consulte o banco nem reinterprete o texto de `valor`. Todas as configurações
+do tenant são carregadas de uma vez e expiram juntas após o TTL; a gravação
+de uma configuração invalida o tenant explicitamente.
+
+O armazenamento é plugável: `BackendLocal` guarda os objetos no próprio
+processo e `BackendCompartilhado` usa um cliente no estilo do Redis, para que
+vários processos compartilhem a carga. Com o backend compartilhado, uma cópia
+local de TTL curto continua atendendo as leituras sem ida à rede.
+"""
+
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.domain.entities.tenant_config import TenantConfig, converter_valor
+from app.infrastructure.persistence.sqlalchemy.repositories.tenant_config_repository_impl import (
+    TenantConfigRepositoryImpl,
+)
+from app.infrastructure.persistence.sqlalchemy.tenant_router import RoteadorTenants
+
+Configuracoes = Mapping[str, TenantConfig]
+
+class EstatisticasCache(NamedTuple):
+    """Contadores do cache de configurações."""
+
+    acertos: int
+    falhas: int
+    carregamentos: int
+    invalidacoes: int
+
+    @property
+    def taxa_acerto(self) -> float:
+        """Fração das leituras atendidas pelo cache."""
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+class BackendCache(ABC):
+    """
+    Armazenamento das configurações de cada tenant.
+    """
+
+    # Obtém as configurações do tenant
+    @abstractmethod
+    def obter(self, tenant_id: str) -> Optional[Configuracoes]:
+        """
+        Obtém as configurações armazenadas do tenant.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+
+        Returns:
+            Optional[Configuracoes]: Configurações por chave, ou None se
+                ausentes ou expiradas.
+        """
+
+    # Armazena as configurações do tenant
+    @abstractmethod
+    def gravar(self, tenant_id: str, configuracoes: Configuracoes, ttl: float) -> None:
+        """
+        Armazena as configurações do tenant.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+            configuracoes (Configuracoes): Configurações por chave.
+            ttl (float): Validade, em segundos.
+        """
+
+    # Remove as configurações do tenant
+    @abstractmethod
+    def remover(self, tenant_id: str) -> None:
+        """
+        Remove as configurações do tenant.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+        """
+
+class BackendLocal(BackendCache):
+    """
+    Backend em memória do processo, que guarda os objetos já convertidos.
+    """
+
+    def __init__(self, relogio: Callable[[], float] = time.monotonic) -> None:
+        """
+        Inicializa o backend.
+
+        Args:
+            relogio (Callable[[], float]): Relógio monotônico, em segundos.
+        """
+        self._relogio = relogio
+        self._itens: Dict[str, Tuple[float, Configuracoes]] = {}
+        self._trava = threading.Lock()
+
+    # Obtém as configurações do tenant
+    def obter(self, tenant_id: str) -> Optional[Configuracoes]:
+        item = self._itens.get(tenant_id)
+        if item is None:
+            return None
+        expira_em, configuracoes = item
+        if self._relogio() >= expira_em:
+            with self._trava:
+                if self._itens.get(tenant_id) is item:
+                    del self._itens[tenant_id]
+            return None
+        return configuracoes
+
+    # Armazena as configurações do tenant
+    def gravar(self, tenant_id: str, configuracoes: Configuracoes, ttl: float) -> None:
+        with self._trava:
+            self._itens[tenant_id] = (self._relogio() + ttl, configuracoes)
+
+    # Remove as configurações do tenant
+    def remover(self, tenant_id: str) -> None:
+        with self._trava:
+            self._itens.pop(tenant_id, None)
+
+    # Remove todos os tenants
+    def limpar(self) -> None:
+        """Remove as configurações de todos os tenants."""
+        with self._trava:
+            self._itens.clear()
+
+class BackendCompartilhado(BackendCache):
+    """
+    Backend compartilhado entre processos sobre um cliente chave-valor.
+
+    O cliente deve oferecer `get(nome)`, `set(nome, valor, ex=segundos)` e
+    `delete(nome)`, como o cliente do Redis. As configurações são gravadas em
+    JSON com o texto original de `valor` e convertidas novamente na leitura.
+    """
+
+    def __init__(self, cliente: Any, prefixo: str = "frota:configuracoes:") -> None:
+        """
+        Inicializa o backend.
+
+        Args:
+            cliente (Any): Cliente chave-valor com get, set e delete.
+            prefixo (str): Prefixo das chaves no armazenamento.
+        """
+        self.cliente = cliente
+        self.prefixo = prefixo
+
+    # Obtém as configurações do tenant
+    def obter(self, tenant_id: str) -> Optional[Configuracoes]:
+        conteudo = self.cliente.get(self.prefixo + tenant_id)
+        if conteudo is None:
+            return None
+        if isinstance(conteudo, bytes):
+            conteudo = conteudo.decode("utf-8")
+        return MappingProxyType({
+            chave: TenantConfig(tenant_id, chave, converter_valor(valor, tipo), tipo, descricao, categoria)
+            for chave, valor, tipo, descricao, categoria in json.loads(conteudo)
+        })
+
+    # Armazena as configurações do tenant
+    def gravar(self, tenant_id: str, configuracoes: Configuracoes, ttl: float) -> None:
+        conteudo = json.dumps(
+            [
+                [c.chave, c.valor_texto(), c.tipo, c.descricao, c.categoria]
+                for c in configuracoes.values()
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        self.cliente.set(self.prefixo + tenant_id, conteudo, ex=max(1, int(round(ttl))))
+
+    # Remove as configurações do tenant
+    def remover(self, tenant_id: str) -> None:
+        self.cliente.delete(self.prefixo + tenant_id)
+
+class CacheConfiguracoes:
+    """
+    Cache das configurações tipadas por tenant.
+
+    A carga de um tenant é feita por uma única thread de cada vez; as demais
+    aguardam e reutilizam o resultado. Cada invalidação incrementa a geração
+    do tenant, e uma carga iniciada antes dela não é armazenada, para que um
+    valor antigo lido do banco não sobrescreva a invalidação.
+    """
+
+    def __init__(
+        self,
+        carregar: Callable[[str], List[TenantConfig]],
+        ttl: float = 60.0,
+        backend: Optional[BackendCache] = None,
+        ttl_local: float = 5.0,
+        relogio: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Inicializa o cache.
+
+        Args:
+            carregar (Callable[[str], List[TenantConfig]]): Função que lê do
+                banco as configurações de um tenant.
+            ttl (float): Validade das configurações no backend, em segundos.
+            backend (Optional[BackendCache]): Backend compartilhado; se omitido,
+                o cache é apenas local.
+            ttl_local (float): Validade da cópia local quando há backend
+                compartilhado, em segundos.
+            relogio (Callable[[], float]): Relógio monotônico, em segundos.
+
+        Raises:
+            ValueError: Se algum TTL não for positivo.
+        """
+        if ttl <= 0 or ttl_local <= 0:
+            raise ValueError("O TTL do cache deve ser positivo")
+        self._carregar = carregar
+        self.ttl = ttl
+        self._local = BackendLocal(relogio)
+        self._compartilhado = backend
+        self._ttl_local = min(ttl, ttl_local) if backend is not None else ttl
+        self._trava = threading.Lock()
+        self._travas_carga: Dict[str, threading.Lock] = {}
+        self._geracoes: Dict[str, int] = {}
+        self._acertos = 0
+        self._falhas = 0
+        self._carregamentos = 0
+        self._invalidacoes = 0
+
+    # Configurações do tenant
+    def configuracoes(self, tenant_id: str) -> Configuracoes:
+        """
+        Obtém todas as configurações do tenant, carregando-as se necessário.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+
+        Returns:
+            Configuracoes: Configurações por chave, somente leitura.
+        """
+        configuracoes = self._local.obter(tenant_id)
+        if configuracoes is not None:
+            with self._trava:
+                self._acertos += 1
+            return configuracoes
+        with self._trava:
+            self._falhas += 1
+            trava_carga = self._travas_carga.setdefault(tenant_id, threading.Lock())
+        with trava_carga:
+            # Outra thread pode ter carregado enquanto esta aguardava
+            configuracoes = self._local.obter(tenant_id)
+            if configuracoes is None:
+                configuracoes = self._buscar(tenant_id)
+        return configuracoes
+
+    # Valor de uma configuração
+    def obter(self, tenant_id: str, chave: str, padrao: Any = None) -> Any:
+        """
+        Obtém o valor convertido de uma configuração.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+            chave (str): Chave da configuração.
+            padrao (Any): Valor devolvido se a configuração não existir.
+
+        Returns:
+            Any: Valor convertido pelo tipo da configuração.
+        """
+        configuracao = self.configuracoes(tenant_id).get(chave)
+        return padrao if configuracao is None else configuracao.valor
+
+    # Invalida o tenant
+    def invalidar(self, tenant_id: str) -> None:
+        """
+        Descarta as configurações do tenant, local e compartilhadas.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+        """
+        with self._trava:
+            self._geracoes[tenant_id] = self._geracoes.get(tenant_id, 0) + 1
+            self._invalidacoes += 1
+        self._local.remover(tenant_id)
+        if self._compartilhado is not None:
+            self._compartilhado.remover(tenant_id)
+
+    # Descarta a cópia local de todos os tenants
+    def limpar(self) -> None:
+        """Descarta as configurações de todos os tenants guardadas no processo."""
+        with self._trava:
+            for tenant_id in self._geracoes:
+                self._geracoes[tenant_id] += 1
+        self._local.limpar()
+
+    # Contadores do cache
+    def estatisticas(self) -> EstatisticasCache:
+        """
+        Retorna os contadores de acertos, falhas, cargas e invalidações.
+
+        Returns:
+            EstatisticasCache: Contadores acumulados desde a criação.
+        """
+        with self._trava:
+            return EstatisticasCache(self._acertos, self._falhas, self._carregamentos, self._invalidacoes)
+
+    def _buscar(self, tenant_id: str) -> Configuracoes:
+        """Busca no backend compartilhado ou no banco e guarda a cópia local."""
+        with self._trava:
+            geracao = self._geracoes.get(tenant_id, 0)
+        configuracoes = None
+        if self._compartilhado is not None:
+            configuracoes = self._compartilhado.obter(tenant_id)
+        if configuracoes is None:
+            configuracoes = MappingProxyType({c.chave: c for c in self._carregar(tenant_id)})
+            with self._trava:
+                self._carregamentos += 1
+                valida = self._geracoes.get(tenant_id, 0) == geracao
+            if valida and self._compartilhado is not None:
+                self._compartilhado.gravar(tenant_id, configuracoes, self.ttl)
+        with self._trava:
+            valida = self._geracoes.get(tenant_id, 0) == geracao
+        if valida:
+            self._local.gravar(tenant_id, configuracoes, self._ttl_local)
+        return configuracoes
+
+# Carregador das configurações a partir do banco
+def carregador_banco(fabrica_sessao: Callable[[], Session]) -> Callable[[str], List[TenantConfig]]:
+    """
+    Cria a função de carga do cache sobre o repositório SQLAlchemy.
+
+    Args:
+        fabrica_sessao (Callable[[], Session]): Fábrica de sessões.
+
+    Returns:
+        Callable[[str], List[TenantConfig]]: Função que lê as configurações de
+            um tenant em uma sessão própria.
+    """
+    def carregar(tenant_id: str) -> List[TenantConfig]:
+        with fabrica_sessao() as session:
+            return TenantConfigRepositoryImpl(session).listar(tenant_id)
+    return carregar
+
+# Carregador das configurações a partir do banco de cada tenant
+def carregador_tenants(roteador: RoteadorTenants) -> Callable[[str], List[TenantConfig]]:
+    """
+    Cria a função de carga do cache sobre os bancos separados por tenant.
+
+    Args:
+        roteador (RoteadorTenants): Roteador dos bancos de tenant.
+
+    Returns:
+        Callable[[str], List[TenantConfig]]: Função que lê as configurações de
+            um tenant no banco do próprio tenant.
+    """
+    def carregar(tenant_id: str) -> List[TenantConfig]:
+        with roteador.sessao(tenant_id) as session:
+            return TenantConfigRepositoryImpl(session).listar(tenant_id)
+    return carregar
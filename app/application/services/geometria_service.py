@@ -0,0 +1,327 @@
+"""
+Módulo de serviço de geometria das trilhas de GPS.
+
+Opera sobre as colunas de coordenadas das trilhas, com NumPy: distância de
+haversine entre pontos consecutivos, simplificação por Douglas–Peucker e por
+Visvalingam–Whyatt e detecção de paradas.
+
+As simplificações calculam, uma única vez, a importância de cada ponto: a
+tolerância de Douglas–Peucker abaixo da qual o ponto é mantido, ou a área
+efetiva de Visvalingam. Cada nível de zoom é então um filtro pelo limiar
+correspondente, sem refazer a simplificação.
+
+Requer o extra opcional `analytics` (NumPy).
+"""
+
+import heapq
+import math
+from typing import List, NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional
+    np = None
+
+RAIO_TERRA_M = 6_371_008.8
+# Metros por pixel no zoom 0 do Web Mercator, no equador, com blocos de 256 px
+METROS_PIXEL_ZOOM_0 = 156_543.033_92
+
+class Parada(NamedTuple):
+    """
+    Trecho da trilha com o veículo parado ou em marcha lenta.
+
+    Attributes:
+        inicio (int): Índice do primeiro ponto do trecho.
+        fim (int): Índice do último ponto do trecho.
+        instante_inicial (int): Instante do primeiro ponto, em milissegundos.
+        instante_final (int): Instante do último ponto, em milissegundos.
+        latitude (float): Latitude média do trecho.
+        longitude (float): Longitude média do trecho.
+    """
+
+    inicio: int
+    fim: int
+    instante_inicial: int
+    instante_final: int
+    latitude: float
+    longitude: float
+
+    # Duração da parada
+    @property
+    def duracao_segundos(self) -> float:
+        return (self.instante_final - self.instante_inicial) / 1000
+
+# Distâncias entre pontos consecutivos
+def distancias_m(latitudes: "np.ndarray", longitudes: "np.ndarray") -> "np.ndarray":
+    """
+    Calcula a distância de haversine de cada ponto ao seguinte.
+
+    Args:
+        latitudes (np.ndarray): Latitudes em graus.
+        longitudes (np.ndarray): Longitudes em graus.
+
+    Returns:
+        np.ndarray: n - 1 distâncias em metros.
+
+    Raises:
+        ImportError: Se o NumPy não estiver instalado.
+    """
+    _exigir_numpy()
+    lat = np.radians(latitudes)
+    lon = np.radians(longitudes)
+    seno_lat = np.sin(np.diff(lat) / 2)
+    seno_lon = np.sin(np.diff(lon) / 2)
+    cossenos = np.cos(lat)
+    termo = seno_lat * seno_lat + cossenos[1:] * cossenos[:-1] * seno_lon * seno_lon
+    return 2 * RAIO_TERRA_M * np.arcsin(np.sqrt(np.minimum(termo, 1.0)))
+
+# Projeção local em metros
+def projetar_m(latitudes: "np.ndarray", longitudes: "np.ndarray"):
+    """
+    Projeta as coordenadas em um plano equirretangular centrado na trilha.
+
+    A distorção é desprezível na extensão de uma viagem para medir desvios
+    e áreas da simplificação; as distâncias usam haversine.
+
+    Args:
+        latitudes (np.ndarray): Latitudes em graus.
+        longitudes (np.ndarray): Longitudes em graus.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Coordenadas x e y em metros.
+    """
+    _exigir_numpy()
+    referencia = math.radians(float(np.mean(latitudes))) if len(latitudes) else 0.0
+    escala = math.pi / 180 * RAIO_TERRA_M
+    x = (np.asarray(longitudes, dtype=np.float64) - (longitudes[0] if len(longitudes) else 0.0))
+    x *= escala * math.cos(referencia)
+    y = (np.asarray(latitudes, dtype=np.float64) - (latitudes[0] if len(latitudes) else 0.0)) * escala
+    return x, y
+
+# Tolerância de um nível de zoom
+def tolerancia_zoom(zoom: float, latitude: float, pixels: float = 1.0) -> float:
+    """
+    Converte um nível de zoom do mapa na tolerância da simplificação.
+
+    Args:
+        zoom (float): Nível de zoom do Web Mercator.
+        latitude (float): Latitude de referência, em graus.
+        pixels (float): Desvio tolerado, em pixels da tela.
+
+    Returns:
+        float: Tolerância em metros.
+    """
+    return pixels * METROS_PIXEL_ZOOM_0 * math.cos(math.radians(latitude)) / 2**zoom
+
+def _distancia_segmento(x, y, xa, ya, xb, yb):
+    """Distância de cada ponto ao segmento AB correspondente, em arrays alinhados."""
+    dx, dy = xb - xa, yb - ya
+    comprimento = dx * dx + dy * dy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        projecao = np.where(comprimento > 0, ((x - xa) * dx + (y - ya) * dy) / comprimento, 0.0)
+    projecao = np.clip(projecao, 0.0, 1.0)
+    return np.hypot(x - (xa + projecao * dx), y - (ya + projecao * dy))
+
+# Importância de cada ponto pela simplificação de Douglas–Peucker
+def importancia_douglas_peucker(x: "np.ndarray", y: "np.ndarray", tolerancia_minima: float = 0.0) -> "np.ndarray":
+    """
+    Calcula a maior tolerância de Douglas–Peucker que ainda mantém cada ponto.
+
+    A simplificação com tolerância `t` mantém exatamente os pontos de
+    importância maior que `t`. A importância de um ponto é o seu desvio no
+    passo em que foi escolhido, limitado pela dos extremos do trecho dividido.
+    Todos os trechos de um mesmo nível da recursão são divididos juntos, em
+    operações sobre os pontos ainda ativos; trechos com desvio máximo até
+    `tolerancia_minima` não são subdivididos.
+
+    Args:
+        x (np.ndarray): Coordenadas x em metros.
+        y (np.ndarray): Coordenadas y em metros.
+        tolerancia_minima (float): Menor tolerância de interesse, em metros.
+
+    Returns:
+        np.ndarray: Importância de cada ponto; infinita nas extremidades.
+    """
+    _exigir_numpy()
+    n = len(x)
+    importancia = np.zeros(n)
+    if n == 0:
+        return importancia
+    importancia[0] = importancia[-1] = np.inf
+    divisoes = np.zeros(n, dtype=bool)
+    divisoes[0] = divisoes[-1] = True
+    ativos = np.arange(1, n - 1)
+    while ativos.size:
+        extremos = np.flatnonzero(divisoes)
+        trecho = np.searchsorted(extremos, ativos) - 1
+        a, b = extremos[trecho], extremos[trecho + 1]
+        desvios = _distancia_segmento(x[ativos], y[ativos], x[a], y[a], x[b], y[b])
+
+        # Maior desvio de cada trecho e o primeiro ponto que o atinge
+        inicios = np.flatnonzero(np.concatenate(([True], trecho[1:] != trecho[:-1])))
+        grupo = np.repeat(np.arange(inicios.size), np.diff(np.append(inicios, ativos.size)))
+        maiores = np.maximum.reduceat(desvios, inicios)
+        atingem = np.flatnonzero(desvios == maiores[grupo])
+        escolhidos = atingem[np.unique(grupo[atingem], return_index=True)[1]]
+
+        dividem = maiores > tolerancia_minima
+        escolhidos = escolhidos[dividem]
+        pontos = ativos[escolhidos]
+        teto = np.minimum(importancia[a[escolhidos]], importancia[b[escolhidos]])
+        importancia[pontos] = np.minimum(maiores[dividem], teto)
+        divisoes[pontos] = True
+
+        continuam = dividem[grupo]
+        continuam[escolhidos] = False
+        ativos = ativos[continuam]
+    return importancia
+
+# Área efetiva de cada ponto pela simplificação de Visvalingam–Whyatt
+def areas_visvalingam(x: "np.ndarray", y: "np.ndarray") -> "np.ndarray":
+    """
+    Calcula a área efetiva de cada ponto na eliminação de Visvalingam–Whyatt.
+
+    Os pontos são eliminados em ordem crescente da área do triângulo que
+    formam com os vizinhos ainda presentes; a área efetiva registrada nunca
+    é menor que a do ponto eliminado antes, de modo que filtrar por um
+    limiar reproduz a eliminação até aquele limiar. As áreas iniciais são
+    vetorizadas; a eliminação, sequencial por natureza, usa um heap.
+
+    Args:
+        x (np.ndarray): Coordenadas x em metros.
+        y (np.ndarray): Coordenadas y em metros.
+
+    Returns:
+        np.ndarray: Área efetiva de cada ponto, em m²; infinita nas extremidades.
+    """
+    _exigir_numpy()
+    n = len(x)
+    if n < 3:
+        return np.full(n, np.inf)
+    iniciais = 0.5 * np.abs(
+        (x[:-2] - x[2:]) * (y[1:-1] - y[:-2]) - (x[:-2] - x[1:-1]) * (y[2:] - y[:-2])
+    )
+    xs, ys = x.tolist(), y.tolist()
+    anterior = list(range(-1, n - 1))
+    seguinte = list(range(1, n + 1))
+    atual = [math.inf] + iniciais.tolist() + [math.inf]
+    resultado = [math.inf] * n
+    heap = list(zip(atual[1:-1], range(1, n - 1)))
+    heapq.heapify(heap)
+    retirar, inserir = heapq.heappop, heapq.heappush
+    maior = 0.0
+    ultimo = n - 1
+    while heap:
+        valor, indice = retirar(heap)
+        if valor != atual[indice]:
+            continue
+        if valor > maior:
+            maior = valor
+        resultado[indice] = maior
+        atual[indice] = -1.0
+        a, b = anterior[indice], seguinte[indice]
+        seguinte[a] = b
+        anterior[b] = a
+        if a > 0:
+            c = anterior[a]
+            area = 0.5 * abs((xs[c] - xs[b]) * (ys[a] - ys[c]) - (xs[c] - xs[a]) * (ys[b] - ys[c]))
+            atual[a] = area
+            inserir(heap, (area, a))
+        if b < ultimo:
+            d = seguinte[b]
+            area = 0.5 * abs((xs[a] - xs[d]) * (ys[b] - ys[a]) - (xs[a] - xs[b]) * (ys[d] - ys[a]))
+            atual[b] = area
+            inserir(heap, (area, b))
+    return np.array(resultado)
+
+# Índices mantidos por um limiar de importância
+def selecionar(importancia: "np.ndarray", limiar: float, max_pontos: int = 0) -> "np.ndarray":
+    """
+    Escolhe os pontos de importância maior que o limiar.
+
+    Args:
+        importancia (np.ndarray): Importância de cada ponto.
+        limiar (float): Tolerância (Douglas–Peucker) ou área (Visvalingam).
+        max_pontos (int): Limite de pontos; zero para não limitar. Acima do
+            limite, ficam os mais importantes.
+
+    Returns:
+        np.ndarray: Índices escolhidos, em ordem crescente.
+    """
+    _exigir_numpy()
+    indices = np.flatnonzero(importancia > limiar)
+    if max_pontos and len(indices) > max_pontos:
+        mais_importantes = np.argpartition(importancia[indices], len(indices) - max_pontos)[-max_pontos:]
+        indices = np.sort(indices[mais_importantes])
+    return indices
+
+# Detecta os trechos parados
+def detectar_paradas(
+    instantes: "np.ndarray",
+    latitudes: "np.ndarray",
+    longitudes: "np.ndarray",
+    velocidade_maxima_kmh: float = 5.0,
+    duracao_minima_s: float = 300.0,
+    janela_s: float = 60.0,
+) -> List[Parada]:
+    """
+    Agrupa os trechos em que o veículo ficou parado.
+
+    A velocidade é medida pelo deslocamento em janelas de `janela_s`
+    segundos a partir de cada ponto, de modo que a oscilação do GPS com o
+    veículo parado não seja confundida com movimento. Um intervalo sem sinal
+    com deslocamento pequeno também conta como parado.
+
+    Args:
+        instantes (np.ndarray): Instantes em milissegundos.
+        latitudes (np.ndarray): Latitudes em graus.
+        longitudes (np.ndarray): Longitudes em graus.
+        velocidade_maxima_kmh (float): Velocidade até a qual o veículo é
+            considerado parado.
+        duracao_minima_s (float): Duração mínima de uma parada, em segundos.
+        janela_s (float): Duração da janela de medição da velocidade.
+
+    Returns:
+        List[Parada]: Paradas em ordem cronológica.
+    """
+    _exigir_numpy()
+    n = len(instantes)
+    if n < 2:
+        return []
+    instantes = np.asarray(instantes, dtype=np.int64)
+    # Fim de cada janela: primeiro ponto a `janela_s` do início, ou o seguinte
+    fins = np.searchsorted(instantes, instantes + int(janela_s * 1000))
+    fins = np.clip(np.maximum(fins, np.arange(1, n + 1)), 0, n - 1)
+    lat, lon = np.radians(latitudes), np.radians(longitudes)
+    seno_lat = np.sin((lat[fins] - lat) / 2)
+    seno_lon = np.sin((lon[fins] - lon) / 2)
+    termo = seno_lat * seno_lat + np.cos(lat) * np.cos(lat[fins]) * seno_lon * seno_lon
+    deslocamento = 2 * RAIO_TERRA_M * np.arcsin(np.sqrt(np.minimum(termo, 1.0)))
+    segundos = (instantes[fins] - instantes) / 1000.0
+    lenta = (fins > np.arange(n)) & (deslocamento <= segundos * (velocidade_maxima_kmh / 3.6))
+
+    # Trechos entre pontos cobertos por alguma janela lenta
+    cobertura = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(cobertura, np.flatnonzero(lenta), 1)
+    np.add.at(cobertura, fins[lenta], -1)
+    parado = np.cumsum(cobertura[:-1])[:-1] > 0
+    bordas = np.diff(np.concatenate(([0], parado.view(np.int8), [0])))
+    inicios = np.flatnonzero(bordas == 1)
+    ultimos = np.flatnonzero(bordas == -1)  # índice do último ponto de cada trecho
+    duracoes = (instantes[ultimos] - instantes[inicios]) / 1000.0
+    mantidas = duracoes >= duracao_minima_s
+    inicios, ultimos = inicios[mantidas], ultimos[mantidas]
+    soma_lat = np.concatenate(([0.0], np.cumsum(latitudes)))
+    soma_lon = np.concatenate(([0.0], np.cumsum(longitudes)))
+    quantidade = ultimos - inicios + 1
+    medias_lat = (soma_lat[ultimos + 1] - soma_lat[inicios]) / quantidade
+    medias_lon = (soma_lon[ultimos + 1] - soma_lon[inicios]) / quantidade
+    return [
+        Parada(int(a), int(b), int(instantes[a]), int(instantes[b]), float(la), float(lo))
+        for a, b, la, lo in zip(inicios, ultimos, medias_lat, medias_lon)
+    ]
+
+def _exigir_numpy() -> None:
+    """Falha com uma mensagem clara quando o extra `analytics` não está instalado."""
+    if np is None:
+        raise ImportError("A geometria das trilhas requer o NumPy: pip install sistema_frota[analytics]")
@@ -0,0 +1,513 @@
+"""
+Módulo de serviço de previsão de manutenção preventiva.
+
+Mantém, para toda a frota, a última manutenção de cada tipo por veículo e a
+taxa recente de quilômetros por dia, e projeta a data prevista de cada
+manutenção. As previsões ficam em um min-heap ordenado pela próxima data em
+que a criticidade de alguma manutenção pode mudar, de modo que leituras de
+hodômetro e a passagem do tempo são processadas de forma incremental, sem
+varrer a frota, emitindo eventos ManutencaoNecessaria. As leituras feitas
+pelos casos de uso gravam os eventos no outbox, na mesma transação.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.domain.events import ManutencaoNecessaria
+from app.domain.events import TipoManutencao as TipoManutencaoEvento
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Manutencao,
+    StatusViagem,
+    TipoManutencao,
+    Veiculo,
+    Viagem,
+)
+from app.infrastructure.sync.outbox import registrar_eventos
+
+@dataclass(frozen=True)
+class PlanoManutencao:
+    """
+    Periodicidade de um tipo de manutenção; vence o que ocorrer primeiro.
+
+    Attributes:
+        intervalo_km (Optional[float]): Quilômetros entre manutenções.
+        intervalo_dias (Optional[int]): Dias entre manutenções.
+    """
+    intervalo_km: Optional[float] = None
+    intervalo_dias: Optional[int] = None
+
+# Plano padrão da frota (manutenções corretivas não são programadas)
+PLANO_PADRAO: Dict[TipoManutencao, PlanoManutencao] = {
+    TipoManutencao.TROCA_OLEO: PlanoManutencao(10_000, 180),
+    TipoManutencao.PREVENTIVA: PlanoManutencao(15_000, 180),
+    TipoManutencao.REVISAO: PlanoManutencao(20_000, 365),
+    TipoManutencao.PNEUS: PlanoManutencao(50_000),
+}
+
+# Tipo do evento correspondente a cada tipo de manutenção gravado
+TIPOS_EVENTO: Dict[TipoManutencao, TipoManutencaoEvento] = {
+    TipoManutencao.PREVENTIVA: TipoManutencaoEvento.PREVENTIVA,
+    TipoManutencao.CORRETIVA: TipoManutencaoEvento.CORRETIVA,
+    TipoManutencao.TROCA_OLEO: TipoManutencaoEvento.TROCA_OLEO,
+    TipoManutencao.REVISAO: TipoManutencaoEvento.REVISAO_PERIODICA,
+    TipoManutencao.PNEUS: TipoManutencaoEvento.PNEUS,
+}
+_TIPOS_MANUTENCAO = {evento: tipo for tipo, evento in TIPOS_EVENTO.items()}
+
+# Níveis de criticidade, do menor para o maior
+CRITICIDADES: Tuple[str, ...] = ("baixa", "media", "alta")
+
+# Dias antes da data prevista em que a criticidade passa a média
+DIAS_CRITICIDADE_MEDIA = 7
+
+# Limite das projeções por km, para veículos praticamente parados
+HORIZONTE_MAXIMO_DIAS = 3650
+
+@dataclass(frozen=True)
+class PrevisaoManutencao:
+    """
+    Previsão da próxima manutenção de um tipo para um veículo.
+
+    Attributes:
+        veiculo_id (int): Identificador do veículo.
+        tipo (TipoManutencao): Tipo de manutenção.
+        km_base (float): Quilometragem da última manutenção do tipo.
+        km_prevista (float): Quilometragem em que a manutenção vence.
+        data_prevista (date): Data projetada para o vencimento.
+    """
+    veiculo_id: int
+    tipo: TipoManutencao
+    km_base: float
+    km_prevista: float
+    data_prevista: date
+
+@dataclass
+class _EstadoVeiculo:
+    """Hodômetro, leituras recentes e últimas manutenções de um veículo."""
+    km_atual: float
+    data_leitura: date
+    leituras: Deque[Tuple[date, float]]
+    taxa_km_dia: Optional[float] = None
+    ultimas: Dict[TipoManutencao, Tuple[float, date]] = field(default_factory=dict)
+
+class PrevisaoManutencaoService:
+    """
+    Agenda de manutenções preventivas da frota.
+
+    Cada par (veículo, tipo) tem uma previsão vigente e uma entrada no heap
+    com a data da próxima mudança de criticidade. Entradas substituídas por
+    uma nova previsão são descartadas ao chegar ao topo do heap. Um evento só
+    é emitido quando a criticidade do par aumenta.
+
+    A agenda é compartilhada entre as requisições e o agendador; as operações
+    são serializadas por uma trava da instância.
+    """
+
+    def __init__(
+        self,
+        plano: Optional[Dict[TipoManutencao, PlanoManutencao]] = None,
+        antecedencia_dias: int = 30,
+        janela_leituras: int = 10,
+    ) -> None:
+        """
+        Inicializa o serviço.
+
+        Args:
+            plano (Optional[Dict[TipoManutencao, PlanoManutencao]]): Periodicidade
+                por tipo. Padrão: PLANO_PADRAO.
+            antecedencia_dias (int): Dias antes da data prevista em que a
+                manutenção passa a gerar alerta de criticidade baixa.
+            janela_leituras (int): Leituras de hodômetro usadas na taxa de km/dia.
+        """
+        self.plano = plano if plano is not None else PLANO_PADRAO
+        self.antecedencia_dias = antecedencia_dias
+        self.janela_leituras = janela_leituras
+        self._veiculos: Dict[int, _EstadoVeiculo] = {}
+        self._previsoes: Dict[Tuple[int, TipoManutencao], PrevisaoManutencao] = {}
+        self._vigentes: Dict[Tuple[int, TipoManutencao], int] = {}
+        self._emitidas: Dict[Tuple[int, TipoManutencao], int] = {}
+        self._heap: List[Tuple[date, int, int, TipoManutencao]] = []
+        self._sequencia = itertools.count()
+        self._trava = threading.RLock()
+        self.carregado = False
+
+    # Carrega o estado inicial a partir do banco
+    def carregar(
+        self,
+        session: Session,
+        hoje: Optional[date] = None,
+        janela_dias: int = 30,
+    ) -> "PrevisaoManutencaoService":
+        """
+        Carrega veículos, últimas manutenções e taxas de uso do banco.
+
+        Usa três consultas agregadas: hodômetro dos veículos, última manutenção
+        concluída por veículo e tipo, e km rodados em viagens concluídas nos
+        últimos `janela_dias` dias, usados como taxa inicial de km/dia.
+
+        Args:
+            session (Session): Sessão do banco.
+            hoje (Optional[date]): Data de referência. Padrão: date.today().
+            janela_dias (int): Janela das viagens usadas na taxa inicial.
+
+        Returns:
+            PrevisaoManutencaoService: A própria instância.
+        """
+        with self._trava:
+            self._carregar(session, hoje or date.today(), janela_dias)
+            self.carregado = True
+        return self
+
+    def _carregar(self, session: Session, hoje: date, janela_dias: int) -> None:
+        """Lê o estado da frota e inclui cada veículo na agenda."""
+        inicio_janela = datetime.combine(hoje - timedelta(days=janela_dias), datetime.min.time())
+        ultimas: Dict[int, Dict[TipoManutencao, Tuple[float, date]]] = {}
+        for veiculo_id, tipo, km, data in session.execute(
+            select(
+                Manutencao.veiculo_id,
+                Manutencao.tipo,
+                func.max(Manutencao.quilometragem),
+                func.max(Manutencao.data_manutencao),
+            )
+            .where(Manutencao.concluida.is_not(False), Manutencao.tipo.in_(list(self.plano)))
+            .group_by(Manutencao.veiculo_id, Manutencao.tipo)
+        ):
+            ultimas.setdefault(veiculo_id, {})[tipo] = (km, data)
+
+        taxas = dict(
+            session.execute(
+                select(Viagem.veiculo_id, func.sum(Viagem.km_total))
+                .where(
+                    Viagem.status == StatusViagem.CONCLUIDA,
+                    Viagem.data_chegada_real >= inicio_janela,
+                )
+                .group_by(Viagem.veiculo_id)
+            ).all()
+        )
+
+        for veiculo_id, km_atual in session.execute(select(Veiculo.id, Veiculo.quilometragem_atual)):
+            km_rodados = taxas.get(veiculo_id)
+            self.adicionar_veiculo(
+                veiculo_id,
+                km_atual or 0.0,
+                hoje,
+                taxa_km_dia=km_rodados / janela_dias if km_rodados else None,
+                ultimas=ultimas.get(veiculo_id),
+            )
+
+    # Inclui um veículo na agenda
+    def adicionar_veiculo(
+        self,
+        veiculo_id: int,
+        km_atual: float,
+        data_leitura: date,
+        taxa_km_dia: Optional[float] = None,
+        ultimas: Optional[Dict[TipoManutencao, Tuple[float, date]]] = None,
+    ) -> None:
+        """
+        Inclui (ou substitui) um veículo na agenda.
+
+        Tipos sem manutenção registrada têm como base o último múltiplo do
+        intervalo em km abaixo do hodômetro atual e a data da leitura.
+
+        Args:
+            veiculo_id (int): Identificador do veículo.
+            km_atual (float): Hodômetro atual.
+            data_leitura (date): Data da leitura do hodômetro.
+            taxa_km_dia (Optional[float]): Taxa de uso inicial, em km/dia.
+            ultimas (Optional[Dict[TipoManutencao, Tuple[float, date]]]): Km e
+                data da última manutenção de cada tipo.
+        """
+        estado = _EstadoVeiculo(
+            km_atual=km_atual,
+            data_leitura=data_leitura,
+            leituras=deque([(data_leitura, km_atual)], maxlen=self.janela_leituras),
+            taxa_km_dia=taxa_km_dia,
+            ultimas=dict(ultimas or {}),
+        )
+        for tipo, plano in self.plano.items():
+            if tipo not in estado.ultimas:
+                km_base = km_atual
+                if plano.intervalo_km:
+                    km_base = math.floor(km_atual / plano.intervalo_km) * plano.intervalo_km
+                estado.ultimas[tipo] = (km_base, data_leitura)
+        with self._trava:
+            self._veiculos[veiculo_id] = estado
+            self._reprogramar(veiculo_id)
+
+    # Registra uma leitura de hodômetro
+    def registrar_leitura(self, veiculo_id: int, km: float, data: date) -> List[ManutencaoNecessaria]:
+        """
+        Atualiza o hodômetro e a taxa de uso do veículo e reprojeta apenas as
+        manutenções dele.
+
+        Leituras menores que o hodômetro atual são ignoradas. Um veículo fora
+        da agenda, cadastrado depois da carga, é incluído com a leitura.
+
+        Args:
+            veiculo_id (int): Identificador do veículo.
+            km (float): Hodômetro lido.
+            data (date): Data da leitura.
+
+        Returns:
+            List[ManutencaoNecessaria]: Eventos das manutenções do veículo cuja
+                criticidade aumentou.
+        """
+        with self._trava:
+            estado = self._veiculos.get(veiculo_id)
+            if estado is None:
+                self.adicionar_veiculo(veiculo_id, km, data)
+                estado = self._veiculos[veiculo_id]
+            elif km < estado.km_atual:
+                return []
+            estado.km_atual = km
+            estado.data_leitura = max(estado.data_leitura, data)
+            if estado.leituras[-1] != (data, km):
+                estado.leituras.append((data, km))
+            data_inicial, km_inicial = estado.leituras[0]
+            dias = (data - data_inicial).days
+            if dias > 0:
+                estado.taxa_km_dia = (km - km_inicial) / dias
+
+            self._reprogramar(veiculo_id)
+            eventos = []
+            for tipo in self.plano:
+                evento = self._avaliar(veiculo_id, tipo, data)
+                if evento is not None:
+                    eventos.append(evento)
+            return eventos
+
+    # Desfaz a emissão de eventos que não foram gravados
+    def desfazer(self, eventos: List[ManutencaoNecessaria]) -> None:
+        """
+        Esquece a criticidade dos eventos cuja transação foi desfeita, para
+        que a próxima leitura ou avanço os emita de novo.
+
+        Args:
+            eventos (List[ManutencaoNecessaria]): Eventos não gravados.
+        """
+        with self._trava:
+            for evento in eventos:
+                self._emitidas.pop((evento.veiculo_id, _TIPOS_MANUTENCAO[evento.tipo_manutencao]), None)
+
+    # Registra uma manutenção realizada
+    def registrar_manutencao(self, veiculo_id: int, tipo: TipoManutencao, km: float, data: date) -> None:
+        """
+        Registra a manutenção realizada, reiniciando a contagem do tipo.
+
+        Args:
+            veiculo_id (int): Identificador do veículo.
+            tipo (TipoManutencao): Tipo de manutenção realizada.
+            km (float): Hodômetro na manutenção.
+            data (date): Data da manutenção.
+
+        Raises:
+            KeyError: Se o veículo não estiver na agenda.
+        """
+        with self._trava:
+            estado = self._veiculos[veiculo_id]
+            if tipo not in self.plano:
+                return
+            estado.ultimas[tipo] = (km, data)
+            if km > estado.km_atual:
+                estado.km_atual = km
+            self._emitidas.pop((veiculo_id, tipo), None)
+            self._programar(veiculo_id, tipo)
+
+    # Processa a passagem do tempo
+    def avancar(self, hoje: Optional[date] = None) -> List[ManutencaoNecessaria]:
+        """
+        Emite os eventos das manutenções cuja criticidade aumentou até `hoje`.
+
+        Consome apenas as entradas do topo do heap com data até `hoje`; cada
+        uma é reprogramada para a próxima mudança de criticidade.
+
+        Args:
+            hoje (Optional[date]): Data de referência. Padrão: date.today().
+
+        Returns:
+            List[ManutencaoNecessaria]: Eventos em ordem de data prevista.
+        """
+        hoje = hoje or date.today()
+        eventos = []
+        with self._trava:
+            while self._heap and self._heap[0][0] <= hoje:
+                _, sequencia, veiculo_id, tipo = heapq.heappop(self._heap)
+                if self._vigentes.get((veiculo_id, tipo)) != sequencia:
+                    continue
+                del self._vigentes[(veiculo_id, tipo)]
+                evento = self._avaliar(veiculo_id, tipo, hoje)
+                if evento is not None:
+                    eventos.append(evento)
+        return eventos
+
+    # Próximas manutenções previstas
+    def proximas(self, quantidade: int = 10) -> List[PrevisaoManutencao]:
+        """
+        Lista as previsões com as datas mais próximas.
+
+        Args:
+            quantidade (int): Quantidade máxima de previsões.
+
+        Returns:
+            List[PrevisaoManutencao]: Previsões em ordem de data prevista.
+        """
+        with self._trava:
+            return heapq.nsmallest(
+                quantidade,
+                self._previsoes.values(),
+                key=lambda previsao: (previsao.data_prevista, previsao.veiculo_id),
+            )
+
+    def previsao(self, veiculo_id: int, tipo: TipoManutencao) -> Optional[PrevisaoManutencao]:
+        """
+        Retorna a previsão vigente de um tipo de manutenção do veículo.
+
+        Args:
+            veiculo_id (int): Identificador do veículo.
+            tipo (TipoManutencao): Tipo de manutenção.
+
+        Returns:
+            Optional[PrevisaoManutencao]: Previsão vigente, se houver.
+        """
+        return self._previsoes.get((veiculo_id, tipo))
+
+    def _reprogramar(self, veiculo_id: int) -> None:
+        """Reprojeta todas as manutenções de um veículo."""
+        for tipo in self.plano:
+            self._programar(veiculo_id, tipo)
+
+    def _programar(self, veiculo_id: int, tipo: TipoManutencao) -> None:
+        """Projeta a data prevista do tipo e agenda a próxima mudança de criticidade."""
+        estado = self._veiculos[veiculo_id]
+        plano = self.plano[tipo]
+        km_base, data_base = estado.ultimas[tipo]
+
+        datas = []
+        km_prevista = estado.km_atual
+        if plano.intervalo_km:
+            km_prevista = km_base + plano.intervalo_km
+            km_restante = km_prevista - estado.km_atual
+            if km_restante <= 0:
+                datas.append(estado.data_leitura)
+            elif estado.taxa_km_dia:
+                dias = min(math.ceil(km_restante / estado.taxa_km_dia), HORIZONTE_MAXIMO_DIAS)
+                datas.append(estado.data_leitura + timedelta(days=dias))
+        if plano.intervalo_dias:
+            datas.append(data_base + timedelta(days=plano.intervalo_dias))
+        if not datas and plano.intervalo_km:
+            # Sem taxa de uso conhecida, só as leituras de hodômetro disparam alertas
+            datas.append(date.max)
+        if not datas:
+            self._previsoes.pop((veiculo_id, tipo), None)
+            self._vigentes.pop((veiculo_id, tipo), None)
+            return
+
+        previsao = PrevisaoManutencao(veiculo_id, tipo, km_base, km_prevista, min(datas))
+        self._previsoes[(veiculo_id, tipo)] = previsao
+        nivel = self._emitidas.get((veiculo_id, tipo), -1)
+        self._agendar(previsao, nivel)
+
+    def _agendar(self, previsao: PrevisaoManutencao, nivel: int) -> None:
+        """Coloca no heap a data em que a criticidade pode passar de `nivel`."""
+        chave = (previsao.veiculo_id, previsao.tipo)
+        if nivel >= len(CRITICIDADES) - 1:
+            self._vigentes.pop(chave, None)
+            return
+        antecedencias = (self.antecedencia_dias, DIAS_CRITICIDADE_MEDIA, 0)
+        data = previsao.data_prevista - timedelta(days=antecedencias[nivel + 1])
+        sequencia = next(self._sequencia)
+        self._vigentes[chave] = sequencia
+        heapq.heappush(self._heap, (data, sequencia, previsao.veiculo_id, previsao.tipo))
+        if len(self._heap) > 2 * len(self._vigentes) + 64:
+            self._compactar()
+
+    def _compactar(self) -> None:
+        """Remove do heap as entradas substituídas por previsões mais novas."""
+        self._heap = [
+            entrada for entrada in self._heap if self._vigentes.get((entrada[2], entrada[3])) == entrada[1]
+        ]
+        heapq.heapify(self._heap)
+
+    def _avaliar(self, veiculo_id: int, tipo: TipoManutencao, hoje: date) -> Optional[ManutencaoNecessaria]:
+        """Calcula a criticidade atual do par e gera o evento se ela aumentou."""
+        previsao = self._previsoes.get((veiculo_id, tipo))
+        if previsao is None:
+            return None
+        estado = self._veiculos[veiculo_id]
+        intervalo_km = self.plano[tipo].intervalo_km
+        dias = (previsao.data_prevista - hoje).days
+        km_restante = previsao.km_prevista - estado.km_atual if intervalo_km else math.inf
+
+        nivel = -1
+        if dias <= 0 or km_restante <= 0:
+            nivel = 2
+        elif dias <= DIAS_CRITICIDADE_MEDIA or km_restante <= 0.05 * intervalo_km:
+            nivel = 1
+        elif dias <= self.antecedencia_dias or km_restante <= 0.1 * intervalo_km:
+            nivel = 0
+
+        chave = (veiculo_id, tipo)
+        anterior = self._emitidas.get(chave, -1)
+        if nivel > anterior:
+            self._emitidas[chave] = nivel
+        if chave not in self._vigentes:
+            self._agendar(previsao, max(nivel, anterior))
+        if nivel <= anterior:
+            return None
+
+        return ManutencaoNecessaria(
+            veiculo_id=veiculo_id,
+            km_atual=estado.km_atual,
+            km_ultima_manutencao=previsao.km_base,
+            km_proxima_manutencao=previsao.km_prevista,
+            data_alerta=datetime.combine(hoje, datetime.min.time()),
+            tipo_manutencao=TIPOS_EVENTO[tipo],
+            criticidade=CRITICIDADES[nivel],
+            descricao=(
+                f"{tipo.value} prevista para {previsao.data_prevista:%d/%m/%Y} "
+                f"({previsao.km_prevista:,.0f} km)"
+            ),
+        )
+
+# Registra a leitura do hodômetro na unidade de trabalho
+def registrar_leitura_hodometro(
+    session: Session,
+    previsao: PrevisaoManutencaoService,
+    veiculo_id: int,
+    km: float,
+    data: Optional[date] = None,
+) -> List[ManutencaoNecessaria]:
+    """
+    Alimenta a agenda com a leitura e grava no outbox os eventos gerados.
+
+    Não realiza commit: os eventos só são publicados se a transação do caso
+    de uso for confirmada. Se ela for desfeita, o caso de uso deve chamar
+    `PrevisaoManutencaoService.desfazer` com os eventos retornados. Enquanto
+    a agenda não foi carregada, a leitura é ignorada; a carga já lê o
+    hodômetro atual do banco.
+
+    Args:
+        session (Session): Sessão da unidade de trabalho.
+        previsao (PrevisaoManutencaoService): Agenda de manutenções.
+        veiculo_id (int): Identificador do veículo.
+        km (float): Hodômetro lido.
+        data (Optional[date]): Data da leitura. Padrão: date.today().
+
+    Returns:
+        List[ManutencaoNecessaria]: Eventos gravados no outbox.
+    """
+    if not previsao.carregado:
+        return []
+    eventos = previsao.registrar_leitura(veiculo_id, km, data or date.today())
+    registrar_eventos(session, eventos, agregado_id=veiculo_id)
+    return eventos
@@ -0,0 +1,255 @@
+"""
+Módulo de serviço de execução de relatórios em segundo plano.
+
+Define o GerenciadorRelatorios, que executa a geração dos relatórios em um
+pool de threads, fora do laço de eventos da API. Cada relatório recebe um
+identificador de tarefa, pelo qual o cliente acompanha o progresso e, ao
+final, baixa o arquivo. O arquivo é gravado com nome temporário e só recebe
+o nome definitivo quando a geração termina. Cada tarefa lê o banco do tenant
+que a solicitou e só é visível para ele.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.application.use_cases.viagem.relatorio_viagem import RelatorioViagensClienteUseCase
+from app.domain.entities.tenant_config import TENANT_PADRAO
+from app.infrastructure.persistence.sqlalchemy.tenant_router import RoteadorTenants
+from app.infrastructure.relatorios.escritores import FORMATOS
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDENTE = "pendente"
+STATUS_EXECUTANDO = "executando"
+STATUS_CONCLUIDO = "concluido"
+STATUS_ERRO = "erro"
+
+@dataclass
+class TarefaRelatorio:
+    """
+    Estado de uma tarefa de geração de relatório.
+
+    Attributes:
+        id (str): Identificador da tarefa.
+        cliente_id (int): Cliente do relatório.
+        formato (str): Formato do arquivo.
+        inicio (date): Primeiro dia do período.
+        fim (date): Último dia do período.
+        tenant_id (str): Tenant que solicitou o relatório.
+        status (str): pendente, executando, concluido ou erro.
+        total (Optional[int]): Viagens a gravar, conhecido ao iniciar.
+        processadas (int): Viagens já gravadas.
+        caminho (Optional[str]): Arquivo gerado, quando concluída.
+        erro (Optional[str]): Mensagem da falha, quando houver.
+        criada_em (datetime): Momento do envio.
+        concluida_em (Optional[datetime]): Momento da conclusão ou da falha.
+    """
+    id: str
+    cliente_id: int
+    formato: str
+    inicio: date
+    fim: date
+    tenant_id: str = TENANT_PADRAO
+    status: str = STATUS_PENDENTE
+    total: Optional[int] = None
+    processadas: int = 0
+    caminho: Optional[str] = None
+    erro: Optional[str] = None
+    criada_em: Optional[datetime] = None
+    concluida_em: Optional[datetime] = None
+
+    @property
+    def progresso(self) -> float:
+        """Fração concluída, entre 0 e 1."""
+        if self.status == STATUS_CONCLUIDO:
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(self.processadas / self.total, 1.0)
+
+    @property
+    def finalizada(self) -> bool:
+        """Indica se a tarefa terminou, com sucesso ou não."""
+        return self.status in (STATUS_CONCLUIDO, STATUS_ERRO)
+
+class GerenciadorRelatorios:
+    """
+    Gerenciador das tarefas de relatório executadas em um pool de threads.
+    """
+
+    def __init__(
+        self,
+        fabrica_sessao: Callable[[], Session],
+        diretorio: str,
+        workers: int = 2,
+        retencao: timedelta = timedelta(hours=1),
+        roteador: Optional[RoteadorTenants] = None,
+    ) -> None:
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            fabrica_sessao (Callable[[], Session]): Cria a sessão de cada tarefa.
+            diretorio (str): Diretório dos arquivos gerados.
+            workers (int): Relatórios gerados em paralelo.
+            retencao (timedelta): Tempo que as tarefas finalizadas e seus
+                arquivos são mantidos.
+            roteador (Optional[RoteadorTenants]): Roteador dos bancos de
+                tenant; sem ele, todas as tarefas usam `fabrica_sessao`.
+        """
+        if workers < 1:
+            raise ValueError("O pool de relatórios precisa de ao menos um worker")
+        self.fabrica_sessao = fabrica_sessao
+        self.roteador = roteador
+        self.diretorio = diretorio
+        self.retencao = retencao
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="relatorios")
+        self._tarefas: Dict[str, TarefaRelatorio] = {}
+        self._trava = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+
+    # Enfileira a geração de um relatório
+    def enviar(
+        self,
+        cliente_id: int,
+        formato: str,
+        inicio: date,
+        fim: date,
+        tenant_id: str = TENANT_PADRAO,
+    ) -> TarefaRelatorio:
+        """
+        Enfileira o relatório de viagens de um cliente.
+
+        Args:
+            cliente_id (int): Cliente do relatório.
+            formato (str): "csv", "xlsx" ou "pdf".
+            inicio (date): Primeiro dia do período.
+            fim (date): Último dia do período, inclusivo.
+            tenant_id (str): Tenant cujo banco é lido.
+
+        Returns:
+            TarefaRelatorio: Cópia do estado inicial da tarefa.
+
+        Raises:
+            ValueError: Se o formato não for suportado ou o período for inválido.
+        """
+        formato = formato.lower()
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de relatório inválido: {formato} (use {', '.join(FORMATOS)})")
+        if fim < inicio:
+            raise ValueError("O fim do período é anterior ao início")
+
+        self.limpar_expiradas()
+        tarefa = TarefaRelatorio(
+            id=uuid.uuid4().hex,
+            cliente_id=cliente_id,
+            formato=formato,
+            inicio=inicio,
+            fim=fim,
+            tenant_id=tenant_id,
+            criada_em=datetime.now(),
+        )
+        with self._trava:
+            self._tarefas[tarefa.id] = tarefa
+            copia = replace(tarefa)
+        self._executor.submit(self._executar, tarefa)
+        return copia
+
+    # Consulta uma tarefa
+    def obter(self, tarefa_id: str, tenant_id: str = TENANT_PADRAO) -> Optional[TarefaRelatorio]:
+        """
+        Retorna o estado atual de uma tarefa.
+
+        Args:
+            tarefa_id (str): Identificador da tarefa.
+            tenant_id (str): Tenant que consulta a tarefa.
+
+        Returns:
+            Optional[TarefaRelatorio]: Cópia do estado, ou None se a tarefa
+                não existir, já tiver expirado ou for de outro tenant.
+        """
+        with self._trava:
+            tarefa = self._tarefas.get(tarefa_id)
+            if tarefa is None or tarefa.tenant_id != tenant_id:
+                return None
+            return replace(tarefa)
+
+    # Remove tarefas finalizadas antigas
+    def limpar_expiradas(self, agora: Optional[datetime] = None) -> int:
+        """
+        Remove as tarefas finalizadas há mais que a retenção e seus arquivos.
+
+        Args:
+            agora (Optional[datetime]): Momento de referência.
+
+        Returns:
+            int: Quantidade de tarefas removidas.
+        """
+        limite = (agora or datetime.now()) - self.retencao
+        with self._trava:
+            expiradas = [
+                tarefa for tarefa in self._tarefas.values()
+                if tarefa.finalizada and tarefa.concluida_em < limite
+            ]
+            for tarefa in expiradas:
+                del self._tarefas[tarefa.id]
+        for tarefa in expiradas:
+            if tarefa.caminho and os.path.exists(tarefa.caminho):
+                os.remove(tarefa.caminho)
+        return len(expiradas)
+
+    # Encerra o pool
+    def encerrar(self, esperar: bool = True) -> None:
+        """
+        Encerra o pool de threads.
+
+        Args:
+            esperar (bool): Se deve aguardar as tarefas em execução.
+        """
+        self._executor.shutdown(wait=esperar)
+
+    def _executar(self, tarefa: TarefaRelatorio) -> None:
+        """Gera o relatório de uma tarefa, atualizando seu progresso."""
+        caminho = os.path.join(self.diretorio, f"{tarefa.id}.{tarefa.formato}")
+        temporario = caminho + ".parcial"
+        self._atualizar(tarefa, status=STATUS_EXECUTANDO)
+        try:
+            with self._sessao(tarefa.tenant_id) as session:
+                caso_de_uso = RelatorioViagensClienteUseCase(session)
+                self._atualizar(tarefa, total=caso_de_uso.contar(tarefa.cliente_id, tarefa.inicio, tarefa.fim))
+                with open(temporario, "wb") as arquivo:
+                    caso_de_uso.gerar(
+                        tarefa.cliente_id,
+                        tarefa.inicio,
+                        tarefa.fim,
+                        tarefa.formato,
+                        arquivo,
+                        progresso=lambda processadas: self._atualizar(tarefa, processadas=processadas),
+                    )
+            os.replace(temporario, caminho)
+            self._atualizar(tarefa, status=STATUS_CONCLUIDO, caminho=caminho, concluida_em=datetime.now())
+        except Exception as erro:
+            logger.exception("Falha ao gerar o relatório %s", tarefa.id)
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            self._atualizar(tarefa, status=STATUS_ERRO, erro=str(erro), concluida_em=datetime.now())
+
+    def _sessao(self, tenant_id: str) -> Session:
+        """Abre a sessão no banco do tenant da tarefa."""
+        if self.roteador is None:
+            return self.fabrica_sessao()
+        return self.roteador.sessao(tenant_id)
+
+    def _atualizar(self, tarefa: TarefaRelatorio, **campos) -> None:
+        """Altera o estado da tarefa sob a trava."""
+        with self._trava:
+            for nome, valor in campos.items():
+                setattr(tarefa, nome, valor)
@@ -0,0 +1,253 @@
+"""
+Módulo de serviço de consolidação dos custos de viagem.
+
+Mantém a tabela `resumos_custo_mensal`, com os custos das viagens concluídas
+somados por mês e por veículo, motorista e cliente. A tabela é atualizada de
+forma incremental no flush de cada sessão: cada viagem incluída, alterada ou
+removida gera a diferença entre a contribuição anterior e a nova, aplicada
+nas linhas de resumo afetadas na mesma transação. A reconstrução completa
+serve para a carga inicial e para corrigir alterações feitas fora do ORM.
+"""
+
+import weakref
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from sqlalchemy import bindparam, delete, event, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.infrastructure.persistence.sqlalchemy.models import (
+    ResumoCustoMensal,
+    StatusViagem,
+    Viagem,
+)
+
+DIMENSOES = ("veiculo", "motorista", "cliente")
+
+METRICAS = (
+    "quantidade_viagens",
+    "km_total",
+    "custo_combustivel",
+    "pedagio",
+    "alimentacao",
+    "hospedagem",
+    "outros_custos",
+    "custo_total",
+    "valor_frete",
+)
+
+_CUSTOS = ("custo_combustivel", "pedagio", "alimentacao", "hospedagem", "outros_custos")
+
+# Sessões e fábricas de sessão com a atualização dos resumos ativa
+_ALVOS_RESUMIDOS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+_CAMPOS_VIAGEM = (
+    "status",
+    "veiculo_id",
+    "motorista_id",
+    "cliente_id",
+    "data_saida_prevista",
+    "data_saida_real",
+    "data_chegada_real",
+    "km_total",
+    "custo_combustivel",
+    "pedagio",
+    "alimentacao",
+    "hospedagem",
+    "outros_custos",
+    "custo_total",
+    "valor_frete",
+)
+
+ChaveResumo = Tuple[str, int, date]
+
+# Contribuição de uma viagem para os resumos
+def contribuicao(viagem: Mapping[str, Any]) -> Dict[ChaveResumo, Tuple[float, ...]]:
+    """
+    Calcula as linhas de resumo a que a viagem contribui e com quanto.
+
+    Apenas viagens concluídas contribuem, no mês da chegada (ou da saída,
+    quando a chegada não foi registrada). Sem `custo_total`, o custo total é
+    a soma dos custos parciais.
+
+    Args:
+        viagem (Mapping[str, Any]): Valores das colunas da viagem.
+
+    Returns:
+        Dict[ChaveResumo, Tuple[float, ...]]: Métricas (na ordem de
+            `METRICAS`) por chave (dimensão, entidade, mês).
+    """
+    if viagem["status"] != StatusViagem.CONCLUIDA:
+        return {}
+    data = viagem["data_chegada_real"] or viagem["data_saida_real"] or viagem["data_saida_prevista"]
+    if data is None:
+        return {}
+    mes = date(data.year, data.month, 1)
+
+    custos = [viagem[campo] or 0.0 for campo in _CUSTOS]
+    custo_total = viagem["custo_total"]
+    if custo_total is None:
+        custo_total = sum(custos)
+    metricas = (1, viagem["km_total"] or 0.0, *custos, custo_total, viagem["valor_frete"] or 0.0)
+
+    chaves = {}
+    for dimensao in DIMENSOES:
+        entidade_id = viagem[f"{dimensao}_id"]
+        if entidade_id is not None:
+            chaves[(dimensao, entidade_id, mes)] = metricas
+    return chaves
+
+class AcumuladorResumos:
+    """
+    Diferenças pendentes por linha de resumo.
+    """
+
+    def __init__(self) -> None:
+        self._deltas: Dict[ChaveResumo, List[float]] = defaultdict(lambda: [0.0] * len(METRICAS))
+
+    # Soma a contribuição de uma viagem
+    def somar(self, viagem: Mapping[str, Any], sinal: int = 1) -> None:
+        """
+        Soma (ou subtrai, com sinal negativo) a contribuição da viagem.
+
+        Args:
+            viagem (Mapping[str, Any]): Valores das colunas da viagem.
+            sinal (int): 1 para incluir, -1 para retirar.
+        """
+        for chave, metricas in contribuicao(viagem).items():
+            delta = self._deltas[chave]
+            for posicao, valor in enumerate(metricas):
+                delta[posicao] += sinal * valor
+
+    def linhas(self) -> List[Dict[str, Any]]:
+        """
+        Retorna as diferenças não nulas como linhas da tabela de resumo.
+
+        Returns:
+            List[Dict[str, Any]]: Chave e métricas de cada linha afetada.
+        """
+        linhas = []
+        for (dimensao, entidade_id, mes), delta in self._deltas.items():
+            if any(delta):
+                linha = {"dimensao": dimensao, "entidade_id": entidade_id, "mes": mes}
+                linha.update(zip(METRICAS, delta))
+                linha["quantidade_viagens"] = int(round(linha["quantidade_viagens"]))
+                linhas.append(linha)
+        return linhas
+
+    # Aplica as diferenças no banco
+    def aplicar(self, conexao: Connection) -> int:
+        """
+        Soma as diferenças nas linhas de resumo, criando as que faltam e
+        removendo as que ficaram sem viagens.
+
+        Args:
+            conexao (Connection): Conexão da transação corrente.
+
+        Returns:
+            int: Quantidade de linhas de resumo afetadas.
+        """
+        tabela = ResumoCustoMensal.__table__
+        chave = (
+            (tabela.c.dimensao == bindparam("_dimensao"))
+            & (tabela.c.entidade_id == bindparam("_entidade_id"))
+            & (tabela.c.mes == bindparam("_mes"))
+        )
+        somar = update(tabela).where(chave).values(
+            {metrica: tabela.c[metrica] + bindparam(metrica) for metrica in METRICAS}
+        )
+        remover = delete(tabela).where(chave & (tabela.c.quantidade_viagens <= 0))
+
+        linhas = self.linhas()
+        for linha in linhas:
+            parametros = dict(linha, _dimensao=linha["dimensao"], _entidade_id=linha["entidade_id"], _mes=linha["mes"])
+            if conexao.execute(somar, parametros).rowcount == 0:
+                conexao.execute(insert(tabela), linha)
+            elif linha["quantidade_viagens"] < 0:
+                conexao.execute(remover, parametros)
+        self._deltas.clear()
+        return len(linhas)
+
+class ResumoCustoService:
+    """
+    Serviço de manutenção dos resumos mensais de custo das viagens.
+    """
+
+    def __init__(self, session: Session, tamanho_lote: int = 5000) -> None:
+        """
+        Inicializa o serviço.
+
+        Args:
+            session (Session): Sessão do banco.
+            tamanho_lote (int): Viagens lidas por vez na reconstrução.
+        """
+        self.session = session
+        self.tamanho_lote = tamanho_lote
+
+    # Reconstrói os resumos a partir das viagens
+    def reconstruir(self) -> int:
+        """
+        Apaga e recalcula todos os resumos a partir das viagens concluídas,
+        confirmando a transação.
+
+        Returns:
+            int: Quantidade de linhas de resumo gravadas.
+        """
+        colunas = [getattr(Viagem, campo) for campo in _CAMPOS_VIAGEM]
+        consulta = (
+            select(*colunas)
+            .where(Viagem.status == StatusViagem.CONCLUIDA)
+            .execution_options(yield_per=self.tamanho_lote)
+        )
+        acumulador = AcumuladorResumos()
+        for linha in self.session.execute(consulta).mappings():
+            acumulador.somar(linha)
+
+        linhas = acumulador.linhas()
+        self.session.execute(delete(ResumoCustoMensal))
+        for inicio in range(0, len(linhas), self.tamanho_lote):
+            self.session.execute(insert(ResumoCustoMensal), linhas[inicio:inicio + self.tamanho_lote])
+        self.session.commit()
+        return len(linhas)
+
+# Ativa a atualização incremental dos resumos em uma fábrica de sessões
+def ativar_resumo_custos(alvo: Any) -> None:
+    """
+    Registra o listener que atualiza os resumos de custo a cada flush.
+
+    Args:
+        alvo (Any): Session, sessionmaker ou classe Session cujos flushes
+            devem atualizar os resumos.
+    """
+    if alvo not in _ALVOS_RESUMIDOS:
+        event.listen(alvo, "before_flush", _atualizar_resumos)
+        _ALVOS_RESUMIDOS.add(alvo)
+
+def _atualizar_resumos(session: Session, flush_context: Any, instancias: Any) -> None:
+    """Aplica nos resumos a diferença causada pelas viagens do flush."""
+    novas = [obj for obj in session.new if isinstance(obj, Viagem)]
+    alteradas = [
+        obj for obj in session.dirty
+        if isinstance(obj, Viagem) and session.is_modified(obj, include_collections=False)
+    ]
+    removidas = [obj for obj in session.deleted if isinstance(obj, Viagem)]
+    if not (novas or alteradas or removidas):
+        return
+
+    acumulador = AcumuladorResumos()
+    conexao = session.connection()
+    # Antes do flush, o banco ainda tem os valores anteriores das viagens
+    for linha in _valores_gravados(conexao, [obj.id for obj in alteradas + removidas]):
+        acumulador.somar(linha, -1)
+    for obj in novas + alteradas:
+        acumulador.somar({campo: getattr(obj, campo) for campo in _CAMPOS_VIAGEM})
+    acumulador.aplicar(conexao)
+
+def _valores_gravados(conexao: Connection, ids: List[int]) -> Iterable[Mapping[str, Any]]:
+    """Lê do banco os valores atuais das viagens indicadas."""
+    if not ids:
+        return []
+    colunas = [getattr(Viagem, campo) for campo in _CAMPOS_VIAGEM]
+    return conexao.execute(select(*colunas).where(Viagem.id.in_(ids))).mappings().all()
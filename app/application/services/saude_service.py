@@ -0,0 +1,173 @@
+"""
+Módulo de verificação de saúde da aplicação.
+
+Reúne as sondas de prontidão usadas pelo orquestrador: conectividade do
+banco, saturação do pool de conexões, acúmulo do outbox e atraso do
+agendador. Cada sonda mede a própria latência e é comparada a um limite
+configurável. O resultado fica em cache por um intervalo curto e é
+compartilhado pelas requisições concorrentes, para que uma rajada de sondas
+não chegue ao banco.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+
+from app.infrastructure.agendamento.agendador import Agendador
+from app.infrastructure.persistence.sqlalchemy.models import OutboxEvento
+
+class ResultadoSonda(NamedTuple):
+    """Resultado de uma sonda de prontidão."""
+
+    nome: str
+    ok: bool
+    latencia_ms: float
+    detalhe: str
+
+class RelatorioProntidao(NamedTuple):
+    """Resultado consolidado das sondas."""
+
+    pronto: bool
+    verificado_em: datetime
+    sondas: List[ResultadoSonda]
+
+@dataclass
+class LimitesProntidao:
+    """
+    Limites a partir dos quais a aplicação deixa de estar pronta.
+
+    Attributes:
+        latencia_banco_ms (float): Latência máxima do SELECT 1.
+        saturacao_pool (float): Fração máxima de conexões em uso no pool.
+        outbox_pendentes (int): Eventos pendentes máximos no outbox.
+        outbox_idade_segundos (float): Idade máxima do evento mais antigo.
+        atraso_agendador_segundos (float): Atraso máximo do laço do agendador.
+    """
+
+    latencia_banco_ms: float = 250.0
+    saturacao_pool: float = 0.9
+    outbox_pendentes: int = 10_000
+    outbox_idade_segundos: float = 300.0
+    atraso_agendador_segundos: float = 30.0
+
+class VerificadorProntidao:
+    """
+    Executa as sondas de prontidão com cache do resultado.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        agendador: Callable[[], Optional[Agendador]] = lambda: None,
+        limites: Optional[LimitesProntidao] = None,
+        validade: float = 2.0,
+        relogio: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Inicializa o verificador.
+
+        Args:
+            engine (Engine): Engine do banco principal.
+            agendador (Callable[[], Optional[Agendador]]): Função que retorna o
+                agendador em execução, ou None se desabilitado.
+            limites (Optional[LimitesProntidao]): Limites das sondas.
+            validade (float): Tempo de cache do resultado, em segundos.
+            relogio (Callable[[], float]): Relógio monotônico, em segundos.
+        """
+        self.engine = engine
+        self.agendador = agendador
+        self.limites = limites or LimitesProntidao()
+        self.validade = validade
+        self._relogio = relogio
+        self._trava = threading.Lock()
+        self._ultimo: Optional[RelatorioProntidao] = None
+        self._expira_em = 0.0
+
+    # Avalia a prontidão
+    def avaliar(self) -> RelatorioProntidao:
+        """
+        Executa as sondas, ou devolve o resultado em cache se ainda válido.
+
+        Chamadas concorrentes aguardam a avaliação em andamento e recebem o
+        mesmo resultado.
+
+        Returns:
+            RelatorioProntidao: Resultado consolidado das sondas.
+        """
+        with self._trava:
+            if self._ultimo is not None and self._relogio() < self._expira_em:
+                return self._ultimo
+            sondas = [
+                _medir("banco", self._sondar_banco),
+                _medir("pool", self._sondar_pool),
+                _medir("outbox", self._sondar_outbox),
+                _medir("agendador", self._sondar_agendador),
+            ]
+            self._ultimo = RelatorioProntidao(
+                pronto=all(sonda.ok for sonda in sondas),
+                verificado_em=datetime.now(timezone.utc),
+                sondas=sondas,
+            )
+            self._expira_em = self._relogio() + self.validade
+            return self._ultimo
+
+    def _sondar_banco(self):
+        inicio = time.perf_counter()
+        with self.engine.connect() as conexao:
+            conexao.execute(text("SELECT 1"))
+        latencia = (time.perf_counter() - inicio) * 1000
+        limite = self.limites.latencia_banco_ms
+        return latencia <= limite, f"SELECT 1 em {latencia:.1f} ms (limite {limite:.0f} ms)"
+
+    def _sondar_pool(self):
+        pool = self.engine.pool
+        if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+            return True, f"{type(pool).__name__} sem limite de conexões"
+        capacidade = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+        em_uso = pool.checkedout()
+        saturacao = em_uso / capacidade if capacidade > 0 else 0.0
+        limite = self.limites.saturacao_pool
+        return saturacao < limite, f"{em_uso}/{capacidade} conexões em uso ({saturacao:.0%})"
+
+    def _sondar_outbox(self):
+        with self.engine.connect() as conexao:
+            pendentes, mais_antigo = conexao.execute(
+                select(func.count(OutboxEvento.id), func.min(OutboxEvento.data_criacao))
+            ).one()
+        idade = _idade_segundos(mais_antigo)
+        ok = pendentes <= self.limites.outbox_pendentes and idade <= self.limites.outbox_idade_segundos
+        return ok, f"{pendentes} eventos pendentes; mais antigo há {idade:.0f} s"
+
+    def _sondar_agendador(self):
+        agendador = self.agendador()
+        if agendador is None:
+            return True, "agendador desabilitado"
+        atraso = agendador.atraso()
+        if atraso is None:
+            return True, "aguardando a primeira verificação"
+        limite = self.limites.atraso_agendador_segundos
+        return atraso <= limite, f"laço atrasado {atraso:.1f} s (limite {limite:.0f} s)"
+
+def _medir(nome: str, sonda: Callable[[], tuple]) -> ResultadoSonda:
+    """Executa a sonda medindo a latência; exceções tornam a sonda negativa."""
+    inicio = time.perf_counter()
+    try:
+        ok, detalhe = sonda()
+    except Exception as erro:
+        ok, detalhe = False, f"{type(erro).__name__}: {erro}"
+    return ResultadoSonda(nome, ok, round((time.perf_counter() - inicio) * 1000, 3), detalhe)
+
+def _idade_segundos(momento: Optional[datetime]) -> float:
+    """Idade de um horário do banco; horários sem fuso são UTC (CURRENT_TIMESTAMP)."""
+    if momento is None:
+        return 0.0
+    if isinstance(momento, str):
+        momento = datetime.fromisoformat(momento)
+    if momento.tzinfo is None:
+        momento = momento.replace(tzinfo=timezone.utc)
+    return max(0.0, (datetime.now(timezone.utc) - momento).total_seconds())
@@ -0,0 +1,106 @@
+"""
+Módulo das tarefas recorrentes da frota.
+
+Reúne as funções executadas pelo agendador: alertas de CNH, varredura de
+documentos a vencer, previsão de manutenção, varredura de anomalias nos
+abastecimentos e reconstrução dos resumos de custo. Cada função abre a
+própria sessão, para que possa rodar em uma thread ou em outro processo, e
+retorna a quantidade de itens tratados. A previsão de manutenção é a
+exceção: usa a agenda compartilhada com a API, que roda no pool de threads.
+"""
+
+import logging
+from datetime import date
+from functools import partial
+from typing import Optional
+
+from app.application.services.alerta_service import AlertaService
+from app.application.services.anomalia_abastecimento_service import DetectorAnomaliasAbastecimento
+from app.application.services.manutencao_service import PrevisaoManutencaoService
+from app.application.services.resumo_custo_service import ResumoCustoService
+from app.application.use_cases.motorista.alertas_cnh import AlertasCNHUseCase
+from app.infrastructure.agendamento.agendador import Agendador
+from app.infrastructure.persistence.sqlalchemy.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Alertas de CNH a vencer
+def alertar_cnh() -> int:
+    """Emite os alertas de CNH desde a última execução."""
+    with SessionLocal() as session:
+        alertas = AlertasCNHUseCase(session).executar()
+    for alerta in alertas:
+        logger.info("CNH de %s vence em %d dias", alerta.nome, alerta.dias_restantes)
+    return len(alertas)
+
+# Documentos a vencer
+def varrer_documentos() -> int:
+    """Varre os documentos de motoristas e veículos a vencer desde a última execução."""
+    with SessionLocal() as session:
+        quantidade = 0
+        for vencimento in AlertaService(session).varrer():
+            logger.info(
+                "Documento %s (%s %d) vence em %s",
+                vencimento.tipo, vencimento.origem, vencimento.titular_id, vencimento.data_validade,
+            )
+            quantidade += 1
+    return quantidade
+
+# Previsão de manutenção
+def prever_manutencoes(previsao: Optional[PrevisaoManutencaoService] = None) -> int:
+    """
+    Avança a agenda de manutenções e registra as que mudaram de criticidade.
+
+    A agenda é mantida entre as execuções, para que cada alerta seja
+    registrado uma única vez; é carregada do banco apenas se ainda não foi.
+
+    Args:
+        previsao (Optional[PrevisaoManutencaoService]): Agenda compartilhada.
+            Padrão é uma agenda nova, carregada nesta execução.
+
+    Returns:
+        int: Quantidade de alertas registrados.
+    """
+    hoje = date.today()
+    servico = previsao if previsao is not None else PrevisaoManutencaoService()
+    if not servico.carregado:
+        with SessionLocal() as session:
+            servico.carregar(session, hoje=hoje)
+    eventos = servico.avancar(hoje)
+    for evento in eventos:
+        logger.info(
+            "Manutenção %s do veículo %s com criticidade %s",
+            evento.tipo_manutencao.value, evento.veiculo_id, evento.criticidade,
+        )
+    return len(eventos)
+
+# Anomalias nos abastecimentos
+def varrer_anomalias_abastecimento() -> int:
+    """Reprocessa o histórico de abastecimentos e grava os códigos de anomalia."""
+    with SessionLocal() as session:
+        return len(DetectorAnomaliasAbastecimento().varrer_historico(session))
+
+# Resumos de custo das viagens
+def reconstruir_resumos_custo() -> int:
+    """Reconstrói os resumos mensais de custo a partir das viagens."""
+    with SessionLocal() as session:
+        return ResumoCustoService(session).reconstruir()
+
+# Registra as tarefas da frota no agendador
+def registrar_tarefas_frota(agendador: Agendador, previsao: Optional[PrevisaoManutencaoService] = None) -> None:
+    """
+    Registra as tarefas recorrentes da frota.
+
+    As varreduras de histórico consomem CPU e rodam no pool de processos,
+    quando houver; as demais, no pool de threads.
+
+    Args:
+        agendador (Agendador): Agendador da aplicação.
+        previsao (Optional[PrevisaoManutencaoService]): Agenda de manutenções
+            compartilhada com a API.
+    """
+    agendador.agendar("alertas.cnh", alertar_cnh, "0 6 * * *")
+    agendador.agendar("alertas.documentos", varrer_documentos, "10 6 * * *")
+    agendador.agendar("manutencao.previsao", partial(prever_manutencoes, previsao), "0 */6 * * *")
+    agendador.agendar("abastecimentos.anomalias", varrer_anomalias_abastecimento, "30 2 * * *", cpu=True)
+    agendador.agendar("viagens.resumos_custo", reconstruir_resumos_custo, "0 3 * * 0", cpu=True)
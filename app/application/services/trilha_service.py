@@ -0,0 +1,366 @@
+"""
+Módulo de serviço das trilhas de GPS das viagens.
+
+Calcula a distância percorrida por uma trilha e reduz a quantidade de pontos
+enviada para exibição em mapa. Com o extra `analytics` (NumPy), a geometria
+de cada trilha (distância, paradas e simplificações por nível de zoom) é
+calculada uma vez e mantida em um LRU por viagem, invalidado quando chegam
+novos pontos, respeitada uma idade mínima configurável; sem ele, a distância é somada ponto a ponto e a redução é por
+amostragem uniforme.
+"""
+
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional
+    np = None
+
+from sqlalchemy.orm import Session
+
+from app.application.services import geometria_service
+from app.application.services.geometria_service import Parada
+from app.infrastructure.telemetria.armazem import ArmazemPosicoes, Trilha
+
+RAIO_TERRA_KM = 6371.0088
+METODOS_SIMPLIFICACAO = ("douglas_peucker", "visvalingam")
+TOLERANCIA_DIVERGENCIA = 10.0  # diferença percentual aceita entre hodômetro e trilha
+
+# Distância percorrida pela trilha
+def distancia_km(trilha: Trilha) -> float:
+    """
+    Soma as distâncias de haversine entre pontos consecutivos da trilha,
+    de forma vetorizada quando o NumPy está instalado.
+
+    Args:
+        trilha (Trilha): Posições da viagem.
+
+    Returns:
+        float: Distância em quilômetros; zero com menos de dois pontos.
+    """
+    if len(trilha) < 2:
+        return 0.0
+    if np is not None:
+        latitudes = np.frombuffer(trilha.latitudes, dtype=np.float64)
+        longitudes = np.frombuffer(trilha.longitudes, dtype=np.float64)
+        return float(geometria_service.distancias_m(latitudes, longitudes).sum()) / 1000
+    radianos = math.radians
+    latitudes = [radianos(valor) for valor in trilha.latitudes]
+    longitudes = [radianos(valor) for valor in trilha.longitudes]
+    cossenos = [math.cos(valor) for valor in latitudes]
+    total = 0.0
+    for indice in range(1, len(latitudes)):
+        seno_lat = math.sin((latitudes[indice] - latitudes[indice - 1]) / 2)
+        seno_lon = math.sin((longitudes[indice] - longitudes[indice - 1]) / 2)
+        termo = seno_lat * seno_lat + cossenos[indice] * cossenos[indice - 1] * seno_lon * seno_lon
+        total += math.asin(math.sqrt(min(termo, 1.0)))
+    return 2 * RAIO_TERRA_KM * total
+
+# Reduz a trilha para exibição
+def amostrar(trilha: Trilha, max_pontos: int) -> Trilha:
+    """
+    Escolhe pontos igualmente espaçados da trilha, mantendo o primeiro e o último.
+
+    Args:
+        trilha (Trilha): Posições da viagem.
+        max_pontos (int): Quantidade máxima de pontos, a partir de dois.
+
+    Returns:
+        Trilha: A própria trilha, se já couber no limite, ou a amostra.
+
+    Raises:
+        ValueError: Se `max_pontos` for menor que dois.
+    """
+    if max_pontos < 2:
+        raise ValueError("A amostra precisa de pelo menos dois pontos")
+    quantidade = len(trilha)
+    if quantidade <= max_pontos:
+        return trilha
+    passo = (quantidade - 1) / (max_pontos - 1)
+    indices: List[int] = [round(posicao * passo) for posicao in range(max_pontos)]
+    return Trilha(
+        array("q", [trilha.instantes[indice] for indice in indices]),
+        array("d", [trilha.latitudes[indice] for indice in indices]),
+        array("d", [trilha.longitudes[indice] for indice in indices]),
+    )
+
+# Diferença entre a quilometragem do hodômetro e a da trilha
+def divergencia_km(km_hodometro: Optional[float], km_rastreado: Optional[float]) -> Optional[float]:
+    """
+    Calcula a diferença percentual do hodômetro em relação à trilha de GPS.
+
+    Args:
+        km_hodometro (Optional[float]): Quilometragem pelo hodômetro.
+        km_rastreado (Optional[float]): Quilometragem pela trilha.
+
+    Returns:
+        Optional[float]: Diferença em percentual da trilha, positiva se o
+            hodômetro registrou mais; None sem trilha ou com trilha parada.
+    """
+    if km_hodometro is None or not km_rastreado:
+        return None
+    return (km_hodometro - km_rastreado) / km_rastreado * 100
+
+class AnaliseTrilha:
+    """
+    Geometria de uma trilha: distância, paradas e importância dos pontos.
+
+    As importâncias de cada método de simplificação são calculadas na
+    primeira simplificação que as usa.
+    """
+
+    def __init__(
+        self,
+        trilha: Trilha,
+        velocidade_parada_kmh: float = 5.0,
+        parada_minima_segundos: float = 300.0,
+        tolerancia_pixels: float = 1.0,
+    ) -> None:
+        """
+        Calcula a distância e as paradas da trilha.
+
+        Args:
+            trilha (Trilha): Posições da viagem, com ao menos dois pontos.
+            velocidade_parada_kmh (float): Velocidade até a qual o veículo é
+                considerado parado.
+            parada_minima_segundos (float): Duração mínima de uma parada.
+            tolerancia_pixels (float): Desvio tolerado na simplificação, em
+                pixels do mapa.
+
+        Raises:
+            ImportError: Se o NumPy não estiver instalado.
+        """
+        _exigir_numpy()
+        self.quantidade = len(trilha)
+        self.instantes = np.frombuffer(trilha.instantes, dtype=np.int64)
+        self.latitudes = np.frombuffer(trilha.latitudes, dtype=np.float64)
+        self.longitudes = np.frombuffer(trilha.longitudes, dtype=np.float64)
+        self.tolerancia_pixels = tolerancia_pixels
+        self.distancia_km = float(geometria_service.distancias_m(self.latitudes, self.longitudes).sum()) / 1000
+        self.paradas: List[Parada] = geometria_service.detectar_paradas(
+            self.instantes,
+            self.latitudes,
+            self.longitudes,
+            velocidade_maxima_kmh=velocidade_parada_kmh,
+            duracao_minima_s=parada_minima_segundos,
+        )
+        self._importancias: Dict[str, "np.ndarray"] = {}
+        self._trava = threading.Lock()
+
+    # Duração da trilha
+    @property
+    def duracao_segundos(self) -> float:
+        return float(self.instantes[-1] - self.instantes[0]) / 1000
+
+    # Tempo total parado
+    @property
+    def tempo_parado_segundos(self) -> float:
+        return sum(parada.duracao_segundos for parada in self.paradas)
+
+    # Simplifica a trilha para um nível de zoom
+    def simplificar(
+        self,
+        metodo: str = "douglas_peucker",
+        zoom: Optional[float] = None,
+        max_pontos: int = 0,
+    ) -> Trilha:
+        """
+        Escolhe os pontos exibidos em um nível de zoom do mapa.
+
+        Args:
+            metodo (str): "douglas_peucker" ou "visvalingam".
+            zoom (Optional[float]): Nível de zoom; sem ele, ficam os pontos
+                mais importantes até `max_pontos`.
+            max_pontos (int): Limite de pontos; zero para não limitar.
+
+        Returns:
+            Trilha: Pontos escolhidos, sempre com o primeiro e o último.
+
+        Raises:
+            ValueError: Se o método for desconhecido.
+        """
+        if metodo not in METODOS_SIMPLIFICACAO:
+            raise ValueError(f"Método de simplificação desconhecido: {metodo}")
+        with self._trava:
+            importancia = self._importancias.get(metodo)
+            if importancia is None:
+                x, y = geometria_service.projetar_m(self.latitudes, self.longitudes)
+                if metodo == "douglas_peucker":
+                    importancia = geometria_service.importancia_douglas_peucker(x, y)
+                else:
+                    importancia = geometria_service.areas_visvalingam(x, y)
+                self._importancias[metodo] = importancia
+        limiar = 0.0
+        if zoom is not None:
+            latitude = float(self.latitudes[self.quantidade // 2])
+            limiar = geometria_service.tolerancia_zoom(zoom, latitude, self.tolerancia_pixels)
+            if metodo == "visvalingam":
+                limiar *= limiar
+        indices = geometria_service.selecionar(importancia, limiar, max_pontos)
+        return Trilha(
+            array("q", self.instantes[indices].tobytes()),
+            array("d", self.latitudes[indices].tobytes()),
+            array("d", self.longitudes[indices].tobytes()),
+        )
+
+class CacheTrilhas:
+    """
+    LRU das análises de trilha por viagem.
+
+    A entrada é válida enquanto a viagem tiver a mesma quantidade de pontos;
+    como as trilhas só crescem, um ponto novo invalida a análise. Com
+    `idade_minima_segundos`, uma análise mais recente que esse prazo é
+    servida sem consultar o banco, mesmo que tenham chegado pontos: uma
+    viagem em andamento recebe pontos a todo instante e, sem o prazo, cada
+    leitura recalcularia a trilha inteira.
+    """
+
+    def __init__(
+        self,
+        armazem: ArmazemPosicoes,
+        capacidade: int = 32,
+        velocidade_parada_kmh: float = 5.0,
+        parada_minima_segundos: float = 300.0,
+        tolerancia_pixels: float = 1.0,
+        tolerancia_divergencia: float = TOLERANCIA_DIVERGENCIA,
+        idade_minima_segundos: float = 0.0,
+        relogio: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Inicializa o cache.
+
+        Args:
+            armazem (ArmazemPosicoes): Armazém das posições.
+            capacidade (int): Quantidade máxima de trilhas em cache.
+            velocidade_parada_kmh (float): Velocidade até a qual o veículo é
+                considerado parado.
+            parada_minima_segundos (float): Duração mínima de uma parada.
+            tolerancia_pixels (float): Desvio tolerado na simplificação, em
+                pixels do mapa.
+            tolerancia_divergencia (float): Diferença percentual aceita entre
+                a quilometragem do hodômetro e a da trilha.
+            idade_minima_segundos (float): Tempo durante o qual uma análise é
+                servida sem verificar se chegaram novos pontos.
+            relogio (Callable[[], float]): Relógio monotônico, em segundos.
+
+        Raises:
+            ImportError: Se o NumPy não estiver instalado.
+        """
+        _exigir_numpy()
+        self.armazem = armazem
+        self.capacidade = capacidade
+        self.velocidade_parada_kmh = velocidade_parada_kmh
+        self.parada_minima_segundos = parada_minima_segundos
+        self.tolerancia_pixels = tolerancia_pixels
+        self.tolerancia_divergencia = tolerancia_divergencia
+        self.idade_minima_segundos = idade_minima_segundos
+        self._relogio = relogio
+        # Análise e instante do cálculo, por viagem
+        self._itens: "OrderedDict[int, Tuple[AnaliseTrilha, float]]" = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    # Obtém a análise da trilha da viagem
+    def analisar(self, session: Session, viagem_id: int, atual: bool = False) -> Optional[AnaliseTrilha]:
+        """
+        Obtém a análise da trilha, calculando-a se a trilha mudou.
+
+        Args:
+            session (Session): Sessão usada na leitura dos blocos.
+            viagem_id (int): Identificador da viagem.
+            atual (bool): Ignora a idade mínima e sempre verifica se chegaram
+                novos pontos, como no encerramento da viagem.
+
+        Returns:
+            Optional[AnaliseTrilha]: Análise, ou None com menos de dois pontos.
+        """
+        with self._trava:
+            item = self._itens.get(viagem_id)
+            if (
+                item is not None
+                and not atual
+                and self._relogio() - item[1] < self.idade_minima_segundos
+            ):
+                self._itens.move_to_end(viagem_id)
+                self.acertos += 1
+                return item[0]
+        verificada = self._relogio()
+        quantidade = self.armazem.quantidade(session, viagem_id)
+        with self._trava:
+            item = self._itens.get(viagem_id)
+            if item is not None and item[0].quantidade == quantidade:
+                # Confirmada pela contagem, a análise volta a valer pela idade mínima
+                self._itens[viagem_id] = (item[0], verificada)
+                self._itens.move_to_end(viagem_id)
+                self.acertos += 1
+                return item[0]
+            self.falhas += 1
+        if quantidade < 2:
+            return None
+        trilha = self.armazem.trilha(session, viagem_id)
+        analise = AnaliseTrilha(
+            trilha,
+            velocidade_parada_kmh=self.velocidade_parada_kmh,
+            parada_minima_segundos=self.parada_minima_segundos,
+            tolerancia_pixels=self.tolerancia_pixels,
+        )
+        with self._trava:
+            self._itens[viagem_id] = (analise, verificada)
+            self._itens.move_to_end(viagem_id)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+        return analise
+
+class TelemetriaTenants:
+    """
+    Armazém de posições e cache de trilhas de cada tenant com banco próprio.
+
+    Os identificadores das viagens se repetem entre os bancos dos tenants,
+    por isso cada tenant tem os próprios blocos abertos e análises em cache,
+    criados no primeiro acesso.
+    """
+
+    def __init__(self, criar: Callable[[], Tuple[ArmazemPosicoes, Optional[CacheTrilhas]]]) -> None:
+        """
+        Inicializa o conjunto vazio.
+
+        Args:
+            criar (Callable[[], Tuple[ArmazemPosicoes, Optional[CacheTrilhas]]]):
+                Fábrica do armazém e do cache (None sem o NumPy) de um tenant.
+        """
+        self.criar = criar
+        self._tenants: Dict[str, Tuple[ArmazemPosicoes, Optional[CacheTrilhas]]] = {}
+        self._trava = threading.Lock()
+
+    # Armazém e cache do tenant
+    def obter(self, tenant_id: str) -> Tuple[ArmazemPosicoes, Optional[CacheTrilhas]]:
+        """
+        Obtém o armazém e o cache do tenant, criando-os no primeiro acesso.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+
+        Returns:
+            Tuple[ArmazemPosicoes, Optional[CacheTrilhas]]: Armazém e cache.
+        """
+        with self._trava:
+            telemetria = self._tenants.get(tenant_id)
+            if telemetria is None:
+                telemetria = self._tenants[tenant_id] = self.criar()
+            return telemetria
+
+    def armazens(self) -> List[Tuple[str, ArmazemPosicoes]]:
+        """Retorna os armazéns já criados, por tenant."""
+        with self._trava:
+            return [(tenant_id, armazem) for tenant_id, (armazem, _) in self._tenants.items()]
+
+def _exigir_numpy() -> None:
+    """Falha com uma mensagem clara quando o extra `analytics` não está instalado."""
+    if np is None:
+        raise ImportError("A análise das trilhas requer o NumPy: pip install sistema_frota[analytics]")
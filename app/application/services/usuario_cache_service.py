@@ -0,0 +1,196 @@
+"""
+Módulo de cache dos usuários autenticados.
+
+Mantém em um LRU pequeno os dados de cada usuário usados na autorização
+(perfil e permissões), para que uma requisição autenticada não consulte o
+banco. Usuários inexistentes ou inativos também ficam em cache, como
+ausentes, para que um token de usuário desativado não gere uma consulta por
+requisição. A alteração ou exclusão de um usuário invalida a entrada após o
+commit.
+"""
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.auth.permissions import permissoes_do_perfil, possui_permissoes
+from app.infrastructure.persistence.sqlalchemy.models import Usuario
+
+_CHAVE_ALTERADOS = "usuarios_alterados"
+
+# Caches invalidados por sessão ou fábrica de sessões instrumentada
+_ALVOS_INVALIDACAO: "weakref.WeakKeyDictionary[Any, weakref.WeakSet]" = weakref.WeakKeyDictionary()
+
+@dataclass(frozen=True)
+class UsuarioAutenticado:
+    """
+    Dados do usuário autenticado usados na autorização.
+
+    Attributes:
+        id (int): Identificador do usuário.
+        nome (str): Nome do usuário.
+        email (str): E-mail do usuário.
+        perfil (str): Perfil do usuário.
+        permissoes (FrozenSet[str]): Permissões concedidas pelo perfil.
+    """
+
+    id: int
+    nome: str
+    email: str
+    perfil: str
+    permissoes: FrozenSet[str]
+
+    # Verifica as permissões do usuário
+    def pode(self, *permissoes: str) -> bool:
+        """
+        Verifica se o usuário possui todas as permissões indicadas.
+
+        Args:
+            *permissoes (str): Permissões exigidas.
+
+        Returns:
+            bool: True se o usuário possuir todas.
+        """
+        return possui_permissoes(self.permissoes, permissoes)
+
+class CacheUsuarios:
+    """
+    LRU dos usuários autenticados, com validade por entrada.
+    """
+
+    def __init__(
+        self,
+        fabrica_sessao: Callable[[], Session],
+        capacidade: int = 1024,
+        ttl: float = 300.0,
+        relogio: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Inicializa o cache.
+
+        Args:
+            fabrica_sessao (Callable[[], Session]): Fábrica de sessões.
+            capacidade (int): Quantidade máxima de usuários em cache.
+            ttl (float): Validade de cada entrada, em segundos.
+            relogio (Callable[[], float]): Relógio monotônico, em segundos.
+        """
+        self.fabrica_sessao = fabrica_sessao
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._relogio = relogio
+        self._itens: "OrderedDict[int, Tuple[float, Optional[UsuarioAutenticado]]]" = OrderedDict()
+        self._geracoes: Dict[int, int] = {}
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    # Consulta o cache sem acessar o banco
+    def obter_em_cache(self, usuario_id: int) -> Tuple[bool, Optional[UsuarioAutenticado]]:
+        """
+        Consulta o usuário apenas no cache.
+
+        Args:
+            usuario_id (int): Identificador do usuário.
+
+        Returns:
+            Tuple[bool, Optional[UsuarioAutenticado]]: Se o usuário está em
+                cache e, nesse caso, o usuário ou None se inexistente ou inativo.
+        """
+        with self._trava:
+            item = self._itens.get(usuario_id)
+            if item is not None and self._relogio() < item[0]:
+                self._itens.move_to_end(usuario_id)
+                self.acertos += 1
+                return True, item[1]
+            self.falhas += 1
+            return False, None
+
+    # Obtém o usuário, consultando o banco se necessário
+    def obter(self, usuario_id: int) -> Optional[UsuarioAutenticado]:
+        """
+        Obtém o usuário ativo, carregando-o do banco se não estiver em cache.
+
+        Args:
+            usuario_id (int): Identificador do usuário.
+
+        Returns:
+            Optional[UsuarioAutenticado]: Usuário, ou None se inexistente ou inativo.
+        """
+        encontrado, usuario = self.obter_em_cache(usuario_id)
+        if encontrado:
+            return usuario
+        with self._trava:
+            geracao = self._geracoes.get(usuario_id, 0)
+        with self.fabrica_sessao() as session:
+            linha = session.execute(
+                select(Usuario.id, Usuario.nome, Usuario.email, Usuario.perfil, Usuario.ativo)
+                .where(Usuario.id == usuario_id)
+            ).first()
+        usuario = None
+        if linha is not None and linha.ativo:
+            perfil = linha.perfil or "operador"
+            usuario = UsuarioAutenticado(linha.id, linha.nome, linha.email, perfil, permissoes_do_perfil(perfil))
+        with self._trava:
+            # Uma invalidação durante a consulta descarta o resultado lido
+            if self._geracoes.get(usuario_id, 0) == geracao:
+                self._itens[usuario_id] = (self._relogio() + self.ttl, usuario)
+                self._itens.move_to_end(usuario_id)
+                if len(self._itens) > self.capacidade:
+                    self._itens.popitem(last=False)
+        return usuario
+
+    # Invalida um usuário
+    def invalidar(self, usuario_id: int) -> None:
+        """
+        Remove o usuário do cache.
+
+        Args:
+            usuario_id (int): Identificador do usuário.
+        """
+        with self._trava:
+            self._geracoes[usuario_id] = self._geracoes.get(usuario_id, 0) + 1
+            self._itens.pop(usuario_id, None)
+
+# Invalida o cache quando usuários são alterados
+def ativar_invalidacao_usuarios(alvo, cache: CacheUsuarios) -> None:
+    """
+    Registra os eventos que invalidam o cache quando um usuário é alterado
+    ou excluído, após o commit da transação.
+
+    Os eventos são registrados uma vez por alvo; chamadas seguintes com
+    outros caches apenas os acrescentam aos invalidados pelo mesmo alvo.
+
+    Args:
+        alvo: Classe Session, sessionmaker ou sessão a instrumentar.
+        cache (CacheUsuarios): Cache a invalidar.
+    """
+    caches = _ALVOS_INVALIDACAO.get(alvo)
+    if caches is not None:
+        caches.add(cache)
+        return
+    caches = _ALVOS_INVALIDACAO[alvo] = weakref.WeakSet([cache])
+
+    def _apos_flush(session: Session, _contexto) -> None:
+        alterados = session.info.setdefault(_CHAVE_ALTERADOS, set())
+        for obj in list(session.dirty) + list(session.deleted):
+            if isinstance(obj, Usuario) and obj.id is not None:
+                alterados.add(obj.id)
+
+    def _apos_commit(session: Session) -> None:
+        alterados = session.info.pop(_CHAVE_ALTERADOS, ())
+        for invalidado in list(caches):
+            for usuario_id in alterados:
+                invalidado.invalidar(usuario_id)
+
+    def _apos_rollback(session: Session) -> None:
+        session.info.pop(_CHAVE_ALTERADOS, None)
+
+    event.listen(alvo, "after_flush", _apos_flush)
+    event.listen(alvo, "after_commit", _apos_commit)
+    event.listen(alvo, "after_rollback", _apos_rollback)
@@ -0,0 +1,68 @@
+"""
+Módulo de caso de uso de atualização de configuração.
+
+Atualiza uma configuração tipada do tenant e invalida o cache do tenant após
+a confirmação da transação, para que a próxima leitura já veja o novo valor.
+"""
+
+from dataclasses import replace
+
+from sqlalchemy.orm import Session
+
+from app.application.dto.tenant_config_dto import AtualizarConfiguracaoDTO
+from app.application.services.configuracao_cache_service import CacheConfiguracoes
+from app.domain.entities.tenant_config import TenantConfig, converter_valor, serializar_valor
+from app.infrastructure.persistence.sqlalchemy.repositories.tenant_config_repository_impl import (
+    TenantConfigRepositoryImpl,
+)
+from app.infrastructure.persistence.sqlalchemy.session import confirmar
+
+class AtualizarConfiguracaoUseCase:
+    """
+    Caso de uso de atualização de configuração.
+    """
+
+    def __init__(self, session: Session, cache: CacheConfiguracoes) -> None:
+        """
+        Inicializa o caso de uso.
+
+        Args:
+            session (Session): Sessão da unidade de trabalho.
+            cache (CacheConfiguracoes): Cache invalidado após a gravação.
+        """
+        self.session = session
+        self.repositorio = TenantConfigRepositoryImpl(session)
+        self.cache = cache
+
+    # Atualiza a configuração
+    def executar(self, tenant_id: str, chave: str, dados: AtualizarConfiguracaoDTO) -> TenantConfig:
+        """
+        Atualiza a configuração do tenant.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+            chave (str): Chave da configuração.
+            dados (AtualizarConfiguracaoDTO): Novos dados; campos nulos são mantidos.
+
+        Returns:
+            TenantConfig: Configuração atualizada, com o valor convertido.
+
+        Raises:
+            LookupError: Se a configuração não existir.
+            ValueError: Se o tipo for desconhecido ou o valor incompatível.
+        """
+        atual = self.repositorio.obter(tenant_id, chave)
+        if atual is None:
+            raise LookupError(f"Configuração {chave!r} não encontrada")
+        tipo = dados.tipo or atual.tipo
+        texto = serializar_valor(dados.valor, tipo)
+        configuracao = self.repositorio.salvar(replace(
+            atual,
+            valor=converter_valor(texto, tipo),
+            tipo=tipo,
+            descricao=atual.descricao if dados.descricao is None else dados.descricao,
+            categoria=atual.categoria if dados.categoria is None else dados.categoria,
+        ))
+        confirmar(self.session)
+        self.cache.invalidar(tenant_id)
+        return configuracao
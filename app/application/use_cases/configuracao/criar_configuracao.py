@@ -0,0 +1,64 @@
+"""
+Módulo de caso de uso de criação de configuração.
+
+Cria uma configuração tipada do tenant e invalida o cache do tenant após a
+confirmação da transação.
+"""
+
+from sqlalchemy.orm import Session
+
+from app.application.dto.tenant_config_dto import CriarConfiguracaoDTO
+from app.application.services.configuracao_cache_service import CacheConfiguracoes
+from app.domain.entities.tenant_config import TenantConfig, converter_valor, serializar_valor
+from app.domain.events import BusinessRuleViolation
+from app.infrastructure.persistence.sqlalchemy.repositories.tenant_config_repository_impl import (
+    TenantConfigRepositoryImpl,
+)
+from app.infrastructure.persistence.sqlalchemy.session import confirmar
+
+class CriarConfiguracaoUseCase:
+    """
+    Caso de uso de criação de configuração.
+    """
+
+    def __init__(self, session: Session, cache: CacheConfiguracoes) -> None:
+        """
+        Inicializa o caso de uso.
+
+        Args:
+            session (Session): Sessão da unidade de trabalho.
+            cache (CacheConfiguracoes): Cache invalidado após a gravação.
+        """
+        self.session = session
+        self.repositorio = TenantConfigRepositoryImpl(session)
+        self.cache = cache
+
+    # Cria a configuração
+    def executar(self, dados: CriarConfiguracaoDTO) -> TenantConfig:
+        """
+        Cria a configuração do tenant.
+
+        Args:
+            dados (CriarConfiguracaoDTO): Dados da configuração.
+
+        Returns:
+            TenantConfig: Configuração criada, com o valor convertido.
+
+        Raises:
+            ValueError: Se o tipo for desconhecido ou o valor incompatível.
+            BusinessRuleViolation: Se a chave já existir no tenant.
+        """
+        texto = serializar_valor(dados.valor, dados.tipo)
+        if self.repositorio.obter(dados.tenant_id, dados.chave) is not None:
+            raise BusinessRuleViolation(f"Configuração {dados.chave!r} já existe")
+        configuracao = self.repositorio.salvar(TenantConfig(
+            tenant_id=dados.tenant_id,
+            chave=dados.chave,
+            valor=converter_valor(texto, dados.tipo),
+            tipo=dados.tipo,
+            descricao=dados.descricao,
+            categoria=dados.categoria,
+        ))
+        confirmar(self.session)
+        self.cache.invalidar(dados.tenant_id)
+        return configuracao
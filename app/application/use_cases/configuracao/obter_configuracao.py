@@ -0,0 +1,59 @@
+"""
+Módulo de caso de uso de consulta de configurações.
+
+Lê as configurações do tenant pelo cache, sem acesso ao banco enquanto o
+tenant estiver carregado.
+"""
+
+from typing import List
+
+from app.application.services.configuracao_cache_service import CacheConfiguracoes
+from app.domain.entities.tenant_config import TenantConfig
+
+class ObterConfiguracaoUseCase:
+    """
+    Caso de uso de consulta de configurações.
+    """
+
+    def __init__(self, cache: CacheConfiguracoes) -> None:
+        """
+        Inicializa o caso de uso.
+
+        Args:
+            cache (CacheConfiguracoes): Cache das configurações.
+        """
+        self.cache = cache
+
+    # Obtém uma configuração
+    def executar(self, tenant_id: str, chave: str) -> TenantConfig:
+        """
+        Obtém uma configuração do tenant.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+            chave (str): Chave da configuração.
+
+        Returns:
+            TenantConfig: Configuração com o valor convertido.
+
+        Raises:
+            LookupError: Se a configuração não existir.
+        """
+        configuracao = self.cache.configuracoes(tenant_id).get(chave)
+        if configuracao is None:
+            raise LookupError(f"Configuração {chave!r} não encontrada")
+        return configuracao
+
+    # Lista as configurações
+    def listar(self, tenant_id: str) -> List[TenantConfig]:
+        """
+        Lista as configurações do tenant, ordenadas pela chave.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+
+        Returns:
+            List[TenantConfig]: Configurações do tenant.
+        """
+        configuracoes = self.cache.configuracoes(tenant_id)
+        return [configuracoes[chave] for chave in sorted(configuracoes)]
@@ -0,0 +1,217 @@
+"""
+Módulo de caso de uso de alertas de vencimento de CNH.
+
+Responde "quais CNHs vencem nos próximos N dias" com uma varredura por faixa
+sobre a coluna indexada `cnh_validade`, agrupando o resultado em baldes por
+data ordenados em memória, e gera alertas incrementais: a cada execução são
+emitidos apenas os motoristas que cruzaram uma das antecedências configuradas
+desde a execução anterior, registrada como checkpoint.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.application.services.checkpoint_service import gravar_checkpoint, ler_checkpoint
+from app.infrastructure.persistence.sqlalchemy.models import Motorista as MotoristaModel
+
+# Antecedências padrão dos alertas, em dias
+ANTECEDENCIAS_PADRAO: Tuple[int, ...] = (90, 30, 7)
+
+# Chave do checkpoint em configuracoes_sistema
+CHAVE_CHECKPOINT = "alertas_cnh.ultima_execucao"
+
+@dataclass(frozen=True)
+class AlertaCNH:
+    """
+    Alerta de vencimento da CNH de um motorista.
+
+    Attributes:
+        motorista_id (int): Identificador do motorista.
+        nome (str): Nome do motorista.
+        cnh_validade (date): Data de validade da CNH.
+        antecedencia (int): Antecedência, em dias, que originou o alerta.
+        dias_restantes (int): Dias até o vencimento (negativo se já vencida).
+    """
+    motorista_id: int
+    nome: str
+    cnh_validade: date
+    antecedencia: int
+    dias_restantes: int
+
+class IndiceValidadeCNH:
+    """
+    Índice em memória das validades de CNH, agrupadas em baldes por data.
+
+    As datas ficam em uma lista ordenada e cada posição aponta para o balde
+    dos motoristas com aquela validade, de modo que qualquer faixa de datas é
+    localizada por busca binária.
+    """
+
+    def __init__(self, registros: Iterable[Tuple[date, int, str]]) -> None:
+        """
+        Monta o índice.
+
+        Args:
+            registros (Iterable[Tuple[date, int, str]]): Tuplas (validade,
+                motorista_id, nome) em ordem crescente de validade.
+
+        Raises:
+            ValueError: Se os registros não estiverem ordenados pela validade.
+        """
+        self._datas: List[date] = []
+        self._baldes: List[List[Tuple[int, str]]] = []
+        for validade, motorista_id, nome in registros:
+            if not self._datas or self._datas[-1] != validade:
+                if self._datas and validade < self._datas[-1]:
+                    raise ValueError("Registros fora de ordem de validade")
+                self._datas.append(validade)
+                self._baldes.append([])
+            self._baldes[-1].append((motorista_id, nome))
+
+    # Carrega o índice a partir do banco
+    @classmethod
+    def carregar(cls, session: Session, inicio: date, fim: date) -> "IndiceValidadeCNH":
+        """
+        Carrega os motoristas ativos com validade em [inicio, fim].
+
+        A consulta filtra e ordena pela coluna indexada `cnh_validade`, lendo
+        apenas a faixa de interesse em vez de todos os motoristas.
+
+        Args:
+            session (Session): Sessão do banco.
+            inicio (date): Primeira validade incluída.
+            fim (date): Última validade incluída.
+
+        Returns:
+            IndiceValidadeCNH: Índice da faixa carregada.
+        """
+        linhas = session.execute(
+            select(MotoristaModel.cnh_validade, MotoristaModel.id, MotoristaModel.nome)
+            .where(
+                MotoristaModel.cnh_validade >= inicio,
+                MotoristaModel.cnh_validade <= fim,
+                MotoristaModel.ativo.is_not(False),
+            )
+            .order_by(MotoristaModel.cnh_validade, MotoristaModel.id)
+        )
+        return cls(linhas.tuples())
+
+    def intervalo(self, apos: date, ate: date) -> Iterator[Tuple[date, int, str]]:
+        """
+        Percorre os motoristas com validade em (apos, ate].
+
+        Args:
+            apos (date): Limite inferior, exclusivo.
+            ate (date): Limite superior, inclusivo.
+
+        Yields:
+            Tuple[date, int, str]: (validade, motorista_id, nome) em ordem de validade.
+        """
+        inicio = bisect_right(self._datas, apos)
+        fim = bisect_right(self._datas, ate)
+        for posicao in range(inicio, fim):
+            validade = self._datas[posicao]
+            for motorista_id, nome in self._baldes[posicao]:
+                yield validade, motorista_id, nome
+
+    def __len__(self) -> int:
+        return sum(len(balde) for balde in self._baldes)
+
+class AlertasCNHUseCase:
+    """
+    Caso de uso de alertas de vencimento de CNH.
+
+    Um motorista cruza a antecedência de N dias no dia `validade - N`. Uma
+    execução em `hoje`, sendo `d0` a execução anterior, emite os cruzamentos
+    ocorridos em (d0, hoje], isto é, validades em (d0 + N, hoje + N], para
+    todas as antecedências em uma única consulta. Se o motorista cruzou mais
+    de uma antecedência no período, apenas a mais urgente é emitida.
+    """
+
+    def __init__(self, session: Session, antecedencias: Sequence[int] = ANTECEDENCIAS_PADRAO) -> None:
+        """
+        Inicializa o caso de uso.
+
+        Args:
+            session (Session): Sessão do banco.
+            antecedencias (Sequence[int]): Antecedências dos alertas, em dias.
+                Zero gera alerta de CNH vencida.
+
+        Raises:
+            ValueError: Se não houver antecedências ou alguma for negativa.
+        """
+        if not antecedencias or min(antecedencias) < 0:
+            raise ValueError("Informe antecedências maiores ou iguais a zero")
+        self.session = session
+        self.antecedencias = sorted(set(antecedencias))
+
+    # Lista as CNHs que vencem nos próximos dias
+    def vencendo_em(self, dias: int, hoje: Optional[date] = None) -> List[AlertaCNH]:
+        """
+        Lista os motoristas cuja CNH vence entre hoje e hoje + `dias`.
+
+        Args:
+            dias (int): Janela, em dias.
+            hoje (Optional[date]): Data de referência. Padrão: date.today().
+
+        Returns:
+            List[AlertaCNH]: Alertas em ordem de validade.
+        """
+        hoje = hoje or date.today()
+        limite = hoje + timedelta(days=dias)
+        indice = IndiceValidadeCNH.carregar(self.session, hoje, limite)
+        return [
+            AlertaCNH(motorista_id, nome, validade, dias, (validade - hoje).days)
+            for validade, motorista_id, nome in indice.intervalo(hoje - timedelta(days=1), limite)
+        ]
+
+    # Gera os alertas desde a última execução
+    def executar(self, hoje: Optional[date] = None) -> List[AlertaCNH]:
+        """
+        Emite os alertas dos cruzamentos ocorridos desde a última execução e
+        registra `hoje` como checkpoint.
+
+        Na primeira execução todos os motoristas que já estão dentro de alguma
+        janela são tratados como cruzamentos novos. Executar de novo no mesmo
+        dia não repete alertas.
+
+        Args:
+            hoje (Optional[date]): Data de referência. Padrão: date.today().
+
+        Returns:
+            List[AlertaCNH]: Alertas novos, em ordem de validade.
+        """
+        hoje = hoje or date.today()
+        menor, maior = self.antecedencias[0], self.antecedencias[-1]
+        ultima = ler_checkpoint(self.session, CHAVE_CHECKPOINT)
+        if ultima is None:
+            ultima = hoje - timedelta(days=maior + 1)
+        if ultima >= hoje:
+            return []
+
+        indice = IndiceValidadeCNH.carregar(
+            self.session, ultima + timedelta(days=menor + 1), hoje + timedelta(days=maior)
+        )
+        alertas: List[AlertaCNH] = []
+        emitidos: Set[int] = set()
+        for antecedencia in self.antecedencias:
+            for validade, motorista_id, nome in indice.intervalo(
+                ultima + timedelta(days=antecedencia), hoje + timedelta(days=antecedencia)
+            ):
+                # Antecedências positivas só valem para CNHs ainda não vencidas
+                if motorista_id in emitidos or (antecedencia > 0 and validade < hoje):
+                    continue
+                emitidos.add(motorista_id)
+                alertas.append(AlertaCNH(motorista_id, nome, validade, antecedencia, (validade - hoje).days))
+
+        gravar_checkpoint(
+            self.session, CHAVE_CHECKPOINT, hoje, "Última execução dos alertas de vencimento de CNH"
+        )
+        self.session.commit()
+        alertas.sort(key=lambda alerta: (alerta.cnh_validade, alerta.motorista_id))
+        return alertas
@@ -0,0 +1,78 @@
+"""
+Módulo de caso de uso de autenticação de usuário.
+
+Confere e-mail e senha de um usuário ativo. A consulta ao banco roda no
+executor padrão e o bcrypt no pool do `ServicoSenhas`, de modo que o loop de
+eventos nunca fica ocupado durante o login. Quando o custo do hash armazenado
+difere do configurado, o novo hash é gravado na mesma chamada.
+"""
+
+import asyncio
+from typing import Callable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.infrastructure.auth.password_service import ServicoSenhas
+from app.infrastructure.persistence.sqlalchemy.models import Usuario
+
+class AutenticarUsuarioUseCase:
+    """
+    Caso de uso de autenticação de usuário.
+    """
+
+    def __init__(self, fabrica_sessao: Callable[[], Session], servico_senhas: ServicoSenhas) -> None:
+        """
+        Inicializa o caso de uso.
+
+        Args:
+            fabrica_sessao (Callable[[], Session]): Fábrica de sessões; cada
+                acesso ao banco usa uma sessão própria, fora do loop de eventos.
+            servico_senhas (ServicoSenhas): Serviço de verificação de senhas.
+        """
+        self.fabrica_sessao = fabrica_sessao
+        self.servico_senhas = servico_senhas
+
+    # Autentica o usuário
+    async def executar(self, email: str, senha: str) -> Optional[Usuario]:
+        """
+        Autentica o usuário pelo e-mail e senha.
+
+        Args:
+            email (str): E-mail do usuário.
+            senha (str): Senha informada.
+
+        Returns:
+            Optional[Usuario]: Usuário autenticado, ou None se as credenciais
+                forem inválidas ou o usuário estiver inativo.
+
+        Raises:
+            TentativasExcedidas: Se a conta estiver bloqueada por excesso de tentativas.
+        """
+        loop = asyncio.get_running_loop()
+        usuario = await loop.run_in_executor(None, self._buscar, email.strip().lower())
+        hash_senha = usuario.senha_hash if usuario is not None and usuario.ativo else None
+        resultado = await self.servico_senhas.autenticar(email, senha, hash_senha)
+        if not resultado.valida:
+            return None
+        if resultado.novo_hash is not None:
+            await loop.run_in_executor(None, self._regravar_hash, usuario.id, hash_senha, resultado.novo_hash)
+            usuario.senha_hash = resultado.novo_hash
+        return usuario
+
+    def _buscar(self, email: str) -> Optional[Usuario]:
+        with self.fabrica_sessao() as session:
+            usuario = session.execute(select(Usuario).where(Usuario.email == email)).scalar()
+            if usuario is not None:
+                session.expunge(usuario)
+            return usuario
+
+    def _regravar_hash(self, usuario_id: int, hash_anterior: str, novo_hash: str) -> None:
+        """Grava o novo hash se a senha não foi trocada desde a leitura."""
+        with self.fabrica_sessao() as session:
+            session.execute(
+                update(Usuario)
+                .where(Usuario.id == usuario_id, Usuario.senha_hash == hash_anterior)
+                .values(senha_hash=novo_hash)
+            )
+            session.commit()
@@ -0,0 +1,81 @@
+"""
+Módulo de caso de uso de atualização de veículo.
+
+Atualiza a quilometragem do veículo com controle de concorrência otimista:
+a alteração só é gravada se o registro ainda estiver na versão lida. A
+leitura do hodômetro alimenta a agenda de manutenções, cujos alertas vão
+para o outbox na mesma transação.
+"""
+
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.application.services.concorrencia_service import verificar_versao
+from app.application.services.manutencao_service import (
+    PrevisaoManutencaoService,
+    registrar_leitura_hodometro,
+)
+from app.domain.events import BusinessRuleViolation
+from app.infrastructure.persistence.sqlalchemy.models import Veiculo as VeiculoModel
+from app.infrastructure.persistence.sqlalchemy.session import confirmar
+
+class AtualizarVeiculoUseCase:
+    """
+    Caso de uso de atualização dos dados operacionais do veículo.
+    """
+
+    def __init__(self, session: Session, manutencoes: Optional[PrevisaoManutencaoService] = None) -> None:
+        """
+        Inicializa o caso de uso.
+
+        Args:
+            session (Session): Sessão da unidade de trabalho.
+            manutencoes (Optional[PrevisaoManutencaoService]): Agenda de
+                manutenções alimentada com as leituras do hodômetro.
+        """
+        self.session = session
+        self.manutencoes = manutencoes
+
+    # Atualiza a quilometragem do veículo
+    def atualizar_quilometragem(
+        self,
+        veiculo_id: int,
+        quilometragem: float,
+        versao_esperada: Optional[int] = None,
+    ) -> VeiculoModel:
+        """
+        Registra a nova quilometragem do veículo.
+
+        Args:
+            veiculo_id (int): Identificador do veículo.
+            quilometragem (float): Leitura atual do hodômetro.
+            versao_esperada (Optional[int]): Versão lida pelo cliente (If-Match).
+
+        Returns:
+            VeiculoModel: Veículo atualizado.
+
+        Raises:
+            LookupError: Se o veículo não existir.
+            BusinessRuleViolation: Se a quilometragem for menor que a atual.
+            ConcurrencyConflict: Se o veículo foi alterado por outra transação.
+        """
+        veiculo = self.session.get(VeiculoModel, veiculo_id)
+        if veiculo is None:
+            raise LookupError(f"Veículo {veiculo_id} não encontrado")
+        verificar_versao(veiculo, versao_esperada)
+
+        if quilometragem < (veiculo.quilometragem_atual or 0.0):
+            raise BusinessRuleViolation("Quilometragem menor que a registrada")
+
+        veiculo.quilometragem_atual = quilometragem
+        alertas = []
+        if self.manutencoes is not None:
+            alertas = registrar_leitura_hodometro(self.session, self.manutencoes, veiculo_id, quilometragem)
+        try:
+            confirmar(self.session)
+        except Exception:
+            if alertas:
+                self.manutencoes.desfazer(alertas)
+            raise
+        return veiculo
@@ -0,0 +1,96 @@
+"""
+Módulo de caso de uso de validação de licenciamento.
+
+Verifica se um veículo está com a documentação obrigatória (CRLV, IPVA e
+licenciamento) e o seguro em dia em uma data de referência.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.persistence.sqlalchemy.models import (
+    DocumentoVeiculo,
+    Veiculo as VeiculoModel,
+)
+
+# Documentos exigidos para o veículo circular
+DOCUMENTOS_OBRIGATORIOS = ("CRLV", "IPVA", "LICENCIAMENTO")
+
+@dataclass
+class SituacaoLicenciamento:
+    """
+    Situação da documentação de um veículo.
+
+    Attributes:
+        veiculo_id (int): Identificador do veículo.
+        data_referencia (date): Data da verificação.
+        pendencias (List[str]): Descrição de cada documento ausente ou vencido.
+    """
+    veiculo_id: int
+    data_referencia: date
+    pendencias: List[str] = field(default_factory=list)
+
+    @property
+    def regular(self) -> bool:
+        """Indica se o veículo não tem pendências."""
+        return not self.pendencias
+
+class ValidarLicenciamentoUseCase:
+    """
+    Caso de uso de validação do licenciamento de veículos.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """
+        Inicializa o caso de uso.
+
+        Args:
+            session (Session): Sessão do banco.
+        """
+        self.session = session
+
+    # Verifica a documentação do veículo
+    def executar(self, veiculo_id: int, data_referencia: Optional[date] = None) -> SituacaoLicenciamento:
+        """
+        Verifica a documentação obrigatória e o seguro do veículo.
+
+        Para cada tipo obrigatório vale o documento de validade mais recente.
+        O seguro só é verificado quando o veículo possui vencimento cadastrado.
+
+        Args:
+            veiculo_id (int): Identificador do veículo.
+            data_referencia (Optional[date]): Data da verificação. Padrão: date.today().
+
+        Returns:
+            SituacaoLicenciamento: Situação da documentação.
+
+        Raises:
+            LookupError: Se o veículo não existir.
+        """
+        data_referencia = data_referencia or date.today()
+        veiculo = self.session.get(VeiculoModel, veiculo_id)
+        if veiculo is None:
+            raise LookupError(f"Veículo {veiculo_id} não encontrado")
+
+        tipo = func.upper(DocumentoVeiculo.tipo)
+        validades: Dict[str, Optional[date]] = dict(
+            self.session.execute(
+                select(tipo, func.max(DocumentoVeiculo.data_validade))
+                .where(DocumentoVeiculo.veiculo_id == veiculo_id, tipo.in_(DOCUMENTOS_OBRIGATORIOS))
+                .group_by(tipo)
+            ).all()
+        )
+
+        situacao = SituacaoLicenciamento(veiculo_id, data_referencia)
+        for documento in DOCUMENTOS_OBRIGATORIOS:
+            if documento not in validades:
+                situacao.pendencias.append(f"{documento} ausente")
+            elif validades[documento] is not None and validades[documento] < data_referencia:
+                situacao.pendencias.append(f"{documento} vencido em {validades[documento]:%d/%m/%Y}")
+        if veiculo.vencimento_seguro is not None and veiculo.vencimento_seguro < data_referencia:
+            situacao.pendencias.append(f"Seguro vencido em {veiculo.vencimento_seguro:%d/%m/%Y}")
+        return situacao
@@ -0,0 +1,188 @@
+"""
+Módulo de caso de uso de encerramento de viagem.
+
+Conclui uma viagem em andamento, calcula quilometragem e custos, libera o
+veículo e registra o evento ViagemEncerrada no outbox, na mesma transação.
+Se a viagem tiver trilha de GPS, a distância rastreada é gravada e, quando o
+hodômetro de chegada não é informado, passa a determinar a quilometragem.
+Com a análise das trilhas, a quilometragem do hodômetro é comparada à da
+trilha e o tempo parado é registrado. O hodômetro de chegada alimenta a
+agenda de manutenções, cujos alertas vão para o outbox na mesma transação.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.application.services.concorrencia_service import verificar_versao
+from app.application.services.manutencao_service import (
+    PrevisaoManutencaoService,
+    registrar_leitura_hodometro,
+)
+from app.application.services.trilha_service import (
+    TOLERANCIA_DIVERGENCIA,
+    CacheTrilhas,
+    distancia_km,
+    divergencia_km,
+)
+from app.domain.events import BusinessRuleViolation, ViagemEncerrada
+from app.infrastructure.persistence.sqlalchemy.models import (
+    StatusVeiculo,
+    StatusViagem,
+    Viagem as ViagemModel,
+)
+from app.infrastructure.persistence.sqlalchemy.session import confirmar
+from app.infrastructure.sync.outbox import registrar_eventos
+from app.infrastructure.telemetria.armazem import ArmazemPosicoes
+
+class EncerrarViagemUseCase:
+    """
+    Caso de uso de encerramento de viagem.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        armazem_posicoes: Optional[ArmazemPosicoes] = None,
+        trilhas: Optional[CacheTrilhas] = None,
+        manutencoes: Optional[PrevisaoManutencaoService] = None,
+    ) -> None:
+        """
+        Inicializa o caso de uso.
+
+        Args:
+            session (Session): Sessão da unidade de trabalho.
+            armazem_posicoes (Optional[ArmazemPosicoes]): Armazém das
+                posições de GPS; sem ele, a trilha não é considerada.
+            trilhas (Optional[CacheTrilhas]): Análise das trilhas, usada no
+                lugar da soma ponto a ponto quando disponível.
+            manutencoes (Optional[PrevisaoManutencaoService]): Agenda de
+                manutenções alimentada com o hodômetro de chegada.
+        """
+        self.session = session
+        self.trilhas = trilhas
+        self.manutencoes = manutencoes
+        if armazem_posicoes is None and trilhas is not None:
+            armazem_posicoes = trilhas.armazem
+        self.armazem_posicoes = armazem_posicoes
+
+    # Encerra a viagem
+    def executar(
+        self,
+        viagem_id: int,
+        km_final: Optional[float] = None,
+        combustivel_consumido: Optional[float] = None,
+        custo_combustivel: Optional[float] = None,
+        versao_esperada: Optional[int] = None,
+    ) -> ViagemModel:
+        """
+        Encerra uma viagem em andamento.
+
+        Args:
+            viagem_id (int): Identificador da viagem.
+            km_final (Optional[float]): Hodômetro na chegada; se omitido, é
+                a quilometragem inicial somada à distância da trilha de GPS.
+            combustivel_consumido (Optional[float]): Combustível consumido, em litros.
+            custo_combustivel (Optional[float]): Custo do combustível da viagem.
+            versao_esperada (Optional[int]): Versão da viagem lida pelo cliente.
+
+        Returns:
+            ViagemModel: Viagem encerrada.
+
+        Raises:
+            LookupError: Se a viagem não existir.
+            BusinessRuleViolation: Se a viagem não estiver em andamento, se a
+                quilometragem final for menor que a inicial ou se ela for
+                omitida e a viagem não tiver trilha.
+            ConcurrencyConflict: Se a viagem ou o veículo foram alterados por
+                outra transação.
+        """
+        viagem = self.session.get(ViagemModel, viagem_id)
+        if viagem is None:
+            raise LookupError(f"Viagem {viagem_id} não encontrada")
+        verificar_versao(viagem, versao_esperada)
+
+        if viagem.status != StatusViagem.EM_ANDAMENTO:
+            raise BusinessRuleViolation("Somente viagens em andamento podem ser encerradas")
+        km_inicial = viagem.km_inicial or 0.0
+        km_rastreado = tempo_parado = None
+        if self.trilhas is not None:
+            analise = self.trilhas.analisar(self.session, viagem_id, atual=True)
+            if analise is not None:
+                km_rastreado = analise.distancia_km
+                tempo_parado = analise.tempo_parado_segundos / 60
+        elif self.armazem_posicoes is not None:
+            trilha = self.armazem_posicoes.trilha(self.session, viagem_id)
+            if len(trilha) >= 2:
+                km_rastreado = distancia_km(trilha)
+        if km_final is None:
+            if km_rastreado is None:
+                raise BusinessRuleViolation("Quilometragem final não informada e viagem sem trilha de GPS")
+            km_final = km_inicial + km_rastreado
+        if km_final < km_inicial:
+            raise BusinessRuleViolation("Quilometragem final menor que a inicial")
+
+        viagem.status = StatusViagem.CONCLUIDA
+        viagem.data_chegada_real = datetime.now()
+        viagem.km_final = km_final
+        viagem.km_total = km_final - km_inicial
+        viagem.km_rastreado = km_rastreado
+        viagem.tempo_parado_minutos = tempo_parado
+        viagem.km_divergencia = divergencia_km(viagem.km_total, km_rastreado)
+        tolerancia = self.trilhas.tolerancia_divergencia if self.trilhas is not None else TOLERANCIA_DIVERGENCIA
+        viagem.km_divergente = (
+            None if viagem.km_divergencia is None else abs(viagem.km_divergencia) > tolerancia
+        )
+        if combustivel_consumido is not None:
+            viagem.combustivel_consumido = combustivel_consumido
+        if custo_combustivel is not None:
+            viagem.custo_combustivel = custo_combustivel
+        viagem.custo_total = sum(
+            valor or 0.0
+            for valor in (
+                viagem.custo_combustivel,
+                viagem.pedagio,
+                viagem.alimentacao,
+                viagem.hospedagem,
+                viagem.outros_custos,
+            )
+        )
+
+        veiculo = viagem.veiculo
+        veiculo.quilometragem_atual = max(veiculo.quilometragem_atual or 0.0, km_final)
+        veiculo.status = StatusVeiculo.DISPONIVEL
+
+        duracao = None
+        if viagem.data_saida_real is not None:
+            duracao = (viagem.data_chegada_real - viagem.data_saida_real).total_seconds() / 3600
+        registrar_eventos(
+            self.session,
+            [
+                ViagemEncerrada(
+                    viagem_id=str(viagem.id),
+                    motorista_id=str(viagem.motorista_id),
+                    duracao_horas=duracao,
+                    data_fim=viagem.data_chegada_real,
+                )
+            ],
+            agregado_id=viagem.id,
+        )
+        alertas = []
+        if self.manutencoes is not None:
+            alertas = registrar_leitura_hodometro(
+                self.session,
+                self.manutencoes,
+                veiculo.id,
+                veiculo.quilometragem_atual,
+                viagem.data_chegada_real.date(),
+            )
+        if self.armazem_posicoes is not None:
+            self.armazem_posicoes.selar(self.session, viagem_id)
+        try:
+            confirmar(self.session)
+        except Exception:
+            if alertas:
+                self.manutencoes.desfazer(alertas)
+            raise
+        return viagem
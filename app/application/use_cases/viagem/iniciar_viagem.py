@@ -0,0 +1,93 @@
+"""
+Módulo de caso de uso de início de viagem.
+
+Coloca uma viagem agendada em andamento, reserva o veículo e registra o
+evento ViagemIniciada no outbox, na mesma transação.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.application.services.concorrencia_service import verificar_versao
+from app.domain.events import BusinessRuleViolation, ViagemIniciada
+from app.infrastructure.persistence.sqlalchemy.models import (
+    StatusVeiculo,
+    StatusViagem,
+    Viagem as ViagemModel,
+)
+from app.infrastructure.persistence.sqlalchemy.session import confirmar
+from app.infrastructure.sync.outbox import registrar_eventos
+
+class IniciarViagemUseCase:
+    """
+    Caso de uso de início de viagem.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """
+        Inicializa o caso de uso.
+
+        Args:
+            session (Session): Sessão da unidade de trabalho.
+        """
+        self.session = session
+
+    # Inicia a viagem
+    def executar(
+        self,
+        viagem_id: int,
+        km_inicial: Optional[float] = None,
+        versao_esperada: Optional[int] = None,
+    ) -> ViagemModel:
+        """
+        Inicia uma viagem agendada.
+
+        Args:
+            viagem_id (int): Identificador da viagem.
+            km_inicial (Optional[float]): Hodômetro na saída. Por padrão, a
+                quilometragem atual do veículo.
+            versao_esperada (Optional[int]): Versão da viagem lida pelo cliente.
+
+        Returns:
+            ViagemModel: Viagem iniciada.
+
+        Raises:
+            LookupError: Se a viagem não existir.
+            BusinessRuleViolation: Se a viagem não estiver agendada ou o
+                veículo não estiver disponível.
+            ConcurrencyConflict: Se a viagem ou o veículo foram alterados por
+                outra transação.
+        """
+        viagem = self.session.get(ViagemModel, viagem_id)
+        if viagem is None:
+            raise LookupError(f"Viagem {viagem_id} não encontrada")
+        verificar_versao(viagem, versao_esperada)
+
+        if viagem.status != StatusViagem.AGENDADA:
+            raise BusinessRuleViolation("Somente viagens agendadas podem ser iniciadas")
+        veiculo = viagem.veiculo
+        if veiculo.status != StatusVeiculo.DISPONIVEL:
+            raise BusinessRuleViolation("Veículo indisponível")
+
+        viagem.status = StatusViagem.EM_ANDAMENTO
+        viagem.data_saida_real = datetime.now()
+        viagem.km_inicial = veiculo.quilometragem_atual if km_inicial is None else km_inicial
+        veiculo.status = StatusVeiculo.EM_USO
+
+        registrar_eventos(
+            self.session,
+            [
+                ViagemIniciada(
+                    viagem_id=str(viagem.id),
+                    motorista_id=str(viagem.motorista_id),
+                    destino=viagem.destino,
+                    veiculo_id=str(viagem.veiculo_id),
+                    data_inicio=viagem.data_saida_real,
+                )
+            ],
+            agregado_id=viagem.id,
+        )
+        confirmar(self.session)
+        return viagem
@@ -0,0 +1,286 @@
+"""
+Módulo de casos de uso de relatórios de viagens.
+
+Consulta os custos mensais das viagens concluídas por veículo, motorista ou
+cliente a partir da tabela de resumos mantida pelo `resumo_custo_service`,
+lendo algumas centenas de linhas consolidadas em vez de varrer as viagens, e
+gera o relatório de viagens de um cliente em CSV, XLSX ou PDF, lendo as
+viagens por um cursor no servidor e gravando-as no arquivo em fluxo.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, BinaryIO, Callable, Iterator, List, Mapping, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.application.services.resumo_custo_service import DIMENSOES, METRICAS
+from app.infrastructure.persistence.sqlalchemy.models import Cliente, ResumoCustoMensal, Viagem
+from app.infrastructure.relatorios.escritores import ColunaRelatorio, ModeloRelatorio, criar_escritor
+
+@dataclass(frozen=True)
+class TotalCustoEntidade:
+    """
+    Custos de uma entidade somados no período.
+
+    Attributes:
+        entidade_id (int): Veículo, motorista ou cliente.
+        quantidade_viagens (int): Viagens concluídas no período.
+        km_total (float): Quilometragem percorrida.
+        custo_combustivel (float): Custo de combustível.
+        pedagio (float): Custo de pedágio.
+        alimentacao (float): Custo de alimentação.
+        hospedagem (float): Custo de hospedagem.
+        outros_custos (float): Outros custos.
+        custo_total (float): Custo total.
+        valor_frete (float): Valor de frete faturado.
+    """
+    entidade_id: int
+    quantidade_viagens: int
+    km_total: float
+    custo_combustivel: float
+    pedagio: float
+    alimentacao: float
+    hospedagem: float
+    outros_custos: float
+    custo_total: float
+    valor_frete: float
+
+    @property
+    def custo_km(self) -> Optional[float]:
+        """Custo total por km rodado."""
+        return self.custo_total / self.km_total if self.km_total else None
+
+class RelatorioCustosUseCase:
+    """
+    Caso de uso de relatório de custos mensais das viagens.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """
+        Inicializa o caso de uso.
+
+        Args:
+            session (Session): Sessão do banco.
+        """
+        self.session = session
+
+    # Custos mês a mês
+    def executar(
+        self,
+        dimensao: str,
+        inicio: date,
+        fim: date,
+        entidade_id: Optional[int] = None,
+    ) -> List[ResumoCustoMensal]:
+        """
+        Lista os custos mensais de cada entidade no período.
+
+        Args:
+            dimensao (str): "veiculo", "motorista" ou "cliente".
+            inicio (date): Primeiro mês do período (o dia é ignorado).
+            fim (date): Último mês do período, inclusivo (o dia é ignorado).
+            entidade_id (Optional[int]): Restringe a uma entidade.
+
+        Returns:
+            List[ResumoCustoMensal]: Resumos ordenados por mês e entidade.
+
+        Raises:
+            ValueError: Se a dimensão for desconhecida.
+        """
+        consulta = (
+            select(ResumoCustoMensal)
+            .where(self._filtro(dimensao, inicio, fim, entidade_id))
+            .order_by(ResumoCustoMensal.mes, ResumoCustoMensal.entidade_id)
+        )
+        return list(self.session.scalars(consulta))
+
+    # Custos somados no período
+    def totalizar(
+        self,
+        dimensao: str,
+        inicio: date,
+        fim: date,
+    ) -> List[TotalCustoEntidade]:
+        """
+        Soma os custos de cada entidade no período, do maior custo total
+        para o menor.
+
+        Args:
+            dimensao (str): "veiculo", "motorista" ou "cliente".
+            inicio (date): Primeiro mês do período (o dia é ignorado).
+            fim (date): Último mês do período, inclusivo (o dia é ignorado).
+
+        Returns:
+            List[TotalCustoEntidade]: Totais por entidade.
+
+        Raises:
+            ValueError: Se a dimensão for desconhecida.
+        """
+        somas = [func.sum(getattr(ResumoCustoMensal, metrica)) for metrica in METRICAS]
+        consulta = (
+            select(ResumoCustoMensal.entidade_id, *somas)
+            .where(self._filtro(dimensao, inicio, fim))
+            .group_by(ResumoCustoMensal.entidade_id)
+            .order_by(somas[METRICAS.index("custo_total")].desc(), ResumoCustoMensal.entidade_id)
+        )
+        return [
+            TotalCustoEntidade(entidade_id, int(quantidade), *valores)
+            for entidade_id, quantidade, *valores in self.session.execute(consulta)
+        ]
+
+    def _filtro(self, dimensao: str, inicio: date, fim: date, entidade_id: Optional[int] = None):
+        """Monta o filtro por dimensão, meses e entidade."""
+        if dimensao not in DIMENSOES:
+            raise ValueError(f"Dimensão inválida: {dimensao} (use {', '.join(DIMENSOES)})")
+        filtro = (
+            (ResumoCustoMensal.dimensao == dimensao)
+            & (ResumoCustoMensal.mes >= inicio.replace(day=1))
+            & (ResumoCustoMensal.mes <= fim.replace(day=1))
+        )
+        if entidade_id is not None:
+            filtro &= ResumoCustoMensal.entidade_id == entidade_id
+        return filtro
+
+MODELO_VIAGENS_CLIENTE = ModeloRelatorio(
+    titulo="Viagens de {cliente} - {inicio:%d/%m/%Y} a {fim:%d/%m/%Y}",
+    colunas=(
+        ColunaRelatorio("Código", "codigo", largura=12),
+        ColunaRelatorio("Saída", "data_saida", "{:%d/%m/%Y}", largura=10),
+        ColunaRelatorio("Origem", "origem", largura=18),
+        ColunaRelatorio("Destino", "destino", largura=18),
+        ColunaRelatorio("Status", "status", largura=12),
+        ColunaRelatorio("Km", "km_total", "{:,.1f}", largura=9),
+        ColunaRelatorio("Combustível", "custo_combustivel", "{:,.2f}", largura=11),
+        ColunaRelatorio("Pedágio", "pedagio", "{:,.2f}", largura=9),
+        ColunaRelatorio("Outros", "outros", "{:,.2f}", largura=9),
+        ColunaRelatorio("Custo total", "custo_total", "{:,.2f}", largura=11),
+        ColunaRelatorio("Frete", "valor_frete", "{:,.2f}", largura=11),
+        ColunaRelatorio("Margem", "margem", "{:,.2f}", largura=11),
+    ),
+)
+
+class RelatorioViagensClienteUseCase:
+    """
+    Caso de uso de geração do relatório de viagens de um cliente.
+    """
+
+    def __init__(self, session: Session, tamanho_lote: int = 1000) -> None:
+        """
+        Inicializa o caso de uso.
+
+        Args:
+            session (Session): Sessão do banco.
+            tamanho_lote (int): Linhas buscadas do cursor por vez.
+        """
+        self.session = session
+        self.tamanho_lote = tamanho_lote
+
+    # Quantidade de viagens do relatório
+    def contar(self, cliente_id: int, inicio: date, fim: date) -> int:
+        """
+        Conta as viagens do cliente no período, para o acompanhamento do progresso.
+
+        Args:
+            cliente_id (int): Identificador do cliente.
+            inicio (date): Primeiro dia do período.
+            fim (date): Último dia do período, inclusivo.
+
+        Returns:
+            int: Quantidade de viagens.
+        """
+        consulta = select(func.count(Viagem.id)).where(self._filtro(cliente_id, inicio, fim))
+        return self.session.execute(consulta).scalar_one()
+
+    # Linhas do relatório
+    def linhas(self, cliente_id: int, inicio: date, fim: date) -> Iterator[Mapping[str, Any]]:
+        """
+        Lê as viagens do cliente no período por um cursor no servidor.
+
+        Args:
+            cliente_id (int): Identificador do cliente.
+            inicio (date): Primeiro dia do período.
+            fim (date): Último dia do período, inclusivo.
+
+        Yields:
+            Mapping[str, Any]: Valores de uma viagem, pelos campos do modelo.
+        """
+        outros = (
+            func.coalesce(Viagem.alimentacao, 0.0)
+            + func.coalesce(Viagem.hospedagem, 0.0)
+            + func.coalesce(Viagem.outros_custos, 0.0)
+        )
+        consulta = (
+            select(
+                Viagem.codigo,
+                func.coalesce(Viagem.data_saida_real, Viagem.data_saida_prevista).label("data_saida"),
+                Viagem.origem,
+                Viagem.destino,
+                Viagem.status,
+                Viagem.km_total,
+                Viagem.custo_combustivel,
+                Viagem.pedagio,
+                outros.label("outros"),
+                Viagem.custo_total,
+                Viagem.valor_frete,
+                (Viagem.valor_frete - Viagem.custo_total).label("margem"),
+            )
+            .where(self._filtro(cliente_id, inicio, fim))
+            .order_by(Viagem.data_saida_prevista, Viagem.id)
+            .execution_options(stream_results=True, yield_per=self.tamanho_lote)
+        )
+        yield from self.session.execute(consulta).mappings()
+
+    # Gera o relatório
+    def gerar(
+        self,
+        cliente_id: int,
+        inicio: date,
+        fim: date,
+        formato: str,
+        arquivo: BinaryIO,
+        progresso: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Grava o relatório de viagens do cliente no arquivo, em fluxo.
+
+        Args:
+            cliente_id (int): Identificador do cliente.
+            inicio (date): Primeiro dia do período.
+            fim (date): Último dia do período, inclusivo.
+            formato (str): "csv", "xlsx" ou "pdf".
+            arquivo (BinaryIO): Arquivo binário de destino.
+            progresso (Optional[Callable[[int], None]]): Chamado a cada lote
+                com a quantidade de viagens já gravadas.
+
+        Returns:
+            int: Quantidade de viagens gravadas.
+
+        Raises:
+            LookupError: Se o cliente não existir.
+            ValueError: Se o formato não for suportado.
+        """
+        cliente = self.session.get(Cliente, cliente_id)
+        if cliente is None:
+            raise LookupError(f"Cliente {cliente_id} não encontrado")
+        contexto = {"cliente": cliente.nome, "inicio": inicio, "fim": fim}
+        escritor = criar_escritor(formato, arquivo, MODELO_VIAGENS_CLIENTE, contexto)
+
+        escritor.iniciar()
+        for linha in self.linhas(cliente_id, inicio, fim):
+            escritor.escrever(linha)
+            if progresso is not None and escritor.linhas % self.tamanho_lote == 0:
+                progresso(escritor.linhas)
+        escritor.finalizar()
+        if progresso is not None:
+            progresso(escritor.linhas)
+        return escritor.linhas
+
+    def _filtro(self, cliente_id: int, inicio: date, fim: date):
+        """Monta o filtro por cliente e período de saída prevista."""
+        return (
+            (Viagem.cliente_id == cliente_id)
+            & (Viagem.data_saida_prevista >= datetime.combine(inicio, time.min))
+            & (Viagem.data_saida_prevista < datetime.combine(fim + timedelta(days=1), time.min))
+        )
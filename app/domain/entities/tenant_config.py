@@ -0,0 +1,124 @@
+"""
+Módulo de entidade Configuração do Tenant.
+
+Define a configuração tipada de um tenant (empresa cliente do sistema), lida de
+`configuracoes_sistema`, e as funções que convertem o texto armazenado em
+`valor` para o tipo declarado em `tipo` e de volta.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Optional
+
+# Tenant das configurações globais do sistema (checkpoints, padrões)
+TENANT_PADRAO = "padrao"
+
+TIPOS = ("string", "integer", "float", "boolean", "json", "date")
+
+_VERDADEIROS = frozenset({"1", "true", "t", "sim", "s", "yes", "y", "on"})
+_FALSOS = frozenset({"0", "false", "f", "nao", "não", "n", "no", "off", ""})
+
+@dataclass(frozen=True)
+class TenantConfig:
+    """
+    Representa uma configuração de um tenant, com o valor já convertido.
+
+    Attributes:
+        tenant_id (str): Identificador do tenant.
+        chave (str): Chave da configuração.
+        valor (Any): Valor convertido conforme o tipo.
+        tipo (str): Tipo declarado (string, integer, float, boolean, json ou date).
+        descricao (Optional[str]): Descrição da configuração.
+        categoria (Optional[str]): Categoria usada para agrupar as configurações.
+    """
+
+    tenant_id: str
+    chave: str
+    valor: Any
+    tipo: str = "string"
+    descricao: Optional[str] = None
+    categoria: Optional[str] = None
+
+    # Texto a ser armazenado em `valor`
+    def valor_texto(self) -> Optional[str]:
+        """
+        Serializa o valor para armazenamento.
+
+        Returns:
+            Optional[str]: Texto do valor, ou None se o valor for nulo.
+        """
+        return serializar_valor(self.valor, self.tipo)
+
+# Converte o texto armazenado para o tipo declarado
+def converter_valor(texto: Optional[str], tipo: Optional[str]) -> Any:
+    """
+    Converte o texto de `valor` conforme o tipo declarado.
+
+    Args:
+        texto (Optional[str]): Texto armazenado.
+        tipo (Optional[str]): Tipo declarado; nulo equivale a "string".
+
+    Returns:
+        Any: Valor convertido, ou None se o texto for nulo.
+
+    Raises:
+        ValueError: Se o tipo for desconhecido ou o texto não for válido para ele.
+    """
+    tipo = tipo or "string"
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo de configuração desconhecido: {tipo!r}")
+    if texto is None:
+        return None
+    if tipo == "string":
+        return texto
+    if tipo == "integer":
+        return int(texto)
+    if tipo == "float":
+        return float(texto)
+    if tipo == "boolean":
+        normalizado = texto.strip().lower()
+        if normalizado in _VERDADEIROS:
+            return True
+        if normalizado in _FALSOS:
+            return False
+        raise ValueError(f"Valor booleano inválido: {texto!r}")
+    if tipo == "date":
+        return date.fromisoformat(texto)
+    try:
+        return json.loads(texto)
+    except json.JSONDecodeError as erro:
+        raise ValueError(f"JSON inválido: {erro}") from erro
+
+# Serializa o valor para o texto armazenado
+def serializar_valor(valor: Any, tipo: Optional[str]) -> Optional[str]:
+    """
+    Serializa o valor para o texto de `valor`, validando-o contra o tipo.
+
+    Args:
+        valor (Any): Valor a serializar.
+        tipo (Optional[str]): Tipo declarado; nulo equivale a "string".
+
+    Returns:
+        Optional[str]: Texto do valor, ou None se o valor for nulo.
+
+    Raises:
+        ValueError: Se o tipo for desconhecido ou o valor não for compatível.
+    """
+    tipo = tipo or "string"
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo de configuração desconhecido: {tipo!r}")
+    if valor is None:
+        return None
+    if tipo == "json":
+        return json.dumps(valor, ensure_ascii=False, separators=(",", ":"))
+    if tipo == "boolean":
+        if isinstance(valor, str):
+            valor = converter_valor(valor, tipo)
+        return "true" if valor else "false"
+    if tipo == "date" and isinstance(valor, date):
+        return valor.isoformat()
+    texto = str(valor)
+    # Valida o texto relendo-o com o tipo declarado
+    converter_valor(texto, tipo)
+    return texto
@@ -23,6 +23,8 @@ class Veiculo:
     Attributes:
         km_atual (float): Quilometragem atual do veículo.
         manutencoes (List[Manutencao]): Lista de manutenções registradas.
+        km_ultima_manutencao (Optional[float]): Maior quilometragem entre as
+            manutenções registradas, mantida a cada registro.
     """
     def __init__(self, km_atual: float):
         """
@@ -33,6 +35,7 @@ class Veiculo:
         """
         self.km_atual: float = km_atual
         self.manutencoes: List[Manutencao] = []
+        self.km_ultima_manutencao: Optional[float] = None
     
     # Adiciona manutenção ao veículo
     def adicionar_manutencao(self, manutencao: Manutencao):
@@ -43,6 +46,8 @@ class Veiculo:
             manutencao (Manutencao): Objeto de manutenção a ser registrado.
         """
         self.manutencoes.append(manutencao)
+        if self.km_ultima_manutencao is None or manutencao.km_veiculo > self.km_ultima_manutencao:
+            self.km_ultima_manutencao = manutencao.km_veiculo
     
     # Calcula próximo KM para manutenção
     def proxima_manutencao_km(self, intervalo_km: float) -> float:
@@ -58,9 +63,8 @@ class Veiculo:
         Returns:
             float: Quilometragem estimada para a próxima manutenção.
         """
-        if not self.manutencoes:
+        if self.km_ultima_manutencao is None:
             return self.km_atual + intervalo_km
-        
-        ultima_km = max(m.km_veiculo for m in self.manutencoes)
-        return ultima_km + intervalo_km
+
+        return self.km_ultima_manutencao + intervalo_km
     
\ No newline at end of file
@@ -5,5 +5,6 @@ Pacote de eventos do domínio.
 
 from app.domain.events.domain_event import *
 from app.domain.events.motorista.motorista_criado import *
+from app.domain.events.veiculo.manutencao_necessaria import *
 from app.domain.events.viagem.viagem_encerrada import *
 from app.domain.events.viagem.viagem_iniciada import *
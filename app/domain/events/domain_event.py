@@ -3,4 +3,7 @@ class DomainEvent:
     pass
 
 class BusinessRuleViolation(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class ConcurrencyConflict(Exception):
+    pass
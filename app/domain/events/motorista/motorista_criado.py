@@ -1,5 +1,7 @@
 
-class MotoristaCriado:
+from app.domain.events.domain_event import DomainEvent
+
+class MotoristaCriado(DomainEvent):
     def __init__(self, motorista_id: str, nome: str):
         self.motorista_id = motorista_id
         self.nome = nome
@@ -11,6 +11,8 @@ from datetime import datetime
 from uuid import UUID
 from enum import Enum
 
+from app.domain.events.domain_event import DomainEvent
+
 class TipoManutencao(Enum):
     """
     Enumeração que representa os tipos de manutenção
@@ -21,9 +23,10 @@ class TipoManutencao(Enum):
     CORRETIVA = "corretiva"
     TROCA_OLEO = "troca_oleo"
     REVISAO_PERIODICA = "revisao_periodica"
+    PNEUS = "pneus"
 
 @dataclass
-class ManutencaoNecessaria:
+class ManutencaoNecessaria(DomainEvent):
     """
     Evento de domínio disparado quando um veículo
     necessita de manutenção.
@@ -1,7 +1,18 @@
 
-class ViagemEncerrada:
-    def __init__(self, viagem_id: str, motorista_id: str, duracao_horas: float):
+from datetime import datetime
+from typing import Optional
+
+from app.domain.events.domain_event import DomainEvent
+
+class ViagemEncerrada(DomainEvent):
+    def __init__(
+        self,
+        viagem_id: str,
+        motorista_id: Optional[str] = None,
+        duracao_horas: Optional[float] = None,
+        data_fim: Optional[datetime] = None,
+    ):
         self.viagem_id = viagem_id
         self.motorista_id = motorista_id
         self.duracao_horas = duracao_horas
-        
\ No newline at end of file
+        self.data_fim = data_fim
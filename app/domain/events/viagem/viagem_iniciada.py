@@ -1,7 +1,20 @@
 
-class ViagemIniciada:
-    def __init__(self, viagem_id: str, motorista_id: str, destino: str):
+from datetime import datetime
+from typing import Optional
+
+from app.domain.events.domain_event import DomainEvent
+
+class ViagemIniciada(DomainEvent):
+    def __init__(
+        self,
+        viagem_id: str,
+        motorista_id: str,
+        destino: Optional[str] = None,
+        veiculo_id: Optional[str] = None,
+        data_inicio: Optional[datetime] = None,
+    ):
         self.viagem_id = viagem_id
         self.motorista_id = motorista_id
         self.destino = destino
-        
\ No newline at end of file
+        self.veiculo_id = veiculo_id
+        self.data_inicio = data_inicio
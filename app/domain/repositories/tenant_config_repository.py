@@ -0,0 +1,56 @@
+"""
+Módulo de interface do repositório de configurações por tenant.
+
+Define as operações de leitura e gravação das configurações tipadas de um
+tenant, independentes da tecnologia de persistência.
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from app.domain.entities.tenant_config import TenantConfig
+
+class TenantConfigRepository(ABC):
+    """
+    Repositório das configurações de tenant.
+    """
+
+    # Lista as configurações do tenant
+    @abstractmethod
+    def listar(self, tenant_id: str) -> List[TenantConfig]:
+        """
+        Lista todas as configurações do tenant.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+
+        Returns:
+            List[TenantConfig]: Configurações com os valores convertidos.
+        """
+
+    # Obtém uma configuração do tenant
+    @abstractmethod
+    def obter(self, tenant_id: str, chave: str) -> Optional[TenantConfig]:
+        """
+        Obtém uma configuração do tenant.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+            chave (str): Chave da configuração.
+
+        Returns:
+            Optional[TenantConfig]: Configuração, ou None se não existir.
+        """
+
+    # Grava uma configuração do tenant
+    @abstractmethod
+    def salvar(self, configuracao: TenantConfig) -> TenantConfig:
+        """
+        Cria ou atualiza a configuração, sem realizar commit.
+
+        Args:
+            configuracao (TenantConfig): Configuração a gravar.
+
+        Returns:
+            TenantConfig: Configuração gravada.
+        """
@@ -0,0 +1,443 @@
+"""
+Módulo do agendador de tarefas recorrentes.
+
+Define o Agendador, que executa tarefas periódicas da frota (alertas,
+varreduras, previsões, reconstruções) em um pool limitado de threads, com um
+pool opcional de processos para as tarefas que consomem CPU. Os horários
+seguem expressões cron e cada ocorrência é reivindicada por um lease gravado
+no banco, de modo que, com várias instâncias da API, apenas uma execute cada
+ocorrência. O agendador mede a duração das execuções e o atraso entre o
+horário previsto e o início efetivo, publicados também no registro de
+métricas exportado em /metrics.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.infrastructure.agendamento.cron import ExpressaoCron
+from app.infrastructure.observabilidade.metricas import REGISTRO, RegistroMetricas
+from app.infrastructure.persistence.sqlalchemy.models import LeaseTarefa
+
+logger = logging.getLogger(__name__)
+
+_TABELA = LeaseTarefa.__table__
+
+STATUS_SUCESSO = "sucesso"
+STATUS_FALHA = "falha"
+
+# Espera para tentar de novo uma ocorrência cujo lease ainda está ativo
+_REVERIFICACAO = timedelta(seconds=30)
+
+# Limites dos histogramas de duração e atraso das tarefas, em segundos
+LIMITES_TAREFA = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 1800.0, 3600.0)
+
+@dataclass
+class MetricasTarefa:
+    """
+    Métricas de execução de uma tarefa agendada nesta instância.
+
+    Attributes:
+        nome (str): Nome da tarefa.
+        execucoes (int): Execuções concluídas com sucesso.
+        falhas (int): Execuções que lançaram exceção.
+        duracao_total (float): Soma das durações, em segundos.
+        duracao_max (float): Maior duração observada, em segundos.
+        ultima_duracao (float): Duração da última execução, em segundos.
+        atraso_ultimo (float): Atraso da última execução entre o horário
+            previsto e o início no pool, em segundos.
+        atraso_max (float): Maior atraso observado, em segundos.
+        em_execucao (bool): Indica se a tarefa está executando agora.
+        ultima_execucao (Optional[datetime]): Início da última execução.
+        proxima_execucao (Optional[datetime]): Próximo horário conhecido.
+    """
+    nome: str
+    execucoes: int = 0
+    falhas: int = 0
+    duracao_total: float = 0.0
+    duracao_max: float = 0.0
+    ultima_duracao: float = 0.0
+    atraso_ultimo: float = 0.0
+    atraso_max: float = 0.0
+    em_execucao: bool = False
+    ultima_execucao: Optional[datetime] = None
+    proxima_execucao: Optional[datetime] = None
+
+    @property
+    def duracao_media(self) -> float:
+        """Duração média por execução, em segundos."""
+        total = self.execucoes + self.falhas
+        return self.duracao_total / total if total else 0.0
+
+    def registrar_execucao(self, duracao: float, atraso: float, sucesso: bool) -> None:
+        """
+        Contabiliza uma execução da tarefa.
+
+        Args:
+            duracao (float): Duração da execução, em segundos.
+            atraso (float): Atraso do início em relação ao previsto, em segundos.
+            sucesso (bool): Indica se a tarefa terminou sem exceção.
+        """
+        if sucesso:
+            self.execucoes += 1
+        else:
+            self.falhas += 1
+        self.duracao_total += duracao
+        self.duracao_max = max(self.duracao_max, duracao)
+        self.ultima_duracao = duracao
+        self.atraso_ultimo = atraso
+        self.atraso_max = max(self.atraso_max, atraso)
+
+@dataclass
+class TarefaAgendada:
+    """
+    Tarefa registrada no agendador.
+
+    Attributes:
+        nome (str): Nome único da tarefa, usado como chave do lease.
+        funcao (Callable[[], Any]): Função sem argumentos executada a cada
+            ocorrência. Tarefas de CPU exigem uma função de módulo, que
+            possa ser enviada a outro processo.
+        cron (ExpressaoCron): Horários da tarefa.
+        cpu (bool): Executa no pool de processos.
+        exclusiva (bool): Reivindica cada ocorrência pelo lease no banco;
+            tarefas locais (por exemplo, limpeza de arquivos da instância)
+            executam em todas as instâncias.
+        duracao_lease (timedelta): Validade do lease; deve superar a duração
+            esperada da tarefa.
+    """
+    nome: str
+    funcao: Callable[[], Any]
+    cron: ExpressaoCron
+    cpu: bool = False
+    exclusiva: bool = True
+    duracao_lease: timedelta = timedelta(minutes=10)
+    metricas: MetricasTarefa = field(init=False)
+    proxima: Optional[datetime] = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        self.metricas = MetricasTarefa(nome=self.nome)
+
+class Agendador:
+    """
+    Agendador de tarefas recorrentes com leases no banco.
+    """
+
+    def __init__(
+        self,
+        fabrica_sessao: Callable[[], Session],
+        workers: int = 4,
+        processos: int = 0,
+        instancia: Optional[str] = None,
+        intervalo: float = 1.0,
+        relogio: Callable[[], datetime] = datetime.now,
+        registro: RegistroMetricas = REGISTRO,
+    ) -> None:
+        """
+        Inicializa o agendador.
+
+        O pool de processos usa o método spawn: os processos filhos não
+        herdam as conexões abertas do pool do SQLAlchemy nem as threads do
+        processo da API.
+
+        Args:
+            fabrica_sessao (Callable[[], Session]): Fábrica de sessões para os leases.
+            workers (int): Tamanho do pool de threads.
+            processos (int): Tamanho do pool de processos; com 0, as tarefas
+                de CPU executam no pool de threads.
+            instancia (Optional[str]): Identificador desta instância nos leases.
+            intervalo (float): Espera máxima entre verificações, em segundos.
+            relogio (Callable[[], datetime]): Fonte do horário corrente.
+            registro (RegistroMetricas): Registro onde a duração e o atraso
+                das execuções são publicados.
+        """
+        if workers < 1:
+            raise ValueError("O agendador precisa de ao menos um worker")
+        self.fabrica_sessao = fabrica_sessao
+        self.instancia = instancia or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.intervalo = intervalo
+        self.relogio = relogio
+        self._threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agendador")
+        self._processos: Optional[Executor] = None
+        if processos:
+            self._processos = ProcessPoolExecutor(
+                max_workers=processos, mp_context=multiprocessing.get_context("spawn")
+            )
+        self._tarefas: Dict[str, TarefaAgendada] = {}
+        self._trava = threading.Lock()
+        self._parar: Optional[asyncio.Event] = None
+        self._laco: Optional[asyncio.Task] = None
+        self.ultima_verificacao: Optional[datetime] = None
+        self._duracao = registro.histograma(
+            "agendador_tarefa_duracao_segundos", "Duração das execuções das tarefas agendadas.", ("tarefa",),
+            LIMITES_TAREFA,
+        )
+        self._atraso = registro.histograma(
+            "agendador_tarefa_atraso_segundos",
+            "Atraso entre o horário previsto e o início das tarefas agendadas.",
+            ("tarefa",),
+            LIMITES_TAREFA,
+        )
+        self._falhas = registro.contador(
+            "agendador_tarefas_falhas", "Execuções de tarefas agendadas que falharam.", ("tarefa",)
+        )
+
+    # Registra uma tarefa
+    def agendar(
+        self,
+        nome: str,
+        funcao: Callable[[], Any],
+        cron: str,
+        cpu: bool = False,
+        exclusiva: bool = True,
+        duracao_lease: timedelta = timedelta(minutes=10),
+    ) -> TarefaAgendada:
+        """
+        Registra uma tarefa recorrente.
+
+        Args:
+            nome (str): Nome único da tarefa.
+            funcao (Callable[[], Any]): Função executada a cada ocorrência.
+            cron (str): Expressão cron dos horários.
+            cpu (bool): Executa no pool de processos.
+            exclusiva (bool): Uma única instância executa cada ocorrência.
+            duracao_lease (timedelta): Validade do lease.
+
+        Returns:
+            TarefaAgendada: Tarefa registrada.
+
+        Raises:
+            ValueError: Se o nome já estiver registrado ou o cron for inválido.
+        """
+        if nome in self._tarefas:
+            raise ValueError(f"Tarefa já agendada: {nome}")
+        tarefa = TarefaAgendada(nome, funcao, ExpressaoCron(cron), cpu, exclusiva, duracao_lease)
+        self._tarefas[nome] = tarefa
+        return tarefa
+
+    # Verifica e dispara as tarefas vencidas
+    def verificar(self, agora: Optional[datetime] = None) -> List[str]:
+        """
+        Dispara as tarefas cujo horário chegou e cujo lease foi obtido.
+
+        Args:
+            agora (Optional[datetime]): Momento de referência.
+
+        Returns:
+            List[str]: Nomes das tarefas disparadas.
+        """
+        agora = agora or self.relogio()
+        disparadas = []
+        for tarefa in self._tarefas.values():
+            if tarefa.proxima is None:
+                tarefa.proxima = self._preparar(tarefa, agora)
+            if tarefa.proxima > agora or tarefa.metricas.em_execucao:
+                continue
+            previsto = self._reivindicar(tarefa, agora)
+            if previsto is None:
+                continue
+            with self._trava:
+                tarefa.metricas.em_execucao = True
+            self._threads.submit(self._executar, tarefa, previsto)
+            disparadas.append(tarefa.nome)
+        self.ultima_verificacao = agora
+        return disparadas
+
+    # Atraso do laço de verificação
+    def atraso(self, agora: Optional[datetime] = None) -> Optional[float]:
+        """
+        Mede há quanto tempo o laço não conclui uma verificação, além do intervalo.
+
+        Args:
+            agora (Optional[datetime]): Momento de referência.
+
+        Returns:
+            Optional[float]: Atraso em segundos, ou None se o agendador ainda
+                não verificou as tarefas.
+        """
+        if self.ultima_verificacao is None:
+            return None
+        decorrido = ((agora or self.relogio()) - self.ultima_verificacao).total_seconds()
+        return max(0.0, decorrido - self.intervalo)
+
+    # Inicia o laço de verificação
+    async def iniciar(self) -> None:
+        """Inicia o laço de verificação no event loop corrente."""
+        if self._laco is not None:
+            return
+        self._parar = asyncio.Event()
+        self._laco = asyncio.get_running_loop().create_task(self._executar_laco())
+
+    # Encerra o laço e os pools
+    async def parar(self, esperar: bool = True) -> None:
+        """
+        Encerra o laço de verificação e os pools.
+
+        Args:
+            esperar (bool): Se deve aguardar as execuções em andamento.
+        """
+        if self._laco is not None:
+            self._parar.set()
+            await self._laco
+            self._laco = None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.encerrar, esperar)
+
+    def encerrar(self, esperar: bool = True) -> None:
+        """Encerra os pools de threads e de processos."""
+        self._threads.shutdown(wait=esperar)
+        if self._processos is not None:
+            self._processos.shutdown(wait=esperar)
+
+    def metricas(self) -> List[MetricasTarefa]:
+        """
+        Retorna as métricas de todas as tarefas registradas.
+
+        Returns:
+            List[MetricasTarefa]: Métricas com a próxima execução conhecida.
+        """
+        resultado = []
+        for tarefa in self._tarefas.values():
+            tarefa.metricas.proxima_execucao = tarefa.proxima
+            resultado.append(tarefa.metricas)
+        return resultado
+
+    async def _executar_laco(self) -> None:
+        """Verifica as tarefas até o sinal de parada."""
+        loop = asyncio.get_running_loop()
+        while not self._parar.is_set():
+            try:
+                await loop.run_in_executor(None, self.verificar)
+            except Exception:
+                logger.exception("Falha ao verificar as tarefas agendadas")
+            try:
+                await asyncio.wait_for(self._parar.wait(), timeout=self._espera())
+            except asyncio.TimeoutError:
+                pass
+
+    def _espera(self) -> float:
+        """Tempo até a próxima tarefa, limitado ao intervalo."""
+        proximas = [t.proxima for t in self._tarefas.values() if t.proxima is not None]
+        if not proximas:
+            return self.intervalo
+        restante = (min(proximas) - self.relogio()).total_seconds()
+        return min(max(restante, 0.05), self.intervalo)
+
+    def _preparar(self, tarefa: TarefaAgendada, agora: datetime) -> datetime:
+        """Cria o lease da tarefa, se ainda não existir, e lê a próxima execução."""
+        proxima = tarefa.cron.proxima(agora)
+        if not tarefa.exclusiva:
+            return proxima
+        with self.fabrica_sessao() as session:
+            gravada = session.execute(
+                select(_TABELA.c.proxima_execucao).where(_TABELA.c.nome == tarefa.nome)
+            ).scalar_one_or_none()
+            if gravada is not None:
+                return gravada
+            try:
+                session.execute(insert(_TABELA).values(nome=tarefa.nome, proxima_execucao=proxima))
+                session.commit()
+            except IntegrityError:
+                # Outra instância criou o lease ao mesmo tempo
+                session.rollback()
+                return session.execute(
+                    select(_TABELA.c.proxima_execucao).where(_TABELA.c.nome == tarefa.nome)
+                ).scalar_one()
+        return proxima
+
+    def _reivindicar(self, tarefa: TarefaAgendada, agora: datetime) -> Optional[datetime]:
+        """
+        Tenta obter o lease da ocorrência vencida.
+
+        Returns:
+            Optional[datetime]: Horário previsto da ocorrência obtida, ou None
+                se outra instância a obteve ou ainda detém o lease.
+        """
+        if not tarefa.exclusiva:
+            previsto, tarefa.proxima = tarefa.proxima, tarefa.cron.proxima(agora)
+            return previsto
+
+        with self.fabrica_sessao() as session:
+            linha = session.execute(
+                select(_TABELA.c.proxima_execucao, _TABELA.c.expira_em).where(_TABELA.c.nome == tarefa.nome)
+            ).one()
+            previsto = linha.proxima_execucao
+            if previsto > agora:
+                # Outra instância já executou esta ocorrência
+                tarefa.proxima = previsto
+                return None
+            if linha.expira_em is not None and linha.expira_em > agora:
+                # A execução anterior ainda está em andamento em alguma instância
+                tarefa.proxima = min(linha.expira_em, agora + _REVERIFICACAO)
+                return None
+
+            # Compare-and-set sobre a ocorrência lida: só uma instância avança o horário
+            proxima = tarefa.cron.proxima(agora)
+            resultado = session.execute(
+                update(_TABELA)
+                .where(_TABELA.c.nome == tarefa.nome, _TABELA.c.proxima_execucao == previsto)
+                .values(dono=self.instancia, expira_em=agora + tarefa.duracao_lease, proxima_execucao=proxima)
+            )
+            session.commit()
+        tarefa.proxima = proxima
+        return previsto if resultado.rowcount == 1 else None
+
+    def _executar(self, tarefa: TarefaAgendada, previsto: datetime) -> None:
+        """Executa uma ocorrência da tarefa e libera o lease."""
+        inicio = self.relogio()
+        atraso = max((inicio - previsto).total_seconds(), 0.0)
+        cronometro = time.perf_counter()
+        sucesso = True
+        try:
+            if tarefa.cpu and self._processos is not None:
+                self._processos.submit(tarefa.funcao).result()
+            else:
+                tarefa.funcao()
+        except Exception:
+            sucesso = False
+            logger.exception("Falha na tarefa agendada %s", tarefa.nome)
+        duracao = time.perf_counter() - cronometro
+        self._duracao.observar(duracao, tarefa.nome)
+        self._atraso.observar(atraso, tarefa.nome)
+        if not sucesso:
+            self._falhas.inc(tarefa.nome)
+
+        with self._trava:
+            tarefa.metricas.registrar_execucao(duracao, atraso, sucesso)
+            tarefa.metricas.ultima_execucao = inicio
+            tarefa.metricas.em_execucao = False
+        if tarefa.exclusiva:
+            self._liberar(tarefa, inicio, duracao, sucesso)
+
+    def _liberar(self, tarefa: TarefaAgendada, inicio: datetime, duracao: float, sucesso: bool) -> None:
+        """Libera o lease e registra o resultado da execução."""
+        try:
+            with self.fabrica_sessao() as session:
+                session.execute(
+                    update(_TABELA)
+                    .where(_TABELA.c.nome == tarefa.nome, _TABELA.c.dono == self.instancia)
+                    .values(
+                        dono=None,
+                        expira_em=None,
+                        ultima_execucao=inicio,
+                        ultimo_status=STATUS_SUCESSO if sucesso else STATUS_FALHA,
+                        ultima_duracao=duracao,
+                    )
+                )
+                session.commit()
+        except Exception:
+            # O lease expira sozinho; a próxima ocorrência não fica bloqueada
+            logger.exception("Falha ao liberar o lease da tarefa %s", tarefa.nome)
@@ -0,0 +1,133 @@
+"""
+Módulo de expressões de agendamento no formato cron.
+
+Interpreta expressões de cinco campos (minuto, hora, dia do mês, mês e dia
+da semana), com listas, intervalos, passos e os atalhos usuais (@hourly,
+@daily, @weekly, @monthly e @yearly), e calcula o próximo horário que as
+satisfaz. Como no cron tradicional, quando dia do mês e dia da semana são
+ambos restritos, basta que um deles coincida.
+"""
+
+from datetime import datetime, timedelta
+from typing import FrozenSet, Tuple
+
+ATALHOS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# (mínimo, máximo) de cada campo
+_LIMITES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# Horizonte de busca: expressões como "0 0 30 2 *" nunca ocorrem
+_ANOS_BUSCA = 8
+
+class ExpressaoCron:
+    """
+    Expressão cron de cinco campos.
+
+    Attributes:
+        texto (str): Expressão original.
+        minutos (FrozenSet[int]): Minutos aceitos.
+        horas (FrozenSet[int]): Horas aceitas.
+        dias (FrozenSet[int]): Dias do mês aceitos.
+        meses (FrozenSet[int]): Meses aceitos.
+        dias_semana (FrozenSet[int]): Dias da semana aceitos (0 = domingo).
+    """
+
+    def __init__(self, texto: str) -> None:
+        """
+        Interpreta a expressão.
+
+        Args:
+            texto (str): Expressão cron ou atalho.
+
+        Raises:
+            ValueError: Se a expressão for inválida.
+        """
+        self.texto = texto
+        campos = ATALHOS.get(texto.strip().lower(), texto).split()
+        if len(campos) != 5:
+            raise ValueError(f"Expressão cron deve ter 5 campos: {texto!r}")
+        valores = [_interpretar_campo(campo, *limites) for campo, limites in zip(campos, _LIMITES)]
+        self.minutos, self.horas, self.dias, self.meses, dias_semana = valores
+        # 7 também representa o domingo
+        self.dias_semana = frozenset(dia % 7 for dia in dias_semana)
+        self._dia_restrito = campos[2] != "*"
+        self._semana_restrita = campos[4] != "*"
+
+    # Próximo horário da expressão
+    def proxima(self, apos: datetime) -> datetime:
+        """
+        Calcula o primeiro horário, estritamente posterior a `apos`, que
+        satisfaz a expressão.
+
+        Args:
+            apos (datetime): Momento de referência.
+
+        Returns:
+            datetime: Próximo horário, com segundos zerados.
+
+        Raises:
+            ValueError: Se a expressão não ocorrer no horizonte de busca.
+        """
+        momento = apos.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limite = apos.year + _ANOS_BUSCA
+        while momento.year <= limite:
+            if momento.month not in self.meses:
+                ano, mes = divmod(momento.month, 12)
+                momento = momento.replace(year=momento.year + ano, month=mes + 1, day=1, hour=0, minute=0)
+                continue
+            if not self._dia_aceito(momento):
+                momento = (momento + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if momento.hour not in self.horas:
+                momento = (momento + timedelta(hours=1)).replace(minute=0)
+                continue
+            if momento.minute not in self.minutos:
+                momento += timedelta(minutes=1)
+                continue
+            return momento
+        raise ValueError(f"Expressão cron sem ocorrência nos próximos {_ANOS_BUSCA} anos: {self.texto!r}")
+
+    def _dia_aceito(self, momento: datetime) -> bool:
+        """Aplica a regra do cron para dia do mês e dia da semana."""
+        no_mes = momento.day in self.dias
+        # isoweekday: segunda = 1 ... domingo = 7
+        na_semana = momento.isoweekday() % 7 in self.dias_semana
+        if self._dia_restrito and self._semana_restrita:
+            return no_mes or na_semana
+        return no_mes and na_semana
+
+    def __repr__(self) -> str:
+        return f"ExpressaoCron({self.texto!r})"
+
+def _interpretar_campo(campo: str, minimo: int, maximo: int) -> FrozenSet[int]:
+    """Converte um campo (lista de itens com intervalo e passo) no conjunto de valores."""
+    valores = set()
+    for item in campo.split(","):
+        intervalo, _, passo = item.partition("/")
+        inicio, fim = _intervalo(intervalo, minimo, maximo, bool(passo))
+        incremento = int(passo) if passo else 1
+        if incremento < 1 or inicio > fim or inicio < minimo or fim > maximo:
+            raise ValueError(f"Campo cron inválido: {campo!r}")
+        valores.update(range(inicio, fim + 1, incremento))
+    return frozenset(valores)
+
+def _intervalo(texto: str, minimo: int, maximo: int, com_passo: bool) -> Tuple[int, int]:
+    """Interpreta "*", "n" ou "n-m"; com passo, "n/p" vai de n até o máximo."""
+    try:
+        if texto == "*":
+            return minimo, maximo
+        if "-" in texto:
+            inicio, fim = texto.split("-", 1)
+            return int(inicio), int(fim)
+        valor = int(texto)
+        return valor, maximo if com_passo else valor
+    except ValueError:
+        raise ValueError(f"Campo cron inválido: {texto!r}")
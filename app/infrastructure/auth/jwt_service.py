@@ -1,16 +1,107 @@
-
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from typing import Any, Callable, Dict, Tuple
+
+from jose import JWTError, jwk, jwt
 
 SECRET_KEY = "your-secret-key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+class TokenInvalido(Exception):
+    """Exceção levantada quando o token é inválido, malformado ou expirado."""
+
+class VerificadorTokens:
+    """
+    Verificador de tokens JWT com cache das claims decodificadas.
+
+    A chave é construída uma única vez, em vez de a cada decodificação. As
+    claims de cada token válido ficam em um LRU indexado pelo SHA-256 do
+    token até o `exp`, de modo que as requisições seguintes com o mesmo token
+    não repetem a verificação da assinatura.
+    """
+
+    def __init__(
+        self,
+        chave: str = SECRET_KEY,
+        algoritmo: str = ALGORITHM,
+        capacidade: int = 10_000,
+        relogio: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Inicializa o verificador.
+
+        Args:
+            chave (str): Chave secreta de assinatura.
+            algoritmo (str): Algoritmo de assinatura.
+            capacidade (int): Quantidade máxima de tokens em cache.
+            relogio (Callable[[], float]): Relógio em segundos desde a época.
+        """
+        self._chave = jwk.construct(chave, algoritmo)
+        self._algoritmos = [algoritmo]
+        self.capacidade = capacidade
+        self._relogio = relogio
+        self._cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    # Verifica o token e retorna as claims
+    def verificar(self, token: str) -> Dict[str, Any]:
+        """
+        Verifica a assinatura e a validade do token.
+
+        Args:
+            token (str): Token JWT.
+
+        Returns:
+            Dict[str, Any]: Claims do token; não devem ser alteradas, pois
+                são compartilhadas pelo cache.
+
+        Raises:
+            TokenInvalido: Se o token for inválido, não tiver `exp` ou estiver expirado.
+        """
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        agora = self._relogio()
+        with self._trava:
+            item = self._cache.get(digest)
+            if item is not None:
+                if agora < item[0]:
+                    self._cache.move_to_end(digest)
+                    self.acertos += 1
+                    return item[1]
+                del self._cache[digest]
+            self.falhas += 1
+        try:
+            claims = jwt.decode(token, self._chave, algorithms=self._algoritmos, options={"require_exp": True})
+        except JWTError as erro:
+            raise TokenInvalido(str(erro)) from erro
+        with self._trava:
+            self._cache[digest] = (float(claims["exp"]), claims)
+            if len(self._cache) > self.capacidade:
+                self._cache.popitem(last=False)
+        return claims
+
+    # Remove tokens expirados
+    def limpar(self) -> int:
+        """
+        Remove do cache os tokens expirados.
+
+        Returns:
+            int: Quantidade de tokens removidos.
+        """
+        agora = self._relogio()
+        with self._trava:
+            expirados = [digest for digest, (expira_em, _) in self._cache.items() if expira_em <= agora]
+            for digest in expirados:
+                del self._cache[digest]
+        return len(expirados)
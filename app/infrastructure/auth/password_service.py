@@ -0,0 +1,323 @@
+"""
+Módulo de serviço de senhas.
+
+O bcrypt consome de 100 a 300 ms de CPU por verificação, de propósito. Executado
+dentro de uma rota assíncrona, esse tempo bloqueia o loop de eventos e atrasa
+todas as outras requisições; nas trocas de turno, quando muitos motoristas
+entram ao mesmo tempo, a aplicação inteira para. O `ServicoSenhas` executa o
+hash e a verificação em um pool limitado de threads (o bcrypt libera o GIL)
+ou de processos, refaz o hash de forma transparente quando o custo
+configurado muda e limita as tentativas de login por conta.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, NamedTuple, Optional
+
+import bcrypt
+
+# O bcrypt considera apenas os primeiros 72 bytes da senha
+TAMANHO_MAXIMO = 72
+CUSTO_MINIMO = 4
+CUSTO_MAXIMO = 31
+
+class TentativasExcedidas(Exception):
+    """Exceção levantada quando a conta excede o limite de tentativas de login."""
+
+    def __init__(self, conta: str, espera: float) -> None:
+        super().__init__(f"Muitas tentativas de login para {conta!r}; aguarde {espera:.0f} s")
+        self.conta = conta
+        self.espera = espera
+
+class ResultadoVerificacao(NamedTuple):
+    """Resultado da verificação de uma senha."""
+
+    valida: bool
+    # Novo hash a gravar quando o custo do hash armazenado difere do configurado
+    novo_hash: Optional[str] = None
+
+class LimitadorTentativas:
+    """
+    Limita as tentativas de login malsucedidas por conta.
+
+    As falhas são contadas em uma janela deslizante; ao atingir o limite, a
+    conta fica bloqueada pelo tempo de bloqueio. Um login bem-sucedido zera o
+    histórico da conta. Quando a quantidade de contas acompanhadas passa do
+    limite, as falhas expiradas são removidas na própria falha registrada.
+    """
+
+    def __init__(
+        self,
+        max_tentativas: int = 5,
+        janela: float = 300.0,
+        bloqueio: float = 900.0,
+        relogio: Callable[[], float] = time.monotonic,
+        max_contas: int = 10_000,
+    ) -> None:
+        """
+        Inicializa o limitador.
+
+        Args:
+            max_tentativas (int): Falhas permitidas dentro da janela.
+            janela (float): Duração da janela de contagem, em segundos.
+            bloqueio (float): Duração do bloqueio, em segundos.
+            relogio (Callable[[], float]): Relógio monotônico, em segundos.
+            max_contas (int): Contas acompanhadas a partir das quais as
+                expiradas são removidas a cada falha registrada.
+        """
+        self.max_tentativas = max_tentativas
+        self.janela = janela
+        self.bloqueio = bloqueio
+        self.max_contas = max_contas
+        self._relogio = relogio
+        self._falhas: Dict[str, Deque[float]] = {}
+        self._bloqueadas: Dict[str, float] = {}
+        self._trava = threading.Lock()
+        # Tamanho a partir do qual a próxima falha remove as contas expiradas
+        self._proxima_limpeza = max_contas
+
+    # Verifica se a conta pode tentar o login
+    def verificar(self, conta: str) -> None:
+        """
+        Verifica se a conta está liberada para uma tentativa.
+
+        Args:
+            conta (str): Identificador da conta (e-mail normalizado).
+
+        Raises:
+            TentativasExcedidas: Se a conta estiver bloqueada.
+        """
+        agora = self._relogio()
+        with self._trava:
+            liberacao = self._bloqueadas.get(conta)
+            if liberacao is None:
+                return
+            if agora < liberacao:
+                raise TentativasExcedidas(conta, liberacao - agora)
+            del self._bloqueadas[conta]
+
+    # Registra uma falha de login
+    def registrar_falha(self, conta: str) -> None:
+        """
+        Registra uma tentativa malsucedida e bloqueia a conta ao atingir o limite.
+
+        Args:
+            conta (str): Identificador da conta.
+        """
+        agora = self._relogio()
+        with self._trava:
+            falhas = self._falhas.setdefault(conta, deque())
+            falhas.append(agora)
+            while falhas and falhas[0] <= agora - self.janela:
+                falhas.popleft()
+            if len(falhas) >= self.max_tentativas:
+                self._bloqueadas[conta] = agora + self.bloqueio
+                del self._falhas[conta]
+            if len(self._falhas) + len(self._bloqueadas) > self._proxima_limpeza:
+                self._limpar(agora)
+                # Com muitas contas ainda ativas, a limpeza não se repete a cada falha
+                self._proxima_limpeza = max(self.max_contas, 2 * (len(self._falhas) + len(self._bloqueadas)))
+
+    # Registra um login bem-sucedido
+    def registrar_sucesso(self, conta: str) -> None:
+        """
+        Zera o histórico de falhas da conta.
+
+        Args:
+            conta (str): Identificador da conta.
+        """
+        with self._trava:
+            self._falhas.pop(conta, None)
+
+    # Remove históricos expirados
+    def limpar(self) -> int:
+        """
+        Remove falhas fora da janela e bloqueios vencidos.
+
+        Returns:
+            int: Quantidade de contas removidas.
+        """
+        with self._trava:
+            return self._limpar(self._relogio())
+
+    def _limpar(self, agora: float) -> int:
+        """Remove as contas expiradas; deve ser chamado com a trava adquirida."""
+        expiradas = [c for c, f in self._falhas.items() if f[-1] <= agora - self.janela]
+        vencidas = [c for c, liberacao in self._bloqueadas.items() if liberacao <= agora]
+        for conta in expiradas:
+            del self._falhas[conta]
+        for conta in vencidas:
+            del self._bloqueadas[conta]
+        return len(expiradas) + len(vencidas)
+
+class ServicoSenhas:
+    """
+    Serviço de hash e verificação de senhas fora do loop de eventos.
+    """
+
+    def __init__(
+        self,
+        custo: int = 12,
+        workers: int = 4,
+        processos: bool = False,
+        limitador: Optional[LimitadorTentativas] = None,
+    ) -> None:
+        """
+        Inicializa o serviço.
+
+        Args:
+            custo (int): Fator de custo do bcrypt (log2 das iterações).
+            workers (int): Tamanho do pool; limita quantos hashes rodam em paralelo.
+            processos (bool): Usa um pool de processos em vez de threads.
+            limitador (Optional[LimitadorTentativas]): Limitador de tentativas;
+                por padrão, 5 falhas em 5 minutos bloqueiam a conta por 15 minutos.
+
+        Raises:
+            ValueError: Se o custo ou a quantidade de workers for inválida.
+        """
+        if not CUSTO_MINIMO <= custo <= CUSTO_MAXIMO:
+            raise ValueError(f"Custo do bcrypt deve estar entre {CUSTO_MINIMO} e {CUSTO_MAXIMO}")
+        if workers < 1:
+            raise ValueError("O pool de senhas precisa de ao menos um worker")
+        self.custo = custo
+        self.limitador = limitador or LimitadorTentativas()
+        self._executor: Executor = (
+            ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            if processos
+            else ThreadPoolExecutor(max_workers=workers, thread_name_prefix="senhas")
+        )
+        # Hash de referência para equalizar o tempo de resposta de contas inexistentes
+        self._hash_ficticio = _gerar_hash(b"senha-ficticia", custo)
+
+    # Gera o hash de uma senha
+    async def gerar_hash(self, senha: str) -> str:
+        """
+        Gera o hash da senha no pool.
+
+        Args:
+            senha (str): Senha em texto puro.
+
+        Returns:
+            str: Hash bcrypt com o custo configurado.
+
+        Raises:
+            ValueError: Se a senha for vazia ou exceder 72 bytes.
+        """
+        return await self._executar(_gerar_hash, _codificar(senha), self.custo)
+
+    # Verifica uma senha
+    async def verificar(self, senha: str, hash_senha: str) -> ResultadoVerificacao:
+        """
+        Verifica a senha no pool e refaz o hash se o custo mudou.
+
+        Args:
+            senha (str): Senha informada.
+            hash_senha (str): Hash armazenado.
+
+        Returns:
+            ResultadoVerificacao: Validade e, se for o caso, o novo hash.
+        """
+        try:
+            senha_bytes = _codificar(senha)
+        except ValueError:
+            return ResultadoVerificacao(False)
+        valida = await self._executar(_verificar, senha_bytes, hash_senha)
+        if valida and self.precisa_rehash(hash_senha):
+            return ResultadoVerificacao(True, await self._executar(_gerar_hash, senha_bytes, self.custo))
+        return ResultadoVerificacao(valida)
+
+    # Autentica uma conta
+    async def autenticar(self, conta: str, senha: str, hash_senha: Optional[str]) -> ResultadoVerificacao:
+        """
+        Verifica a senha da conta aplicando o limite de tentativas.
+
+        Contas inexistentes (`hash_senha` nulo) são verificadas contra um hash
+        fictício, para que o tempo de resposta não revele quais contas existem.
+
+        Args:
+            conta (str): Identificador da conta (e-mail).
+            senha (str): Senha informada.
+            hash_senha (Optional[str]): Hash armazenado, ou None se a conta não existir.
+
+        Returns:
+            ResultadoVerificacao: Validade e, se for o caso, o novo hash.
+
+        Raises:
+            TentativasExcedidas: Se a conta estiver bloqueada.
+        """
+        conta = conta.strip().lower()
+        self.limitador.verificar(conta)
+        resultado = await self.verificar(senha, hash_senha or self._hash_ficticio)
+        if hash_senha is None:
+            resultado = ResultadoVerificacao(False)
+        if resultado.valida:
+            self.limitador.registrar_sucesso(conta)
+        else:
+            self.limitador.registrar_falha(conta)
+        return resultado
+
+    # Indica se o hash usa um custo diferente do configurado
+    def precisa_rehash(self, hash_senha: str) -> bool:
+        """
+        Indica se o hash deve ser refeito com o custo configurado.
+
+        Args:
+            hash_senha (str): Hash armazenado.
+
+        Returns:
+            bool: True se o custo do hash for diferente do configurado.
+        """
+        return custo_do_hash(hash_senha) != self.custo
+
+    # Encerra o pool
+    def encerrar(self, esperar: bool = True) -> None:
+        """
+        Encerra o pool de hash.
+
+        Args:
+            esperar (bool): Aguarda as operações em andamento.
+        """
+        self._executor.shutdown(wait=esperar)
+
+    async def _executar(self, funcao, *argumentos):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, funcao, *argumentos)
+
+# Custo registrado no hash
+def custo_do_hash(hash_senha: str) -> Optional[int]:
+    """
+    Extrai o fator de custo de um hash bcrypt ($2b$12$...).
+
+    Args:
+        hash_senha (str): Hash bcrypt.
+
+    Returns:
+        Optional[int]: Custo, ou None se o texto não for um hash bcrypt.
+    """
+    partes = hash_senha.split("$")
+    if len(partes) != 4 or not partes[2].isdigit():
+        return None
+    return int(partes[2])
+
+def _codificar(senha: str) -> bytes:
+    """Codifica a senha, recusando as que o bcrypt truncaria."""
+    senha_bytes = senha.encode("utf-8")
+    if not senha_bytes:
+        raise ValueError("A senha não pode ser vazia")
+    if len(senha_bytes) > TAMANHO_MAXIMO:
+        raise ValueError(f"A senha não pode exceder {TAMANHO_MAXIMO} bytes")
+    return senha_bytes
+
+def _gerar_hash(senha: bytes, custo: int) -> str:
+    """Gera o hash no worker; função de módulo para o pool de processos."""
+    return bcrypt.hashpw(senha, bcrypt.gensalt(rounds=custo)).decode("ascii")
+
+def _verificar(senha: bytes, hash_senha: str) -> bool:
+    """Verifica a senha no worker; hashes malformados são tratados como inválidos."""
+    try:
+        return bcrypt.checkpw(senha, hash_senha.encode("ascii"))
+    except ValueError:
+        return False
@@ -0,0 +1,62 @@
+"""
+Módulo de permissões por perfil.
+
+Associa cada perfil de usuário (admin, gestor, operador) ao conjunto de
+permissões que ele concede. As permissões seguem o formato "recurso:ação";
+o curinga "*" concede todas.
+"""
+
+from typing import Dict, FrozenSet, Iterable
+
+PERFIL_ADMIN = "admin"
+PERFIL_GESTOR = "gestor"
+PERFIL_OPERADOR = "operador"
+
+CURINGA = "*"
+
+PERMISSOES_POR_PERFIL: Dict[str, FrozenSet[str]] = {
+    PERFIL_ADMIN: frozenset({CURINGA}),
+    PERFIL_GESTOR: frozenset({
+        "motoristas:ler", "motoristas:editar",
+        "veiculos:ler", "veiculos:editar",
+        "viagens:ler", "viagens:editar",
+        "relatorios:gerar",
+        "configuracoes:ler", "configuracoes:editar",
+        "agendador:ler",
+        "sync:ler", "sync:enviar",
+    }),
+    PERFIL_OPERADOR: frozenset({
+        "motoristas:ler",
+        "veiculos:ler",
+        "viagens:ler", "viagens:editar",
+        "configuracoes:ler",
+        "sync:ler", "sync:enviar",
+    }),
+}
+
+# Permissões do perfil
+def permissoes_do_perfil(perfil: str) -> FrozenSet[str]:
+    """
+    Retorna as permissões concedidas pelo perfil.
+
+    Args:
+        perfil (str): Perfil do usuário.
+
+    Returns:
+        FrozenSet[str]: Permissões do perfil; vazio para perfis desconhecidos.
+    """
+    return PERMISSOES_POR_PERFIL.get(perfil, frozenset())
+
+# Verifica as permissões
+def possui_permissoes(concedidas: FrozenSet[str], exigidas: Iterable[str]) -> bool:
+    """
+    Verifica se as permissões concedidas cobrem todas as exigidas.
+
+    Args:
+        concedidas (FrozenSet[str]): Permissões do usuário.
+        exigidas (Iterable[str]): Permissões exigidas pela operação.
+
+    Returns:
+        bool: True se o usuário possuir todas as permissões exigidas.
+    """
+    return CURINGA in concedidas or all(permissao in concedidas for permissao in exigidas)
@@ -0,0 +1,278 @@
+"""
+Módulo de despacho de eventos de domínio.
+
+Define o EventDispatcher, responsável por entregar os eventos de domínio
+gerados pelos aggregates aos handlers registrados. A entrega é assíncrona,
+feita fora do caminho da requisição, com uma fila limitada por handler
+para aplicar backpressure quando os consumidores não acompanham o volume.
+Os eventos gravados pelos casos de uso chegam ao dispatcher pelo relay do
+outbox, somente depois do commit da transação que os gerou.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Type
+
+from app.domain.events import DomainEvent
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[DomainEvent], Awaitable[None]]
+
+@dataclass
+class MetricasHandler:
+    """
+    Métricas de execução de um handler registrado no dispatcher.
+
+    Attributes:
+        nome (str): Nome do handler.
+        processados (int): Quantidade de eventos processados com sucesso.
+        falhas (int): Quantidade de eventos cujo processamento lançou exceção.
+        latencia_total (float): Soma das latências de processamento, em segundos.
+        latencia_max (float): Maior latência observada, em segundos.
+        profundidade_fila (int): Eventos aguardando na fila no momento da leitura.
+        capacidade_fila (int): Tamanho máximo da fila do handler.
+    """
+    nome: str
+    processados: int = 0
+    falhas: int = 0
+    latencia_total: float = 0.0
+    latencia_max: float = 0.0
+    profundidade_fila: int = 0
+    capacidade_fila: int = 0
+
+    @property
+    def latencia_media(self) -> float:
+        """Latência média por evento, em segundos."""
+        total = self.processados + self.falhas
+        return self.latencia_total / total if total else 0.0
+
+    def registrar_execucao(self, duracao: float, sucesso: bool) -> None:
+        """
+        Contabiliza uma execução do handler.
+
+        Args:
+            duracao (float): Duração da execução, em segundos.
+            sucesso (bool): Indica se o handler terminou sem exceção.
+        """
+        if sucesso:
+            self.processados += 1
+        else:
+            self.falhas += 1
+        self.latencia_total += duracao
+        if duracao > self.latencia_max:
+            self.latencia_max = duracao
+
+@dataclass
+class _Assinatura:
+    """Handler registrado com sua fila e seus workers."""
+    handler: Handler
+    metricas: MetricasHandler
+    tamanho_fila: int
+    workers: int
+    fila: Optional[asyncio.Queue] = None
+    tarefas: List[asyncio.Task] = field(default_factory=list)
+
+class EventDispatcher:
+    """
+    Dispatcher assíncrono de eventos de domínio em processo.
+
+    Os handlers são registrados por tipo de evento; um handler registrado para
+    uma classe base (por exemplo, DomainEvent) recebe também os eventos das
+    subclasses. Cada handler possui uma fila limitada e seus próprios workers,
+    de modo que handlers lentos não atrasam os demais.
+    """
+
+    def __init__(self, tamanho_fila: int = 1000, workers_por_handler: int = 1) -> None:
+        """
+        Inicializa o dispatcher.
+
+        Args:
+            tamanho_fila (int): Capacidade padrão da fila de cada handler.
+            workers_por_handler (int): Quantidade padrão de workers por handler.
+        """
+        self.tamanho_fila = tamanho_fila
+        self.workers_por_handler = workers_por_handler
+        self._assinaturas: Dict[Type[DomainEvent], List[_Assinatura]] = {}
+        self._rotas: Dict[type, List[_Assinatura]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def em_execucao(self) -> bool:
+        """Indica se os workers do dispatcher foram iniciados."""
+        return self._loop is not None
+
+    # Registra um handler para um tipo de evento
+    def registrar(
+        self,
+        tipo_evento: Type[DomainEvent],
+        handler: Handler,
+        nome: Optional[str] = None,
+        tamanho_fila: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        """
+        Registra um handler para um tipo de evento.
+
+        Args:
+            tipo_evento (Type[DomainEvent]): Classe do evento tratado.
+            handler (Handler): Corrotina que recebe o evento.
+            nome (Optional[str]): Nome usado nas métricas. Padrão é o nome do handler.
+            tamanho_fila (Optional[int]): Capacidade da fila deste handler.
+            workers (Optional[int]): Quantidade de workers deste handler.
+
+        Raises:
+            RuntimeError: Se o dispatcher já estiver em execução.
+        """
+        if self.em_execucao:
+            raise RuntimeError("Handlers devem ser registrados antes de iniciar o dispatcher")
+
+        nome = nome or getattr(handler, "__name__", type(handler).__name__)
+        capacidade = tamanho_fila or self.tamanho_fila
+        assinatura = _Assinatura(
+            handler=handler,
+            metricas=MetricasHandler(nome=nome, capacidade_fila=capacidade),
+            tamanho_fila=capacidade,
+            workers=workers or self.workers_por_handler,
+        )
+        self._assinaturas.setdefault(tipo_evento, []).append(assinatura)
+        self._rotas.clear()
+
+    # Inicia os workers de todos os handlers
+    async def iniciar(self) -> None:
+        """
+        Cria as filas e inicia os workers de todos os handlers registrados.
+
+        Deve ser chamado dentro do event loop que processará os eventos,
+        normalmente no lifespan da aplicação.
+        """
+        if self.em_execucao:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        for assinatura in self._todas_assinaturas():
+            assinatura.fila = asyncio.Queue(maxsize=assinatura.tamanho_fila)
+            assinatura.tarefas = [
+                self._loop.create_task(self._consumir(assinatura))
+                for _ in range(assinatura.workers)
+            ]
+
+    # Encerra os workers após esvaziar as filas
+    async def parar(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Aguarda o esvaziamento das filas e encerra os workers.
+
+        Args:
+            timeout (Optional[float]): Tempo máximo de espera pelo esvaziamento,
+                em segundos. Eventos ainda pendentes após o prazo são descartados.
+        """
+        if not self.em_execucao:
+            return
+
+        filas = [a.fila.join() for a in self._todas_assinaturas()]
+        if filas:
+            try:
+                await asyncio.wait_for(asyncio.gather(*filas), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Dispatcher encerrado com eventos pendentes nas filas")
+
+        tarefas = [t for a in self._todas_assinaturas() for t in a.tarefas]
+        for tarefa in tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+
+        for assinatura in self._todas_assinaturas():
+            assinatura.fila = None
+            assinatura.tarefas = []
+        self._loop = None
+
+    # Publica eventos aguardando espaço nas filas
+    async def publicar(self, eventos: Iterable[DomainEvent]) -> None:
+        """
+        Enfileira os eventos para todos os handlers interessados.
+
+        Quando a fila de algum handler está cheia, a corrotina aguarda até que
+        haja espaço, propagando backpressure ao produtor.
+
+        Args:
+            eventos (Iterable[DomainEvent]): Eventos a publicar.
+
+        Raises:
+            RuntimeError: Se o dispatcher não estiver em execução.
+        """
+        if not self.em_execucao:
+            raise RuntimeError("Dispatcher não iniciado")
+
+        for evento in eventos:
+            for assinatura in self._resolver(type(evento)):
+                await assinatura.fila.put(evento)
+
+    # Publica eventos a partir de outra thread, bloqueando enquanto houver backpressure
+    def publicar_threadsafe(self, eventos: Iterable[DomainEvent], timeout: Optional[float] = None) -> None:
+        """
+        Publica eventos a partir de uma thread fora do event loop.
+
+        Bloqueia a thread chamadora até que todos os eventos tenham sido
+        enfileirados, o que permite a produtores síncronos (como o relay do
+        outbox) respeitar o backpressure das filas.
+
+        Args:
+            eventos (Iterable[DomainEvent]): Eventos a publicar.
+            timeout (Optional[float]): Tempo máximo de espera, em segundos.
+
+        Raises:
+            RuntimeError: Se o dispatcher não estiver em execução.
+        """
+        if not self.em_execucao:
+            raise RuntimeError("Dispatcher não iniciado")
+
+        futuro = asyncio.run_coroutine_threadsafe(self.publicar(list(eventos)), self._loop)
+        futuro.result(timeout)
+
+    def metricas(self) -> List[MetricasHandler]:
+        """
+        Retorna as métricas de todos os handlers registrados.
+
+        Returns:
+            List[MetricasHandler]: Métricas com a profundidade atual das filas.
+        """
+        resultado = []
+        for assinatura in self._todas_assinaturas():
+            metricas = assinatura.metricas
+            metricas.profundidade_fila = assinatura.fila.qsize() if assinatura.fila else 0
+            resultado.append(metricas)
+        return resultado
+
+    def _todas_assinaturas(self) -> List[_Assinatura]:
+        return [a for lista in self._assinaturas.values() for a in lista]
+
+    def _resolver(self, tipo: type) -> List[_Assinatura]:
+        """Resolve (com cache) os handlers de um tipo seguindo sua MRO."""
+        rota = self._rotas.get(tipo)
+        if rota is None:
+            rota = []
+            for classe in tipo.__mro__:
+                rota.extend(self._assinaturas.get(classe, ()))
+            self._rotas[tipo] = rota
+        return rota
+
+    async def _consumir(self, assinatura: _Assinatura) -> None:
+        """Loop de um worker: retira eventos da fila e executa o handler."""
+        fila = assinatura.fila
+        while True:
+            evento = await fila.get()
+            inicio = time.perf_counter()
+            sucesso = True
+            try:
+                await assinatura.handler(evento)
+            except Exception:
+                sucesso = False
+                logger.exception(
+                    "Falha no handler %s ao processar %s",
+                    assinatura.metricas.nome, type(evento).__name__,
+                )
+            finally:
+                assinatura.metricas.registrar_execucao(time.perf_counter() - inicio, sucesso)
+                fila.task_done()
@@ -0,0 +1,63 @@
+"""
+Módulo de handler de alertas.
+
+Define o AlertaHandler, que reage aos eventos de domínio de viagens
+registrando os alertas operacionais correspondentes.
+"""
+
+import logging
+from typing import Optional
+
+from app.domain.events import DomainEvent, ViagemEncerrada, ViagemIniciada
+from app.infrastructure.sync.outbox import FiltroIdempotencia, MensagemOutbox, decodificar_evento
+
+logger = logging.getLogger(__name__)
+
+# Eventos de domínio que geram alertas
+_EVENTOS_ALERTA = (ViagemIniciada, ViagemEncerrada)
+
+class AlertaHandler:
+    """
+    Handler responsável por gerar alertas a partir de eventos de domínio.
+
+    Executado pelo EventDispatcher fora do caminho da requisição. As
+    mensagens do outbox são entregues at-least-once, por isso passam por um
+    filtro de idempotência antes de gerar o alerta.
+    """
+
+    def __init__(self, nome_logger: str = __name__, filtro: Optional[FiltroIdempotencia] = None) -> None:
+        """
+        Inicializa o handler.
+
+        Args:
+            nome_logger (str): Nome do logger onde os alertas são registrados.
+            filtro (Optional[FiltroIdempotencia]): Filtro das entregas repetidas
+                do outbox. Padrão é um filtro com a capacidade padrão.
+        """
+        self.logger = logging.getLogger(nome_logger)
+        self.filtro = filtro or FiltroIdempotencia()
+
+    # Processa um evento de domínio
+    async def __call__(self, evento: DomainEvent) -> None:
+        """
+        Registra o alerta correspondente ao evento recebido.
+
+        Aceita tanto os eventos de domínio quanto as mensagens entregues pelo
+        relay do outbox; as mensagens repetidas são ignoradas.
+
+        Args:
+            evento (DomainEvent): Evento publicado pelo dispatcher.
+        """
+        if isinstance(evento, MensagemOutbox):
+            mensagem = evento
+            evento = decodificar_evento(mensagem, _EVENTOS_ALERTA)
+            if evento is None or not self.filtro.primeira_entrega(mensagem.chave_idempotencia):
+                return
+
+        if isinstance(evento, ViagemIniciada):
+            self.logger.info(
+                "Viagem %s iniciada pelo motorista %s",
+                evento.viagem_id, evento.motorista_id,
+            )
+        elif isinstance(evento, ViagemEncerrada):
+            self.logger.info("Viagem %s encerrada", evento.viagem_id)
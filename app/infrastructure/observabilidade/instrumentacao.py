@@ -0,0 +1,183 @@
+"""
+Módulo de instrumentação da aplicação.
+
+Define as métricas de HTTP e de banco de dados e os pontos que as alimentam:
+um middleware ASGI que mede a latência e o status de cada rota e listeners
+do SQLAlchemy que medem cada comando enviado ao banco. As consultas também
+são contadas por requisição, o que expõe rotas com o padrão N+1 (uma
+consulta por item de uma listagem).
+"""
+
+import logging
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+
+from app.infrastructure.observabilidade.metricas import REGISTRO, RegistroMetricas
+
+logger = logging.getLogger(__name__)
+
+# Rótulo das requisições que não corresponderam a nenhuma rota
+ROTA_DESCONHECIDA = "desconhecida"
+
+# Limites do histograma de consultas por requisição
+LIMITES_CONSULTAS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+_OPERACOES = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+
+# Contador de consultas da requisição em andamento
+_CONSULTAS_REQUISICAO: ContextVar[Optional[List[int]]] = ContextVar("consultas_requisicao", default=None)
+
+# Engines e classes de engine com medição ativa
+_ALVOS_MEDIDOS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+class MetricasAplicacao:
+    """
+    Métricas de HTTP e de banco de dados da aplicação.
+    """
+
+    def __init__(self, registro: RegistroMetricas = REGISTRO) -> None:
+        """
+        Cria ou obtém as métricas no registro.
+
+        Args:
+            registro (RegistroMetricas): Registro onde as métricas são publicadas.
+        """
+        self.registro = registro
+        self.requisicoes = registro.contador(
+            "http_requisicoes", "Requisições HTTP atendidas.", ("metodo", "rota", "status")
+        )
+        self.duracao_requisicao = registro.histograma(
+            "http_requisicao_duracao_segundos", "Latência das requisições HTTP.", ("metodo", "rota")
+        )
+        self.consultas_requisicao = registro.histograma(
+            "http_requisicao_consultas",
+            "Comandos SQL executados por requisição HTTP.",
+            ("metodo", "rota"),
+            LIMITES_CONSULTAS,
+        )
+        self.requisicoes_excessivas = registro.contador(
+            "http_requisicoes_consultas_excessivas",
+            "Requisições que excederam o limite de comandos SQL (possível N+1).",
+            ("metodo", "rota"),
+        )
+        self.consultas = registro.contador("db_consultas", "Comandos SQL executados.", ("operacao",))
+        self.duracao_consulta = registro.histograma(
+            "db_consulta_duracao_segundos", "Duração dos comandos SQL.", ("operacao",)
+        )
+        self.erros_consulta = registro.contador("db_consultas_erros", "Comandos SQL que falharam.", ("operacao",))
+
+# Métricas do registro padrão
+METRICAS = MetricasAplicacao()
+
+class MiddlewareMetricas:
+    """
+    Middleware ASGI que registra latência, status e consultas por rota.
+
+    A rota é rotulada pelo modelo do caminho (`/api/v1/viagens/{viagem_id}`),
+    não pelo caminho requisitado, para que a quantidade de séries não cresça
+    com os identificadores.
+    """
+
+    def __init__(self, app: Any, metricas: MetricasAplicacao = METRICAS, limite_consultas: int = 50) -> None:
+        """
+        Inicializa o middleware.
+
+        Args:
+            app (Any): Aplicação ASGI envolvida.
+            metricas (MetricasAplicacao): Métricas alimentadas.
+            limite_consultas (int): Comandos SQL por requisição a partir dos
+                quais a requisição é registrada como excessiva.
+        """
+        self.app = app
+        self.metricas = metricas
+        self.limite_consultas = limite_consultas
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        inicio = time.perf_counter()
+        status = [500]
+        consultas = [0]
+        token = _CONSULTAS_REQUISICAO.set(consultas)
+
+        async def enviar(mensagem) -> None:
+            if mensagem["type"] == "http.response.start":
+                status[0] = mensagem["status"]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _CONSULTAS_REQUISICAO.reset(token)
+            duracao = time.perf_counter() - inicio
+            metodo = scope["method"]
+            rota = _modelo_rota(scope)
+            self.metricas.requisicoes.inc(metodo, rota, str(status[0]))
+            self.metricas.duracao_requisicao.observar(duracao, metodo, rota)
+            self.metricas.consultas_requisicao.observar(consultas[0], metodo, rota)
+            if consultas[0] > self.limite_consultas:
+                self.metricas.requisicoes_excessivas.inc(metodo, rota)
+                logger.warning("%s %s executou %d comandos SQL", metodo, rota, consultas[0])
+
+# Ativa a medição dos comandos SQL
+def ativar_metricas_sql(alvo: Any, metricas: MetricasAplicacao = METRICAS) -> None:
+    """
+    Registra os listeners que medem cada comando SQL.
+
+    Args:
+        alvo (Any): Engine, ou a classe Engine para medir todas as engines,
+            inclusive as dos tenants.
+        metricas (MetricasAplicacao): Métricas alimentadas.
+    """
+    if alvo in _ALVOS_MEDIDOS:
+        return
+    _ALVOS_MEDIDOS.add(alvo)
+
+    def antes(conexao, cursor, comando, parametros, contexto, executemany) -> None:
+        conexao.info.setdefault("metricas_inicio", []).append(time.perf_counter())
+
+    def depois(conexao, cursor, comando, parametros, contexto, executemany) -> None:
+        duracao = time.perf_counter() - conexao.info["metricas_inicio"].pop()
+        operacao = _operacao(comando)
+        metricas.consultas.inc(operacao)
+        metricas.duracao_consulta.observar(duracao, operacao)
+        consultas = _CONSULTAS_REQUISICAO.get()
+        if consultas is not None:
+            consultas[0] += 1
+
+    def erro(contexto_excecao) -> None:
+        conexao = contexto_excecao.connection
+        if conexao is not None and conexao.info.get("metricas_inicio"):
+            conexao.info["metricas_inicio"].pop()
+        metricas.erros_consulta.inc(_operacao(contexto_excecao.statement or ""))
+
+    event.listen(alvo, "before_cursor_execute", antes)
+    event.listen(alvo, "after_cursor_execute", depois)
+    event.listen(alvo, "handle_error", erro)
+
+# Consultas executadas na requisição em andamento
+def consultas_da_requisicao() -> Optional[int]:
+    """
+    Retorna a quantidade de comandos SQL já executados na requisição atual.
+
+    Returns:
+        Optional[int]: Quantidade de comandos, ou None fora de uma requisição.
+    """
+    consultas = _CONSULTAS_REQUISICAO.get()
+    return None if consultas is None else consultas[0]
+
+def _modelo_rota(scope) -> str:
+    """Modelo do caminho da rota atendida, preenchido pelo roteador no escopo."""
+    rota = scope.get("route")
+    return getattr(rota, "path", None) or ROTA_DESCONHECIDA
+
+def _operacao(comando: str) -> str:
+    """Primeira palavra do comando SQL, limitada às operações de dados."""
+    partes = comando.lstrip().split(None, 1)
+    operacao = partes[0].upper() if partes else ""
+    return operacao if operacao in _OPERACOES else "OUTRO"
@@ -0,0 +1,267 @@
+"""
+Módulo de métricas no formato do Prometheus.
+
+Contadores e histogramas gravam em fragmentos por thread: cada thread
+incrementa apenas o próprio dicionário, sem travas no caminho quente, e a
+leitura soma os fragmentos de todas as threads no momento da exportação. Os
+fragmentos de threads encerradas são mantidos, para que os contadores nunca
+diminuam.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Limites padrão dos histogramas de latência, em segundos
+LIMITES_LATENCIA = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Rotulos = Tuple[str, ...]
+
+class _PorThread:
+    """Fragmentos de dados, um por thread, registrados no primeiro uso."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._fragmentos: List[dict] = []
+        self._trava = threading.Lock()
+
+    def fragmento(self) -> dict:
+        try:
+            return self._local.fragmento
+        except AttributeError:
+            fragmento = self._local.fragmento = {}
+            with self._trava:
+                self._fragmentos.append(fragmento)
+            return fragmento
+
+    def fragmentos(self) -> List[dict]:
+        with self._trava:
+            return list(self._fragmentos)
+
+class Metrica:
+    """
+    Base das métricas registradas.
+
+    Attributes:
+        nome (str): Nome da métrica.
+        ajuda (str): Descrição exibida na exportação.
+        rotulos (Tuple[str, ...]): Nomes dos rótulos.
+    """
+
+    tipo = "untyped"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> None:
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+
+    def amostras(self) -> Iterable[Tuple[str, Rotulos, float]]:
+        """Retorna as amostras (sufixo, valores dos rótulos, valor) para exportação."""
+        raise NotImplementedError
+
+    def _formatar_rotulos(self, valores: Rotulos, extra: str = "") -> str:
+        pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(self.rotulos, valores)]
+        if extra:
+            pares.append(extra)
+        return "{" + ",".join(pares) + "}" if pares else ""
+
+class Contador(Metrica):
+    """
+    Contador monotônico com rótulos.
+    """
+
+    tipo = "counter"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> None:
+        super().__init__(nome, ajuda, rotulos)
+        self._dados = _PorThread()
+
+    # Incrementa o contador
+    def inc(self, *valores_rotulos: str, valor: float = 1.0) -> None:
+        """
+        Incrementa o contador para a combinação de rótulos.
+
+        Args:
+            *valores_rotulos (str): Valores dos rótulos, na ordem declarada.
+            valor (float): Incremento.
+        """
+        fragmento = self._dados.fragmento()
+        fragmento[valores_rotulos] = fragmento.get(valores_rotulos, 0.0) + valor
+
+    # Soma dos fragmentos
+    def valores(self) -> Dict[Rotulos, float]:
+        """
+        Soma os fragmentos de todas as threads.
+
+        Returns:
+            Dict[Rotulos, float]: Valor por combinação de rótulos.
+        """
+        totais: Dict[Rotulos, float] = {}
+        for fragmento in self._dados.fragmentos():
+            for chave, valor in list(fragmento.items()):
+                totais[chave] = totais.get(chave, 0.0) + valor
+        return totais
+
+    def amostras(self):
+        for chave, valor in sorted(self.valores().items()):
+            yield "_total", chave, valor
+
+class Histograma(Metrica):
+    """
+    Histograma cumulativo com limites fixos.
+    """
+
+    tipo = "histogram"
+
+    def __init__(
+        self,
+        nome: str,
+        ajuda: str,
+        rotulos: Sequence[str] = (),
+        limites: Sequence[float] = LIMITES_LATENCIA,
+    ) -> None:
+        super().__init__(nome, ajuda, rotulos)
+        self.limites = tuple(sorted(limites))
+        self._dados = _PorThread()
+
+    # Registra uma observação
+    def observar(self, valor: float, *valores_rotulos: str) -> None:
+        """
+        Registra uma observação.
+
+        Args:
+            valor (float): Valor observado.
+            *valores_rotulos (str): Valores dos rótulos, na ordem declarada.
+        """
+        fragmento = self._dados.fragmento()
+        contagens = fragmento.get(valores_rotulos)
+        if contagens is None:
+            # Uma posição por limite, uma para +Inf e a soma no final
+            contagens = fragmento[valores_rotulos] = [0] * (len(self.limites) + 1) + [0.0]
+        contagens[bisect_left(self.limites, valor)] += 1
+        contagens[-1] += valor
+
+    # Soma dos fragmentos
+    def valores(self) -> Dict[Rotulos, List[float]]:
+        """
+        Soma os fragmentos de todas as threads.
+
+        Returns:
+            Dict[Rotulos, List[float]]: Contagens não cumulativas por faixa,
+                seguidas da soma, por combinação de rótulos.
+        """
+        totais: Dict[Rotulos, List[float]] = {}
+        for fragmento in self._dados.fragmentos():
+            for chave, contagens in list(fragmento.items()):
+                atual = totais.setdefault(chave, [0] * len(contagens))
+                for indice, valor in enumerate(list(contagens)):
+                    atual[indice] += valor
+        return totais
+
+    def amostras(self):
+        for chave, contagens in sorted(self.valores().items()):
+            acumulado = 0
+            for limite, quantidade in zip(self.limites + (float("inf"),), contagens):
+                acumulado += quantidade
+                yield "_bucket", chave + (_formatar_numero(limite),), acumulado
+            yield "_sum", chave, contagens[-1]
+            yield "_count", chave, acumulado
+
+    def _formatar_rotulos(self, valores: Rotulos, extra: str = "") -> str:
+        if len(valores) > len(self.rotulos):
+            return super()._formatar_rotulos(valores[:-1], f'le="{valores[-1]}"')
+        return super()._formatar_rotulos(valores, extra)
+
+class Medidor(Metrica):
+    """
+    Medidor cujo valor é lido de uma função no momento da exportação.
+    """
+
+    tipo = "gauge"
+
+    def __init__(self, nome: str, ajuda: str, funcao: Callable[[], Optional[float]]) -> None:
+        super().__init__(nome, ajuda)
+        self.funcao = funcao
+
+    def amostras(self):
+        valor = self.funcao()
+        if valor is not None:
+            yield "", (), valor
+
+class RegistroMetricas:
+    """
+    Conjunto de métricas exportadas em um mesmo endpoint.
+    """
+
+    def __init__(self) -> None:
+        self._metricas: Dict[str, Metrica] = {}
+        self._trava = threading.Lock()
+
+    # Registra uma métrica
+    def registrar(self, metrica: Metrica) -> Metrica:
+        """
+        Registra a métrica; se já houver uma com o mesmo nome, retorna a existente.
+
+        Args:
+            metrica (Metrica): Métrica a registrar.
+
+        Returns:
+            Metrica: Métrica registrada.
+        """
+        with self._trava:
+            return self._metricas.setdefault(metrica.nome, metrica)
+
+    # Cria ou obtém um contador
+    def contador(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Contador:
+        """Cria ou obtém o contador com o nome indicado."""
+        return self.registrar(Contador(nome, ajuda, rotulos))
+
+    # Cria ou obtém um histograma
+    def histograma(
+        self,
+        nome: str,
+        ajuda: str,
+        rotulos: Sequence[str] = (),
+        limites: Sequence[float] = LIMITES_LATENCIA,
+    ) -> Histograma:
+        """Cria ou obtém o histograma com o nome indicado."""
+        return self.registrar(Histograma(nome, ajuda, rotulos, limites))
+
+    # Cria ou substitui um medidor
+    def medidor(self, nome: str, ajuda: str, funcao: Callable[[], Optional[float]]) -> Medidor:
+        """Cria o medidor, substituindo a função de um medidor anterior de mesmo nome."""
+        with self._trava:
+            medidor = Medidor(nome, ajuda, funcao)
+            self._metricas[nome] = medidor
+            return medidor
+
+    # Exporta no formato texto do Prometheus
+    def exportar(self) -> str:
+        """
+        Exporta as métricas no formato de exposição texto do Prometheus (0.0.4).
+
+        Returns:
+            str: Texto de exposição.
+        """
+        with self._trava:
+            metricas = sorted(self._metricas.values(), key=lambda metrica: metrica.nome)
+        linhas = []
+        for metrica in metricas:
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            for sufixo, rotulos, valor in metrica.amostras():
+                linhas.append(f"{metrica.nome}{sufixo}{metrica._formatar_rotulos(rotulos)} {_formatar_numero(valor)}")
+        return "\n".join(linhas) + "\n"
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _formatar_numero(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+# Registro padrão da aplicação
+REGISTRO = RegistroMetricas()
@@ -0,0 +1,120 @@
+"""
+Módulo de normalização dos comandos SQL para o perfil das consultas.
+
+Reúne as funções usadas pelos perfis de consultas das duas pilhas de
+persistência, o da aplicação (SQLAlchemy) e o dos repositórios sqlite3 do
+pacote `sistema_frota`: a impressão digital do comando, a redação dos
+parâmetros e o `EXPLAIN QUERY PLAN` do SQLite. Como os dois perfis usam as
+mesmas funções, as linhas dos logs de consultas lentas de ambos podem ser
+agregadas juntas. O módulo usa apenas a biblioteca padrão.
+"""
+
+import hashlib
+import re
+import sqlite3
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+_COMENTARIOS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_TEXTOS = re.compile(r"'(?:[^']|'')*'")
+_NUMEROS = re.compile(r"\b\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_MARCADORES = re.compile(r"%\(\w+\)s|%s|:\w+|\?\d*")
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_LINHAS_VALUES = re.compile(r"(\(\?\+\))(?:\s*,\s*\(\?\+\))+")
+_ESPACOS = re.compile(r"\s+")
+
+# Comandos aceitos pelo EXPLAIN QUERY PLAN
+_EXPLICAVEIS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH"})
+
+# Normaliza o SQL
+@lru_cache(maxsize=4096)
+def impressao_digital(sql: str) -> Tuple[str, str]:
+    """
+    Normaliza o comando e calcula sua impressão digital.
+
+    Literais, números e marcadores de parâmetro viram `?`, listas de
+    parâmetros viram `(?+)` e as várias linhas de um VALUES viram uma só, de
+    modo que o mesmo comando com valores diferentes produz a mesma impressão.
+
+    Args:
+        sql (str): Comando SQL.
+
+    Returns:
+        Tuple[str, str]: SQL normalizado e identificador de 12 caracteres hexadecimais.
+    """
+    normalizado = _COMENTARIOS.sub(" ", sql)
+    normalizado = _TEXTOS.sub("?", normalizado)
+    normalizado = _MARCADORES.sub("?", normalizado)
+    normalizado = _NUMEROS.sub("?", normalizado)
+    normalizado = _LISTAS.sub("(?+)", normalizado)
+    normalizado = _LINHAS_VALUES.sub(r"\1", normalizado)
+    normalizado = _ESPACOS.sub(" ", normalizado).strip().rstrip(";").strip()
+    return normalizado, hashlib.sha1(normalizado.encode("utf-8")).hexdigest()[:12]
+
+# Redige os parâmetros
+def redigir_parametros(parametros: Any) -> Any:
+    """
+    Substitui os valores de texto e binários por tipo e tamanho.
+
+    Números, booleanos e nulos são mantidos, pois costumam ser
+    identificadores úteis no diagnóstico; textos podem conter dados pessoais
+    (nomes, CNH, e-mails) e nunca vão para o log.
+
+    Args:
+        parametros (Any): Parâmetros de um comando, ou a lista de conjuntos de
+            um executemany.
+
+    Returns:
+        Any: Parâmetros redigidos, na mesma estrutura.
+    """
+    if parametros is None:
+        return None
+    if isinstance(parametros, dict):
+        return {chave: _redigir(valor) for chave, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        if parametros and isinstance(parametros[0], (list, tuple, dict)):
+            return {"conjuntos": len(parametros), "primeiro": redigir_parametros(parametros[0])}
+        return [_redigir(valor) for valor in parametros]
+    return _redigir(parametros)
+
+# Plano de execução no SQLite
+def plano_sqlite(conexao_dbapi: Any, sql: str, parametros: Any) -> Optional[List[str]]:
+    """
+    Obtém o `EXPLAIN QUERY PLAN` do comando na própria conexão DBAPI.
+
+    Em conexões sqlite3, o cursor é criado pela classe base, de modo que uma
+    conexão que mede os próprios comandos não mede também o EXPLAIN.
+
+    Args:
+        conexao_dbapi (Any): Conexão sqlite3.
+        sql (str): Comando executado.
+        parametros (Any): Parâmetros de uma execução do comando.
+
+    Returns:
+        Optional[List[str]]: Linhas do plano, ou None se o comando não puder
+            ser explicado.
+    """
+    partes = sql.lstrip().split(None, 1)
+    if not partes or partes[0].upper() not in _EXPLICAVEIS:
+        return None
+    try:
+        if isinstance(conexao_dbapi, sqlite3.Connection):
+            cursor = sqlite3.Connection.cursor(conexao_dbapi)
+        else:
+            cursor = conexao_dbapi.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parametros if parametros is not None else ())
+            return [str(linha[-1]) for linha in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception:
+        return None
+
+def _redigir(valor: Any) -> Any:
+    if valor is None or isinstance(valor, (bool, int, float)):
+        return valor
+    if isinstance(valor, str):
+        return f"<str:{len(valor)}>"
+    if isinstance(valor, (bytes, bytearray, memoryview)):
+        return f"<bytes:{len(valor)}>"
+    return f"<{type(valor).__name__}>"
@@ -0,0 +1,284 @@
+"""
+Módulo de perfil das consultas SQL.
+
+Agrupa os comandos pela impressão digital, o SQL normalizado sem literais,
+comentários e listas de parâmetros, e acumula chamadas, tempo total e tempo
+máximo de cada grupo. Os comandos acima do limite configurado vão para o log
+de consultas lentas, uma linha JSON por comando, com os parâmetros
+redigidos e o `EXPLAIN QUERY PLAN` do SQLite.
+
+Executado como script, lê um ou mais logs de consultas lentas e mostra as
+impressões digitais que mais consumiram tempo:
+
+    python -m app.infrastructure.observabilidade.perfil_consultas consultas_lentas.log --top 20
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import event
+
+from app.infrastructure.observabilidade.normalizacao_sql import impressao_digital, plano_sqlite, redigir_parametros
+
+# Logger do log de consultas lentas
+LOGGER_CONSULTAS_LENTAS = "app.consultas_lentas"
+
+# Critérios de ordenação das impressões digitais
+ORDENS = ("total", "chamadas", "media", "maximo")
+
+# Perfil alimentado por engine ou classe de engine, em uma lista de um item
+# que os listeners consultam a cada comando
+_PERFIS_ATIVOS: "weakref.WeakKeyDictionary[Any, List[PerfilConsultas]]" = weakref.WeakKeyDictionary()
+
+@dataclass
+class EstatisticaConsulta:
+    """
+    Estatísticas acumuladas de uma impressão digital.
+
+    Attributes:
+        impressao (str): Identificador curto da impressão digital.
+        sql (str): SQL normalizado.
+        chamadas (int): Quantidade de execuções.
+        total_ms (float): Tempo total, em milissegundos.
+        maximo_ms (float): Maior tempo de uma execução, em milissegundos.
+        lentas (int): Execuções acima do limite de consulta lenta.
+    """
+    impressao: str
+    sql: str
+    chamadas: int = 0
+    total_ms: float = 0.0
+    maximo_ms: float = 0.0
+    lentas: int = 0
+
+    @property
+    def media_ms(self) -> float:
+        """Tempo médio por execução, em milissegundos."""
+        return self.total_ms / self.chamadas if self.chamadas else 0.0
+
+class PerfilConsultas:
+    """
+    Acumulador das estatísticas por impressão digital e emissor do log de
+    consultas lentas.
+
+    A quantidade de impressões digitais é limitada por `capacidade`; ao
+    excedê-la, a de menor tempo total é descartada.
+    """
+
+    def __init__(
+        self,
+        limite_lenta_ms: float = 100.0,
+        capacidade: int = 1000,
+        explicar: bool = True,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Inicializa o perfil.
+
+        Args:
+            limite_lenta_ms (float): Duração a partir da qual o comando é
+                registrado no log de consultas lentas.
+            capacidade (int): Quantidade máxima de impressões digitais acumuladas.
+            explicar (bool): Inclui o plano de execução no log de consultas lentas.
+            logger (Optional[logging.Logger]): Destino do log de consultas
+                lentas; por padrão, o logger `app.consultas_lentas`.
+        """
+        self.limite_lenta_ms = limite_lenta_ms
+        self.capacidade = capacidade
+        self.explicar = explicar
+        self.logger = logger or logging.getLogger(LOGGER_CONSULTAS_LENTAS)
+        self._estatisticas: Dict[str, EstatisticaConsulta] = {}
+        self._trava = threading.Lock()
+
+    # Registra a execução de um comando
+    def registrar(
+        self,
+        sql: str,
+        parametros: Any,
+        duracao: float,
+        plano: Optional[Callable[[], Optional[List[str]]]] = None,
+    ) -> None:
+        """
+        Acumula a execução e, se lenta, grava o comando no log.
+
+        Args:
+            sql (str): Comando executado.
+            parametros (Any): Parâmetros do comando.
+            duracao (float): Duração, em segundos.
+            plano (Optional[Callable[[], Optional[List[str]]]]): Função que
+                obtém o plano de execução, chamada apenas para comandos lentos.
+        """
+        normalizado, impressao = impressao_digital(sql)
+        duracao_ms = duracao * 1000
+        lenta = duracao_ms >= self.limite_lenta_ms
+        with self._trava:
+            estatistica = self._estatisticas.get(impressao)
+            if estatistica is None:
+                if len(self._estatisticas) >= self.capacidade:
+                    menor = min(self._estatisticas.values(), key=lambda item: item.total_ms)
+                    del self._estatisticas[menor.impressao]
+                estatistica = self._estatisticas[impressao] = EstatisticaConsulta(impressao, normalizado)
+            estatistica.chamadas += 1
+            estatistica.total_ms += duracao_ms
+            estatistica.lentas += lenta
+            if duracao_ms > estatistica.maximo_ms:
+                estatistica.maximo_ms = duracao_ms
+        if lenta:
+            registro = {
+                "momento": datetime.now(timezone.utc).isoformat(),
+                "impressao": impressao,
+                "sql": normalizado,
+                "duracao_ms": round(duracao_ms, 3),
+                "parametros": redigir_parametros(parametros),
+                "plano": plano() if plano is not None and self.explicar else None,
+            }
+            self.logger.warning(json.dumps(registro, ensure_ascii=False, default=str))
+
+    # Impressões digitais mais custosas
+    def mais_custosas(self, quantidade: int = 10, ordem: str = "total") -> List[EstatisticaConsulta]:
+        """
+        Retorna as impressões digitais mais custosas.
+
+        Args:
+            quantidade (int): Quantidade de impressões digitais.
+            ordem (str): Critério: "total", "chamadas", "media" ou "maximo".
+
+        Returns:
+            List[EstatisticaConsulta]: Cópias das estatísticas, em ordem decrescente.
+
+        Raises:
+            ValueError: Se o critério de ordenação for desconhecido.
+        """
+        with self._trava:
+            estatisticas = [EstatisticaConsulta(**asdict(item)) for item in self._estatisticas.values()]
+        return ordenar(estatisticas, ordem)[:quantidade]
+
+    # Descarta as estatísticas
+    def limpar(self) -> None:
+        """Descarta as estatísticas acumuladas."""
+        with self._trava:
+            self._estatisticas.clear()
+
+# Ativa o perfil dos comandos SQL
+def ativar_perfil_sql(alvo: Any, perfil: PerfilConsultas) -> None:
+    """
+    Registra os listeners que alimentam o perfil com cada comando SQL.
+
+    Ativar novamente o mesmo alvo apenas substitui o perfil alimentado.
+
+    Args:
+        alvo (Any): Engine, ou a classe Engine para perfilar todas as engines.
+        perfil (PerfilConsultas): Perfil alimentado.
+    """
+    ativo = _PERFIS_ATIVOS.get(alvo)
+    if ativo is not None:
+        ativo[0] = perfil
+        return
+    ativo = _PERFIS_ATIVOS[alvo] = [perfil]
+
+    def antes(conexao, cursor, comando, parametros, contexto, executemany) -> None:
+        conexao.info.setdefault("perfil_inicio", []).append(time.perf_counter())
+
+    def depois(conexao, cursor, comando, parametros, contexto, executemany) -> None:
+        duracao = time.perf_counter() - conexao.info["perfil_inicio"].pop()
+        plano = None
+        if conexao.dialect.name == "sqlite":
+            primeiro = parametros[0] if executemany and parametros else parametros
+            plano = lambda: plano_sqlite(cursor.connection, comando, primeiro)
+        ativo[0].registrar(comando, parametros, duracao, plano)
+
+    def erro(contexto_excecao) -> None:
+        conexao = contexto_excecao.connection
+        if conexao is not None and conexao.info.get("perfil_inicio"):
+            conexao.info["perfil_inicio"].pop()
+
+    event.listen(alvo, "before_cursor_execute", antes)
+    event.listen(alvo, "after_cursor_execute", depois)
+    event.listen(alvo, "handle_error", erro)
+
+# Ordena as estatísticas
+def ordenar(estatisticas: Iterable[EstatisticaConsulta], ordem: str = "total") -> List[EstatisticaConsulta]:
+    """
+    Ordena as estatísticas em ordem decrescente pelo critério.
+
+    Args:
+        estatisticas (Iterable[EstatisticaConsulta]): Estatísticas.
+        ordem (str): Critério: "total", "chamadas", "media" ou "maximo".
+
+    Returns:
+        List[EstatisticaConsulta]: Estatísticas ordenadas.
+
+    Raises:
+        ValueError: Se o critério de ordenação for desconhecido.
+    """
+    if ordem not in ORDENS:
+        raise ValueError(f"Ordem desconhecida: {ordem!r}; use {', '.join(ORDENS)}")
+    atributo = {"total": "total_ms", "chamadas": "chamadas", "media": "media_ms", "maximo": "maximo_ms"}[ordem]
+    return sorted(estatisticas, key=lambda item: getattr(item, atributo), reverse=True)
+
+# Agrega logs de consultas lentas
+def agregar_log(linhas: Iterable[str]) -> List[EstatisticaConsulta]:
+    """
+    Agrega as linhas de um log de consultas lentas por impressão digital.
+
+    Linhas sem registro JSON, como as de outros loggers, são ignoradas. O
+    registro pode vir precedido pelo prefixo do formatter do logging.
+
+    Args:
+        linhas (Iterable[str]): Linhas do log.
+
+    Returns:
+        List[EstatisticaConsulta]: Estatísticas das consultas registradas.
+    """
+    estatisticas: Dict[str, EstatisticaConsulta] = {}
+    for linha in linhas:
+        inicio = linha.find("{")
+        if inicio < 0:
+            continue
+        try:
+            registro = json.loads(linha[inicio:])
+            impressao, sql, duracao_ms = registro["impressao"], registro["sql"], float(registro["duracao_ms"])
+        except (ValueError, KeyError, TypeError):
+            continue
+        estatistica = estatisticas.setdefault(impressao, EstatisticaConsulta(impressao, sql))
+        estatistica.chamadas += 1
+        estatistica.lentas += 1
+        estatistica.total_ms += duracao_ms
+        estatistica.maximo_ms = max(estatistica.maximo_ms, duracao_ms)
+    return list(estatisticas.values())
+
+def formatar_tabela(estatisticas: Sequence[EstatisticaConsulta], largura_sql: int = 80) -> str:
+    """Formata as estatísticas como tabela de texto."""
+    linhas = [f"{'impressao':<12} {'chamadas':>8} {'total_ms':>11} {'media_ms':>9} {'max_ms':>9}  sql"]
+    for item in estatisticas:
+        sql = item.sql if len(item.sql) <= largura_sql else item.sql[: largura_sql - 3] + "..."
+        linhas.append(
+            f"{item.impressao:<12} {item.chamadas:>8} {item.total_ms:>11.1f} "
+            f"{item.media_ms:>9.2f} {item.maximo_ms:>9.2f}  {sql}"
+        )
+    return "\n".join(linhas)
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Lê os logs de consultas lentas e imprime as impressões digitais mais custosas."""
+    parser = argparse.ArgumentParser(description="Impressões digitais mais custosas do log de consultas lentas.")
+    parser.add_argument("arquivos", nargs="+", help="Arquivos do log de consultas lentas")
+    parser.add_argument("--top", type=int, default=10, help="Quantidade de impressões digitais")
+    parser.add_argument("--ordem", choices=ORDENS, default="total", help="Critério de ordenação")
+    parser.add_argument("--largura-sql", type=int, default=80, help="Largura máxima do SQL exibido")
+    args = parser.parse_args(argv)
+
+    linhas: List[str] = []
+    for caminho in args.arquivos:
+        with open(caminho, encoding="utf-8") as arquivo:
+            linhas.extend(arquivo)
+    estatisticas = ordenar(agregar_log(linhas), args.ordem)[: args.top]
+    print(formatar_tabela(estatisticas, args.largura_sql))
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime, 
-    ForeignKey, Float, Date, Enum, Text, JSON
+    ForeignKey, Float, Date, Enum, Text, JSON, Index,
+    BigInteger, LargeBinary
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -82,7 +83,7 @@ class Motorista(Base):
     cpf = Column(String(11), unique=True, nullable=False, index=True)
     cnh_numero = Column(String(20), unique=True, nullable=False)
     cnh_categoria = Column(Enum(TipoCNH), nullable=False)
-    cnh_validade = Column(Date, nullable=False)
+    cnh_validade = Column(Date, nullable=False, index=True)
     cnh_emissao = Column(Date, nullable=False)
     telefone = Column(String(20))
     email = Column(String(100))
@@ -126,9 +127,11 @@ class Veiculo(Base):
     valor_aquisicao = Column(Float)
     seguradora = Column(String(100))
     apolice_seguro = Column(String(50))
-    vencimento_seguro = Column(Date)
+    vencimento_seguro = Column(Date, index=True)
     
     # Campos de controle
+    versao = Column(Integer, nullable=False, default=1)  # controle de concorrência otimista
+    vetor_versao = Column(String(255))  # vetor de versão da sincronização (ator=contador,...)
     criado_por = Column(Integer, ForeignKey("usuarios.id"))
     data_criacao = Column(DateTime(timezone=True), server_default=func.now())
     data_atualizacao = Column(DateTime(timezone=True), onupdate=func.now())
@@ -139,6 +142,8 @@ class Veiculo(Base):
     manutencoes = relationship("Manutencao", back_populates="veiculo", cascade="all, delete-orphan")
     documentos = relationship("DocumentoVeiculo", back_populates="veiculo", cascade="all, delete-orphan")
 
+    __mapper_args__ = {"version_id_col": versao}
+
 class Cliente(Base):
     """Modelo de clientes/transportadoras"""
     __tablename__ = "clientes"
@@ -188,6 +193,10 @@ class Viagem(Base):
     km_inicial = Column(Float)
     km_final = Column(Float)
     km_total = Column(Float)
+    km_rastreado = Column(Float)  # distância percorrida pela trilha de GPS
+    km_divergencia = Column(Float)  # % do hodômetro (km_total) em relação à trilha
+    km_divergente = Column(Boolean)  # divergência acima da tolerância
+    tempo_parado_minutos = Column(Float)  # paradas detectadas na trilha
     
     # Consumo
     combustivel_inicial = Column(Float)  # litros
@@ -213,6 +222,8 @@ class Viagem(Base):
     motivo_cancelamento = Column(Text)
     
     # Campos de controle
+    versao = Column(Integer, nullable=False, default=1)  # controle de concorrência otimista
+    vetor_versao = Column(String(255))  # vetor de versão da sincronização (ator=contador,...)
     criado_por = Column(Integer, ForeignKey("usuarios.id"))
     data_criacao = Column(DateTime(timezone=True), server_default=func.now())
     data_atualizacao = Column(DateTime(timezone=True), onupdate=func.now())
@@ -223,6 +234,11 @@ class Viagem(Base):
     cliente = relationship("Cliente", back_populates="viagens")
     criador = relationship("Usuario", back_populates="criador_viagens")
 
+    __table_args__ = (
+        Index("ix_viagens_cliente_saida", "cliente_id", "data_saida_prevista"),
+    )
+    __mapper_args__ = {"version_id_col": versao}
+
 # ================ MODELOS DE SUPORTE ================
 class Manutencao(Base):
     """Modelo de manutenções dos veículos"""
@@ -270,7 +286,7 @@ class DocumentoMotorista(Base):
     numero = Column(String(50))
     orgao_emissor = Column(String(50))
     data_emissao = Column(Date)
-    data_validade = Column(Date)
+    data_validade = Column(Date, index=True)
     
     # Arquivo digital
     arquivo_nome = Column(String(255))
@@ -295,7 +311,7 @@ class DocumentoVeiculo(Base):
     numero = Column(String(50))
     orgao_emissor = Column(String(50))
     data_emissao = Column(Date)
-    data_validade = Column(Date)
+    data_validade = Column(Date, index=True)
     
     # Valores
     valor = Column(Float)
@@ -336,21 +352,121 @@ class Abastecimento(Base):
     nota_fiscal = Column(String(50))
     
     observacoes = Column(Text)
+    anomalias = Column(String(120))  # códigos de anomalia separados por vírgula
     data_criacao = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relacionamentos
     veiculo = relationship("Veiculo")
     motorista = relationship("Motorista")
 
+    __table_args__ = (
+        Index("ix_abastecimentos_veiculo_data", "veiculo_id", "data"),
+    )
+
 class ConfiguracaoSistema(Base):
     """Configurações do sistema"""
     __tablename__ = "configuracoes_sistema"
     
     id = Column(Integer, primary_key=True, index=True)
-    chave = Column(String(50), unique=True, nullable=False, index=True)
+    tenant_id = Column(String(50), nullable=False, default="padrao", server_default="padrao")
+    chave = Column(String(50), nullable=False, index=True)
     valor = Column(Text)
-    tipo = Column(String(20))  # string, integer, float, boolean, json
+    tipo = Column(String(20))  # string, integer, float, boolean, json, date
     descricao = Column(Text)
     categoria = Column(String(50))
     data_criacao = Column(DateTime(timezone=True), server_default=func.now())
     data_atualizacao = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ux_configuracoes_sistema_tenant_chave", "tenant_id", "chave", unique=True),
+    )
+
+# ================ MODELOS DE RELATÓRIO ================
+class ResumoCustoMensal(Base):
+    """Custos mensais consolidados das viagens concluídas, por veículo, motorista ou cliente"""
+    __tablename__ = "resumos_custo_mensal"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    dimensao = Column(String(20), nullable=False)  # veiculo, motorista, cliente
+    entidade_id = Column(Integer, nullable=False)
+    mes = Column(Date, nullable=False)  # primeiro dia do mês de conclusão
+    
+    quantidade_viagens = Column(Integer, nullable=False, default=0)
+    km_total = Column(Float, nullable=False, default=0.0)
+    custo_combustivel = Column(Float, nullable=False, default=0.0)
+    pedagio = Column(Float, nullable=False, default=0.0)
+    alimentacao = Column(Float, nullable=False, default=0.0)
+    hospedagem = Column(Float, nullable=False, default=0.0)
+    outros_custos = Column(Float, nullable=False, default=0.0)
+    custo_total = Column(Float, nullable=False, default=0.0)
+    valor_frete = Column(Float, nullable=False, default=0.0)
+    
+    __table_args__ = (
+        Index("ux_resumos_custo_mensal_chave", "dimensao", "mes", "entidade_id", unique=True),
+    )
+
+# ================ MODELOS DE INFRAESTRUTURA ================
+class BlocoPosicoes(Base):
+    """Bloco de posições de GPS de uma viagem, com instantes e coordenadas codificados por diferença"""
+    __tablename__ = "blocos_posicoes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    viagem_id = Column(Integer, ForeignKey("viagens.id"), nullable=False)
+    instante_inicial = Column(BigInteger, nullable=False)  # epoch em milissegundos
+    instante_final = Column(BigInteger, nullable=False)
+    quantidade = Column(Integer, nullable=False)
+    dados = Column(LargeBinary, nullable=False)  # colunas de diferenças int32 comprimidas com zlib
+    
+    __table_args__ = (
+        Index("ix_blocos_posicoes_viagem_instante", "viagem_id", "instante_inicial"),
+    )
+
+class OutboxEvento(Base):
+    """Eventos de domínio pendentes de publicação (transactional outbox)"""
+    __tablename__ = "outbox_eventos"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    chave_idempotencia = Column(String(36), unique=True, nullable=False)
+    tipo_evento = Column(String(100), nullable=False)
+    agregado_id = Column(String(50), index=True)
+    payload = Column(Text, nullable=False)  # JSON
+    tentativas = Column(Integer, default=0)
+    data_criacao = Column(DateTime(timezone=True), server_default=func.now())
+
+class RegistroAlteracao(Base):
+    """Log de alterações das tabelas sincronizadas com os dispositivos de campo"""
+    __tablename__ = "registro_alteracoes"
+    
+    seq = Column(Integer, primary_key=True, autoincrement=True)  # número de sequência da alteração
+    tabela = Column(String(50), nullable=False)
+    registro_id = Column(Integer, nullable=False)
+    operacao = Column(String(10), nullable=False)  # upsert, delete
+    campos = Column(Text)  # colunas alteradas separadas por vírgula (vazio = todas)
+    valores_anteriores = Column(Text)  # JSON com os valores das colunas antes da alteração
+    data = Column(DateTime(timezone=True), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_registro_alteracoes_tabela_registro", "tabela", "registro_id", "seq"),
+    )
+
+class DispositivoSincronizacao(Base):
+    """Estado de sincronização de cada dispositivo de campo"""
+    __tablename__ = "dispositivos_sincronizacao"
+    
+    dispositivo_id = Column(String(64), primary_key=True)
+    ultimo_token = Column(String(32))
+    status = Column(String(20), default="pendente")  # pendente, sincronizado, conflito, erro
+    ultima_sincronizacao = Column(DateTime(timezone=True))
+    data_criacao = Column(DateTime(timezone=True), server_default=func.now())
+
+class LeaseTarefa(Base):
+    """Lease e próxima execução de cada tarefa agendada, compartilhados entre instâncias"""
+    __tablename__ = "leases_tarefas"
+    
+    nome = Column(String(100), primary_key=True)
+    dono = Column(String(100))  # instância que detém o lease
+    expira_em = Column(DateTime)
+    proxima_execucao = Column(DateTime, nullable=False)
+    ultima_execucao = Column(DateTime)
+    ultimo_status = Column(String(20))  # sucesso, falha
+    ultima_duracao = Column(Float)  # segundos
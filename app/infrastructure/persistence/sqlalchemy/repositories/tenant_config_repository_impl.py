@@ -0,0 +1,82 @@
+"""
+Módulo de implementação SQLAlchemy do repositório de configurações por tenant.
+
+Lê e grava as configurações em `configuracoes_sistema`, convertendo o texto de
+`valor` para o tipo declarado uma única vez, na leitura.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domain.entities.tenant_config import TenantConfig, converter_valor
+from app.domain.repositories.tenant_config_repository import TenantConfigRepository
+from app.infrastructure.persistence.sqlalchemy.models import ConfiguracaoSistema
+
+class TenantConfigRepositoryImpl(TenantConfigRepository):
+    """
+    Repositório de configurações de tenant sobre `configuracoes_sistema`.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """
+        Inicializa o repositório.
+
+        Args:
+            session (Session): Sessão da unidade de trabalho.
+        """
+        self.session = session
+
+    # Lista as configurações do tenant
+    def listar(self, tenant_id: str) -> List[TenantConfig]:
+        linhas = self.session.execute(
+            select(
+                ConfiguracaoSistema.chave,
+                ConfiguracaoSistema.valor,
+                ConfiguracaoSistema.tipo,
+                ConfiguracaoSistema.descricao,
+                ConfiguracaoSistema.categoria,
+            ).where(ConfiguracaoSistema.tenant_id == tenant_id)
+        ).all()
+        return [
+            TenantConfig(tenant_id, chave, converter_valor(valor, tipo), tipo or "string", descricao, categoria)
+            for chave, valor, tipo, descricao, categoria in linhas
+        ]
+
+    # Obtém uma configuração do tenant
+    def obter(self, tenant_id: str, chave: str) -> Optional[TenantConfig]:
+        modelo = self._modelo(tenant_id, chave)
+        return _para_entidade(modelo) if modelo is not None else None
+
+    # Grava uma configuração do tenant
+    def salvar(self, configuracao: TenantConfig) -> TenantConfig:
+        modelo = self._modelo(configuracao.tenant_id, configuracao.chave)
+        if modelo is None:
+            modelo = ConfiguracaoSistema(tenant_id=configuracao.tenant_id, chave=configuracao.chave)
+            self.session.add(modelo)
+        modelo.valor = configuracao.valor_texto()
+        modelo.tipo = configuracao.tipo
+        modelo.descricao = configuracao.descricao
+        modelo.categoria = configuracao.categoria
+        self.session.flush()
+        return configuracao
+
+    def _modelo(self, tenant_id: str, chave: str) -> Optional[ConfiguracaoSistema]:
+        return self.session.execute(
+            select(ConfiguracaoSistema).where(
+                ConfiguracaoSistema.tenant_id == tenant_id,
+                ConfiguracaoSistema.chave == chave,
+            )
+        ).scalar()
+
+def _para_entidade(modelo: ConfiguracaoSistema) -> TenantConfig:
+    """Converte o modelo na entidade, interpretando o valor pelo tipo."""
+    return TenantConfig(
+        tenant_id=modelo.tenant_id,
+        chave=modelo.chave,
+        valor=converter_valor(modelo.valor, modelo.tipo),
+        tipo=modelo.tipo or "string",
+        descricao=modelo.descricao,
+        categoria=modelo.categoria,
+    )
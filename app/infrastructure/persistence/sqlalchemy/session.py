@@ -0,0 +1,36 @@
+"""
+Módulo de sessões do SQLAlchemy.
+
+Reexporta a fábrica de sessões da aplicação e concentra a tradução das falhas
+de concorrência otimista do SQLAlchemy para a exceção de domínio.
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.domain.events import ConcurrencyConflict
+from app.infrastructure.persistence.sqlalchemy.database import SessionLocal
+
+__all__ = ["SessionLocal", "confirmar"]
+
+# Confirma a transação detectando atualizações perdidas
+def confirmar(session: Session) -> None:
+    """
+    Confirma a transação da sessão.
+
+    Os modelos com `version_id_col` incluem a versão lida no WHERE do UPDATE;
+    se outra transação gravou o registro antes, nenhuma linha é afetada e o
+    SQLAlchemy levanta StaleDataError. A transação é desfeita e a falha é
+    repassada como ConcurrencyConflict.
+
+    Args:
+        session (Session): Sessão com as alterações pendentes.
+
+    Raises:
+        ConcurrencyConflict: Se algum registro foi alterado por outra transação.
+    """
+    try:
+        session.commit()
+    except StaleDataError as erro:
+        session.rollback()
+        raise ConcurrencyConflict("Registro alterado por outra transação") from erro
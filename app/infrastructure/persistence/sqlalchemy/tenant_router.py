@@ -0,0 +1,287 @@
+"""
+Módulo de roteamento de dados por tenant.
+
+Cada tenant tem o próprio arquivo SQLite, de modo que o bloqueio de escrita
+do SQLite, único por arquivo, não se estende aos demais tenants. Só os tenants
+registrados no roteador são atendidos. O roteador cria a engine do tenant no
+primeiro acesso, aplica as migrações pendentes no arquivo e mantém abertas
+apenas as engines usadas mais recentemente; as demais são descartadas e
+reabertas sob demanda.
+
+O tenant padrão continua usando a engine principal da aplicação.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.domain.entities.tenant_config import TENANT_PADRAO
+from app.infrastructure.persistence.sqlalchemy.database import SessionLocal
+from app.infrastructure.persistence.sqlalchemy.models import Base, BlocoPosicoes
+
+# Identificadores usados como nome de arquivo: sem separadores de caminho
+_TENANT_VALIDO = re.compile(r"^[A-Za-z0-9_-]{1,50}$")
+
+# Chave, em Session.info, do tenant das sessões abertas pelo roteador
+CHAVE_TENANT = "tenant_id"
+
+class TenantDesconhecido(LookupError):
+    """Exceção lançada para um tenant que não está registrado no roteador."""
+
+class Migracao(NamedTuple):
+    """Migração de esquema aplicada a cada banco de tenant."""
+
+    versao: int
+    descricao: str
+    aplicar: Callable[[Connection], None]
+
+# Migrações dos bancos de tenant, em ordem crescente de versão. A versão
+# aplicada fica registrada no cabeçalho do arquivo (PRAGMA user_version).
+MIGRACOES: List[Migracao] = [
+    Migracao(1, "esquema inicial", lambda conexao: Base.metadata.create_all(conexao)),
+    Migracao(2, "posições de GPS das viagens", lambda conexao: _migrar_posicoes(conexao)),
+    Migracao(3, "validação da quilometragem pela trilha", lambda conexao: _adicionar_colunas(
+        conexao, "viagens", ("km_divergencia", "km_divergente", "tempo_parado_minutos")
+    )),
+]
+
+def _adicionar_colunas(conexao: Connection, tabela: str, nomes: Sequence[str]) -> None:
+    # Bancos criados na versão 1 já com o esquema atual têm as colunas
+    existentes = {coluna["name"] for coluna in inspect(conexao).get_columns(tabela)}
+    for nome in nomes:
+        if nome not in existentes:
+            tipo = Base.metadata.tables[tabela].c[nome].type.compile(dialect=conexao.dialect)
+            conexao.exec_driver_sql(f"ALTER TABLE {tabela} ADD COLUMN {nome} {tipo}")
+
+def _migrar_posicoes(conexao: Connection) -> None:
+    _adicionar_colunas(conexao, "viagens", ("km_rastreado",))
+    BlocoPosicoes.__table__.create(conexao, checkfirst=True)
+    for indice in BlocoPosicoes.__table__.indexes:
+        indice.create(conexao, checkfirst=True)
+
+class EstatisticasRoteador(NamedTuple):
+    """Contadores do roteador de tenants."""
+
+    abertas: int
+    aberturas: int
+    descartes: int
+    migracoes: int
+
+class RoteadorTenants:
+    """
+    Roteador que associa cada tenant a um arquivo SQLite e a uma engine.
+
+    As engines abertas ficam em um LRU limitado por `capacidade`. A criação
+    e a migração de um tenant são serializadas por uma trava do próprio
+    tenant, sem bloquear o acesso aos tenants já abertos.
+    """
+
+    def __init__(
+        self,
+        diretorio: str,
+        capacidade: int = 32,
+        migracoes: Optional[Sequence[Migracao]] = None,
+        fabrica_sessao: sessionmaker = SessionLocal,
+        engine_padrao: Optional[Engine] = None,
+        tenants: Iterable[str] = (),
+    ) -> None:
+        """
+        Inicializa o roteador.
+
+        Args:
+            diretorio (str): Diretório dos arquivos dos tenants.
+            capacidade (int): Quantidade máxima de engines abertas.
+            migracoes (Optional[Sequence[Migracao]]): Migrações dos bancos de
+                tenant; por padrão, `MIGRACOES`.
+            fabrica_sessao (sessionmaker): Fábrica de sessões, da qual as
+                sessões dos tenants herdam configuração e eventos.
+            engine_padrao (Optional[Engine]): Engine do tenant padrão; por
+                padrão, a da fábrica de sessões.
+            tenants (Iterable[str]): Tenants atendidos, além do padrão.
+
+        Raises:
+            ValueError: Se a capacidade não for positiva, as versões das
+                migrações não forem crescentes ou algum tenant for inválido.
+        """
+        if capacidade < 1:
+            raise ValueError("A capacidade do roteador deve ser positiva")
+        self.migracoes = list(MIGRACOES if migracoes is None else migracoes)
+        versoes = [migracao.versao for migracao in self.migracoes]
+        if versoes != sorted(set(versoes)) or (versoes and versoes[0] < 1):
+            raise ValueError("As versões das migrações devem ser positivas e crescentes")
+        self.diretorio = diretorio
+        self.capacidade = capacidade
+        self.fabrica_sessao = fabrica_sessao
+        self.engine_padrao = engine_padrao or fabrica_sessao.kw.get("bind")
+        os.makedirs(diretorio, exist_ok=True)
+        self._engines: "OrderedDict[str, Engine]" = OrderedDict()
+        self._trava = threading.Lock()
+        self._travas_tenant: Dict[str, threading.Lock] = {}
+        self._registrados: Set[str] = set()
+        self._aberturas = 0
+        self._descartes = 0
+        self._migracoes = 0
+        for tenant_id in tenants:
+            self.registrar(tenant_id)
+
+    # Registra um tenant
+    def registrar(self, tenant_id: str) -> None:
+        """
+        Passa a atender o tenant; o banco é criado no primeiro acesso.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+
+        Raises:
+            ValueError: Se o identificador do tenant for inválido.
+        """
+        if not _TENANT_VALIDO.match(tenant_id):
+            raise ValueError(f"Identificador de tenant inválido: {tenant_id!r}")
+        with self._trava:
+            self._registrados.add(tenant_id)
+
+    def registrado(self, tenant_id: str) -> bool:
+        """Indica se o tenant é o padrão ou está registrado no roteador."""
+        if tenant_id == TENANT_PADRAO and self.engine_padrao is not None:
+            return True
+        with self._trava:
+            return tenant_id in self._registrados
+
+    # Engine do tenant
+    def engine(self, tenant_id: str) -> Engine:
+        """
+        Obtém a engine do tenant, criando e migrando o banco se necessário.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+
+        Returns:
+            Engine: Engine do banco do tenant.
+
+        Raises:
+            TenantDesconhecido: Se o tenant não estiver registrado.
+        """
+        if tenant_id == TENANT_PADRAO and self.engine_padrao is not None:
+            return self.engine_padrao
+        with self._trava:
+            engine = self._engines.get(tenant_id)
+            if engine is not None:
+                self._engines.move_to_end(tenant_id)
+                return engine
+            if tenant_id not in self._registrados:
+                raise TenantDesconhecido(f"Tenant desconhecido: {tenant_id!r}")
+            trava_tenant = self._travas_tenant.setdefault(tenant_id, threading.Lock())
+        with trava_tenant:
+            # Outra thread pode ter aberto o tenant enquanto esta aguardava
+            with self._trava:
+                engine = self._engines.get(tenant_id)
+            if engine is None:
+                engine = self._abrir(tenant_id)
+            with self._trava:
+                self._engines[tenant_id] = engine
+                self._engines.move_to_end(tenant_id)
+                descartadas = []
+                while len(self._engines) > self.capacidade:
+                    antigo_id, antiga = self._engines.popitem(last=False)
+                    self._descartar_trava(antigo_id)
+                    descartadas.append(antiga)
+                self._descartes += len(descartadas)
+        # As conexões em uso continuam válidas; o pool é fechado ao devolvê-las
+        for antiga in descartadas:
+            antiga.dispose()
+        return engine
+
+    # Sessão do tenant
+    def sessao(self, tenant_id: str) -> Session:
+        """
+        Abre uma sessão no banco do tenant.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+
+        Returns:
+            Session: Sessão criada pela fábrica da aplicação, ligada ao banco
+                do tenant, com o tenant em `Session.info[CHAVE_TENANT]`.
+
+        Raises:
+            TenantDesconhecido: Se o tenant não estiver registrado.
+        """
+        return self.fabrica_sessao(bind=self.engine(tenant_id), info={CHAVE_TENANT: tenant_id})
+
+    # Caminho do arquivo do tenant
+    def caminho(self, tenant_id: str) -> str:
+        """
+        Retorna o caminho do arquivo SQLite do tenant.
+
+        Args:
+            tenant_id (str): Identificador do tenant.
+
+        Returns:
+            str: Caminho do arquivo.
+        """
+        return os.path.join(self.diretorio, f"{tenant_id}.db")
+
+    # Contadores do roteador
+    def estatisticas(self) -> EstatisticasRoteador:
+        """
+        Retorna os contadores de engines abertas, aberturas, descartes e migrações.
+
+        Returns:
+            EstatisticasRoteador: Contadores acumulados desde a criação.
+        """
+        with self._trava:
+            return EstatisticasRoteador(len(self._engines), self._aberturas, self._descartes, self._migracoes)
+
+    # Fecha todas as engines
+    def encerrar(self) -> None:
+        """Descarta todas as engines de tenant abertas."""
+        with self._trava:
+            engines = list(self._engines.values())
+            for tenant_id in self._engines:
+                self._descartar_trava(tenant_id)
+            self._engines.clear()
+        for engine in engines:
+            engine.dispose()
+
+    def _descartar_trava(self, tenant_id: str) -> None:
+        """Remove a trava de abertura do tenant descartado, se nenhuma thread a estiver usando."""
+        trava_tenant = self._travas_tenant.get(tenant_id)
+        if trava_tenant is not None and not trava_tenant.locked():
+            del self._travas_tenant[tenant_id]
+
+    def _abrir(self, tenant_id: str) -> Engine:
+        """Cria a engine do tenant e aplica as migrações pendentes."""
+        engine = create_engine(
+            f"sqlite:///{self.caminho(tenant_id)}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        event.listen(engine, "connect", _configurar_conexao)
+        aplicadas = self._migrar(engine)
+        with self._trava:
+            self._aberturas += 1
+            self._migracoes += aplicadas
+        return engine
+
+    def _migrar(self, engine: Engine) -> int:
+        """Aplica, em uma transação, as migrações posteriores à versão do arquivo."""
+        with engine.begin() as conexao:
+            versao = conexao.exec_driver_sql("PRAGMA user_version").scalar()
+            pendentes = [migracao for migracao in self.migracoes if migracao.versao > versao]
+            for migracao in pendentes:
+                migracao.aplicar(conexao)
+            if pendentes:
+                conexao.exec_driver_sql(f"PRAGMA user_version = {int(pendentes[-1].versao)}")
+        return len(pendentes)
+
+def _configurar_conexao(conexao_dbapi, _registro) -> None:
+    """Ativa o WAL em cada conexão do tenant, para que leituras não esperem a escrita."""
+    cursor = conexao_dbapi.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
@@ -0,0 +1,360 @@
+"""
+Módulo de escritores de relatórios em fluxo.
+
+Define o modelo de relatório (título e colunas com o formato de cada valor)
+e os escritores CSV, XLSX e PDF, que recebem as linhas uma a uma e as gravam
+diretamente no arquivo de destino. Nenhum escritor acumula as linhas: o XLSX
+grava a planilha dentro do zip à medida que as linhas chegam e o PDF guarda
+apenas a página corrente, de modo que a memória não depende do tamanho do
+relatório. Todos usam apenas a biblioteca padrão.
+"""
+
+import csv
+import enum
+import io
+import math
+import zipfile
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+FORMATOS = ("csv", "xlsx", "pdf")
+
+@dataclass(frozen=True)
+class ColunaRelatorio:
+    """
+    Coluna de um relatório.
+
+    Attributes:
+        titulo (str): Título exibido no cabeçalho.
+        campo (str): Chave do valor na linha.
+        formato (str): Modelo de formatação do valor em texto (str.format).
+        largura (int): Largura da coluna, em caracteres.
+    """
+    titulo: str
+    campo: str
+    formato: str = "{}"
+    largura: int = 12
+
+    def formatar(self, valor: Any) -> str:
+        """Converte o valor em texto pelo formato da coluna."""
+        if valor is None:
+            return ""
+        if isinstance(valor, enum.Enum):
+            valor = valor.value
+        return self.formato.format(valor)
+
+@dataclass(frozen=True)
+class ModeloRelatorio:
+    """
+    Modelo de um relatório: título e colunas.
+
+    Attributes:
+        titulo (str): Modelo do título (str.format), preenchido com o
+            contexto da geração.
+        colunas (Tuple[ColunaRelatorio, ...]): Colunas, na ordem de exibição.
+    """
+    titulo: str
+    colunas: Tuple[ColunaRelatorio, ...]
+
+    def renderizar_titulo(self, contexto: Mapping[str, Any]) -> str:
+        """Preenche o título com o contexto."""
+        return self.titulo.format(**contexto)
+
+class EscritorRelatorio:
+    """
+    Base dos escritores: recebe as linhas uma a uma e as grava no arquivo.
+    """
+    extensao = ""
+    tipo_midia = "application/octet-stream"
+
+    def __init__(self, arquivo: BinaryIO, modelo: ModeloRelatorio, contexto: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Inicializa o escritor.
+
+        Args:
+            arquivo (BinaryIO): Arquivo binário de destino, aberto para escrita.
+            modelo (ModeloRelatorio): Modelo do relatório.
+            contexto (Optional[Mapping[str, Any]]): Valores do título.
+        """
+        self.arquivo = arquivo
+        self.modelo = modelo
+        self.titulo = modelo.renderizar_titulo(contexto or {})
+        self.linhas = 0
+
+    # Inicia o arquivo
+    def iniciar(self) -> None:
+        """Grava o início do arquivo (título e cabeçalho)."""
+
+    # Grava uma linha
+    def escrever(self, linha: Mapping[str, Any]) -> None:
+        """
+        Grava uma linha do relatório.
+
+        Args:
+            linha (Mapping[str, Any]): Valores da linha, pelo campo de cada coluna.
+        """
+        raise NotImplementedError
+
+    # Finaliza o arquivo
+    def finalizar(self) -> None:
+        """Grava o fim do arquivo. O arquivo de destino não é fechado."""
+
+class EscritorCSV(EscritorRelatorio):
+    """
+    Escritor CSV, com os valores no formato de cada coluna.
+    """
+    extensao = "csv"
+    tipo_midia = "text/csv"
+
+    def iniciar(self) -> None:
+        self._texto = io.TextIOWrapper(self.arquivo, encoding="utf-8-sig", newline="", write_through=True)
+        self._csv = csv.writer(self._texto)
+        self._csv.writerow([coluna.titulo for coluna in self.modelo.colunas])
+
+    def escrever(self, linha: Mapping[str, Any]) -> None:
+        self._csv.writerow([coluna.formatar(linha[coluna.campo]) for coluna in self.modelo.colunas])
+        self.linhas += 1
+
+    def finalizar(self) -> None:
+        self._texto.flush()
+        # Desacopla o wrapper para que o arquivo de destino continue aberto
+        self._texto.detach()
+
+class EscritorXLSX(EscritorRelatorio):
+    """
+    Escritor XLSX (SpreadsheetML) gravado em fluxo dentro do zip.
+
+    Números são gravados como valores numéricos; os demais valores, como
+    texto no formato da coluna.
+    """
+    extensao = "xlsx"
+    tipo_midia = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+    def iniciar(self) -> None:
+        self._zip = zipfile.ZipFile(self.arquivo, "w", zipfile.ZIP_DEFLATED)
+        for nome, conteudo in _PARTES_XLSX.items():
+            self._zip.writestr(nome, conteudo)
+        self._planilha = self._zip.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        larguras = "".join(
+            f'<col min="{i}" max="{i}" width="{coluna.largura + 2}" customWidth="1"/>'
+            for i, coluna in enumerate(self.modelo.colunas, start=1)
+        )
+        self._gravar(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            f"<cols>{larguras}</cols><sheetData>"
+        )
+        self._proxima_linha = 1
+        self._gravar_linha([self.titulo], estilo=1)
+        self._gravar_linha([coluna.titulo for coluna in self.modelo.colunas], estilo=1)
+
+    def escrever(self, linha: Mapping[str, Any]) -> None:
+        valores = []
+        for coluna in self.modelo.colunas:
+            valor = linha[coluna.campo]
+            numerico = isinstance(valor, (int, float)) and not isinstance(valor, bool) and math.isfinite(valor)
+            valores.append(valor if numerico else coluna.formatar(valor))
+        self._gravar_linha(valores)
+        self.linhas += 1
+
+    def finalizar(self) -> None:
+        self._gravar("</sheetData></worksheet>")
+        self._planilha.close()
+        self._zip.close()
+
+    def _gravar_linha(self, valores: Sequence[Any], estilo: int = 0) -> None:
+        """Grava uma linha da planilha."""
+        numero = self._proxima_linha
+        self._proxima_linha += 1
+        atributo_estilo = f' s="{estilo}"' if estilo else ""
+        celulas = []
+        for valor in valores:
+            if isinstance(valor, str):
+                celulas.append(f'<c t="inlineStr"{atributo_estilo}><is><t>{escape(valor)}</t></is></c>')
+            else:
+                celulas.append(f"<c{atributo_estilo}><v>{valor!r}</v></c>")
+        self._gravar(f'<row r="{numero}">{"".join(celulas)}</row>')
+
+    def _gravar(self, texto: str) -> None:
+        self._planilha.write(texto.encode("utf-8"))
+
+class EscritorPDF(EscritorRelatorio):
+    """
+    Escritor PDF em texto monoespaçado (Courier), paisagem A4.
+
+    Cada página é gravada assim que fica cheia; do documento restam em
+    memória apenas as posições dos objetos gravados, exigidas pela tabela
+    de referências cruzadas do PDF.
+    """
+    extensao = "pdf"
+    tipo_midia = "application/pdf"
+
+    LARGURA_PAGINA = 842
+    ALTURA_PAGINA = 595
+    MARGEM = 36
+    TAMANHO_FONTE = 7
+    ALTURA_LINHA = 9
+
+    def iniciar(self) -> None:
+        self._posicao = 0
+        self._deslocamentos: Dict[int, int] = {}
+        self._paginas: List[int] = []
+        self._proximo_objeto = 4  # 1: catálogo, 2: árvore de páginas, 3: fonte
+        self._corrente: List[str] = []
+        linhas_uteis = (self.ALTURA_PAGINA - 2 * self.MARGEM) // self.ALTURA_LINHA
+        self._linhas_por_pagina = linhas_uteis - 5  # título, cabeçalho, separador e rodapé
+        self._cabecalho = " ".join(coluna.titulo[:coluna.largura].ljust(coluna.largura) for coluna in self.modelo.colunas)
+
+        self._gravar(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._gravar_objeto(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+
+    def escrever(self, linha: Mapping[str, Any]) -> None:
+        textos = []
+        for coluna in self.modelo.colunas:
+            texto = coluna.formatar(linha[coluna.campo])[:coluna.largura]
+            numerico = isinstance(linha[coluna.campo], (int, float))
+            textos.append(texto.rjust(coluna.largura) if numerico else texto.ljust(coluna.largura))
+        self._corrente.append(" ".join(textos))
+        self.linhas += 1
+        if len(self._corrente) >= self._linhas_por_pagina:
+            self._gravar_pagina()
+
+    def finalizar(self) -> None:
+        if self._corrente or not self._paginas:
+            self._gravar_pagina()
+        filhos = " ".join(f"{numero} 0 R" for numero in self._paginas)
+        self._gravar_objeto(2, f"<< /Type /Pages /Kids [{filhos}] /Count {len(self._paginas)} >>".encode("ascii"))
+        self._gravar_objeto(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+        inicio_xref = self._posicao
+        total = self._proximo_objeto
+        partes = [f"xref\n0 {total}\n0000000000 65535 f \n"]
+        partes.extend(f"{self._deslocamentos[numero]:010d} 00000 n \n" for numero in range(1, total))
+        partes.append(f"trailer\n<< /Size {total} /Root 1 0 R >>\nstartxref\n{inicio_xref}\n%%EOF\n")
+        self._gravar("".join(partes).encode("ascii"))
+
+    def _gravar_pagina(self) -> None:
+        """Grava a página corrente e libera suas linhas."""
+        numero_pagina = len(self._paginas) + 1
+        linhas = [self.titulo, self._cabecalho, "-" * len(self._cabecalho), *self._corrente, "", f"Página {numero_pagina}"]
+        comandos = [f"BT /F1 {self.TAMANHO_FONTE} Tf {self.ALTURA_LINHA} TL {self.MARGEM} {self.ALTURA_PAGINA - self.MARGEM} Td"]
+        comandos.extend(f"({_texto_pdf(texto)}) '" for texto in linhas)
+        comandos.append("ET")
+        conteudo = "\n".join(comandos).encode("cp1252", errors="replace")
+
+        objeto_conteudo = self._novo_objeto()
+        self._gravar_objeto(
+            objeto_conteudo,
+            b"<< /Length %d >>\nstream\n" % len(conteudo) + conteudo + b"\nendstream",
+        )
+        objeto_pagina = self._novo_objeto()
+        self._gravar_objeto(objeto_pagina, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.LARGURA_PAGINA} {self.ALTURA_PAGINA}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {objeto_conteudo} 0 R >>"
+        ).encode("ascii"))
+        self._paginas.append(objeto_pagina)
+        self._corrente = []
+
+    def _novo_objeto(self) -> int:
+        numero = self._proximo_objeto
+        self._proximo_objeto += 1
+        return numero
+
+    def _gravar_objeto(self, numero: int, corpo: bytes) -> None:
+        self._deslocamentos[numero] = self._posicao
+        self._gravar(b"%d 0 obj\n" % numero + corpo + b"\nendobj\n")
+
+    def _gravar(self, dados: bytes) -> None:
+        self.arquivo.write(dados)
+        self._posicao += len(dados)
+
+_ESCRITORES = {"csv": EscritorCSV, "xlsx": EscritorXLSX, "pdf": EscritorPDF}
+
+# Cria o escritor de um formato
+def criar_escritor(
+    formato: str,
+    arquivo: BinaryIO,
+    modelo: ModeloRelatorio,
+    contexto: Optional[Mapping[str, Any]] = None,
+) -> EscritorRelatorio:
+    """
+    Cria o escritor do formato indicado.
+
+    Args:
+        formato (str): "csv", "xlsx" ou "pdf".
+        arquivo (BinaryIO): Arquivo binário de destino.
+        modelo (ModeloRelatorio): Modelo do relatório.
+        contexto (Optional[Mapping[str, Any]]): Valores do título.
+
+    Returns:
+        EscritorRelatorio: Escritor ainda não iniciado.
+
+    Raises:
+        ValueError: Se o formato não for suportado.
+    """
+    try:
+        classe = _ESCRITORES[formato.lower()]
+    except KeyError:
+        raise ValueError(f"Formato de relatório inválido: {formato} (use {', '.join(FORMATOS)})")
+    return classe(arquivo, modelo, contexto)
+
+def _texto_pdf(texto: str) -> str:
+    """Escapa o texto para uma string literal do PDF."""
+    return texto.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+_PARTES_XLSX = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Relatorio" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        "</Relationships>"
+    ),
+    # Estilo 0: padrão; estilo 1: negrito (título e cabeçalho)
+    "xl/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+        "</styleSheet>"
+    ),
+}
@@ -0,0 +1,334 @@
+"""
+Módulo de resolução de conflitos de sincronização.
+
+Define as estratégias aplicadas quando um dispositivo envia alterações de um
+registro que também foi alterado no servidor depois da última sincronização
+do dispositivo. As estratégias são intercambiáveis e recebem um `Conflito`
+descrevendo os dois lados da alteração e, quando disponível, a versão base
+a partir da qual o cliente editou o registro.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Set, Tuple, Type
+
+# Ator usado no vetor de versão para alterações feitas no próprio servidor
+ATOR_SERVIDOR = "srv"
+
+class VetorVersao:
+    """
+    Vetor de versão compacto de um registro.
+
+    Guarda, para cada ator que alterou o registro (o servidor ou um
+    dispositivo), quantas alterações ele realizou. Comparando o vetor que o
+    cliente conhecia com o vetor atual do servidor é possível saber se houve
+    alteração concorrente sem consultar o histórico do registro.
+    Serializado como "ator=contador,ator=contador".
+    """
+
+    __slots__ = ("_contadores",)
+
+    def __init__(self, contadores: Optional[Dict[str, int]] = None) -> None:
+        """
+        Inicializa o vetor.
+
+        Args:
+            contadores (Optional[Dict[str, int]]): Contador de alterações por ator.
+        """
+        self._contadores: Dict[str, int] = dict(contadores or {})
+
+    # Lê um vetor serializado
+    @classmethod
+    def decodificar(cls, texto: Optional[str]) -> "VetorVersao":
+        """
+        Reconstrói o vetor a partir da forma serializada.
+
+        Args:
+            texto (Optional[str]): Vetor serializado. Vazio indica vetor zerado.
+
+        Returns:
+            VetorVersao: Vetor correspondente.
+
+        Raises:
+            ValueError: Se o texto estiver em formato inválido.
+        """
+        contadores: Dict[str, int] = {}
+        if texto:
+            for parte in texto.split(","):
+                ator, _, contador = parte.partition("=")
+                if not ator or not contador:
+                    raise ValueError(f"Vetor de versão inválido: {texto}")
+                contadores[ator] = int(contador)
+        return cls(contadores)
+
+    def codificar(self) -> str:
+        """
+        Serializa o vetor, com os atores em ordem alfabética.
+
+        Returns:
+            str: Vetor serializado.
+        """
+        return ",".join(f"{ator}={contador}" for ator, contador in sorted(self._contadores.items()))
+
+    def incrementar(self, ator: str) -> "VetorVersao":
+        """
+        Retorna um novo vetor com uma alteração a mais do ator.
+
+        Args:
+            ator (str): Ator que alterou o registro.
+
+        Returns:
+            VetorVersao: Vetor incrementado.
+        """
+        contadores = dict(self._contadores)
+        contadores[ator] = contadores.get(ator, 0) + 1
+        return VetorVersao(contadores)
+
+    def domina(self, outro: "VetorVersao") -> bool:
+        """
+        Indica se este vetor já contém todas as alterações do outro.
+
+        Args:
+            outro (VetorVersao): Vetor comparado.
+
+        Returns:
+            bool: True se, para todo ator, este vetor é maior ou igual ao outro.
+        """
+        return all(self._contadores.get(ator, 0) >= contador for ator, contador in outro)
+
+    def concorrente(self, outro: "VetorVersao") -> bool:
+        """
+        Indica se os vetores representam alterações concorrentes.
+
+        Args:
+            outro (VetorVersao): Vetor comparado.
+
+        Returns:
+            bool: True se nenhum dos vetores domina o outro.
+        """
+        return not self.domina(outro) and not outro.domina(self)
+
+    def mesclar(self, outro: "VetorVersao") -> "VetorVersao":
+        """
+        Retorna o vetor com o máximo de cada ator entre os dois vetores.
+
+        Args:
+            outro (VetorVersao): Vetor mesclado.
+
+        Returns:
+            VetorVersao: Vetor resultante.
+        """
+        contadores = dict(self._contadores)
+        for ator, contador in outro:
+            if contador > contadores.get(ator, 0):
+                contadores[ator] = contador
+        return VetorVersao(contadores)
+
+    def __iter__(self) -> Iterator[Tuple[str, int]]:
+        return iter(self._contadores.items())
+
+    def __eq__(self, outro: object) -> bool:
+        return isinstance(outro, VetorVersao) and self._contadores == outro._contadores
+
+    def __repr__(self) -> str:
+        return f"VetorVersao({self.codificar()!r})"
+
+@dataclass
+class Conflito:
+    """
+    Alteração concorrente de um mesmo registro no cliente e no servidor.
+
+    Attributes:
+        tabela (str): Tabela do registro.
+        registro_id (int): Identificador do registro.
+        valores_servidor (Dict[str, Any]): Valores atuais do registro no servidor.
+        alteracoes_cliente (Dict[str, Any]): Campos alterados pelo cliente e seus valores.
+        campos_alterados_servidor (Optional[Set[str]]): Campos alterados no servidor
+            desde a última sincronização do cliente. None indica que todos os
+            campos devem ser considerados alterados.
+        data_cliente (datetime): Momento da alteração no cliente.
+        data_servidor (datetime): Momento da última alteração no servidor.
+        valores_base (Optional[Dict[str, Any]]): Valores dos campos alterados pelo
+            cliente na versão a partir da qual ele editou o registro. Campos
+            ausentes têm valor base desconhecido.
+    """
+    tabela: str
+    registro_id: int
+    valores_servidor: Dict[str, Any]
+    alteracoes_cliente: Dict[str, Any]
+    campos_alterados_servidor: Optional[Set[str]]
+    data_cliente: datetime
+    data_servidor: datetime
+    valores_base: Optional[Dict[str, Any]] = None
+
+    def campo_alterado_no_servidor(self, campo: str) -> bool:
+        """
+        Indica se o campo foi alterado no servidor desde a última sincronização.
+
+        Args:
+            campo (str): Nome do campo.
+
+        Returns:
+            bool: True se o campo foi (ou pode ter sido) alterado no servidor.
+        """
+        if self.campos_alterados_servidor is None:
+            return True
+        return campo in self.campos_alterados_servidor
+
+class ResolvedorConflito(ABC):
+    """
+    Estratégia de resolução de conflitos de sincronização.
+    """
+
+    @abstractmethod
+    def resolver(self, conflito: Conflito) -> Dict[str, Any]:
+        """
+        Decide quais alterações do cliente devem ser aplicadas.
+
+        Args:
+            conflito (Conflito): Conflito a resolver.
+
+        Returns:
+            Dict[str, Any]: Campos e valores a gravar no servidor. Um dicionário
+                vazio indica que a alteração do cliente foi descartada.
+        """
+
+class UltimaEscritaVence(ResolvedorConflito):
+    """
+    Last-writer-wins: prevalece a alteração mais recente, comparando o
+    momento da alteração no cliente com o da última alteração no servidor.
+    Em caso de empate, prevalece o servidor.
+    """
+
+    def resolver(self, conflito: Conflito) -> Dict[str, Any]:
+        if _utc(conflito.data_cliente) > _utc(conflito.data_servidor):
+            return dict(conflito.alteracoes_cliente)
+        return {}
+
+class MesclagemPorCampo(ResolvedorConflito):
+    """
+    Mescla as alterações campo a campo.
+
+    Campos alterados apenas pelo cliente são aplicados diretamente; campos
+    alterados pelos dois lados são decididos pela estratégia de desempate
+    (por padrão, last-writer-wins).
+    """
+
+    def __init__(self, desempate: Optional[ResolvedorConflito] = None) -> None:
+        """
+        Inicializa o resolvedor.
+
+        Args:
+            desempate (Optional[ResolvedorConflito]): Estratégia aplicada aos
+                campos alterados pelos dois lados.
+        """
+        self.desempate = desempate or UltimaEscritaVence()
+
+    def resolver(self, conflito: Conflito) -> Dict[str, Any]:
+        aplicar: Dict[str, Any] = {}
+        disputados: Dict[str, Any] = {}
+        for campo, valor in conflito.alteracoes_cliente.items():
+            if not conflito.campo_alterado_no_servidor(campo):
+                aplicar[campo] = valor
+            elif conflito.valores_servidor.get(campo) != valor:
+                disputados[campo] = valor
+
+        if disputados:
+            aplicar.update(self.desempate.resolver(_sub_conflito(conflito, disputados)))
+        return aplicar
+
+class MesclagemTresVias(ResolvedorConflito):
+    """
+    Mesclagem em três vias, coluna a coluna, contra a versão base.
+
+    Para cada campo alterado pelo cliente compara o valor base (B), o valor
+    atual do servidor (S) e o valor do cliente (C):
+
+    - S == B: apenas o cliente alterou o campo, vale C;
+    - C == B ou C == S: nada a aplicar;
+    - caso contrário os dois lados alteraram o campo para valores diferentes,
+      e a decisão cabe à estratégia de desempate.
+
+    O custo é proporcional à quantidade de campos alterados pelo cliente.
+    Campos sem valor base conhecido são tratados pela MesclagemPorCampo.
+    """
+
+    def __init__(self, desempate: Optional[ResolvedorConflito] = None) -> None:
+        """
+        Inicializa o resolvedor.
+
+        Args:
+            desempate (Optional[ResolvedorConflito]): Estratégia aplicada aos
+                campos alterados pelos dois lados para valores diferentes.
+        """
+        self.desempate = desempate or UltimaEscritaVence()
+        self._sem_base = MesclagemPorCampo(self.desempate)
+
+    def resolver(self, conflito: Conflito) -> Dict[str, Any]:
+        base = conflito.valores_base or {}
+        aplicar: Dict[str, Any] = {}
+        disputados: Dict[str, Any] = {}
+        sem_base: Dict[str, Any] = {}
+
+        for campo, valor_cliente in conflito.alteracoes_cliente.items():
+            if campo not in base:
+                sem_base[campo] = valor_cliente
+                continue
+            valor_base = base[campo]
+            valor_servidor = conflito.valores_servidor.get(campo)
+            if valor_servidor == valor_base:
+                if valor_cliente != valor_base:
+                    aplicar[campo] = valor_cliente
+            elif valor_cliente != valor_base and valor_cliente != valor_servidor:
+                disputados[campo] = valor_cliente
+
+        if sem_base:
+            aplicar.update(self._sem_base.resolver(_sub_conflito(conflito, sem_base)))
+        if disputados:
+            aplicar.update(self.desempate.resolver(_sub_conflito(conflito, disputados)))
+        return aplicar
+
+# Estratégias disponíveis por nome
+RESOLVEDORES: Dict[str, Type[ResolvedorConflito]] = {
+    "ultima_escrita": UltimaEscritaVence,
+    "por_campo": MesclagemPorCampo,
+    "tres_vias": MesclagemTresVias,
+}
+
+def obter_resolvedor(nome: str) -> ResolvedorConflito:
+    """
+    Instancia uma estratégia de resolução pelo nome.
+
+    Args:
+        nome (str): Nome da estratégia (ver RESOLVEDORES).
+
+    Returns:
+        ResolvedorConflito: Estratégia correspondente.
+
+    Raises:
+        ValueError: Se a estratégia não existir.
+    """
+    try:
+        return RESOLVEDORES[nome]()
+    except KeyError:
+        raise ValueError(f"Estratégia de resolução desconhecida: {nome}") from None
+
+def _sub_conflito(conflito: Conflito, alteracoes: Dict[str, Any]) -> Conflito:
+    """Cria um conflito restrito a um subconjunto das alterações do cliente."""
+    return Conflito(
+        tabela=conflito.tabela,
+        registro_id=conflito.registro_id,
+        valores_servidor=conflito.valores_servidor,
+        alteracoes_cliente=alteracoes,
+        campos_alterados_servidor=conflito.campos_alterados_servidor,
+        data_cliente=conflito.data_cliente,
+        data_servidor=conflito.data_servidor,
+        valores_base=conflito.valores_base,
+    )
+
+def _utc(data: datetime) -> datetime:
+    """Normaliza uma data para UTC sem fuso, tratando datas ingênuas como UTC."""
+    if data.tzinfo is not None:
+        data = data.astimezone(timezone.utc).replace(tzinfo=None)
+    return data
@@ -0,0 +1,290 @@
+"""
+Módulo de outbox transacional.
+
+Garante que os eventos de domínio gerados pelos aggregates não sejam perdidos
+entre o commit no banco e a publicação. Os eventos são gravados na tabela
+`outbox_eventos` na mesma transação da alteração do aggregate e um relay os
+drena em lotes, com entrega at-least-once e chave de idempotência por evento.
+"""
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+from uuid import uuid4
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.domain.events import DomainEvent
+from app.infrastructure.persistence.sqlalchemy.models import OutboxEvento
+
+logger = logging.getLogger(__name__)
+
+_TABELA = OutboxEvento.__table__
+
+@dataclass
+class MensagemOutbox(DomainEvent):
+    """
+    Evento lido do outbox, pronto para publicação.
+
+    Attributes:
+        id (int): Posição do evento no outbox.
+        chave_idempotencia (str): Chave única usada pelos consumidores para
+            descartar entregas repetidas.
+        tipo_evento (str): Nome da classe do evento de domínio original.
+        agregado_id (Optional[str]): Identificador do aggregate de origem.
+        payload (Dict[str, Any]): Atributos do evento original.
+    """
+    id: int
+    chave_idempotencia: str
+    tipo_evento: str
+    agregado_id: Optional[str] = None
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+Publicador = Callable[[List[MensagemOutbox]], None]
+
+# Serializa um evento de domínio
+def serializar_evento(evento: DomainEvent) -> str:
+    """
+    Serializa os atributos de um evento de domínio em JSON.
+
+    Valores não nativos do JSON (UUID, datetime, Enum) são convertidos em texto.
+
+    Args:
+        evento (DomainEvent): Evento a serializar.
+
+    Returns:
+        str: Representação JSON do evento.
+    """
+    return json.dumps(vars(evento), default=str, separators=(",", ":"))
+
+# Grava eventos no outbox dentro da transação corrente
+def registrar_eventos(
+    session: Session,
+    eventos: Iterable[DomainEvent],
+    agregado_id: Optional[Any] = None,
+) -> List[str]:
+    """
+    Grava os eventos no outbox usando a transação corrente da sessão.
+
+    Não realiza commit: os eventos só se tornam visíveis ao relay quando a
+    transação que altera o aggregate for confirmada.
+
+    Args:
+        session (Session): Sessão da unidade de trabalho do aggregate.
+        eventos (Iterable[DomainEvent]): Eventos gerados pelo aggregate.
+        agregado_id (Optional[Any]): Identificador do aggregate de origem.
+
+    Returns:
+        List[str]: Chaves de idempotência atribuídas aos eventos.
+    """
+    linhas = [
+        {
+            "chave_idempotencia": uuid4().hex,
+            "tipo_evento": type(evento).__name__,
+            "agregado_id": str(agregado_id) if agregado_id is not None else None,
+            "payload": serializar_evento(evento),
+            "tentativas": 0,
+        }
+        for evento in eventos
+    ]
+    if linhas:
+        session.execute(insert(_TABELA), linhas)
+    return [linha["chave_idempotencia"] for linha in linhas]
+
+# Reconstrói o evento de domínio de uma mensagem do outbox
+def decodificar_evento(
+    mensagem: MensagemOutbox,
+    tipos: Iterable[Type[DomainEvent]],
+) -> Optional[DomainEvent]:
+    """
+    Reconstrói o evento de domínio original a partir do tipo e do payload.
+
+    Os valores que a serialização converteu em texto (UUID, datetime, Enum)
+    permanecem como texto no evento reconstruído.
+
+    Args:
+        mensagem (MensagemOutbox): Mensagem entregue pelo relay.
+        tipos (Iterable[Type[DomainEvent]]): Classes de evento aceitas.
+
+    Returns:
+        Optional[DomainEvent]: Evento reconstruído, ou None se o tipo da
+            mensagem não estiver entre os aceitos.
+    """
+    for tipo in tipos:
+        if tipo.__name__ == mensagem.tipo_evento:
+            return tipo(**mensagem.payload)
+    return None
+
+class FiltroIdempotencia:
+    """
+    Filtro de entregas repetidas para consumidores do outbox.
+
+    Mantém as chaves de idempotência processadas mais recentemente, com
+    capacidade limitada, descartando as mais antigas primeiro.
+    """
+
+    def __init__(self, capacidade: int = 100_000) -> None:
+        """
+        Inicializa o filtro.
+
+        Args:
+            capacidade (int): Quantidade máxima de chaves lembradas.
+        """
+        self.capacidade = capacidade
+        self._chaves: "OrderedDict[str, None]" = OrderedDict()
+
+    def primeira_entrega(self, chave: str) -> bool:
+        """
+        Registra a chave e informa se é a primeira vez que ela é vista.
+
+        Args:
+            chave (str): Chave de idempotência da mensagem.
+
+        Returns:
+            bool: True se a mensagem ainda não havia sido processada.
+        """
+        if chave in self._chaves:
+            self._chaves.move_to_end(chave)
+            return False
+        self._chaves[chave] = None
+        if len(self._chaves) > self.capacidade:
+            self._chaves.popitem(last=False)
+        return True
+
+class OutboxRelay:
+    """
+    Relay que drena o outbox em lotes e publica os eventos.
+
+    Cada lote é lido em ordem de id, publicado e então removido em uma única
+    instrução. Se a publicação falhar, as linhas permanecem no outbox com o
+    contador de tentativas incrementado e são reenviadas no próximo ciclo
+    (entrega at-least-once).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        publicar: Publicador,
+        tamanho_lote: int = 500,
+    ) -> None:
+        """
+        Inicializa o relay.
+
+        Args:
+            session_factory (Callable[[], Session]): Fábrica de sessões.
+            publicar (Publicador): Função que entrega um lote de mensagens.
+                Deve levantar exceção se a entrega não for concluída.
+            tamanho_lote (int): Quantidade máxima de eventos por lote.
+        """
+        self.session_factory = session_factory
+        self.publicar = publicar
+        self.tamanho_lote = tamanho_lote
+
+    # Drena um único lote do outbox
+    def drenar_lote(self) -> int:
+        """
+        Lê, publica e remove um lote de eventos do outbox.
+
+        Returns:
+            int: Quantidade de eventos publicados no lote.
+
+        Raises:
+            Exception: Repassa a exceção do publicador após registrar a tentativa.
+        """
+        session = self.session_factory()
+        try:
+            linhas = session.execute(
+                select(
+                    _TABELA.c.id,
+                    _TABELA.c.chave_idempotencia,
+                    _TABELA.c.tipo_evento,
+                    _TABELA.c.agregado_id,
+                    _TABELA.c.payload,
+                )
+                .order_by(_TABELA.c.id)
+                .limit(self.tamanho_lote)
+            ).all()
+            if not linhas:
+                return 0
+
+            mensagens = [
+                MensagemOutbox(
+                    id=linha.id,
+                    chave_idempotencia=linha.chave_idempotencia,
+                    tipo_evento=linha.tipo_evento,
+                    agregado_id=linha.agregado_id,
+                    payload=json.loads(linha.payload),
+                )
+                for linha in linhas
+            ]
+            ids = [mensagem.id for mensagem in mensagens]
+
+            try:
+                self.publicar(mensagens)
+            except Exception:
+                session.rollback()
+                session.execute(
+                    update(_TABELA)
+                    .where(_TABELA.c.id.in_(ids))
+                    .values(tentativas=_TABELA.c.tentativas + 1)
+                )
+                session.commit()
+                raise
+
+            session.execute(delete(_TABELA).where(_TABELA.c.id.in_(ids)))
+            session.commit()
+            return len(mensagens)
+        finally:
+            session.close()
+
+    # Drena o outbox até esvaziá-lo
+    def drenar(self, max_lotes: Optional[int] = None) -> int:
+        """
+        Drena lotes consecutivos até o outbox ficar vazio.
+
+        Args:
+            max_lotes (Optional[int]): Limite de lotes processados nesta chamada.
+
+        Returns:
+            int: Quantidade total de eventos publicados.
+        """
+        total = 0
+        lotes = 0
+        while max_lotes is None or lotes < max_lotes:
+            publicados = self.drenar_lote()
+            total += publicados
+            lotes += 1
+            if publicados < self.tamanho_lote:
+                break
+        return total
+
+    # Executa o relay continuamente
+    async def executar(self, parar: asyncio.Event, intervalo: float = 1.0) -> None:
+        """
+        Executa o relay em segundo plano até que `parar` seja sinalizado.
+
+        A drenagem roda no executor padrão, pois a sessão é síncrona. Quando o
+        outbox está vazio, ou após uma falha de publicação, aguarda `intervalo`
+        segundos antes de tentar novamente.
+
+        Args:
+            parar (asyncio.Event): Sinal de encerramento do relay.
+            intervalo (float): Espera entre ciclos ociosos, em segundos.
+        """
+        loop = asyncio.get_running_loop()
+        while not parar.is_set():
+            try:
+                publicados = await loop.run_in_executor(None, self.drenar)
+            except Exception:
+                logger.exception("Falha ao publicar eventos do outbox")
+                publicados = 0
+
+            if publicados == 0:
+                try:
+                    await asyncio.wait_for(parar.wait(), timeout=intervalo)
+                except asyncio.TimeoutError:
+                    pass
@@ -0,0 +1,513 @@
+"""
+Módulo de sincronização incremental com dispositivos de campo.
+
+Implementa o protocolo de sincronização delta usado pelos dispositivos que
+operam offline. Toda alteração nas tabelas sincronizadas recebe um número de
+sequência no log `registro_alteracoes`; o cliente guarda um token com a última
+sequência recebida e, a cada pull, recebe apenas os registros alterados desde
+então. As alterações locais enviadas pelo cliente passam pelo resolvedor de
+conflitos quando o registro também mudou no servidor. Veículos e viagens
+carregam ainda um vetor de versão, que permite detectar alterações
+concorrentes sem consultar o log.
+"""
+
+import enum
+import json
+import weakref
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from sqlalchemy import Date, DateTime, Enum, event, func, insert, inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Abastecimento,
+    Base,
+    Cliente,
+    DispositivoSincronizacao,
+    Manutencao,
+    Motorista,
+    RegistroAlteracao,
+    Veiculo,
+    Viagem,
+)
+from app.infrastructure.sync.conflict_resolver import (
+    ATOR_SERVIDOR,
+    Conflito,
+    MesclagemTresVias,
+    ResolvedorConflito,
+    VetorVersao,
+)
+from app.infrastructure.sync.sync_status import (
+    ResultadoEnvio,
+    StatusSincronizacao,
+    TokenSincronizacao,
+)
+
+# Tabelas replicadas para os dispositivos de campo
+TABELAS_SINCRONIZADAS: Dict[str, Type[Base]] = {
+    modelo.__tablename__: modelo
+    for modelo in (Motorista, Veiculo, Cliente, Viagem, Manutencao, Abastecimento)
+}
+
+# Colunas mantidas exclusivamente pelo servidor
+CAMPOS_PROTEGIDOS = {
+    "id", "criado_por", "data_criacao", "data_atualizacao", "versao", "vetor_versao",
+}
+
+OPERACAO_UPSERT = "upsert"
+OPERACAO_DELETE = "delete"
+
+# Chave de Session.info com o ator responsável pelas alterações da sessão
+CHAVE_ATOR = "ator_sincronizacao"
+
+_LOG = RegistroAlteracao.__table__
+
+# Sessões e fábricas de sessão com rastreamento ativo
+_ALVOS_RASTREADOS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+@dataclass
+class AlteracaoCliente:
+    """
+    Alteração local enviada por um dispositivo.
+
+    Attributes:
+        tabela (str): Tabela do registro alterado.
+        registro_id (Optional[int]): Identificador do registro. None indica inclusão.
+        campos (Dict[str, Any]): Campos alterados e seus novos valores.
+        data_alteracao (datetime): Momento da alteração no dispositivo.
+        operacao (str): "upsert" ou "delete".
+        vetor_base (Optional[str]): Vetor de versão do registro quando o
+            dispositivo o recebeu, se a tabela possuir vetor de versão.
+    """
+    tabela: str
+    registro_id: Optional[int]
+    campos: Dict[str, Any]
+    data_alteracao: datetime
+    operacao: str = OPERACAO_UPSERT
+    vetor_base: Optional[str] = None
+
+@dataclass
+class LoteAlteracoes:
+    """
+    Lote de alterações entregue em um pull.
+
+    Attributes:
+        alteracoes (Dict[str, List[Dict[str, Any]]]): Registros incluídos ou
+            alterados, agrupados por tabela.
+        removidos (Dict[str, List[int]]): Identificadores removidos, por tabela.
+        token (str): Token a ser enviado no próximo pull.
+        tem_mais (bool): Indica se há mais alterações após este lote.
+    """
+    alteracoes: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    removidos: Dict[str, List[int]] = field(default_factory=dict)
+    token: str = ""
+    tem_mais: bool = False
+
+# Ativa o registro de alterações em uma fábrica de sessões
+def ativar_rastreamento_alteracoes(alvo: Any) -> None:
+    """
+    Registra o listener que alimenta o log de alterações.
+
+    Também mantém o vetor de versão dos registros que o possuem,
+    incrementando o contador do ator da sessão a cada alteração.
+
+    Args:
+        alvo (Any): Session, sessionmaker ou classe Session cujos flushes
+            devem ser rastreados.
+    """
+    if alvo not in _ALVOS_RASTREADOS:
+        event.listen(alvo, "before_flush", _incrementar_vetores)
+        event.listen(alvo, "after_flush", _registrar_alteracoes)
+        _ALVOS_RASTREADOS.add(alvo)
+
+def _incrementar_vetores(session: Session, flush_context: Any, instancias: Any) -> None:
+    """Incrementa o vetor de versão dos registros incluídos ou alterados."""
+    ator = session.info.get(CHAVE_ATOR, ATOR_SERVIDOR)
+    for obj in list(session.new) + list(session.dirty):
+        if not hasattr(obj, "vetor_versao"):
+            continue
+        if obj in session.new or session.is_modified(obj, include_collections=False):
+            obj.vetor_versao = VetorVersao.decodificar(obj.vetor_versao).incrementar(ator).codificar()
+
+def _registrar_alteracoes(session: Session, flush_context: Any) -> None:
+    """Grava no log as inclusões, alterações e remoções do flush."""
+    agora = datetime.now(timezone.utc)
+    linhas = []
+
+    for obj in session.new:
+        tabela = getattr(obj, "__tablename__", None)
+        if tabela in TABELAS_SINCRONIZADAS:
+            linhas.append(_linha_log(tabela, obj.id, OPERACAO_UPSERT, None, agora))
+
+    for obj in session.dirty:
+        tabela = getattr(obj, "__tablename__", None)
+        if tabela not in TABELAS_SINCRONIZADAS:
+            continue
+        estado = inspect(obj)
+        campos = []
+        anteriores = {}
+        for atributo in estado.mapper.column_attrs:
+            historico = estado.attrs[atributo.key].history
+            if historico.has_changes():
+                campos.append(atributo.key)
+                if historico.deleted:
+                    anteriores[atributo.key] = _serializar(historico.deleted[0])
+        if campos:
+            linha = _linha_log(tabela, obj.id, OPERACAO_UPSERT, ",".join(campos), agora)
+            linha["valores_anteriores"] = json.dumps(anteriores, default=str)
+            linhas.append(linha)
+
+    for obj in session.deleted:
+        tabela = getattr(obj, "__tablename__", None)
+        if tabela in TABELAS_SINCRONIZADAS:
+            linhas.append(_linha_log(tabela, obj.id, OPERACAO_DELETE, None, agora))
+
+    if linhas:
+        session.connection().execute(insert(_LOG), linhas)
+
+def _linha_log(tabela: str, registro_id: int, operacao: str, campos: Optional[str], data: datetime) -> Dict[str, Any]:
+    return {
+        "tabela": tabela,
+        "registro_id": registro_id,
+        "operacao": operacao,
+        "campos": campos,
+        "valores_anteriores": None,
+        "data": data,
+    }
+
+class SyncService:
+    """
+    Serviço de sincronização incremental (pull/push) com dispositivos de campo.
+
+    O tamanho de cada pull é proporcional à quantidade de registros alterados
+    desde o token do cliente, e não ao tamanho da frota: alterações repetidas
+    de um mesmo registro dentro do lote são entregues uma única vez, com o
+    estado atual do registro.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        resolvedor: Optional[ResolvedorConflito] = None,
+    ) -> None:
+        """
+        Inicializa o serviço.
+
+        Args:
+            session (Session): Sessão do banco de dados.
+            resolvedor (Optional[ResolvedorConflito]): Estratégia de resolução
+                de conflitos. Padrão é a mesclagem em três vias.
+        """
+        self.session = session
+        self.resolvedor = resolvedor or MesclagemTresVias()
+
+    # Retorna as alterações posteriores ao token do cliente
+    def puxar(
+        self,
+        token: Optional[str] = None,
+        limite: int = 500,
+        dispositivo_id: Optional[str] = None,
+    ) -> LoteAlteracoes:
+        """
+        Retorna as alterações do servidor posteriores ao token informado.
+
+        Args:
+            token (Optional[str]): Token do último pull. Vazio para sincronização inicial.
+            limite (int): Quantidade máxima de entradas do log consideradas no lote.
+            dispositivo_id (Optional[str]): Dispositivo que realiza o pull, para
+                registro do seu estado de sincronização.
+
+        Returns:
+            LoteAlteracoes: Registros alterados, removidos e o próximo token.
+
+        Raises:
+            ValueError: Se o token for inválido.
+        """
+        seq_base = TokenSincronizacao.decodificar(token)
+        entradas = self.session.execute(
+            select(_LOG.c.seq, _LOG.c.tabela, _LOG.c.registro_id, _LOG.c.operacao)
+            .where(_LOG.c.seq > seq_base)
+            .order_by(_LOG.c.seq)
+            .limit(limite + 1)
+        ).all()
+
+        tem_mais = len(entradas) > limite
+        entradas = entradas[:limite]
+
+        # Mantém apenas a última operação de cada registro no lote
+        ultima_operacao: Dict[Tuple[str, int], str] = {}
+        for entrada in entradas:
+            ultima_operacao[(entrada.tabela, entrada.registro_id)] = entrada.operacao
+
+        lote = LoteAlteracoes(
+            token=TokenSincronizacao.codificar(entradas[-1].seq if entradas else seq_base),
+            tem_mais=tem_mais,
+        )
+        alterados: Dict[str, List[int]] = {}
+        for (tabela, registro_id), operacao in ultima_operacao.items():
+            if operacao == OPERACAO_DELETE:
+                lote.removidos.setdefault(tabela, []).append(registro_id)
+            else:
+                alterados.setdefault(tabela, []).append(registro_id)
+
+        for tabela, ids in alterados.items():
+            lote.alteracoes[tabela] = list(self._carregar(tabela, ids))
+
+        if dispositivo_id:
+            self._atualizar_dispositivo(dispositivo_id, StatusSincronizacao.SINCRONIZADO, lote.token)
+        self.session.commit()
+        return lote
+
+    # Aplica as alterações locais enviadas pelo cliente
+    def enviar(
+        self,
+        alteracoes: List[AlteracaoCliente],
+        token_base: Optional[str] = None,
+        dispositivo_id: Optional[str] = None,
+    ) -> ResultadoEnvio:
+        """
+        Aplica as alterações locais de um dispositivo.
+
+        Alterações de registros que não mudaram no servidor desde `token_base`
+        são aplicadas diretamente; as demais passam pelo resolvedor de conflitos.
+
+        Args:
+            alteracoes (List[AlteracaoCliente]): Alterações na ordem em que
+                ocorreram no dispositivo.
+            token_base (Optional[str]): Token do último pull do dispositivo.
+            dispositivo_id (Optional[str]): Dispositivo que envia as alterações.
+
+        Returns:
+            ResultadoEnvio: Resultado de cada alteração, por índice.
+
+        Raises:
+            ValueError: Se o token for inválido.
+        """
+        seq_base = TokenSincronizacao.decodificar(token_base)
+        resultado = ResultadoEnvio()
+
+        # As alterações aplicadas contam no vetor de versão do dispositivo
+        self.session.info[CHAVE_ATOR] = dispositivo_id or ATOR_SERVIDOR
+        _iniciar_transacao(self.session)
+        try:
+            for indice, alteracao in enumerate(alteracoes):
+                # Cada alteração em seu savepoint: uma falha desfaz só a própria alteração
+                try:
+                    with self.session.begin_nested():
+                        self._aplicar(indice, alteracao, seq_base, resultado)
+                except (LookupError, TypeError, ValueError) as erro:
+                    resultado.erros.append(f"{indice}: {erro}")
+                except SQLAlchemyError as erro:
+                    _descartar_indice(resultado, indice)
+                    resultado.rejeitadas.append(indice)
+                    resultado.erros.append(f"{indice}: {getattr(erro, 'orig', None) or erro}")
+        finally:
+            self.session.info.pop(CHAVE_ATOR, None)
+
+        if dispositivo_id:
+            self._atualizar_dispositivo(dispositivo_id, resultado.status)
+        self.session.commit()
+        return resultado
+
+    def _aplicar(
+        self,
+        indice: int,
+        alteracao: AlteracaoCliente,
+        seq_base: int,
+        resultado: ResultadoEnvio,
+    ) -> None:
+        modelo = TABELAS_SINCRONIZADAS.get(alteracao.tabela)
+        if modelo is None:
+            raise LookupError(f"tabela não sincronizada: {alteracao.tabela}")
+
+        campos = {
+            campo: _desserializar(modelo, campo, valor)
+            for campo, valor in alteracao.campos.items()
+            if campo not in CAMPOS_PROTEGIDOS
+        }
+
+        # Inclusão feita no dispositivo
+        if alteracao.registro_id is None:
+            self.session.add(modelo(**campos))
+            self.session.flush()
+            resultado.aplicadas.append(indice)
+            return
+
+        registro = self.session.get(modelo, alteracao.registro_id)
+        if registro is None:
+            if alteracao.operacao == OPERACAO_DELETE:
+                resultado.aplicadas.append(indice)
+                return
+            raise LookupError(f"registro {alteracao.registro_id} não encontrado em {alteracao.tabela}")
+
+        # Com vetor de versão, a concorrência é detectada sem consultar o log
+        vetor_servidor = getattr(registro, "vetor_versao", None)
+        if alteracao.vetor_base is not None and vetor_servidor is not None:
+            concorrente = not VetorVersao.decodificar(alteracao.vetor_base).domina(
+                VetorVersao.decodificar(vetor_servidor)
+            )
+        else:
+            concorrente = None
+
+        if concorrente is False:
+            campos_servidor, data_servidor, valores_base = set(), None, {}
+        else:
+            campos_servidor, data_servidor, valores_base = self._alteracoes_servidor(
+                modelo, alteracao.registro_id, seq_base
+            )
+
+        if alteracao.operacao == OPERACAO_DELETE:
+            # Remoção só prevalece se o servidor não alterou o registro
+            if data_servidor is not None:
+                resultado.rejeitadas.append(indice)
+                return
+            self.session.delete(registro)
+            self.session.flush()
+            resultado.aplicadas.append(indice)
+            return
+
+        if data_servidor is None:
+            self._atribuir(registro, campos)
+            resultado.aplicadas.append(indice)
+            return
+
+        conflito = Conflito(
+            tabela=alteracao.tabela,
+            registro_id=alteracao.registro_id,
+            valores_servidor={campo: getattr(registro, campo, None) for campo in campos},
+            alteracoes_cliente=campos,
+            campos_alterados_servidor=campos_servidor,
+            data_cliente=alteracao.data_alteracao,
+            data_servidor=data_servidor,
+            valores_base=valores_base,
+        )
+        self._atribuir(registro, self.resolvedor.resolver(conflito))
+
+        # Rejeitada se alguma alteração efetiva do cliente não prevaleceu
+        perdidas = [
+            campo for campo, valor in campos.items()
+            if getattr(registro, campo) != valor
+            and (campo not in valores_base or valores_base[campo] != valor)
+        ]
+        if not perdidas:
+            resultado.mescladas.append(indice)
+        else:
+            resultado.rejeitadas.append(indice)
+
+    def _atribuir(self, registro: Base, valores: Dict[str, Any]) -> None:
+        """Aplica os valores ao registro e sincroniza com o banco."""
+        for campo, valor in valores.items():
+            setattr(registro, campo, valor)
+        self.session.flush()
+
+    def _alteracoes_servidor(
+        self, modelo: Type[Base], registro_id: int, seq_base: int
+    ) -> Tuple[Optional[Set[str]], Optional[datetime], Dict[str, Any]]:
+        """
+        Alterações do registro no servidor após `seq_base`.
+
+        Retorna os campos alterados (None se o registro foi recriado), a data
+        da última alteração e os valores base: para cada campo, o valor
+        anterior à primeira alteração posterior a `seq_base`.
+        """
+        entradas = self.session.execute(
+            select(_LOG.c.campos, _LOG.c.valores_anteriores, _LOG.c.data)
+            .where(
+                _LOG.c.tabela == modelo.__tablename__,
+                _LOG.c.registro_id == registro_id,
+                _LOG.c.seq > seq_base,
+            )
+            .order_by(_LOG.c.seq)
+        ).all()
+        if not entradas:
+            return set(), None, {}
+
+        campos: Optional[Set[str]] = set()
+        valores_base: Dict[str, Any] = {}
+        for entrada in entradas:
+            if not entrada.campos:
+                campos = None
+                valores_base = {}
+                break
+            anteriores = json.loads(entrada.valores_anteriores or "{}")
+            for campo in entrada.campos.split(","):
+                if campo not in campos and campo in anteriores:
+                    valores_base[campo] = _desserializar(modelo, campo, anteriores[campo])
+                campos.add(campo)
+        return campos, max(entrada.data for entrada in entradas), valores_base
+
+    def _carregar(self, tabela: str, ids: List[int]) -> Iterable[Dict[str, Any]]:
+        """Carrega o estado atual dos registros, serializado para o cliente."""
+        tabela_sa = TABELAS_SINCRONIZADAS[tabela].__table__
+        for linha in self.session.execute(select(tabela_sa).where(tabela_sa.c.id.in_(ids))):
+            yield {coluna: _serializar(valor) for coluna, valor in linha._mapping.items()}
+
+    def _atualizar_dispositivo(
+        self,
+        dispositivo_id: str,
+        status: StatusSincronizacao,
+        token: Optional[str] = None,
+    ) -> None:
+        dispositivo = self.session.get(DispositivoSincronizacao, dispositivo_id)
+        if dispositivo is None:
+            dispositivo = DispositivoSincronizacao(dispositivo_id=dispositivo_id)
+            self.session.add(dispositivo)
+        dispositivo.status = status.value
+        dispositivo.ultima_sincronizacao = datetime.now(timezone.utc)
+        if token is not None:
+            dispositivo.ultimo_token = token
+
+    # Retorna o token que representa o estado atual do servidor
+    def token_atual(self) -> str:
+        """
+        Retorna o token correspondente à última alteração registrada.
+
+        Returns:
+            str: Token de sincronização atual.
+        """
+        seq = self.session.execute(select(func.max(_LOG.c.seq))).scalar()
+        return TokenSincronizacao.codificar(seq or 0)
+
+def _iniciar_transacao(session: Session) -> None:
+    """
+    Garante a transação aberta no banco antes do primeiro savepoint.
+
+    O driver pysqlite só emite BEGIN antes de um comando de escrita; um
+    SAVEPOINT emitido fora de transação passa a ser a própria transação, e
+    liberá-lo confirmaria as alterações antes do commit da sessão.
+    """
+    conexao = session.connection()
+    if conexao.dialect.name == "sqlite" and not conexao.connection.dbapi_connection.in_transaction:
+        conexao.exec_driver_sql("BEGIN")
+
+def _descartar_indice(resultado: ResultadoEnvio, indice: int) -> None:
+    """Remove a alteração desfeita das listas de aplicadas e mescladas."""
+    for lista in (resultado.aplicadas, resultado.mescladas):
+        if lista and lista[-1] == indice:
+            lista.pop()
+
+def _serializar(valor: Any) -> Any:
+    """Converte valores de coluna em tipos nativos do JSON."""
+    if isinstance(valor, enum.Enum):
+        return valor.value
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return valor
+
+def _desserializar(modelo: Type[Base], campo: str, valor: Any) -> Any:
+    """Converte um valor enviado pelo cliente para o tipo da coluna."""
+    coluna = modelo.__table__.columns.get(campo)
+    if coluna is None:
+        raise LookupError(f"campo desconhecido: {campo}")
+    if valor is None or not isinstance(valor, str):
+        return valor
+    if isinstance(coluna.type, DateTime):
+        return datetime.fromisoformat(valor)
+    if isinstance(coluna.type, Date):
+        return date.fromisoformat(valor)
+    if isinstance(coluna.type, Enum) and coluna.type.enum_class is not None:
+        return coluna.type.enum_class(valor)
+    return valor
@@ -0,0 +1,95 @@
+"""
+Módulo de status de sincronização.
+
+Define os estados de sincronização dos dispositivos de campo, o token
+incremental usado no protocolo de sincronização e o resultado de um envio
+de alterações locais ao servidor.
+"""
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List, Optional
+
+class StatusSincronizacao(str, Enum):
+    """
+    Estados possíveis da sincronização de um dispositivo.
+    """
+
+    PENDENTE = "pendente"
+    SINCRONIZADO = "sincronizado"
+    CONFLITO = "conflito"
+    ERRO = "erro"
+
+class TokenSincronizacao:
+    """
+    Token opaco que representa o ponto de sincronização de um cliente.
+
+    Internamente guarda o número de sequência da última alteração recebida,
+    de modo que o próximo pull retorne apenas as alterações posteriores.
+    """
+
+    PREFIXO = "s1."
+
+    # Converte o número de sequência em token
+    @classmethod
+    def codificar(cls, seq: int) -> str:
+        """
+        Gera o token a partir de um número de sequência.
+
+        Args:
+            seq (int): Número de sequência da última alteração entregue.
+
+        Returns:
+            str: Token a ser devolvido ao cliente.
+        """
+        return f"{cls.PREFIXO}{seq:x}"
+
+    # Converte o token recebido em número de sequência
+    @classmethod
+    def decodificar(cls, token: Optional[str]) -> int:
+        """
+        Obtém o número de sequência de um token.
+
+        Args:
+            token (Optional[str]): Token enviado pelo cliente. Vazio indica
+                sincronização inicial.
+
+        Returns:
+            int: Número de sequência (0 para sincronização inicial).
+
+        Raises:
+            ValueError: Se o token estiver em formato inválido.
+        """
+        if not token:
+            return 0
+        if not token.startswith(cls.PREFIXO):
+            raise ValueError("Token de sincronização inválido")
+        try:
+            return int(token[len(cls.PREFIXO):], 16)
+        except ValueError:
+            raise ValueError("Token de sincronização inválido") from None
+
+@dataclass
+class ResultadoEnvio:
+    """
+    Resultado da aplicação das alterações enviadas por um dispositivo.
+
+    Attributes:
+        aplicadas (List[int]): Índices das alterações aplicadas sem conflito.
+        mescladas (List[int]): Índices das alterações aplicadas após resolução de conflito.
+        rejeitadas (List[int]): Índices das alterações descartadas pelo resolvedor.
+        erros (List[str]): Mensagens de erro por alteração inválida.
+    """
+    aplicadas: List[int] = field(default_factory=list)
+    mescladas: List[int] = field(default_factory=list)
+    rejeitadas: List[int] = field(default_factory=list)
+    erros: List[str] = field(default_factory=list)
+
+    @property
+    def status(self) -> StatusSincronizacao:
+        """Status resultante do envio."""
+        if self.erros:
+            return StatusSincronizacao.ERRO
+        if self.rejeitadas:
+            return StatusSincronizacao.CONFLITO
+        return StatusSincronizacao.SINCRONIZADO
@@ -0,0 +1,497 @@
+"""
+Módulo de armazenamento das posições de GPS das viagens.
+
+As posições são gravadas apenas por acréscimo, em blocos colunares por
+viagem: o bloco guarda o instante e as coordenadas do primeiro ponto e, para
+os demais, a diferença em relação ao ponto anterior, em arrays int32 (tempo
+em milissegundos, coordenadas em micrograus). O bloco aberto de cada viagem
+fica em memória; ao atingir a capacidade, ao ficar parado por
+`selagem_segundos` ou no encerramento da viagem, é selado em uma linha de
+`blocos_posicoes`, comprimido com zlib.
+
+Os pontos só saem da memória depois do commit da transação que gravou o
+bloco. Se a transação for desfeita, ou a sessão fechada sem commit, o bloco
+continua aberto e é selado na próxima oportunidade.
+
+Como os blocos abertos ficam na memória do processo, a API deve rodar em um
+único processo (um worker do uvicorn): com vários, os pontos de uma mesma
+viagem seriam divididos entre blocos abertos independentes, e o reenvio de
+um lote não seria descartado pelo processo que não o recebeu.
+"""
+
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from itertools import accumulate
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.persistence.sqlalchemy.models import BlocoPosicoes
+
+ESCALA_COORDENADAS = 1_000_000
+_CABECALHO = struct.Struct("<Iqii")
+_LIMITE_INT32 = 2**31 - 1
+# Blocos adicionados à sessão e ainda não confirmados
+_CHAVE_SELAGENS = "selagens_posicoes"
+
+class Trilha(NamedTuple):
+    """
+    Posições de uma viagem, em colunas e em ordem cronológica.
+
+    Attributes:
+        instantes (array): Instantes em milissegundos desde a época Unix.
+        latitudes (array): Latitudes em graus.
+        longitudes (array): Longitudes em graus.
+    """
+
+    instantes: array
+    latitudes: array
+    longitudes: array
+
+    # Quantidade de pontos
+    def __len__(self) -> int:
+        return len(self.instantes)
+
+    # Cria uma trilha vazia
+    @classmethod
+    def vazia(cls) -> "Trilha":
+        """
+        Cria uma trilha sem pontos.
+
+        Returns:
+            Trilha: Trilha vazia.
+        """
+        return cls(array("q"), array("d"), array("d"))
+
+    # Acrescenta os pontos de outra trilha
+    def estender(self, outra: "Trilha") -> None:
+        """
+        Acrescenta ao final os pontos de outra trilha.
+
+        Args:
+            outra (Trilha): Trilha com pontos posteriores aos desta.
+        """
+        self.instantes.extend(outra.instantes)
+        self.latitudes.extend(outra.latitudes)
+        self.longitudes.extend(outra.longitudes)
+
+class EstatisticasArmazem(NamedTuple):
+    """Contadores do armazém de posições."""
+
+    viagens_abertas: int
+    pontos_em_memoria: int
+    pontos_aceitos: int
+    pontos_descartados: int
+    blocos_selados: int
+
+def _bytes_int32(valores: array) -> bytes:
+    if sys.byteorder == "big":
+        valores = array("i", valores)
+        valores.byteswap()
+    return valores.tobytes()
+
+def _int32_de_bytes(dados: bytes, inicio: int, quantidade: int) -> array:
+    valores = array("i")
+    valores.frombytes(dados[inicio:inicio + 4 * quantidade])
+    if sys.byteorder == "big":
+        valores.byteswap()
+    return valores
+
+def _absolutos(base: int, diferencas: Sequence[int]) -> List[int]:
+    return [base + valor for valor in accumulate(diferencas)]
+
+class BlocoAberto:
+    """
+    Bloco em memória com as posições ainda não seladas de uma viagem.
+
+    A primeira diferença de cada coluna é sempre zero; os valores absolutos
+    do primeiro ponto ficam na base do bloco.
+    """
+
+    __slots__ = ("base", "ultimo", "tempos", "latitudes", "longitudes")
+
+    def __init__(self) -> None:
+        """
+        Inicializa o bloco vazio.
+        """
+        self.base: Tuple[int, int, int] = (0, 0, 0)
+        self.ultimo: Optional[Tuple[int, int, int]] = None
+        self.tempos = array("i")
+        self.latitudes = array("i")
+        self.longitudes = array("i")
+
+    # Quantidade de pontos do bloco
+    def __len__(self) -> int:
+        return len(self.tempos)
+
+    # Acrescenta um ponto
+    def acrescentar(self, instante: int, latitude: int, longitude: int) -> None:
+        """
+        Acrescenta um ponto posterior ao último do bloco.
+
+        Args:
+            instante (int): Instante em milissegundos.
+            latitude (int): Latitude em micrograus.
+            longitude (int): Longitude em micrograus.
+        """
+        if not self.tempos:
+            self.base = (instante, latitude, longitude)
+            self.tempos.append(0)
+            self.latitudes.append(0)
+            self.longitudes.append(0)
+        else:
+            tempo, lat, lon = self.ultimo
+            self.tempos.append(instante - tempo)
+            self.latitudes.append(latitude - lat)
+            self.longitudes.append(longitude - lon)
+        self.ultimo = (instante, latitude, longitude)
+
+    # Codifica os primeiros pontos do bloco
+    def codificar(self, quantidade: int) -> bytes:
+        """
+        Codifica os primeiros pontos do bloco no formato gravado no banco.
+
+        Args:
+            quantidade (int): Quantidade de pontos, a partir do primeiro.
+
+        Returns:
+            bytes: Cabeçalho e colunas de diferenças, comprimidos com zlib.
+        """
+        partes = [_CABECALHO.pack(quantidade, *self.base)]
+        for coluna in (self.tempos, self.latitudes, self.longitudes):
+            partes.append(_bytes_int32(coluna[:quantidade]))
+        return zlib.compress(b"".join(partes), 1)
+
+    # Descarta os primeiros pontos do bloco
+    def descartar_inicio(self, quantidade: int) -> None:
+        """
+        Remove os primeiros pontos, já selados, rebaseando os demais.
+
+        Args:
+            quantidade (int): Quantidade de pontos removidos.
+        """
+        if quantidade >= len(self.tempos):
+            self.base = (0, 0, 0)
+            del self.tempos[:], self.latitudes[:], self.longitudes[:]
+            return
+        colunas = (self.tempos, self.latitudes, self.longitudes)
+        self.base = tuple(
+            base + sum(coluna[1:quantidade + 1]) for base, coluna in zip(self.base, colunas)
+        )
+        for coluna in colunas:
+            del coluna[:quantidade]
+            coluna[0] = 0
+
+    # Decodifica os pontos do bloco
+    def trilha(self) -> Trilha:
+        """
+        Converte os pontos do bloco em valores absolutos.
+
+        Returns:
+            Trilha: Pontos do bloco.
+        """
+        tempo, lat, lon = self.base
+        return _trilha(
+            _absolutos(tempo, self.tempos), _absolutos(lat, self.latitudes), _absolutos(lon, self.longitudes)
+        )
+
+def _trilha(instantes: List[int], latitudes: List[int], longitudes: List[int]) -> Trilha:
+    return Trilha(
+        array("q", instantes),
+        array("d", [valor / ESCALA_COORDENADAS for valor in latitudes]),
+        array("d", [valor / ESCALA_COORDENADAS for valor in longitudes]),
+    )
+
+# Decodifica um bloco selado
+def decodificar_bloco(dados: bytes) -> Trilha:
+    """
+    Decodifica um bloco gravado por `BlocoAberto.codificar`.
+
+    Args:
+        dados (bytes): Conteúdo da coluna `dados` do bloco.
+
+    Returns:
+        Trilha: Pontos do bloco.
+    """
+    bruto = zlib.decompress(dados)
+    quantidade, tempo, lat, lon = _CABECALHO.unpack_from(bruto)
+    inicio = _CABECALHO.size
+    colunas = [_int32_de_bytes(bruto, inicio + 4 * quantidade * indice, quantidade) for indice in range(3)]
+    return _trilha(
+        _absolutos(tempo, colunas[0]), _absolutos(lat, colunas[1]), _absolutos(lon, colunas[2])
+    )
+
+def _apos_commit(session: Session) -> None:
+    selagens, session.info[_CHAVE_SELAGENS] = session.info.get(_CHAVE_SELAGENS, []), []
+    for armazem, viagem_id, estado, quantidade, finalizar in selagens:
+        armazem._confirmar(viagem_id, estado, quantidade, finalizar)
+
+def _apos_rollback(session: Session, _transacao) -> None:
+    selagens, session.info[_CHAVE_SELAGENS] = session.info.get(_CHAVE_SELAGENS, []), []
+    for armazem, _viagem_id, estado, _quantidade, _finalizar in selagens:
+        armazem._desfazer(estado)
+
+def _apos_transacao(session: Session, transacao) -> None:
+    # Session.close() encerra a transação sem disparar after_soft_rollback;
+    # as selagens que restarem aqui não chegaram ao commit
+    if transacao.parent is None:
+        _apos_rollback(session, transacao)
+
+class _EstadoViagem:
+    __slots__ = ("bloco", "atualizado", "selando")
+
+    def __init__(self, agora: float) -> None:
+        self.bloco = BlocoAberto()
+        self.atualizado = agora
+        self.selando = False
+
+class ArmazemPosicoes:
+    """
+    Armazém das posições de GPS, com um bloco aberto por viagem.
+
+    Os pontos de cada viagem devem chegar em ordem crescente de instante;
+    pontos com instante igual ou anterior ao último aceito são descartados,
+    o que torna idempotente o reenvio de um lote pelo dispositivo.
+    """
+
+    def __init__(
+        self,
+        capacidade_bloco: int = 4096,
+        selagem_segundos: float = 60.0,
+        relogio: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Inicializa o armazém.
+
+        Args:
+            capacidade_bloco (int): Quantidade de pontos que sela um bloco.
+            selagem_segundos (float): Tempo sem novos pontos após o qual o
+                bloco aberto de uma viagem é selado.
+            relogio (Callable[[], float]): Relógio monotônico, em segundos.
+        """
+        self.capacidade_bloco = capacidade_bloco
+        self.selagem_segundos = selagem_segundos
+        self._relogio = relogio
+        self._viagens: Dict[int, _EstadoViagem] = {}
+        self._trava = threading.Lock()
+        self._proxima_varredura = relogio() + selagem_segundos
+        self.pontos_aceitos = 0
+        self.pontos_descartados = 0
+        self.blocos_selados = 0
+
+    # Registra um trecho de posições de uma viagem
+    def registrar(
+        self,
+        session: Session,
+        viagem_id: int,
+        instantes: Sequence[int],
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+    ) -> int:
+        """
+        Acrescenta posições ao bloco aberto da viagem.
+
+        Os blocos cheios ou parados são adicionados à sessão; cabe ao
+        chamador confirmar a transação.
+
+        Args:
+            session (Session): Sessão da unidade de trabalho.
+            viagem_id (int): Identificador da viagem.
+            instantes (Sequence[int]): Instantes em milissegundos, crescentes.
+            latitudes (Sequence[float]): Latitudes em graus.
+            longitudes (Sequence[float]): Longitudes em graus.
+
+        Returns:
+            int: Quantidade de pontos aceitos.
+        """
+        ultimo = None
+        if viagem_id not in self._viagens:
+            ultimo = session.scalar(
+                select(func.max(BlocoPosicoes.instante_final)).where(BlocoPosicoes.viagem_id == viagem_id)
+            )
+        aceitos = 0
+        cheio = False
+        with self._trava:
+            agora = self._relogio()
+            if viagem_id not in self._viagens:
+                self._viagens[viagem_id] = _EstadoViagem(agora)
+                if ultimo is not None:
+                    # Só o instante é comparado; o bloco vazio recebe uma nova base
+                    self._viagens[viagem_id].bloco.ultimo = (ultimo, 0, 0)
+            estado = self._viagens[viagem_id]
+            bloco = estado.bloco
+            for instante, latitude, longitude in zip(instantes, latitudes, longitudes):
+                anterior = bloco.ultimo
+                if anterior is not None and (instante <= anterior[0] or instante - anterior[0] > _LIMITE_INT32):
+                    continue
+                bloco.acrescentar(
+                    instante,
+                    round(latitude * ESCALA_COORDENADAS),
+                    round(longitude * ESCALA_COORDENADAS),
+                )
+                aceitos += 1
+            if aceitos:
+                estado.atualizado = agora
+            self.pontos_aceitos += aceitos
+            self.pontos_descartados += len(instantes) - aceitos
+            cheio = len(bloco) >= self.capacidade_bloco
+            parados: List[int] = []
+            if agora >= self._proxima_varredura:
+                self._proxima_varredura = agora + self.selagem_segundos
+                parados = [
+                    outra
+                    for outra, outro in self._viagens.items()
+                    if outra != viagem_id and agora - outro.atualizado >= self.selagem_segundos
+                ]
+        if cheio:
+            self._selar(session, viagem_id, finalizar=False)
+        for outra in parados:
+            self._selar(session, outra, finalizar=True)
+        return aceitos
+
+    # Sela o bloco aberto da viagem
+    def selar(self, session: Session, viagem_id: int) -> None:
+        """
+        Adiciona à sessão o bloco aberto da viagem, ao encerrá-la.
+
+        A viagem deixa o armazém após o commit; pontos posteriores voltam a
+        ser comparados com o último instante gravado.
+
+        Args:
+            session (Session): Sessão da unidade de trabalho.
+            viagem_id (int): Identificador da viagem.
+        """
+        self._selar(session, viagem_id, finalizar=True)
+
+    # Sela os blocos abertos de todas as viagens
+    def selar_abertos(self, session: Session) -> None:
+        """
+        Adiciona à sessão os blocos abertos de todas as viagens, no desligamento.
+
+        Args:
+            session (Session): Sessão da unidade de trabalho.
+        """
+        with self._trava:
+            viagens = list(self._viagens)
+        for viagem_id in viagens:
+            self._selar(session, viagem_id, finalizar=True)
+
+    def _selar(self, session: Session, viagem_id: int, finalizar: bool) -> None:
+        with self._trava:
+            estado = self._viagens.get(viagem_id)
+            if estado is None or estado.selando:
+                return
+            bloco = estado.bloco
+            quantidade = len(bloco)
+            if quantidade == 0:
+                if finalizar:
+                    del self._viagens[viagem_id]
+                return
+            dados = bloco.codificar(quantidade)
+            inicial, final = bloco.base[0], bloco.ultimo[0]
+            estado.selando = True
+
+        session.add(
+            BlocoPosicoes(
+                viagem_id=viagem_id,
+                instante_inicial=inicial,
+                instante_final=final,
+                quantidade=quantidade,
+                dados=dados,
+            )
+        )
+        selagens = session.info.get(_CHAVE_SELAGENS)
+        if selagens is None:
+            selagens = session.info[_CHAVE_SELAGENS] = []
+            event.listen(session, "after_commit", _apos_commit)
+            event.listen(session, "after_soft_rollback", _apos_rollback)
+            event.listen(session, "after_transaction_end", _apos_transacao)
+        selagens.append((self, viagem_id, estado, quantidade, finalizar))
+
+    def _confirmar(self, viagem_id: int, estado: _EstadoViagem, quantidade: int, finalizar: bool) -> None:
+        with self._trava:
+            estado.bloco.descartar_inicio(quantidade)
+            estado.selando = False
+            self.blocos_selados += 1
+            if finalizar and not estado.bloco.tempos and self._viagens.get(viagem_id) is estado:
+                del self._viagens[viagem_id]
+
+    def _desfazer(self, estado: _EstadoViagem) -> None:
+        with self._trava:
+            estado.selando = False
+
+    # Lê a trilha completa da viagem
+    def trilha(self, session: Session, viagem_id: int) -> Trilha:
+        """
+        Lê os blocos selados e o bloco aberto da viagem.
+
+        Um bloco adicionado à sessão e ainda não confirmado não é lido do
+        banco; seus pontos continuam no bloco aberto até o commit.
+
+        Args:
+            session (Session): Sessão usada na leitura dos blocos.
+            viagem_id (int): Identificador da viagem.
+
+        Returns:
+            Trilha: Posições da viagem em ordem cronológica.
+        """
+        with self._trava:
+            estado = self._viagens.get(viagem_id)
+            aberto = estado.bloco.trilha() if estado is not None else None
+        resultado = Trilha.vazia()
+        with session.no_autoflush:
+            blocos = session.scalars(
+                select(BlocoPosicoes.dados)
+                .where(BlocoPosicoes.viagem_id == viagem_id)
+                .order_by(BlocoPosicoes.instante_inicial, BlocoPosicoes.id)
+            ).all()
+        for dados in blocos:
+            resultado.estender(decodificar_bloco(dados))
+        if aberto is not None:
+            resultado.estender(aberto)
+        return resultado
+
+    # Quantidade de pontos da viagem
+    def quantidade(self, session: Session, viagem_id: int) -> int:
+        """
+        Conta os pontos da viagem sem decodificar os blocos.
+
+        Args:
+            session (Session): Sessão usada na leitura dos blocos.
+            viagem_id (int): Identificador da viagem.
+
+        Returns:
+            int: Pontos selados e do bloco aberto.
+        """
+        with self._trava:
+            estado = self._viagens.get(viagem_id)
+            abertos = len(estado.bloco) if estado is not None else 0
+        with session.no_autoflush:
+            selados = session.scalar(
+                select(func.coalesce(func.sum(BlocoPosicoes.quantidade), 0)).where(
+                    BlocoPosicoes.viagem_id == viagem_id
+                )
+            )
+        return int(selados) + abertos
+
+    # Contadores do armazém
+    def estatisticas(self) -> EstatisticasArmazem:
+        """
+        Retorna os contadores do armazém.
+
+        Returns:
+            EstatisticasArmazem: Viagens e pontos em memória e totais.
+        """
+        with self._trava:
+            return EstatisticasArmazem(
+                viagens_abertas=len(self._viagens),
+                pontos_em_memoria=sum(len(estado.bloco) for estado in self._viagens.values()),
+                pontos_aceitos=self.pontos_aceitos,
+                pontos_descartados=self.pontos_descartados,
+                blocos_selados=self.blocos_selados,
+            )
@@ -1,9 +1,250 @@
 
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.routes import motoristas, veiculos, viagens
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from app.api import healthcheck, metricas
+from app.api.v1.routes import admin, agendador, auth, configuracoes, motoristas, relatorios, sync, telemetria, veiculos, viagens
+from app.application.services.anomalia_abastecimento_service import (
+    DetectorAnomaliasAbastecimento,
+    DetectoresTenants,
+    ativar_deteccao_anomalias,
+)
+from app.application.services.configuracao_cache_service import (
+    CacheConfiguracoes,
+    carregador_banco,
+    carregador_tenants,
+)
+from app.application.services.manutencao_service import PrevisaoManutencaoService
+from app.application.services.relatorio_job_service import GerenciadorRelatorios
+from app.application.services.resumo_custo_service import ativar_resumo_custos
+from app.application.services.saude_service import LimitesProntidao, VerificadorProntidao
+from app.application.services.tarefas_agendadas import registrar_tarefas_frota
+from app.application.services.trilha_service import CacheTrilhas, TelemetriaTenants
+from app.application.services.usuario_cache_service import CacheUsuarios, ativar_invalidacao_usuarios
+from app.infrastructure.agendamento.agendador import Agendador
+from app.infrastructure.auth.jwt_service import SECRET_KEY, VerificadorTokens
+from app.infrastructure.auth.password_service import LimitadorTentativas, ServicoSenhas
+from app.infrastructure.messaging.event_dispatcher import EventDispatcher
+from app.infrastructure.messaging.handlers.alerta_handler import AlertaHandler
+from app.infrastructure.observabilidade.instrumentacao import MiddlewareMetricas, ativar_metricas_sql
+from app.infrastructure.observabilidade.metricas import REGISTRO
+from app.infrastructure.observabilidade.perfil_consultas import LOGGER_CONSULTAS_LENTAS, PerfilConsultas, ativar_perfil_sql
+from app.infrastructure.persistence.sqlalchemy.database import SessionLocal, engine
+from app.infrastructure.persistence.sqlalchemy.tenant_router import RoteadorTenants
+from app.infrastructure.sync.outbox import FiltroIdempotencia, MensagemOutbox, OutboxRelay
+from app.infrastructure.telemetria.armazem import ArmazemPosicoes
+from app.infrastructure.sync.sync_service import ativar_rastreamento_alteracoes
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Log de alterações para a sincronização dos dispositivos de campo
+    ativar_rastreamento_alteracoes(SessionLocal)
+    # Resumos mensais de custo das viagens
+    ativar_resumo_custos(SessionLocal)
+    # Medição dos comandos SQL em todas as engines, inclusive as dos tenants
+    ativar_metricas_sql(Engine)
+    REGISTRO.medidor("db_pool_conexoes_em_uso", "Conexões do pool principal em uso.", _conexoes_em_uso)
+
+    # Perfil das consultas e log de consultas lentas
+    perfil_consultas = None
+    if settings.perfil_consultas_habilitado:
+        perfil_consultas = PerfilConsultas(
+            limite_lenta_ms=settings.perfil_consultas_lenta_ms,
+            capacidade=settings.perfil_consultas_capacidade,
+            explicar=settings.perfil_consultas_explicar,
+        )
+        ativar_perfil_sql(Engine, perfil_consultas)
+        if settings.perfil_consultas_arquivo:
+            _registrar_arquivo_consultas_lentas(settings.perfil_consultas_arquivo)
+    app.state.perfil_consultas = perfil_consultas
+
+    # Pool de hash de senhas, fora do loop de eventos
+    app.state.servico_senhas = ServicoSenhas(
+        custo=settings.senha_custo,
+        workers=settings.senha_workers,
+        processos=settings.senha_processos,
+        limitador=LimitadorTentativas(
+            settings.login_max_tentativas,
+            janela=settings.login_janela_segundos,
+            bloqueio=settings.login_bloqueio_segundos,
+        ),
+    )
+
+    # Caches da autenticação: claims dos tokens e usuários
+    app.state.verificador_tokens = VerificadorTokens(SECRET_KEY, capacidade=settings.jwt_cache_tokens)
+    app.state.cache_usuarios = CacheUsuarios(
+        SessionLocal,
+        capacidade=settings.usuarios_cache_capacidade,
+        ttl=settings.usuarios_cache_ttl,
+    )
+    ativar_invalidacao_usuarios(SessionLocal, app.state.cache_usuarios)
+
+    # Bancos separados por tenant, abertos sob demanda
+    roteador_tenants = None
+    if settings.tenants_habilitado:
+        roteador_tenants = RoteadorTenants(
+            settings.tenants_diretorio,
+            capacidade=settings.tenants_max_engines,
+            tenants=settings.tenants_registrados,
+        )
+    app.state.roteador_tenants = roteador_tenants
+
+    # Anomalias dos abastecimentos novos, a partir do padrão do histórico;
+    # os tenants com banco próprio têm detectores próprios
+    app.state.detector_anomalias = DetectorAnomaliasAbastecimento()
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, _aquecer_detector, app.state.detector_anomalias)
+    except SQLAlchemyError:
+        logger.exception("Falha ao carregar o histórico de abastecimentos")
+    app.state.detectores_tenants = DetectoresTenants() if roteador_tenants else None
+    ativar_deteccao_anomalias(SessionLocal, app.state.detector_anomalias, app.state.detectores_tenants)
+
+    # Blocos abertos das posições de GPS e geometria das trilhas por viagem;
+    # os tenants com banco próprio recebem os seus no primeiro acesso
+    app.state.armazem_posicoes, app.state.cache_trilhas = _criar_telemetria()
+    app.state.telemetria_tenants = TelemetriaTenants(_criar_telemetria) if roteador_tenants else None
+
+    # Agenda de manutenções preventivas, alimentada pelas leituras de hodômetro
+    app.state.previsao_manutencao = PrevisaoManutencaoService()
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, _carregar_previsao, app.state.previsao_manutencao)
+    except SQLAlchemyError:
+        logger.exception("Falha ao carregar a agenda de manutenções")
+
+    # Cache das configurações por tenant
+    app.state.cache_configuracoes = CacheConfiguracoes(
+        carregador_tenants(roteador_tenants) if roteador_tenants else carregador_banco(SessionLocal),
+        ttl=settings.configuracoes_cache_ttl,
+        ttl_local=settings.configuracoes_cache_ttl_local,
+    )
+
+    # Dispatcher de eventos de domínio
+    dispatcher = EventDispatcher(tamanho_fila=settings.event_queue_size)
+    alertas = AlertaHandler(filtro=FiltroIdempotencia(settings.outbox_idempotencia_capacidade))
+    dispatcher.registrar(MensagemOutbox, alertas, nome="alertas.outbox")
+    await dispatcher.iniciar()
+    app.state.event_dispatcher = dispatcher
 
-app = FastAPI(title="Sistema de Frota", version="1.0.0")
+    # Relay do outbox transacional
+    parar_relay = asyncio.Event()
+    relay = OutboxRelay(
+        SessionLocal,
+        dispatcher.publicar_threadsafe,
+        tamanho_lote=settings.outbox_batch_size,
+    )
+    tarefa_relay = asyncio.create_task(relay.executar(parar_relay, settings.outbox_poll_interval))
+
+    # Pool de geração de relatórios
+    app.state.gerenciador_relatorios = GerenciadorRelatorios(
+        SessionLocal,
+        settings.relatorios_diretorio,
+        workers=settings.relatorios_workers,
+        retencao=timedelta(hours=settings.relatorios_retencao_horas),
+        roteador=roteador_tenants,
+    )
+
+    # Agendador das tarefas recorrentes
+    agendador_tarefas = None
+    if settings.agendador_habilitado:
+        agendador_tarefas = Agendador(
+            SessionLocal,
+            workers=settings.agendador_workers,
+            processos=settings.agendador_processos,
+            intervalo=settings.agendador_intervalo,
+        )
+        registrar_tarefas_frota(agendador_tarefas, app.state.previsao_manutencao)
+        agendador_tarefas.agendar(
+            "relatorios.limpeza",
+            app.state.gerenciador_relatorios.limpar_expiradas,
+            "*/15 * * * *",
+            exclusiva=False,
+        )
+        await agendador_tarefas.iniciar()
+    app.state.agendador = agendador_tarefas
+
+    # Sondas de prontidão
+    app.state.verificador_prontidao = VerificadorProntidao(
+        engine,
+        agendador=lambda: app.state.agendador,
+        limites=LimitesProntidao(
+            latencia_banco_ms=settings.saude_banco_latencia_max_ms,
+            saturacao_pool=settings.saude_pool_saturacao_max,
+            outbox_pendentes=settings.saude_outbox_max_pendentes,
+            outbox_idade_segundos=settings.saude_outbox_idade_max_segundos,
+            atraso_agendador_segundos=settings.saude_agendador_atraso_max_segundos,
+        ),
+        validade=settings.saude_cache_segundos,
+    )
+
+    yield
+
+    if agendador_tarefas is not None:
+        await agendador_tarefas.parar(esperar=False)
+    app.state.gerenciador_relatorios.encerrar(esperar=False)
+    parar_relay.set()
+    await tarefa_relay
+    await dispatcher.parar()
+    with SessionLocal() as session:
+        app.state.armazem_posicoes.selar_abertos(session)
+        session.commit()
+    if roteador_tenants is not None:
+        for tenant_id, armazem in app.state.telemetria_tenants.armazens():
+            with roteador_tenants.sessao(tenant_id) as session:
+                armazem.selar_abertos(session)
+                session.commit()
+        roteador_tenants.encerrar()
+    app.state.servico_senhas.encerrar(esperar=False)
+
+def _criar_telemetria():
+    armazem = ArmazemPosicoes(
+        capacidade_bloco=settings.telemetria_capacidade_bloco,
+        selagem_segundos=settings.telemetria_selagem_segundos,
+    )
+    # Geometria das trilhas apenas quando o NumPy está instalado
+    try:
+        trilhas = CacheTrilhas(
+            armazem,
+            capacidade=settings.trilhas_cache_capacidade,
+            velocidade_parada_kmh=settings.trilhas_parada_velocidade_kmh,
+            parada_minima_segundos=settings.trilhas_parada_minima_segundos,
+            tolerancia_pixels=settings.trilhas_tolerancia_pixels,
+            tolerancia_divergencia=settings.trilhas_divergencia_percentual,
+            idade_minima_segundos=settings.trilhas_idade_minima_segundos,
+        )
+    except ImportError:
+        trilhas = None
+    return armazem, trilhas
+
+def _aquecer_detector(detector):
+    with SessionLocal() as session:
+        detector.varrer_historico(session, gravar=False)
+
+def _carregar_previsao(previsao):
+    with SessionLocal() as session:
+        previsao.carregar(session)
+
+def _conexoes_em_uso():
+    checkedout = getattr(engine.pool, "checkedout", None)
+    return checkedout() if checkedout is not None else None
+
+def _registrar_arquivo_consultas_lentas(caminho):
+    logger = logging.getLogger(LOGGER_CONSULTAS_LENTAS)
+    if not any(getattr(handler, "baseFilename", None) == os.path.abspath(caminho) for handler in logger.handlers):
+        handler = logging.FileHandler(caminho, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+
+app = FastAPI(title="Sistema de Frota", version="1.0.0", lifespan=lifespan)
 
 # CORS para frontend
 app.add_middleware(
@@ -14,7 +255,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latência, status e consultas por rota
+app.add_middleware(MiddlewareMetricas, limite_consultas=settings.metricas_limite_consultas)
+
+# Sondas do orquestrador e métricas
+app.include_router(healthcheck.router)
+app.include_router(metricas.router)
+
 # Rotas
+app.include_router(auth.router, prefix="/api/v1")
 app.include_router(motoristas.router, prefix="/api/v1")
 app.include_router(veiculos.router, prefix="/api/v1")
-app.include_router(viagens.router, prefix="/api/v1")
\ No newline at end of file
+app.include_router(viagens.router, prefix="/api/v1")
+app.include_router(sync.router, prefix="/api/v1")
+app.include_router(telemetria.router, prefix="/api/v1")
+app.include_router(relatorios.router, prefix="/api/v1")
+app.include_router(agendador.router, prefix="/api/v1")
+app.include_router(configuracoes.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
\ No newline at end of file
@@ -1,10 +1,82 @@
 
+from typing import List, Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     app_name: str = "Sistema de Frota"
     database_url: str = "sqlite:///./frota.db"
     secret_key: str = "your-secret-key"
+
+    # Eventos de domínio
+    event_queue_size: int = 1000
+    outbox_batch_size: int = 500
+    outbox_poll_interval: float = 1.0
+    outbox_idempotencia_capacidade: int = 100_000
+
+    # Relatórios gerados em segundo plano
+    relatorios_diretorio: str = "./relatorios"
+    relatorios_workers: int = 2
+    relatorios_retencao_horas: float = 1.0
+
+    # Agendador de tarefas recorrentes
+    agendador_habilitado: bool = True
+    agendador_workers: int = 4
+    agendador_processos: int = 1
+    agendador_intervalo: float = 1.0
+
+    # Cache das configurações por tenant
+    configuracoes_cache_ttl: float = 60.0
+    configuracoes_cache_ttl_local: float = 5.0
+
+    # Bancos SQLite separados por tenant
+    tenants_habilitado: bool = False
+    tenants_diretorio: str = "./tenants"
+    tenants_max_engines: int = 32
+    tenants_registrados: List[str] = []
+
+    # Senhas e login
+    senha_custo: int = 12
+    senha_workers: int = 4
+    senha_processos: bool = False
+    login_max_tentativas: int = 5
+    login_janela_segundos: float = 300.0
+    login_bloqueio_segundos: float = 900.0
+
+    # Caches da autenticação
+    jwt_cache_tokens: int = 10_000
+    usuarios_cache_capacidade: int = 1024
+    usuarios_cache_ttl: float = 300.0
+
+    # Sondas de prontidão
+    saude_cache_segundos: float = 2.0
+    saude_banco_latencia_max_ms: float = 250.0
+    saude_pool_saturacao_max: float = 0.9
+    saude_outbox_max_pendentes: int = 10_000
+    saude_outbox_idade_max_segundos: float = 300.0
+    saude_agendador_atraso_max_segundos: float = 30.0
+
+    # Posições de GPS das viagens
+    telemetria_capacidade_bloco: int = 4096
+    telemetria_selagem_segundos: float = 60.0
+
+    # Análise das trilhas de GPS (requer o extra analytics)
+    trilhas_cache_capacidade: int = 32
+    trilhas_parada_velocidade_kmh: float = 5.0
+    trilhas_parada_minima_segundos: float = 300.0
+    trilhas_tolerancia_pixels: float = 1.0
+    trilhas_divergencia_percentual: float = 10.0
+    trilhas_idade_minima_segundos: float = 5.0
+
+    # Métricas
+    metricas_limite_consultas: int = 50
+
+    # Perfil das consultas SQL e log de consultas lentas
+    perfil_consultas_habilitado: bool = True
+    perfil_consultas_lenta_ms: float = 100.0
+    perfil_consultas_capacidade: int = 1000
+    perfil_consultas_explicar: bool = True
+    perfil_consultas_arquivo: Optional[str] = None
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,93 @@
+"""
+Benchmark do detector de anomalias em abastecimentos.
+
+Gera um fluxo sintético de abastecimentos em ordem cronológica, com uma
+pequena fração de fraudes e erros injetados (tanque excedido, hodômetro
+regredido, combustível trocado, preço inflado), e mede a vazão do
+DetectorAnomaliasAbastecimento em eventos por segundo em um único núcleo.
+
+Uso:
+    python -m benchmarks.bench_anomalias --eventos 1000000 --veiculos 5000
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from typing import List, NamedTuple, Optional
+
+from app.application.services.anomalia_abastecimento_service import DetectorAnomaliasAbastecimento
+from app.infrastructure.persistence.sqlalchemy.models import TipoCombustivel
+
+CIDADES = ["Curitiba", "Londrina", "Maringá", "Cascavel", "Ponta Grossa", "Joinville", "Blumenau", "Chapecó"]
+COMBUSTIVEIS = [TipoCombustivel.DIESEL, TipoCombustivel.FLEX, TipoCombustivel.GASOLINA]
+PRECOS = {TipoCombustivel.DIESEL: 6.1, TipoCombustivel.GASOLINA: 6.3, TipoCombustivel.ETANOL: 4.4}
+
+class Evento(NamedTuple):
+    id: int
+    veiculo_id: int
+    quilometragem: float
+    litros: float
+    valor_litro: float
+    tipo_combustivel: Optional[TipoCombustivel]
+    cidade: str
+
+def _gerar(detector: DetectorAnomaliasAbastecimento, eventos: int, veiculos: int,
+           fraude: float, semente: int) -> List[Evento]:
+    """Cadastra os veículos no detector e gera o fluxo de abastecimentos."""
+    aleatorio = random.Random(semente)
+    frota = []
+    for veiculo_id in range(1, veiculos + 1):
+        combustivel = aleatorio.choice(COMBUSTIVEIS)
+        tanque = aleatorio.choice((50.0, 80.0, 150.0, 300.0))
+        detector.registrar_veiculo(veiculo_id, tanque, combustivel)
+        abastece = TipoCombustivel.GASOLINA if combustivel is TipoCombustivel.FLEX else combustivel
+        frota.append([veiculo_id, tanque, abastece, aleatorio.uniform(3.0, 12.0), 0.0])
+
+    fluxo = []
+    for evento_id in range(1, eventos + 1):
+        veiculo = frota[aleatorio.randrange(veiculos)]
+        veiculo_id, tanque, combustivel, km_l, km = veiculo
+        litros = tanque * aleatorio.uniform(0.4, 0.95)
+        km += litros * km_l * aleatorio.gauss(1.0, 0.05)
+        veiculo[4] = km
+        valor = PRECOS[combustivel] * aleatorio.gauss(1.0, 0.02)
+        if aleatorio.random() < fraude:
+            tipo = aleatorio.randrange(4)
+            if tipo == 0:
+                litros = tanque * 1.4
+            elif tipo == 1:
+                km -= 800
+            elif tipo == 2:
+                combustivel = TipoCombustivel.ETANOL if combustivel is TipoCombustivel.DIESEL else TipoCombustivel.DIESEL
+            else:
+                valor *= 1.5
+        fluxo.append(Evento(evento_id, veiculo_id, km, litros, valor, combustivel, aleatorio.choice(CIDADES)))
+    return fluxo
+
+def main() -> None:
+    """Executa o benchmark e imprime a vazão e a contagem por motivo."""
+    parser = argparse.ArgumentParser(description="Benchmark do detector de anomalias em abastecimentos")
+    parser.add_argument("--eventos", type=int, default=1_000_000)
+    parser.add_argument("--veiculos", type=int, default=5000)
+    parser.add_argument("--fraude", type=float, default=0.01, help="fração de eventos adulterados")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    detector = DetectorAnomaliasAbastecimento()
+    fluxo = _gerar(detector, args.eventos, args.veiculos, args.fraude, args.semente)
+
+    inicio = time.perf_counter()
+    anomalias = list(detector.processar_lote(fluxo))
+    duracao = time.perf_counter() - inicio
+
+    motivos = Counter(motivo.value for anomalia in anomalias for motivo in anomalia.motivos)
+    print(f"Eventos:   {len(fluxo):,} ({args.veiculos} veículos)")
+    print(f"Duração:   {duracao:.3f}s")
+    print(f"Vazão:     {len(fluxo) / duracao:,.0f} eventos/s")
+    print(f"Suspeitos: {len(anomalias):,}")
+    for motivo, quantidade in motivos.most_common():
+        print(f"  {motivo:<26} {quantidade:,}")
+
+if __name__ == "__main__":
+    main()
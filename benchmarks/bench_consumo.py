@@ -0,0 +1,109 @@
+"""
+Benchmark da análise vetorizada de consumo de combustível.
+
+Gera um ano de abastecimentos de uma frota sintética e mede o
+AnaliseConsumoService calculando os indicadores por abastecimento e o resumo
+por veículo. Com --banco, mede também a carga dos abastecimentos de um banco
+SQLite para os arrays colunares. O processo termina com erro quando o tempo
+total passa de --limite segundos (um ano da frota em menos de um segundo).
+
+Uso:
+    python -m benchmarks.bench_consumo --veiculos 2000 --abastecimentos 120 [--banco] [--limite 1.0]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Tuple
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.application.services.analise_consumo_service import AnaliseConsumoService, DadosAbastecimento
+from app.infrastructure.persistence.sqlalchemy.models import Abastecimento, Base
+
+def _gerar(veiculos: int, por_veiculo: int, semente: int) -> Tuple[DadosAbastecimento, "np.ndarray"]:
+    """Gera abastecimentos ordenados por veículo e data ao longo de um ano, com as datas."""
+    aleatorio = np.random.default_rng(semente)
+    n = veiculos * por_veiculo
+    veiculo_id = np.repeat(np.arange(1, veiculos + 1, dtype=np.int64), por_veiculo)
+    litros = aleatorio.uniform(40, 300, n)
+    km_l = np.repeat(aleatorio.uniform(2.5, 12, veiculos), por_veiculo) * aleatorio.normal(1, 0.08, n)
+    km = np.cumsum(litros * km_l).reshape(veiculos, por_veiculo)
+    km -= km[:, :1]
+    segundos = np.sort(aleatorio.integers(0, 365 * 86400, (veiculos, por_veiculo)), axis=1)
+    dados = DadosAbastecimento(
+        veiculo_id=veiculo_id,
+        quilometragem=km.ravel(),
+        litros=litros,
+        valor_litro=aleatorio.uniform(5.5, 6.8, n),
+        consumo_referencia={i: 8.0 for i in range(1, veiculos + 1)},
+    )
+    return dados, np.datetime64("2025-01-01T00:00:00") + segundos.ravel().astype("timedelta64[s]")
+
+def _gravar(engine, dados: DadosAbastecimento, datas: "np.ndarray") -> None:
+    """Grava os abastecimentos gerados no banco."""
+    datas = datas.astype(datetime).tolist()
+    linhas = [
+        {
+            "veiculo_id": v, "data": d, "quilometragem": k,
+            "litros": l, "valor_litro": p, "valor_total": l * p,
+        }
+        for v, d, k, l, p in zip(
+            dados.veiculo_id.tolist(), datas, dados.quilometragem.tolist(),
+            dados.litros.tolist(), dados.valor_litro.tolist(),
+        )
+    ]
+    with engine.begin() as conexao:
+        conexao.execute(insert(Abastecimento.__table__), linhas)
+
+def main() -> None:
+    """Executa o benchmark e imprime o tempo de cada etapa."""
+    parser = argparse.ArgumentParser(description="Benchmark da análise de consumo")
+    parser.add_argument("--veiculos", type=int, default=2000)
+    parser.add_argument("--abastecimentos", type=int, default=120, help="abastecimentos por veículo no ano")
+    parser.add_argument("--janela", type=int, default=5)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--banco", action="store_true", help="inclui a carga a partir do SQLite")
+    parser.add_argument("--limite", type=float, default=1.0, help="tempo total máximo, em segundos")
+    args = parser.parse_args()
+
+    dados, datas = _gerar(args.veiculos, args.abastecimentos, args.semente)
+    service = AnaliseConsumoService(janela_media=args.janela)
+    print(f"Abastecimentos: {len(dados):,} ({args.veiculos} veículos, 1 ano)")
+
+    duracao_carga = 0.0
+    if args.banco:
+        with tempfile.TemporaryDirectory() as diretorio:
+            engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'consumo.db')}")
+            Base.metadata.create_all(engine)
+            _gravar(engine, dados, datas)
+            with sessionmaker(bind=engine)() as session:
+                inicio = time.perf_counter()
+                dados = DadosAbastecimento.carregar(session)
+                duracao_carga = time.perf_counter() - inicio
+                print(f"Carga do banco:     {duracao_carga:.3f}s")
+            engine.dispose()
+
+    inicio = time.perf_counter()
+    consumo = service.calcular(dados)
+    duracao_calculo = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    resumos = service.resumir(dados, consumo)
+    duracao_resumo = time.perf_counter() - inicio
+
+    print(f"Indicadores:        {duracao_calculo:.3f}s")
+    print(f"Resumo por veículo: {duracao_resumo:.3f}s ({len(resumos)} veículos)")
+    print(f"Consumo médio da frota: {np.nanmean([r.consumo_km_l for r in resumos]):.2f} km/l")
+
+    total = duracao_carga + duracao_calculo + duracao_resumo
+    print(f"Total:              {total:.3f}s (limite {args.limite:.3f}s)")
+    if total > args.limite:
+        sys.exit(f"Tempo total acima do limite de {args.limite:.3f}s")
+
+if __name__ == "__main__":
+    main()
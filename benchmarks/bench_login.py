@@ -0,0 +1,124 @@
+"""
+Benchmark de logins simultâneos.
+
+Simula a troca de turno: várias rajadas de logins concorrentes contra um
+banco SQLite temporário, enquanto uma tarefa de "pulso" mede a latência de
+uma requisição leve atendida pelo mesmo loop de eventos. Compara a
+verificação do bcrypt executada dentro do loop (modo bloqueante) com o
+`ServicoSenhas`, que a executa em um pool, e imprime os percentis de latência
+dos logins e do pulso em cada modo.
+
+Uso:
+    python -m benchmarks.bench_login --logins 64 --concorrencia 32 --custo 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import List, Sequence
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.application.use_cases.usuario.autenticar_usuario import AutenticarUsuarioUseCase
+from app.infrastructure.auth.password_service import LimitadorTentativas, ServicoSenhas, _gerar_hash, _verificar
+from app.infrastructure.persistence.sqlalchemy.models import Base, Usuario
+
+SENHA = "turno-da-manha"
+
+def _percentil(valores: Sequence[float], fracao: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
+
+def _resumo(nome: str, latencias: List[float]) -> str:
+    ms = [valor * 1000 for valor in latencias]
+    return (
+        f"  {nome:<8} n={len(ms):<5} p50={_percentil(ms, 0.50):8.1f} ms  "
+        f"p95={_percentil(ms, 0.95):8.1f} ms  p99={_percentil(ms, 0.99):8.1f} ms  "
+        f"máx={max(ms):8.1f} ms  média={statistics.mean(ms):8.1f} ms"
+    )
+
+async def _pulso(parar: asyncio.Event, latencias: List[float], intervalo: float = 0.005) -> None:
+    """Mede quanto uma tarefa leve atrasa em relação ao instante agendado."""
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(intervalo)
+        latencias.append(time.perf_counter() - inicio - intervalo)
+
+async def _rodada(autenticar, usuarios: int, logins: int, concorrencia: int):
+    """Executa os logins com a concorrência indicada, medindo logins e pulso."""
+    limite = asyncio.Semaphore(concorrencia)
+    latencias_login: List[float] = []
+    latencias_pulso: List[float] = []
+
+    # Todos os logins chegam no início da rajada; a latência inclui a fila
+    async def login(indice: int) -> None:
+        async with limite:
+            usuario = await autenticar(f"motorista{indice % usuarios}@frota.com", SENHA)
+            latencias_login.append(time.perf_counter() - inicio)
+            assert usuario is not None
+
+    parar = asyncio.Event()
+    pulso = asyncio.create_task(_pulso(parar, latencias_pulso))
+    await asyncio.sleep(0)
+    inicio = time.perf_counter()
+    await asyncio.gather(*(login(indice) for indice in range(logins)))
+    duracao = time.perf_counter() - inicio
+    parar.set()
+    await pulso
+    return duracao, latencias_login, latencias_pulso
+
+def main() -> None:
+    """Executa o benchmark nos dois modos e imprime os percentis."""
+    parser = argparse.ArgumentParser(description="Benchmark de logins simultâneos")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concorrencia", type=int, default=32)
+    parser.add_argument("--usuarios", type=int, default=200)
+    parser.add_argument("--custo", type=int, default=10, help="fator de custo do bcrypt")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--processos", action="store_true", help="usa um pool de processos")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'login.db')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        hash_senha = _gerar_hash(SENHA.encode("utf-8"), args.custo)
+        with Session() as session:
+            session.add_all(
+                Usuario(nome=f"Motorista {i}", email=f"motorista{i}@frota.com", senha_hash=hash_senha)
+                for i in range(args.usuarios)
+            )
+            session.commit()
+
+        servico = ServicoSenhas(
+            custo=args.custo,
+            workers=args.workers,
+            processos=args.processos,
+            limitador=LimitadorTentativas(max_tentativas=10 ** 9),
+        )
+        caso_de_uso = AutenticarUsuarioUseCase(Session, servico)
+
+        async def bloqueante(email: str, senha: str):
+            with Session() as session:
+                usuario = session.query(Usuario).filter(Usuario.email == email).first()
+                return usuario if _verificar(senha.encode("utf-8"), usuario.senha_hash) else None
+
+        modos = (("bloqueante", bloqueante), ("pool", caso_de_uso.executar))
+        print(f"Logins: {args.logins} | concorrência: {args.concorrencia} | custo: {args.custo} | "
+              f"pool: {args.workers} {'processos' if args.processos else 'threads'}")
+        try:
+            for nome, autenticar in modos:
+                duracao, logins, pulso = asyncio.run(_rodada(autenticar, args.usuarios, args.logins, args.concorrencia))
+                print(f"{nome}: {duracao:.2f}s ({args.logins / duracao:,.1f} logins/s)")
+                print(_resumo("login", logins))
+                print(_resumo("pulso", pulso))
+        finally:
+            servico.encerrar()
+            engine.dispose()
+
+if __name__ == "__main__":
+    main()
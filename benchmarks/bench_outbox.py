@@ -0,0 +1,69 @@
+"""
+Benchmark de vazão do outbox transacional.
+
+Grava eventos de viagem no outbox em um banco SQLite e mede quantos eventos
+por segundo o OutboxRelay consegue drenar, com um publicador que apenas
+contabiliza as mensagens recebidas.
+
+Uso:
+    python -m benchmarks.bench_outbox --eventos 200000 --lote 1000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from uuid import uuid4
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.events import ViagemEncerrada
+from app.infrastructure.persistence.sqlalchemy.models import OutboxEvento
+from app.infrastructure.sync.outbox import OutboxRelay, registrar_eventos
+
+def main() -> None:
+    """Executa o benchmark e imprime a vazão de gravação e de drenagem."""
+    parser = argparse.ArgumentParser(description="Benchmark do outbox transacional")
+    parser.add_argument("--eventos", type=int, default=200_000)
+    parser.add_argument("--lote", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'outbox.db')}")
+        OutboxEvento.__table__.create(engine)
+        fabrica = sessionmaker(bind=engine)
+
+        # Gravação: uma transação por lote, como vários commits de aggregates
+        inicio = time.perf_counter()
+        session = fabrica()
+        for base in range(0, args.eventos, args.lote):
+            eventos = [
+                ViagemEncerrada(viagem_id=str(uuid4()), duracao_horas=1.5)
+                for _ in range(min(args.lote, args.eventos - base))
+            ]
+            registrar_eventos(session, eventos)
+            session.commit()
+        session.close()
+        duracao_gravacao = time.perf_counter() - inicio
+
+        # Drenagem
+        recebidos = [0]
+
+        def publicar(mensagens):
+            recebidos[0] += len(mensagens)
+
+        relay = OutboxRelay(fabrica, publicar, tamanho_lote=args.lote)
+        inicio = time.perf_counter()
+        drenados = relay.drenar()
+        duracao_drenagem = time.perf_counter() - inicio
+        engine.dispose()
+
+    print(f"Eventos gravados: {args.eventos} em {duracao_gravacao:.2f}s "
+          f"({args.eventos / duracao_gravacao:,.0f} eventos/s)")
+    print(f"Eventos drenados: {drenados} em {duracao_drenagem:.2f}s "
+          f"({drenados / duracao_drenagem:,.0f} eventos/s, lote={args.lote})")
+    assert drenados == recebidos[0] == args.eventos
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Vazão da ingestão de posições de GPS.
+
+Mede, em pontos por segundo, a gravação de lotes de posições de várias
+viagens em andamento, em dois níveis:
+
+- armazem: `ArmazemPosicoes.registrar` e o commit, com a selagem dos blocos;
+- http: `POST /api/v1/telemetria/posicoes` pelo TestClient, incluindo a
+  decodificação do JSON e a validação do corpo.
+
+Cada viagem recebe um ponto por segundo, em passeio aleatório a partir de uma
+capital; o resultado é comparado com a meta de 50 mil pontos por segundo.
+
+Uso:
+    python -m benchmarks.bench_telemetria --viagens 200 --pontos 100 --lotes 50
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+META_PONTOS_SEGUNDO = 50_000
+INICIO_MS = 1_704_103_200_000
+
+def gerar_lotes(viagens: List[int], pontos: int, lotes: int, semente: int) -> List[Dict]:
+    """Corpos de `POST /telemetria/posicoes`, com `pontos` por viagem em cada lote."""
+    aleatorio = random.Random(semente)
+    posicoes = {viagem: [aleatorio.uniform(-30.0, -3.0), aleatorio.uniform(-55.0, -35.0)] for viagem in viagens}
+    corpos = []
+    for lote in range(lotes):
+        trechos = []
+        for viagem in viagens:
+            posicao = posicoes[viagem]
+            instantes, latitudes, longitudes = [], [], []
+            for indice in range(pontos):
+                posicao[0] += aleatorio.uniform(-0.0002, 0.0002)
+                posicao[1] += aleatorio.uniform(-0.0002, 0.0002)
+                instantes.append(INICIO_MS + (lote * pontos + indice) * 1000)
+                latitudes.append(round(posicao[0], 6))
+                longitudes.append(round(posicao[1], 6))
+            trechos.append({"viagem_id": viagem, "instantes": instantes, "latitudes": latitudes, "longitudes": longitudes})
+        corpos.append({"trechos": trechos})
+    return corpos
+
+def _preparar_banco(caminho: str, quantidade: int):
+    from app.infrastructure.persistence.sqlalchemy.models import Base, StatusViagem, Viagem
+    from benchmarks.gerador_frota import GeradorFrota, gravar_app
+
+    engine = create_engine(f"sqlite:///{caminho}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    gravar_app(engine, GeradorFrota(quantidade, quantidade), quantidade, documentos=False)
+    with engine.begin() as conexao:
+        conexao.execute(Viagem.__table__.update().values(status=StatusViagem.EM_ANDAMENTO.name))
+    return engine
+
+def _medir(nome: str, pontos: int, segundos: float) -> None:
+    vazao = pontos / segundos if segundos else 0.0
+    situacao = "ok" if vazao >= META_PONTOS_SEGUNDO else "abaixo da meta"
+    print(f"{nome:<8} {pontos:>10,} pontos  {segundos:>7.2f} s  {vazao:>12,.0f} pontos/s  ({situacao})")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Executa a ingestão direta e pela API e imprime a vazão de cada uma."""
+    parser = argparse.ArgumentParser(description="Vazão da ingestão de posições de GPS")
+    parser.add_argument("--viagens", type=int, default=200, help="viagens em andamento por lote")
+    parser.add_argument("--pontos", type=int, default=100, help="pontos por viagem em cada lote")
+    parser.add_argument("--lotes", type=int, default=50)
+    parser.add_argument("--capacidade-bloco", type=int, default=4096)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.v1.routes import telemetria
+    from app.infrastructure.persistence.sqlalchemy.database import get_db
+    from app.infrastructure.telemetria.armazem import ArmazemPosicoes
+
+    viagens = list(range(1, args.viagens + 1))
+    corpos = gerar_lotes(viagens, args.pontos, args.lotes, args.semente)
+    total = args.viagens * args.pontos * args.lotes
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = _preparar_banco(os.path.join(diretorio, "telemetria.db"), args.viagens)
+        fabrica = sessionmaker(bind=engine)
+
+        armazem = ArmazemPosicoes(capacidade_bloco=args.capacidade_bloco)
+        inicio = time.perf_counter()
+        for corpo in corpos:
+            with fabrica() as session:
+                for trecho in corpo["trechos"]:
+                    armazem.registrar(
+                        session, trecho["viagem_id"], trecho["instantes"], trecho["latitudes"], trecho["longitudes"]
+                    )
+                session.commit()
+        _medir("armazem", total, time.perf_counter() - inicio)
+
+        with engine.begin() as conexao:
+            conexao.exec_driver_sql("DELETE FROM blocos_posicoes")
+        app = FastAPI()
+        app.include_router(telemetria.router, prefix="/api/v1")
+        app.state.armazem_posicoes = ArmazemPosicoes(capacidade_bloco=args.capacidade_bloco)
+
+        def sessao():
+            with fabrica() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = sessao
+        with TestClient(app) as cliente:
+            inicio = time.perf_counter()
+            for corpo in corpos:
+                resposta = cliente.post("/api/v1/telemetria/posicoes", json=corpo)
+                resposta.raise_for_status()
+            _medir("http", total, time.perf_counter() - inicio)
+        print(app.state.armazem_posicoes.estatisticas())
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
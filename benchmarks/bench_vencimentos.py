@@ -0,0 +1,143 @@
+"""
+Benchmark do feed unificado de vencimentos de documentos.
+
+Gera documentos de motoristas, documentos de veículos e seguros em um banco
+SQLite e mede o AlertaService percorrendo o feed ordenado pelo merge de k
+vias, comparado a carregar as três origens e ordená-las em memória.
+
+Uso:
+    python -m benchmarks.bench_vencimentos --documentos 1000000 [--memoria]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.application.services.alerta_service import AlertaService
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Base,
+    DocumentoMotorista,
+    DocumentoVeiculo,
+    TipoCombustivel,
+    TipoVeiculo,
+    Veiculo,
+)
+
+LOTE = 50_000
+
+def _popular(engine, documentos: int, semente: int) -> None:
+    """Grava os documentos divididos entre as três origens."""
+    aleatorio = random.Random(semente)
+    inicio = date(2026, 1, 1)
+    validade = lambda: inicio + timedelta(days=aleatorio.randrange(3 * 365))
+
+    veiculos = max(1, documentos // 10)
+    por_origem = (documentos - veiculos) // 2
+    with engine.begin() as conexao:
+        for base in range(0, veiculos, LOTE):
+            conexao.execute(insert(Veiculo.__table__), [
+                {
+                    "placa": f"B{i:06d}", "marca": "Marca", "modelo": "Modelo",
+                    "ano_fabricacao": 2020, "ano_modelo": 2020, "versao": 1,
+                    "tipo_veiculo": TipoVeiculo.CAMINHAO.name,
+                    "tipo_combustivel": TipoCombustivel.DIESEL.name,
+                    "vencimento_seguro": validade(),
+                }
+                for i in range(base, min(base + LOTE, veiculos))
+            ])
+        for base in range(0, por_origem, LOTE):
+            quantidade = min(LOTE, por_origem - base)
+            conexao.execute(insert(DocumentoVeiculo.__table__), [
+                {"veiculo_id": aleatorio.randrange(1, veiculos + 1), "tipo": "CRLV", "data_validade": validade()}
+                for _ in range(quantidade)
+            ])
+            conexao.execute(insert(DocumentoMotorista.__table__), [
+                {"motorista_id": aleatorio.randrange(1, 5000), "tipo": "ASO", "data_validade": validade()}
+                for _ in range(quantidade)
+            ])
+
+def _ordenar_em_memoria(session, ate: date) -> list:
+    """Alternativa ingênua: carrega as três origens e ordena em memória."""
+    linhas = []
+    for coluna, chave in (
+        (DocumentoMotorista.data_validade, DocumentoMotorista.id),
+        (DocumentoVeiculo.data_validade, DocumentoVeiculo.id),
+        (Veiculo.vencimento_seguro, Veiculo.id),
+    ):
+        linhas.extend(session.execute(select(coluna, chave).where(coluna <= ate)).all())
+    linhas.sort()
+    return linhas
+
+def _medir(funcao, memoria: bool):
+    """
+    Executa a função e retorna (resultado, segundos, pico de memória em MB).
+
+    O tracemalloc deixa a execução bem mais lenta, por isso o pico de memória
+    é medido em uma segunda execução, apenas quando solicitado.
+    """
+    inicio = time.perf_counter()
+    resultado = funcao()
+    duracao = time.perf_counter() - inicio
+    pico = None
+    if memoria:
+        tracemalloc.start()
+        funcao()
+        pico = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return resultado, duracao, pico
+
+def _pico(pico) -> str:
+    return f", pico {pico:.1f} MB" if pico is not None else ""
+
+def main() -> None:
+    """Executa o benchmark e imprime vazão e pico de memória de cada abordagem."""
+    parser = argparse.ArgumentParser(description="Benchmark do feed de vencimentos")
+    parser.add_argument("--documentos", type=int, default=1_000_000)
+    parser.add_argument("--lote", type=int, default=5000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--memoria", action="store_true", help="mede também o pico de memória")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'vencimentos.db')}")
+        Base.metadata.create_all(engine)
+        inicio = time.perf_counter()
+        _popular(engine, args.documentos, args.semente)
+        print(f"Documentos gerados: {args.documentos} em {time.perf_counter() - inicio:.2f}s")
+
+        ate = date(2030, 1, 1)
+        with sessionmaker(bind=engine)() as session:
+            servico = AlertaService(session, tamanho_lote=args.lote)
+
+            def contar_feed() -> int:
+                quantidade, anterior = 0, None
+                for vencimento in servico.vencimentos(None, ate):
+                    assert anterior is None or anterior <= vencimento
+                    anterior = vencimento
+                    quantidade += 1
+                return quantidade
+
+            lidos, duracao, pico = _medir(contar_feed, args.memoria)
+            print(f"Merge de k vias:     {lidos} vencimentos em {duracao:.2f}s "
+                  f"({lidos / duracao:,.0f}/s){_pico(pico)}")
+
+            # Janela lida por uma varredura incremental após 7 dias
+            semana, duracao_janela, _ = _medir(
+                lambda: sum(1 for _ in servico.vencimentos(date(2026, 6, 1), date(2026, 6, 8))), False
+            )
+            print(f"Janela de 7 dias:    {semana} vencimentos em {duracao_janela * 1000:.1f}ms")
+
+            ordenados, duracao, pico = _medir(lambda: _ordenar_em_memoria(session, ate), args.memoria)
+            print(f"Carga + sort:        {len(ordenados)} vencimentos em {duracao:.2f}s "
+                  f"({len(ordenados) / duracao:,.0f}/s){_pico(pico)}")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
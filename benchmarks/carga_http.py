@@ -0,0 +1,562 @@
+"""
+Teste de carga HTTP com a mistura de tráfego de despachantes e motoristas.
+
+Trabalhadores assíncronos repetem, durante um tempo fixo, operações sorteadas
+conforme os pesos da mistura:
+
+- consultar_veiculo e consultar_viagem: leituras do despachante;
+- iniciar_viagem e encerrar_viagem: saída e chegada dos motoristas, sobre
+  viagens agendadas gravadas antes da carga (um veículo só parte de novo
+  depois de chegar);
+- abastecer: abastecimento enviado pelo dispositivo de campo em
+  `POST /sync/alteracoes`;
+- painel_custos e alertas_cnh: consultas periódicas dos painéis.
+
+Cada nível de concorrência informa vazão, latências p50/p95/p99 e taxa de
+erros, no total e por operação. Os resultados são gravados em JSON e podem ser
+comparados com `--comparar`, para avaliar mudanças de pool, cache ou caminhos
+assíncronos com a mesma mistura, semente e frota.
+
+Em processo, a aplicação roda pelo transporte ASGI do httpx, com o lifespan
+completo, sobre um banco SQLite populado pelo `gerador_frota`; gerador e
+aplicação dividem o mesmo processo, por isso os números só se comparam com
+execuções do mesmo modo. Com `--url`, a carga vai a um servidor já iniciado,
+que deve usar o banco informado em `--banco`.
+
+Uso:
+    python -m benchmarks.carga_http --concorrencia 1 8 32 --duracao 20 --saida base.json
+    DATABASE_URL=sqlite:///carga.db uvicorn app.main:app &
+    python -m benchmarks.carga_http --url http://127.0.0.1:8000 --banco carga.db --saida uvicorn.json
+    python -m benchmarks.carga_http --comparar base.json novo.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import httpx
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.engine import Engine
+
+# Os módulos da aplicação são importados dentro das funções: a engine da
+# aplicação é criada na importação, a partir de DATABASE_URL, que a carga em
+# processo precisa definir antes.
+
+# Mesma semente padrão do gerador_frota
+SEMENTE = 42
+
+# Pesos padrão da mistura de tráfego
+MISTURA_PADRAO: Dict[str, int] = {
+    "consultar_veiculo": 30,
+    "consultar_viagem": 20,
+    "iniciar_viagem": 10,
+    "encerrar_viagem": 10,
+    "abastecer": 15,
+    "painel_custos": 10,
+    "alertas_cnh": 5,
+}
+
+PERCENTIS = (50, 95, 99)
+
+class Requisicao(NamedTuple):
+    """Requisição de uma operação; `concluir` recebe a resposta ou None em caso de falha."""
+    metodo: str
+    caminho: str
+    params: Optional[Dict[str, Any]] = None
+    corpo: Optional[Dict[str, Any]] = None
+    concluir: Optional[Callable[[Optional[httpx.Response]], None]] = None
+
+class Cenario:
+    """
+    Estado compartilhado pelos trabalhadores.
+
+    Guarda os ids lidos do banco e as filas de veículos livres (com viagens
+    agendadas) e em viagem. Os trabalhadores rodam no mesmo loop de eventos e
+    só alteram o estado entre requisições, por isso não há travas.
+    """
+
+    def __init__(
+        self,
+        veiculos: List[int],
+        viagens: List[int],
+        agendadas: Dict[int, Deque[int]],
+        combustiveis: Dict[int, str],
+        inicio_periodo: date,
+        fim_periodo: date,
+    ):
+        self.veiculos = veiculos
+        self.viagens = viagens
+        self.agendadas = agendadas
+        self.combustiveis = combustiveis
+        self.inicio_periodo = inicio_periodo
+        self.fim_periodo = fim_periodo
+        self.livres: Deque[int] = deque(veiculo for veiculo, fila in agendadas.items() if fila)
+        self.em_viagem: Deque[Tuple[int, int, float]] = deque()
+
+def _consultar_veiculo(cenario: Cenario, aleatorio: random.Random) -> Optional[Requisicao]:
+    return Requisicao("GET", f"/api/v1/veiculos/{aleatorio.choice(cenario.veiculos)}")
+
+def _consultar_viagem(cenario: Cenario, aleatorio: random.Random) -> Optional[Requisicao]:
+    return Requisicao("GET", f"/api/v1/viagens/{aleatorio.choice(cenario.viagens)}")
+
+def _iniciar_viagem(cenario: Cenario, aleatorio: random.Random) -> Optional[Requisicao]:
+    if not cenario.livres:
+        return None
+    veiculo = cenario.livres.popleft()
+    viagem = cenario.agendadas[veiculo].popleft()
+
+    def concluir(resposta: Optional[httpx.Response]) -> None:
+        if resposta is not None and resposta.status_code == 200:
+            cenario.em_viagem.append((veiculo, viagem, resposta.json()["km_inicial"] or 0.0))
+        elif cenario.agendadas[veiculo]:
+            cenario.livres.append(veiculo)
+
+    return Requisicao("POST", f"/api/v1/viagens/{viagem}/iniciar", corpo={}, concluir=concluir)
+
+def _encerrar_viagem(cenario: Cenario, aleatorio: random.Random) -> Optional[Requisicao]:
+    if not cenario.em_viagem:
+        return None
+    veiculo, viagem, km_inicial = cenario.em_viagem.popleft()
+    distancia = round(aleatorio.uniform(10, 600), 1)
+    litros = round(distancia / aleatorio.uniform(3, 12), 2)
+
+    def concluir(resposta: Optional[httpx.Response]) -> None:
+        if resposta is not None and resposta.status_code == 200:
+            if cenario.agendadas[veiculo]:
+                cenario.livres.append(veiculo)
+        else:
+            cenario.em_viagem.append((veiculo, viagem, km_inicial))
+
+    corpo = {
+        "km_final": round(km_inicial + distancia, 1),
+        "combustivel_consumido": litros,
+        "custo_combustivel": round(litros * 6.0, 2),
+    }
+    return Requisicao("POST", f"/api/v1/viagens/{viagem}/encerrar", corpo=corpo, concluir=concluir)
+
+def _abastecer(cenario: Cenario, aleatorio: random.Random) -> Optional[Requisicao]:
+    veiculo = aleatorio.choice(cenario.veiculos)
+    litros = round(aleatorio.uniform(30, 300), 2)
+    preco = round(aleatorio.uniform(5.5, 6.8), 3)
+    agora = datetime.now().isoformat()
+    alteracao = {
+        "tabela": "abastecimentos",
+        "data_alteracao": agora,
+        "campos": {
+            "veiculo_id": veiculo, "data": agora, "quilometragem": round(aleatorio.uniform(0, 500_000), 1),
+            "litros": litros, "valor_litro": preco, "valor_total": round(litros * preco, 2),
+            "tipo_combustivel": cenario.combustiveis.get(veiculo),
+        },
+    }
+    return Requisicao(
+        "POST", "/api/v1/sync/alteracoes",
+        corpo={"dispositivo_id": f"carga-{veiculo}", "alteracoes": [alteracao]},
+    )
+
+def _painel_custos(cenario: Cenario, aleatorio: random.Random) -> Optional[Requisicao]:
+    params = {
+        "dimensao": aleatorio.choice(("veiculo", "motorista")),
+        "inicio": cenario.inicio_periodo.isoformat(),
+        "fim": cenario.fim_periodo.isoformat(),
+    }
+    return Requisicao("GET", "/api/v1/viagens/relatorios/custos/totais", params=params)
+
+def _alertas_cnh(cenario: Cenario, aleatorio: random.Random) -> Optional[Requisicao]:
+    return Requisicao("GET", "/api/v1/motoristas/alertas-cnh", params={"dias": aleatorio.choice((15, 30, 60))})
+
+# Operações da mistura; retornam None quando não há trabalho (ex.: nenhuma viagem em andamento)
+OPERACOES: Dict[str, Callable[[Cenario, random.Random], Optional[Requisicao]]] = {
+    "consultar_veiculo": _consultar_veiculo,
+    "consultar_viagem": _consultar_viagem,
+    "iniciar_viagem": _iniciar_viagem,
+    "encerrar_viagem": _encerrar_viagem,
+    "abastecer": _abastecer,
+    "painel_custos": _painel_custos,
+    "alertas_cnh": _alertas_cnh,
+}
+
+# Interpreta a mistura no formato operacao=peso,...
+def interpretar_mistura(texto: str) -> Dict[str, int]:
+    """
+    Interpreta a mistura de tráfego informada na linha de comando.
+
+    Args:
+        texto (str): Pares `operacao=peso` separados por vírgula.
+
+    Returns:
+        Dict[str, int]: Peso de cada operação; as omitidas ficam de fora.
+
+    Raises:
+        ValueError: Se a operação for desconhecida ou o peso não for um inteiro positivo.
+    """
+    mistura = {}
+    for par in filter(None, (parte.strip() for parte in texto.split(","))):
+        nome, _, peso = par.partition("=")
+        if nome not in OPERACOES:
+            raise ValueError(f"Operação desconhecida: {nome}")
+        if not peso.isdigit() or int(peso) <= 0:
+            raise ValueError(f"Peso inválido para {nome}: {peso!r}")
+        mistura[nome] = int(peso)
+    if not mistura:
+        raise ValueError("A mistura precisa de ao menos uma operação")
+    return mistura
+
+# Percentil pelo método do posto mais próximo
+def percentil(ordenados: Sequence[float], p: float) -> float:
+    """Percentil `p` (0 a 100) de valores já ordenados, pelo posto mais próximo."""
+    if not ordenados:
+        return 0.0
+    posto = max(1, -(-len(ordenados) * p // 100))
+    return ordenados[int(posto) - 1]
+
+class Coletor:
+    """Acumula latências e códigos de status por operação."""
+
+    def __init__(self) -> None:
+        self.latencias: Dict[str, List[float]] = {}
+        self.status: Dict[str, Counter] = {}
+        self.sem_trabalho = 0
+
+    # Registra uma requisição concluída
+    def registrar(self, operacao: str, codigo: int, duracao: float) -> None:
+        """Registra a duração em segundos e o status; 0 indica falha de transporte."""
+        self.latencias.setdefault(operacao, []).append(duracao)
+        self.status.setdefault(operacao, Counter())[codigo] += 1
+
+    # Resume as amostras de um nível de concorrência
+    def resumir(self, concorrencia: int, duracao: float) -> Dict[str, Any]:
+        """
+        Resume as amostras coletadas.
+
+        Args:
+            concorrencia (int): Trabalhadores simultâneos.
+            duracao (float): Duração da medição em segundos.
+
+        Returns:
+            Dict[str, Any]: Vazão, latências em ms e erros, no total e por operação.
+        """
+        operacoes = {
+            nome: _resumo(self.latencias[nome], self.status[nome], duracao)
+            for nome in sorted(self.latencias)
+        }
+        total = _resumo(
+            [latencia for latencias in self.latencias.values() for latencia in latencias],
+            sum(self.status.values(), Counter()),
+            duracao,
+        )
+        total.update(concorrencia=concorrencia, duracao_s=round(duracao, 3), sem_trabalho=self.sem_trabalho)
+        total["operacoes"] = operacoes
+        return total
+
+def _resumo(latencias: List[float], status: Counter, duracao: float) -> Dict[str, Any]:
+    """Vazão, percentis de latência e erros de um conjunto de amostras."""
+    ordenadas = sorted(latencias)
+    quantidade = len(ordenadas)
+    erros = sum(n for codigo, n in status.items() if codigo == 0 or codigo >= 400)
+    latencia = {f"p{p}": round(percentil(ordenadas, p) * 1000, 3) for p in PERCENTIS}
+    latencia["media"] = round(sum(ordenadas) / quantidade * 1000, 3) if quantidade else 0.0
+    latencia["maximo"] = round(ordenadas[-1] * 1000, 3) if quantidade else 0.0
+    return {
+        "requisicoes": quantidade,
+        "vazao_rps": round(quantidade / duracao, 2) if duracao > 0 else 0.0,
+        "erros": erros,
+        "taxa_erros": round(erros / quantidade, 5) if quantidade else 0.0,
+        "latencia_ms": latencia,
+        "status": {str(codigo): n for codigo, n in sorted(status.items())},
+    }
+
+async def _trabalhador(
+    cliente: httpx.AsyncClient,
+    cenario: Cenario,
+    mistura: Dict[str, int],
+    aleatorio: random.Random,
+    fim: float,
+    coletor: Optional[Coletor],
+) -> None:
+    """Executa operações sorteadas até o instante `fim`; sem coletor, apenas aquece."""
+    nomes, pesos = list(mistura), list(mistura.values())
+    while time.perf_counter() < fim:
+        operacao = aleatorio.choices(nomes, pesos)[0]
+        requisicao = OPERACOES[operacao](cenario, aleatorio)
+        if requisicao is None:
+            if coletor is not None:
+                coletor.sem_trabalho += 1
+            await asyncio.sleep(0)
+            continue
+        inicio = time.perf_counter()
+        try:
+            resposta = await cliente.request(
+                requisicao.metodo, requisicao.caminho, params=requisicao.params, json=requisicao.corpo
+            )
+        except httpx.HTTPError:
+            resposta = None
+        duracao = time.perf_counter() - inicio
+        if requisicao.concluir is not None:
+            requisicao.concluir(resposta)
+        if coletor is not None:
+            coletor.registrar(operacao, resposta.status_code if resposta is not None else 0, duracao)
+
+# Mede um nível de concorrência
+async def executar_nivel(
+    cliente: httpx.AsyncClient,
+    cenario: Cenario,
+    mistura: Dict[str, int],
+    concorrencia: int,
+    duracao: float,
+    aquecimento: float = 0.0,
+    semente: int = SEMENTE,
+) -> Dict[str, Any]:
+    """
+    Executa a mistura com `concorrencia` trabalhadores e resume a medição.
+
+    Args:
+        cliente (httpx.AsyncClient): Cliente apontado para a aplicação.
+        cenario (Cenario): Estado compartilhado pelos trabalhadores.
+        mistura (Dict[str, int]): Peso de cada operação.
+        concorrencia (int): Trabalhadores simultâneos.
+        duracao (float): Segundos de medição.
+        aquecimento (float): Segundos de carga descartados antes da medição.
+        semente (int): Semente dos sorteios; cada trabalhador deriva a sua.
+
+    Returns:
+        Dict[str, Any]: Resumo do nível (ver `Coletor.resumir`).
+    """
+    sorteios = [random.Random(f"{semente}:{concorrencia}:{indice}") for indice in range(concorrencia)]
+    if aquecimento > 0:
+        fim = time.perf_counter() + aquecimento
+        await asyncio.gather(*(
+            _trabalhador(cliente, cenario, mistura, aleatorio, fim, None) for aleatorio in sorteios
+        ))
+    coletor = Coletor()
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        _trabalhador(cliente, cenario, mistura, aleatorio, inicio + duracao, coletor) for aleatorio in sorteios
+    ))
+    return coletor.resumir(concorrencia, time.perf_counter() - inicio)
+
+# Grava as viagens agendadas e lê os ids usados pela carga
+def preparar_cenario(engine: Engine, agendadas_por_veiculo: int, semente: int = SEMENTE) -> Cenario:
+    """
+    Agenda viagens para os veículos disponíveis e monta o cenário da carga.
+
+    Args:
+        engine (Engine): Engine do banco usado pela aplicação.
+        agendadas_por_veiculo (int): Viagens agendadas gravadas por veículo;
+            limita quantas saídas cada veículo faz durante a carga.
+        semente (int): Semente das escolhas de motorista e destino.
+
+    Returns:
+        Cenario: Estado inicial da carga.
+    """
+    from app.infrastructure.persistence.sqlalchemy.models import (
+        Motorista,
+        StatusVeiculo,
+        StatusViagem,
+        TipoCombustivel,
+        Veiculo,
+        Viagem,
+    )
+
+    aleatorio = random.Random(f"{semente}:agendadas")
+    with engine.begin() as conexao:
+        veiculos = conexao.execute(
+            select(Veiculo.id, Veiculo.tipo_combustivel).where(Veiculo.status == StatusVeiculo.DISPONIVEL)
+        ).all()
+        motoristas = conexao.execute(select(Motorista.id)).scalars().all()
+        viagens = conexao.execute(select(Viagem.id).limit(100_000)).scalars().all()
+        periodo = conexao.execute(select(func.min(Viagem.data_saida_real), func.max(Viagem.data_saida_real))).one()
+        if not veiculos or not motoristas:
+            raise ValueError("O banco precisa de motoristas e veículos disponíveis")
+
+        proximo = conexao.execute(select(func.coalesce(func.max(Viagem.id), 0))).scalar_one() + 1
+        agora = datetime.now()
+        agendadas: Dict[int, Deque[int]] = {}
+        linhas = []
+        for veiculo, _ in veiculos:
+            fila = agendadas[veiculo] = deque()
+            for _ in range(agendadas_por_veiculo):
+                fila.append(proximo)
+                linhas.append({
+                    "id": proximo, "codigo": f"C{proximo:011d}", "motorista_id": aleatorio.choice(motoristas),
+                    "veiculo_id": veiculo, "origem": "Base", "destino": f"Cliente {aleatorio.randrange(1000)}",
+                    "data_saida_prevista": agora + timedelta(hours=len(fila)),
+                    "status": StatusViagem.AGENDADA, "versao": 1,
+                })
+                proximo += 1
+        if linhas:
+            conexao.execute(insert(Viagem.__table__), linhas)
+
+    fim_periodo = (periodo[1] or agora).date()
+    return Cenario(
+        veiculos=[veiculo for veiculo, _ in veiculos],
+        viagens=viagens or [linha["id"] for linha in linhas],
+        agendadas=agendadas,
+        combustiveis={
+            veiculo: (combustivel or TipoCombustivel.DIESEL).value for veiculo, combustivel in veiculos
+        },
+        inicio_periodo=max((periodo[0] or agora).date(), fim_periodo - timedelta(days=90)),
+        fim_periodo=fim_periodo,
+    )
+
+@asynccontextmanager
+async def _cliente_em_processo(caminho_banco: str) -> AsyncIterator[httpx.AsyncClient]:
+    """Cliente ligado à aplicação pelo transporte ASGI, com o lifespan em execução."""
+    from app.infrastructure.persistence.sqlalchemy import database
+
+    if database.DATABASE_URL != _url_sqlite(caminho_banco):
+        raise RuntimeError("A aplicação já foi importada com outro banco; defina DATABASE_URL antes de importá-la")
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://carga", timeout=60.0) as cliente:
+            yield cliente
+
+def _url_sqlite(caminho: str) -> str:
+    return f"sqlite:///{caminho}"
+
+def _cliente_remoto(url: str, concorrencia: int) -> httpx.AsyncClient:
+    """Cliente HTTP com uma conexão por trabalhador."""
+    limites = httpx.Limits(max_connections=concorrencia, max_keepalive_connections=concorrencia)
+    return httpx.AsyncClient(base_url=url, limits=limites, timeout=60.0)
+
+async def _executar(args: argparse.Namespace, caminho_banco: str, cenario: Cenario, mistura: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Executa os níveis de concorrência em sequência, com o mesmo cliente."""
+    maximo = max(args.concorrencia)
+    if args.url:
+        contexto = _cliente_remoto(args.url, maximo)
+    else:
+        contexto = _cliente_em_processo(caminho_banco)
+    niveis = []
+    async with contexto as cliente:
+        for concorrencia in args.concorrencia:
+            nivel = await executar_nivel(
+                cliente, cenario, mistura, concorrencia, args.duracao, args.aquecimento, args.semente
+            )
+            niveis.append(nivel)
+            _imprimir_nivel(nivel)
+    return niveis
+
+def _imprimir_nivel(nivel: Dict[str, Any]) -> None:
+    latencia = nivel["latencia_ms"]
+    print(
+        f"c={nivel['concorrencia']:<4} {nivel['vazao_rps']:>9.1f} req/s  "
+        f"p50 {latencia['p50']:>8.2f}ms  p95 {latencia['p95']:>8.2f}ms  p99 {latencia['p99']:>8.2f}ms  "
+        f"erros {nivel['taxa_erros']:.2%}"
+    )
+    for nome, operacao in nivel["operacoes"].items():
+        latencia = operacao["latencia_ms"]
+        print(
+            f"    {nome:<18} {operacao['requisicoes']:>7}  p50 {latencia['p50']:>8.2f}ms  "
+            f"p99 {latencia['p99']:>8.2f}ms  status {operacao['status']}"
+        )
+
+# Compara dois arquivos de resultados
+def comparar(base: Dict[str, Any], nova: Dict[str, Any]) -> List[str]:
+    """
+    Compara vazão, p95, p99 e taxa de erros por nível de concorrência.
+
+    Args:
+        base (Dict[str, Any]): Resultados de referência.
+        nova (Dict[str, Any]): Resultados a avaliar.
+
+    Returns:
+        List[str]: Linhas da tabela; níveis ausentes em um dos arquivos são ignorados.
+    """
+    def variacao(antes: float, depois: float) -> str:
+        return f"{(depois - antes) / antes:+.1%}" if antes else "n/d"
+
+    niveis_base = {nivel["concorrencia"]: nivel for nivel in base["niveis"]}
+    linhas = [f"{'c':>4}  {'vazão':>18}  {'p95':>18}  {'p99':>18}  {'erros':>15}"]
+    for nivel in nova["niveis"]:
+        antes = niveis_base.get(nivel["concorrencia"])
+        if antes is None:
+            continue
+        linhas.append(
+            f"{nivel['concorrencia']:>4}  "
+            f"{nivel['vazao_rps']:>9.1f} {variacao(antes['vazao_rps'], nivel['vazao_rps']):>8}  "
+            f"{nivel['latencia_ms']['p95']:>9.2f} {variacao(antes['latencia_ms']['p95'], nivel['latencia_ms']['p95']):>8}  "
+            f"{nivel['latencia_ms']['p99']:>9.2f} {variacao(antes['latencia_ms']['p99'], nivel['latencia_ms']['p99']):>8}  "
+            f"{antes['taxa_erros']:>6.2%} → {nivel['taxa_erros']:.2%}"
+        )
+    return linhas
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Prepara o banco, executa a carga em cada nível e grava os resultados."""
+    parser = argparse.ArgumentParser(description="Teste de carga HTTP da API")
+    parser.add_argument("--url", help="servidor já iniciado; por padrão, a aplicação roda em processo")
+    parser.add_argument("--banco", help="arquivo SQLite da aplicação; por padrão, um banco temporário")
+    parser.add_argument("--sem-popular", action="store_true", help="usa a frota já gravada no banco")
+    parser.add_argument("--concorrencia", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duracao", type=float, default=20.0, help="segundos de medição por nível")
+    parser.add_argument("--aquecimento", type=float, default=2.0, help="segundos descartados por nível")
+    parser.add_argument("--mistura", type=interpretar_mistura, help="ex.: consultar_veiculo=50,abastecer=50")
+    parser.add_argument("--motoristas", type=int, default=500)
+    parser.add_argument("--veiculos", type=int, default=300)
+    parser.add_argument("--viagens", type=int, default=50_000)
+    parser.add_argument("--agendadas", type=int, default=50, help="viagens agendadas por veículo")
+    parser.add_argument("--semente", type=int, default=SEMENTE)
+    parser.add_argument("--rotulo", default="", help="descrição da execução gravada no JSON")
+    parser.add_argument("--saida", help="arquivo JSON dos resultados")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "NOVA"), help="compara dois arquivos de resultados")
+    args = parser.parse_args(argv)
+
+    if args.comparar:
+        arquivos = []
+        for caminho in args.comparar:
+            with open(caminho, encoding="utf-8") as arquivo:
+                arquivos.append(json.load(arquivo))
+        print("\n".join(comparar(*arquivos)))
+        return
+    if args.url and not args.banco:
+        parser.error("--url exige --banco com o arquivo usado pelo servidor")
+
+    mistura = args.mistura or dict(MISTURA_PADRAO)
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_banco = os.path.abspath(args.banco or os.path.join(diretorio, "carga.db"))
+        if not args.url:
+            os.environ["DATABASE_URL"] = _url_sqlite(caminho_banco)
+        from app.infrastructure.persistence.sqlalchemy.models import Base
+        from benchmarks.gerador_frota import GeradorFrota, gravar_app
+
+        engine = create_engine(_url_sqlite(caminho_banco))
+        Base.metadata.create_all(engine)
+        frota = None
+        if not args.sem_popular:
+            frota = gravar_app(
+                engine, GeradorFrota(args.motoristas, args.veiculos, args.semente), args.viagens, abastecimentos=True
+            )
+        cenario = preparar_cenario(engine, args.agendadas, args.semente)
+        engine.dispose()
+
+        print(f"Mistura: {mistura}")
+        niveis = asyncio.run(_executar(args, caminho_banco, cenario, mistura))
+
+    resultado = {
+        "rotulo": args.rotulo,
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "alvo": args.url or "asgi",
+        "ambiente": {"python": platform.python_version(), "plataforma": platform.platform(), "cpus": os.cpu_count()},
+        "parametros": {
+            "duracao_s": args.duracao, "aquecimento_s": args.aquecimento, "semente": args.semente,
+            "agendadas_por_veiculo": args.agendadas, "frota": frota,
+        },
+        "mistura": mistura,
+        "niveis": niveis,
+    }
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        print(f"Resultados gravados em {args.saida}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Fixtures da suíte de benchmarks (pytest-benchmark).
+
+Os benchmarks medem inserções, listagens, encerramento de viagens, serviços
+de cálculo, verificações de elegibilidade e rotas da API sobre uma frota
+sintética gravada em um banco SQLite temporário pelo `gerador_frota`. A frota
+é determinística (semente fixa), para que execuções em momentos diferentes
+sejam comparáveis.
+
+Uso, a partir da raiz do repositório:
+
+    # Grava a linha de base
+    pytest benchmarks --benchmark-only --benchmark-save=linha_base
+    # Compara com a última execução gravada; falha se alguma média piorar mais que o limite
+    pytest benchmarks --benchmark-only --benchmark-compare
+
+O limite de regressão, o diretório dos resultados, a ordenação e as colunas
+da tabela são definidos em `pytest_configure`, apenas quando o plugin está
+carregado, e valem se não forem informados na linha de comando. Sem o
+pytest-benchmark instalado, os módulos de benchmark não são coletados.
+"""
+
+import os
+import tempfile
+from typing import Dict, Iterator
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.infrastructure.persistence.sqlalchemy.models import Base, Veiculo, Viagem
+from benchmarks.gerador_frota import SEMENTE, GeradorFrota, gravar_app
+
+try:
+    from pytest_benchmark.utils import parse_columns, parse_compare_fail, parse_sort
+except ImportError:
+    collect_ignore_glob = ["test_*.py"]
+
+# Opções do pytest-benchmark: (destino, valor padrão do plugin, valor da suíte)
+OPCOES_BENCHMARK = (
+    ("benchmark_storage", "file://./.benchmarks", lambda: "file://benchmarks/.resultados"),
+    ("benchmark_sort", "min", lambda: parse_sort("name")),
+    ("benchmark_columns", None, lambda: parse_columns("min,mean,median,max,stddev,rounds")),
+)
+
+# Piora máxima da média em relação à linha de base, com --benchmark-compare
+LIMITE_REGRESSAO = "mean:15%"
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config) -> None:
+    """Aplica as opções da suíte que não foram informadas na linha de comando."""
+    if not config.pluginmanager.hasplugin("benchmark"):
+        return
+    for destino, padrao_plugin, valor in OPCOES_BENCHMARK:
+        if getattr(config.option, destino, padrao_plugin) == padrao_plugin:
+            setattr(config.option, destino, valor())
+    # O plugin recusa o limite de regressão sem uma execução para comparar
+    if config.option.benchmark_compare and not config.option.benchmark_compare_fail:
+        config.option.benchmark_compare_fail = [parse_compare_fail(LIMITE_REGRESSAO)]
+
+# Tamanho da frota sintética usada pelos benchmarks de leitura
+TAMANHO_FROTA = {"motoristas": 200, "veiculos": 200, "viagens": 5000}
+
+def criar_banco(diretorio: str, nome: str = "frota.db") -> Engine:
+    """Cria um banco SQLite vazio com o esquema da aplicação."""
+    engine = create_engine(
+        f"sqlite:///{os.path.join(diretorio, nome)}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+@pytest.fixture(scope="session")
+def engine_frota() -> Iterator[Engine]:
+    """Banco com a frota sintética, compartilhado pelos benchmarks de leitura."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = criar_banco(diretorio)
+        gerador = GeradorFrota(TAMANHO_FROTA["motoristas"], TAMANHO_FROTA["veiculos"], SEMENTE)
+        gravar_app(engine, gerador, TAMANHO_FROTA["viagens"], abastecimentos=True)
+        yield engine
+        engine.dispose()
+
+@pytest.fixture(scope="session")
+def fabrica_frota(engine_frota: Engine) -> sessionmaker:
+    """Fábrica de sessões do banco com a frota sintética."""
+    return sessionmaker(bind=engine_frota, autoflush=False, expire_on_commit=False)
+
+@pytest.fixture
+def sessao_frota(fabrica_frota: sessionmaker) -> Iterator[Session]:
+    """Sessão do banco com a frota sintética, descartada ao final do benchmark."""
+    with fabrica_frota() as sessao:
+        yield sessao
+        sessao.rollback()
+
+@pytest.fixture
+def banco_vazio() -> Iterator[Engine]:
+    """Banco vazio, exclusivo do benchmark."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = criar_banco(diretorio)
+        yield engine
+        engine.dispose()
+
+@pytest.fixture(scope="session")
+def ids_frota(engine_frota: Engine) -> Dict[str, list]:
+    """Identificadores dos veículos e viagens gravados."""
+    with engine_frota.connect() as conexao:
+        return {
+            "veiculos": conexao.execute(select(Veiculo.id)).scalars().all(),
+            "viagens": conexao.execute(select(Viagem.id)).scalars().all(),
+        }
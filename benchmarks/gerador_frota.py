@@ -0,0 +1,631 @@
+"""
+Gerador determinístico de frotas sintéticas para testes de carga e de escala.
+
+Produz motoristas com CPF e CNH válidos (dígitos verificadores), veículos de
+todos os tipos com placas nos formatos ABC1234 e Mercosul ABC1D23 e viagens
+concluídas com hodômetros e horários consistentes por veículo: cada viagem
+começa na quilometragem e depois da chegada da anterior do mesmo veículo.
+
+A mesma semente gera sempre a mesma frota. Motoristas, veículos e viagens usam
+fluxos pseudoaleatórios independentes, de modo que aumentar a quantidade de
+viagens não altera os cadastros. CPFs, CNHs e placas são únicos por
+construção (permutação do índice), sem conjuntos de controle em memória; o
+código da viagem deriva do id gravado.
+
+A gravação é feita em lotes com executemany, no esquema do pacote legado
+(`sistema_frota`) ou nos modelos SQLAlchemy da aplicação. Os registros são
+gerados sob demanda; a memória usada não cresce com a quantidade de viagens.
+
+Uso:
+    python -m benchmarks.gerador_frota frota.db --viagens 10000000
+    python -m benchmarks.gerador_frota legado.db --esquema legado --viagens 1000000
+"""
+
+import argparse
+import itertools
+import random
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Column, Table, bindparam, create_engine, func, insert, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Abastecimento,
+    Base,
+    DocumentoVeiculo,
+    Motorista,
+    StatusVeiculo,
+    StatusViagem,
+    TipoCNH,
+    TipoCombustivel,
+    TipoVeiculo,
+    Veiculo,
+    Viagem,
+)
+
+SEMENTE = 42
+
+LOTE = 50_000
+
+INICIO = datetime(2024, 1, 1)
+
+PRECO_COMBUSTIVEL = 6.0
+
+DOCUMENTOS_OBRIGATORIOS = ("CRLV", "IPVA", "LICENCIAMENTO")
+
+_NOMES = (
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João",
+    "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sabrina", "Thiago", "Vanessa", "Wagner",
+)
+
+_SOBRENOMES = (
+    "Almeida", "Barbosa", "Cardoso", "Dias", "Ferreira", "Gomes", "Lima", "Martins", "Nascimento",
+    "Oliveira", "Pereira", "Ribeiro", "Santos", "Silva", "Souza", "Teixeira", "Vieira",
+)
+
+_CIDADES = (
+    "São Paulo", "Campinas", "Santos", "Sorocaba", "Curitiba", "Belo Horizonte", "Rio de Janeiro",
+    "Goiânia", "Salvador", "Porto Alegre", "Florianópolis", "Ribeirão Preto", "Uberlândia", "Vitória",
+)
+
+# Perfil por tipo: (marcas e modelos, combustível, faixa de consumo em km/l, faixa de viagem em km)
+_PERFIS: Dict[TipoVeiculo, Tuple[Tuple[Tuple[str, str], ...], TipoCombustivel, Tuple[float, float], Tuple[float, float]]] = {
+    TipoVeiculo.CARRO: ((("Fiat", "Argo"), ("Volkswagen", "Gol"), ("Chevrolet", "Onix")), TipoCombustivel.FLEX, (10.0, 14.0), (10.0, 400.0)),
+    TipoVeiculo.CAMINHAO: ((("Volvo", "FH 540"), ("Scania", "R 450"), ("Mercedes-Benz", "Actros")), TipoCombustivel.DIESEL, (2.0, 3.5), (100.0, 1500.0)),
+    TipoVeiculo.VAN: ((("Mercedes-Benz", "Sprinter"), ("Renault", "Master"), ("Fiat", "Ducato")), TipoCombustivel.DIESEL, (7.0, 10.0), (20.0, 600.0)),
+    TipoVeiculo.ONIBUS: ((("Marcopolo", "Paradiso"), ("Mercedes-Benz", "O 500"), ("Volvo", "B 450R")), TipoCombustivel.DIESEL, (2.5, 4.0), (50.0, 1200.0)),
+    TipoVeiculo.CAMINHONETE: ((("Toyota", "Hilux"), ("Ford", "Ranger"), ("Chevrolet", "S10")), TipoCombustivel.DIESEL, (8.0, 11.0), (20.0, 800.0)),
+    TipoVeiculo.MOTO: ((("Honda", "CG 160"), ("Yamaha", "Factor"), ("Honda", "Biz")), TipoCombustivel.GASOLINA, (30.0, 45.0), (5.0, 150.0)),
+    TipoVeiculo.UTILITARIO: ((("Fiat", "Fiorino"), ("Renault", "Kangoo"), ("Peugeot", "Partner")), TipoCombustivel.FLEX, (9.0, 12.0), (10.0, 300.0)),
+}
+
+# Quantidade de combinações de cada formato de placa: LLLNNNN e LLLNLNN
+_PLACAS_ANTIGAS = 26 ** 3 * 10 ** 4
+_PLACAS_MERCOSUL = 26 ** 4 * 10 ** 3
+
+# Multiplicador de Knuth, coprimo com os módulos usados (fatores 2, 5 e 13)
+_MULTIPLICADOR = 2_654_435_761
+
+class MotoristaSintetico(NamedTuple):
+    """Motorista gerado; `indice` começa em 0."""
+    indice: int
+    nome: str
+    cpf: str
+    cnh_numero: str
+    cnh_categoria: TipoCNH
+    cnh_emissao: date
+    cnh_validade: date
+
+class VeiculoSintetico(NamedTuple):
+    """Veículo gerado; `quilometragem` é a do início do período simulado."""
+    indice: int
+    placa: str
+    marca: str
+    modelo: str
+    ano: int
+    tipo_veiculo: TipoVeiculo
+    tipo_combustivel: TipoCombustivel
+    consumo_medio: float
+    quilometragem: float
+
+class ViagemSintetica(NamedTuple):
+    """Viagem concluída; `motorista` e `veiculo` são os índices dos cadastros gerados."""
+    indice: int
+    motorista: int
+    veiculo: int
+    origem: str
+    destino: str
+    saida: datetime
+    chegada: datetime
+    km_inicial: float
+    km_final: float
+    litros: float
+
+# Calcula os dois dígitos verificadores do CPF
+def digitos_cpf(base: str) -> str:
+    """
+    Calcula os dígitos verificadores de um CPF.
+
+    Args:
+        base (str): Nove primeiros dígitos.
+
+    Returns:
+        str: Os dois dígitos verificadores.
+    """
+    numeros = [int(d) for d in base]
+    for pesos in (range(10, 1, -1), range(11, 1, -1)):
+        resto = sum(n * p for n, p in zip(numeros, pesos)) % 11
+        numeros.append(0 if resto < 2 else 11 - resto)
+    return f"{numeros[-2]}{numeros[-1]}"
+
+# Calcula os dois dígitos verificadores da CNH
+def digitos_cnh(base: str) -> str:
+    """
+    Calcula os dígitos verificadores do número de registro da CNH.
+
+    O primeiro dígito usa pesos de 9 a 1 e o segundo, de 1 a 9, ambos módulo
+    11 com resto 10 valendo 0; quando o primeiro resto é 10, o segundo é
+    descontado de 2.
+
+    Args:
+        base (str): Nove primeiros dígitos.
+
+    Returns:
+        str: Os dois dígitos verificadores.
+    """
+    numeros = [int(d) for d in base]
+    primeiro = sum(n * p for n, p in zip(numeros, range(9, 0, -1))) % 11
+    desconto = 0
+    if primeiro >= 10:
+        primeiro, desconto = 0, 2
+    segundo = (sum(n * p for n, p in zip(numeros, range(1, 10))) - desconto) % 11
+    if segundo >= 10:
+        segundo = 0
+    return f"{primeiro}{segundo}"
+
+# Verifica CPF pelos dígitos verificadores
+def cpf_valido(cpf: str) -> bool:
+    """Indica se o CPF tem 11 dígitos, não repetidos, e dígitos verificadores corretos."""
+    return len(cpf) == 11 and cpf.isdigit() and len(set(cpf)) > 1 and digitos_cpf(cpf[:9]) == cpf[9:]
+
+# Verifica CNH pelos dígitos verificadores
+def cnh_valida(cnh: str) -> bool:
+    """Indica se a CNH tem 11 dígitos, não repetidos, e dígitos verificadores corretos."""
+    return len(cnh) == 11 and cnh.isdigit() and len(set(cnh)) > 1 and digitos_cnh(cnh[:9]) == cnh[9:]
+
+def _permutar(indice: int, modulo: int, deslocamento: int) -> int:
+    """Bijeção de [0, modulo) usada para gerar valores únicos com aparência aleatória."""
+    return (indice * _MULTIPLICADOR + deslocamento) % modulo
+
+def _letras(numero: int, quantidade: int) -> str:
+    """Representa o número em base 26 com letras maiúsculas."""
+    letras = []
+    for _ in range(quantidade):
+        numero, resto = divmod(numero, 26)
+        letras.append(chr(65 + resto))
+    return "".join(reversed(letras))
+
+# Gera uma placa única a partir do índice e do formato
+def gerar_placa(indice: int, mercosul: bool, deslocamento: int = 0) -> str:
+    """
+    Gera a placa de número `indice` no formato antigo ou Mercosul.
+
+    Índices diferentes de um mesmo formato geram placas diferentes.
+
+    Args:
+        indice (int): Posição da placa entre as do mesmo formato.
+        mercosul (bool): Gera ABC1D23 em vez de ABC1234.
+        deslocamento (int): Deslocamento da permutação, derivado da semente.
+
+    Returns:
+        str: Placa com 7 caracteres, sem hífen.
+    """
+    if mercosul:
+        numero = _permutar(indice, _PLACAS_MERCOSUL, deslocamento)
+        numero, finais = divmod(numero, 100)
+        numero, letra = divmod(numero, 26)
+        numero, digito = divmod(numero, 10)
+        return f"{_letras(numero, 3)}{digito}{chr(65 + letra)}{finais:02d}"
+    numero, finais = divmod(_permutar(indice, _PLACAS_ANTIGAS, deslocamento), 10_000)
+    return f"{_letras(numero, 3)}{finais:04d}"
+
+class GeradorFrota:
+    """
+    Gera os registros de uma frota sintética.
+
+    Os veículos são mantidos em memória, pois as viagens dependem do consumo e
+    do hodômetro de cada um; motoristas e viagens são gerados sob demanda.
+    Após percorrer `viagens()`, `quilometragem` contém o hodômetro final de
+    cada veículo; cada chamada recomeça do hodômetro inicial.
+    """
+
+    def __init__(self, motoristas: int, veiculos: int, semente: int = SEMENTE, inicio: datetime = INICIO):
+        if motoristas < 1 or veiculos < 1:
+            raise ValueError("A frota precisa de ao menos um motorista e um veículo")
+        self.quantidade_motoristas = motoristas
+        self.semente = semente
+        self.inicio = inicio
+        self._deslocamento = random.Random(f"{semente}:identificadores").randrange(10 ** 9)
+        self.veiculos: List[VeiculoSintetico] = list(self._gerar_veiculos(veiculos))
+        self.quilometragem = [veiculo.quilometragem for veiculo in self.veiculos]
+
+    # Gera os motoristas, em ordem de índice
+    def motoristas(self) -> Iterator[MotoristaSintetico]:
+        """Gera os motoristas com CPF e CNH únicos e válidos."""
+        aleatorio = random.Random(f"{self.semente}:motoristas")
+        categorias = list(TipoCNH)
+        hoje = self.inicio.date()
+        for indice in range(self.quantidade_motoristas):
+            # Bases de 9 dígitos distintas por índice; o prefixo 1 evita dígitos todos iguais
+            base_cpf = f"{_permutar(indice, 10 ** 8, self._deslocamento) + 10 ** 8:09d}"
+            base_cnh = f"{_permutar(indice, 10 ** 8, self._deslocamento + 1) + 10 ** 8:09d}"
+            emissao = hoje - timedelta(days=aleatorio.randrange(30, 3650))
+            yield MotoristaSintetico(
+                indice=indice,
+                nome=f"{aleatorio.choice(_NOMES)} {aleatorio.choice(_SOBRENOMES)} {aleatorio.choice(_SOBRENOMES)}",
+                cpf=base_cpf + digitos_cpf(base_cpf),
+                cnh_numero=base_cnh + digitos_cnh(base_cnh),
+                cnh_categoria=aleatorio.choice(categorias),
+                cnh_emissao=emissao,
+                cnh_validade=emissao + timedelta(days=aleatorio.choice((1825, 3650))),
+            )
+
+    def _gerar_veiculos(self, quantidade: int) -> Iterator[VeiculoSintetico]:
+        """Gera os veículos, metade das placas em cada formato."""
+        aleatorio = random.Random(f"{self.semente}:veiculos")
+        tipos = list(TipoVeiculo)
+        contadores = {False: 0, True: 0}
+        for indice in range(quantidade):
+            tipo = aleatorio.choice(tipos)
+            modelos, combustivel, consumo, _ = _PERFIS[tipo]
+            marca, modelo = aleatorio.choice(modelos)
+            mercosul = aleatorio.random() < 0.5
+            placa = gerar_placa(contadores[mercosul], mercosul, self._deslocamento)
+            contadores[mercosul] += 1
+            yield VeiculoSintetico(
+                indice=indice,
+                placa=placa,
+                marca=marca,
+                modelo=modelo,
+                ano=aleatorio.randint(2010, self.inicio.year),
+                tipo_veiculo=tipo,
+                tipo_combustivel=combustivel,
+                consumo_medio=round(aleatorio.uniform(*consumo), 2),
+                quilometragem=round(aleatorio.uniform(0, 150_000), 1),
+            )
+
+    # Gera as viagens concluídas, com hodômetro e horários encadeados por veículo
+    def viagens(self, quantidade: int) -> Iterator[ViagemSintetica]:
+        """
+        Gera viagens concluídas distribuídas entre os veículos.
+
+        Cada viagem de um veículo começa no hodômetro final e depois da chegada
+        da anterior, com intervalo de 1 a 48 horas; a duração segue uma velocidade
+        média de 40 a 80 km/h e o consumo, o do veículo com variação de 10%.
+
+        Args:
+            quantidade (int): Quantidade de viagens.
+
+        Yields:
+            ViagemSintetica: Viagens em ordem de índice.
+        """
+        aleatorio = random.Random(f"{self.semente}:viagens")
+        sortear = aleatorio.random
+        quantidade_veiculos = len(self.veiculos)
+        quantidade_motoristas = self.quantidade_motoristas
+        cidades = len(_CIDADES)
+        faixas = [_PERFIS[veiculo.tipo_veiculo][3] for veiculo in self.veiculos]
+        consumos = [veiculo.consumo_medio for veiculo in self.veiculos]
+        livre_em = [self.inicio] * quantidade_veiculos
+        km = self.quilometragem = [veiculo.quilometragem for veiculo in self.veiculos]
+        for indice in range(quantidade):
+            veiculo = int(sortear() * quantidade_veiculos)
+            minimo, maximo = faixas[veiculo]
+            distancia = round(minimo + (maximo - minimo) * sortear() ** 2, 1)
+            saida = livre_em[veiculo] + timedelta(minutes=60 + int(sortear() * 2820))
+            chegada = saida + timedelta(minutes=int(60 * distancia / (40 + 40 * sortear())) + 1)
+            origem = int(sortear() * cidades)
+            destino = (origem + 1 + int(sortear() * (cidades - 1))) % cidades
+            km_inicial = km[veiculo]
+            km_final = round(km_inicial + distancia, 1)
+            km[veiculo] = km_final
+            livre_em[veiculo] = chegada
+            yield ViagemSintetica(
+                indice, int(sortear() * quantidade_motoristas), veiculo,
+                _CIDADES[origem], _CIDADES[destino], saida, chegada, km_inicial, km_final,
+                round(distancia / (consumos[veiculo] * (0.9 + 0.2 * sortear())), 2),
+            )
+
+def _lotes(registros: Iterable, tamanho: int) -> Iterator[list]:
+    """Divide um iterável em listas de até `tamanho` elementos."""
+    iterador = iter(registros)
+    while True:
+        lote = list(itertools.islice(iterador, tamanho))
+        if not lote:
+            return
+        yield lote
+
+# Ajustes de carga em massa: sem fsync e com journal em memória. Um erro no meio
+# da carga pode deixar o arquivo inconsistente; o banco deve ser descartável.
+PRAGMAS_CARGA = (
+    "PRAGMA synchronous = OFF",
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",
+)
+
+# Mesmo esquema de sistema_frota.infrastructure.db.schema.criar_tabelas, que
+# grava apenas no banco configurado em DB_NAME; aqui o destino é qualquer arquivo.
+ESQUEMA_LEGADO = (
+    """
+    CREATE TABLE IF NOT EXISTS motoristas (
+        motorista_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        cnh TEXT NOT NULL,
+        ativo INTEGER DEFAULT 1
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS veiculos (
+        veiculo_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        placa TEXT NOT NULL,
+        modelo TEXT NOT NULL,
+        ano INTEGER NOT NULL,
+        km REAL DEFAULT 0,
+        ativo INTEGER DEFAULT 1
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS viagens (
+        viagem_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        motorista_id INTEGER NOT NULL,
+        veiculo_id INTEGER NOT NULL,
+        origem TEXT NOT NULL,
+        destino TEXT NOT NULL,
+        data_inicio TEXT NOT NULL,
+        data_fim TEXT,
+        km_inicial REAL,
+        km_final REAL,
+        FOREIGN KEY (motorista_id) REFERENCES motoristas(motorista_id),
+        FOREIGN KEY (veiculo_id) REFERENCES veiculos(veiculo_id)
+    )
+    """,
+)
+
+# Grava a frota no esquema do pacote legado
+def gravar_legado(caminho: str, gerador: GeradorFrota, viagens: int, lote: int = LOTE) -> Dict[str, int]:
+    """
+    Grava a frota em um banco SQLite com o esquema do pacote sistema_frota.
+
+    As tabelas são criadas se não existirem. Os registros são acrescentados
+    aos existentes; as chaves estrangeiras são deslocadas pelo maior id já
+    gravado. A quilometragem dos veículos é a final, após as viagens.
+
+    Args:
+        caminho (str): Arquivo do banco.
+        gerador (GeradorFrota): Gerador da frota.
+        viagens (int): Quantidade de viagens.
+        lote (int): Registros por executemany.
+
+    Returns:
+        Dict[str, int]: Quantidade de registros gravados por tabela.
+    """
+    conexao = sqlite3.connect(caminho)
+    try:
+        for pragma in PRAGMAS_CARGA:
+            conexao.execute(pragma)
+        for ddl in ESQUEMA_LEGADO:
+            conexao.execute(ddl)
+        base_motorista = conexao.execute("SELECT COALESCE(MAX(motorista_id), 0) FROM motoristas").fetchone()[0] + 1
+        base_veiculo = conexao.execute("SELECT COALESCE(MAX(veiculo_id), 0) FROM veiculos").fetchone()[0] + 1
+        for registros in _lotes(gerador.motoristas(), lote):
+            conexao.executemany(
+                "INSERT INTO motoristas (nome, cnh) VALUES (?, ?)",
+                [(m.nome, m.cnh_numero) for m in registros],
+            )
+        conexao.executemany(
+            "INSERT INTO veiculos (placa, modelo, ano, km) VALUES (?, ?, ?, ?)",
+            [(v.placa, v.modelo, v.ano, v.quilometragem) for v in gerador.veiculos],
+        )
+        for registros in _lotes(gerador.viagens(viagens), lote):
+            conexao.executemany(
+                "INSERT INTO viagens (motorista_id, veiculo_id, origem, destino, data_inicio, data_fim, km_inicial, km_final)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        base_motorista + v.motorista, base_veiculo + v.veiculo, v.origem, v.destino,
+                        v.saida.isoformat(), v.chegada.isoformat(), v.km_inicial, v.km_final,
+                    )
+                    for v in registros
+                ],
+            )
+            conexao.commit()
+        conexao.executemany(
+            "UPDATE veiculos SET km = ? WHERE veiculo_id = ?",
+            [(km, base_veiculo + indice) for indice, km in enumerate(gerador.quilometragem)],
+        )
+        conexao.commit()
+    finally:
+        conexao.close()
+    return {"motoristas": gerador.quantidade_motoristas, "veiculos": len(gerador.veiculos), "viagens": viagens}
+
+def _proximo_id(conexao: Connection, tabela: Table) -> int:
+    """Primeiro id livre da tabela."""
+    return conexao.execute(select(func.coalesce(func.max(tabela.c.id), 0))).scalar_one() + 1
+
+def _processador(conexao: Connection, coluna: Column) -> Callable:
+    """Conversão do valor Python para o formato do driver feita pelo tipo da coluna."""
+    dialeto = conexao.dialect
+    return coluna.type.dialect_impl(dialeto).bind_processor(dialeto) or (lambda valor: valor)
+
+def _insersor(
+    conexao: Connection,
+    tabela: Table,
+    colunas: Tuple[str, ...],
+    convertidas: Tuple[str, ...] = (),
+) -> Callable[[List[tuple]], None]:
+    """
+    Retorna uma função que insere um lote de tuplas nas colunas indicadas.
+
+    Em SQLite, as tuplas vão direto ao executemany do driver, convertidas pelos
+    processadores de tipo do próprio SQLAlchemy (enums, datas); o resultado
+    gravado é o mesmo do `insert()` do Core, sem o custo de montar e processar
+    um dicionário por linha. As colunas em `convertidas` já chegam no formato
+    do driver (obtido com `_processador`). Nos demais bancos, usa o `insert()`
+    do Core e `convertidas` deve ser vazio.
+    """
+    dialeto = conexao.dialect
+    if dialeto.name != "sqlite":
+        instrucao = insert(tabela)
+        return lambda linhas: conexao.execute(instrucao, [dict(zip(colunas, linha)) for linha in linhas])
+
+    sql = f"INSERT INTO {tabela.name} ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})"
+    processadores = [
+        (posicao, tabela.c[coluna].type.dialect_impl(dialeto).bind_processor(dialeto))
+        for posicao, coluna in enumerate(colunas)
+        if coluna not in convertidas
+    ]
+    convertidas = [(posicao, processador) for posicao, processador in processadores if processador]
+
+    def inserir(linhas: List[tuple]) -> None:
+        if convertidas:
+            valores = []
+            for linha in linhas:
+                linha = list(linha)
+                for posicao, processador in convertidas:
+                    linha[posicao] = processador(linha[posicao])
+                valores.append(tuple(linha))
+            linhas = valores
+        conexao.exec_driver_sql(sql, linhas)
+
+    return inserir
+
+# Grava a frota nos modelos SQLAlchemy da aplicação
+def gravar_app(
+    engine: Engine,
+    gerador: GeradorFrota,
+    viagens: int,
+    lote: int = LOTE,
+    documentos: bool = True,
+    abastecimentos: bool = False,
+) -> Dict[str, int]:
+    """
+    Grava a frota nas tabelas da aplicação com inserções em lote.
+
+    As tabelas devem existir. Os registros são acrescentados aos existentes.
+    Em SQLite, a conexão recebe os PRAGMAs de carga em massa.
+
+    Args:
+        engine (Engine): Engine do banco de destino.
+        gerador (GeradorFrota): Gerador da frota.
+        viagens (int): Quantidade de viagens.
+        lote (int): Registros por executemany.
+        documentos (bool): Grava CRLV, IPVA e licenciamento de cada veículo.
+        abastecimentos (bool): Grava um abastecimento na chegada de cada viagem,
+            com os litros consumidos nela.
+
+    Returns:
+        Dict[str, int]: Quantidade de registros gravados por tabela.
+    """
+    gravados = {"motoristas": gerador.quantidade_motoristas, "veiculos": len(gerador.veiculos), "viagens": viagens}
+    with engine.begin() as conexao:
+        sqlite = engine.dialect.name == "sqlite"
+        if sqlite:
+            for pragma in PRAGMAS_CARGA:
+                conexao.exec_driver_sql(pragma)
+        base_motorista = _proximo_id(conexao, Motorista.__table__)
+        base_veiculo = _proximo_id(conexao, Veiculo.__table__)
+        base_viagem = _proximo_id(conexao, Viagem.__table__)
+
+        inserir = _insersor(conexao, Motorista.__table__, (
+            "id", "nome", "cpf", "cnh_numero", "cnh_categoria", "cnh_emissao", "cnh_validade", "ativo",
+        ))
+        for registros in _lotes(gerador.motoristas(), lote):
+            inserir([
+                (base_motorista + m.indice, m.nome, m.cpf, m.cnh_numero, m.cnh_categoria, m.cnh_emissao, m.cnh_validade, True)
+                for m in registros
+            ])
+
+        inserir = _insersor(conexao, Veiculo.__table__, (
+            "id", "placa", "marca", "modelo", "ano_fabricacao", "ano_modelo", "tipo_veiculo",
+            "tipo_combustivel", "consumo_medio", "quilometragem_atual", "status", "versao",
+        ))
+        for registros in _lotes(gerador.veiculos, lote):
+            inserir([
+                (
+                    base_veiculo + v.indice, v.placa, v.marca, v.modelo, v.ano, v.ano, v.tipo_veiculo,
+                    v.tipo_combustivel, v.consumo_medio, v.quilometragem, StatusVeiculo.DISPONIVEL, 1,
+                )
+                for v in registros
+            ])
+
+        if documentos:
+            aleatorio = random.Random(f"{gerador.semente}:documentos")
+            hoje = gerador.inicio.date()
+            linhas = [
+                (base_veiculo + v.indice, tipo, hoje + timedelta(days=aleatorio.randint(-60, 365)))
+                for v in gerador.veiculos
+                for tipo in DOCUMENTOS_OBRIGATORIOS
+            ]
+            inserir = _insersor(conexao, DocumentoVeiculo.__table__, ("veiculo_id", "tipo", "data_validade"))
+            for registros in _lotes(linhas, lote):
+                inserir(registros)
+            gravados["documentos_veiculos"] = len(linhas)
+
+        # Em SQLite, saída e chegada são convertidas uma vez e usadas nas colunas prevista e real
+        data_hora = _processador(conexao, Viagem.__table__.c.data_saida_real) if sqlite else (lambda valor: valor)
+        inserir_viagens = _insersor(conexao, Viagem.__table__, (
+            "id", "codigo", "motorista_id", "veiculo_id", "origem", "destino", "data_saida_prevista",
+            "data_saida_real", "data_chegada_prevista", "data_chegada_real", "km_inicial", "km_final",
+            "km_total", "combustivel_consumido", "custo_combustivel", "pedagio", "alimentacao",
+            "hospedagem", "outros_custos", "custo_total", "status", "versao",
+        ), convertidas=("data_saida_prevista", "data_saida_real", "data_chegada_prevista", "data_chegada_real") if sqlite else ())
+        inserir_abastecimentos = _insersor(conexao, Abastecimento.__table__, (
+            "veiculo_id", "motorista_id", "data", "quilometragem", "litros", "valor_litro",
+            "valor_total", "tipo_combustivel", "cidade",
+        ))
+        combustiveis = [v.tipo_combustivel for v in gerador.veiculos]
+        concluida = StatusViagem.CONCLUIDA
+        for registros in _lotes(gerador.viagens(viagens), lote):
+            linhas = []
+            for v in registros:
+                custo = round(v.litros * PRECO_COMBUSTIVEL, 2)
+                saida, chegada = data_hora(v.saida), data_hora(v.chegada)
+                identificador = base_viagem + v.indice
+                linhas.append((
+                    identificador, f"S{identificador:011d}", base_motorista + v.motorista, base_veiculo + v.veiculo,
+                    v.origem, v.destino, saida, saida, chegada, chegada, v.km_inicial, v.km_final,
+                    round(v.km_final - v.km_inicial, 1), v.litros, custo, 0.0, 0.0, 0.0, 0.0, custo, concluida, 1,
+                ))
+            inserir_viagens(linhas)
+            if abastecimentos:
+                inserir_abastecimentos([
+                    (
+                        base_veiculo + v.veiculo, base_motorista + v.motorista, v.chegada, v.km_final, v.litros,
+                        PRECO_COMBUSTIVEL, round(v.litros * PRECO_COMBUSTIVEL, 2), combustiveis[v.veiculo], v.destino,
+                    )
+                    for v in registros
+                ])
+        if abastecimentos:
+            gravados["abastecimentos"] = viagens
+
+        conexao.execute(
+            update(Veiculo.__table__)
+            .where(Veiculo.__table__.c.id == bindparam("veiculo"))
+            .values(quilometragem_atual=bindparam("km")),
+            [{"veiculo": base_veiculo + indice, "km": km} for indice, km in enumerate(gerador.quilometragem)],
+        )
+    return gravados
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Gera a frota no banco indicado e imprime a vazão da carga."""
+    parser = argparse.ArgumentParser(description="Gerador de frota sintética")
+    parser.add_argument("banco", help="arquivo SQLite de destino")
+    parser.add_argument("--esquema", choices=("app", "legado"), default="app")
+    parser.add_argument("--motoristas", type=int, default=5000)
+    parser.add_argument("--veiculos", type=int, default=2000)
+    parser.add_argument("--viagens", type=int, default=1_000_000)
+    parser.add_argument("--semente", type=int, default=SEMENTE)
+    parser.add_argument("--lote", type=int, default=LOTE)
+    parser.add_argument("--abastecimentos", action="store_true", help="grava um abastecimento por viagem (esquema app)")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    gerador = GeradorFrota(args.motoristas, args.veiculos, args.semente)
+    if args.esquema == "legado":
+        gravados = gravar_legado(args.banco, gerador, args.viagens, args.lote)
+    else:
+        engine = create_engine(f"sqlite:///{args.banco}")
+        Base.metadata.create_all(engine)
+        gravados = gravar_app(engine, gerador, args.viagens, args.lote, abastecimentos=args.abastecimentos)
+        engine.dispose()
+    duracao = time.perf_counter() - inicio
+    for tabela, quantidade in gravados.items():
+        print(f"{tabela:<20} {quantidade:>12,}")
+    print(f"Gravado em {duracao:.1f}s ({args.viagens / duracao:,.0f} viagens/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmarks das rotas da API pelo cliente de testes ASGI.
+
+O lifespan da aplicação não é executado; as rotas medidas dependem apenas da
+sessão do banco, substituída pela do banco com a frota sintética. O tempo
+inclui roteamento, validação, serialização e os middlewares.
+"""
+
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infrastructure.persistence.sqlalchemy.database import get_db
+from app.main import app
+
+@pytest.fixture(scope="module")
+def cliente(fabrica_frota):
+    """Cliente da aplicação ligado ao banco com a frota sintética."""
+    def sessao():
+        with fabrica_frota() as sessao:
+            yield sessao
+
+    app.dependency_overrides[get_db] = sessao
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+def test_vivo(benchmark, cliente):
+    """Sonda de vida: custo fixo da pilha HTTP."""
+    assert benchmark(cliente.get, "/health/live").status_code == 200
+
+def test_obter_viagem(benchmark, cliente, ids_frota):
+    """Leitura de uma viagem por identificador."""
+    viagens = itertools.cycle(ids_frota["viagens"])
+    resposta = benchmark(lambda: cliente.get(f"/api/v1/viagens/{next(viagens)}"))
+    assert resposta.status_code == 200
+
+def test_totais_de_custo(benchmark, cliente):
+    """Totais de custo por veículo em um semestre."""
+    resposta = benchmark(
+        cliente.get,
+        "/api/v1/viagens/relatorios/custos/totais",
+        params={"dimensao": "veiculo", "inicio": "2024-01-01", "fim": "2024-06-30"},
+    )
+    assert resposta.status_code == 200
+
+def test_metricas(benchmark, cliente):
+    """Exportação das métricas no formato do Prometheus."""
+    assert benchmark(cliente.get, "/metrics").status_code == 200
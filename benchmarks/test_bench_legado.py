@@ -0,0 +1,52 @@
+"""
+Benchmarks dos repositórios SQLite do pacote sistema_frota.
+
+Cada chamada abre e fecha a própria conexão, como no uso pelo menu; os
+benchmarks medem esse custo junto com o comando. Os módulos são ignorados
+quando o pacote não pode ser importado.
+"""
+
+import itertools
+import os
+
+import pytest
+
+from benchmarks.gerador_frota import GeradorFrota, gravar_legado
+
+database = pytest.importorskip("sistema_frota.infrastructure.db.database")
+schema = pytest.importorskip("sistema_frota.infrastructure.db.schema")
+motorista_repo = pytest.importorskip("sistema_frota.infrastructure.repositories.motorista_repo")
+veiculo_repo = pytest.importorskip("sistema_frota.infrastructure.repositories.veiculo_repo")
+viagem_repo = pytest.importorskip("sistema_frota.infrastructure.repositories.viagem_repo")
+
+QUANTIDADE = 500
+
+@pytest.fixture
+def banco_legado(tmp_path, monkeypatch):
+    """Banco do sistema_frota em arquivo temporário, com motoristas, veículos e viagens."""
+    caminho = os.fspath(tmp_path / "sistema_frota.db")
+    monkeypatch.setattr(database, "DB_NAME", caminho)
+    schema.criar_tabelas()
+    gravar_legado(caminho, GeradorFrota(QUANTIDADE, QUANTIDADE), QUANTIDADE)
+
+def test_criar_motorista(benchmark, banco_legado):
+    """Inserção de um motorista, com conexão e commit por chamada."""
+    repositorio = motorista_repo.MotoristaRepositorySQLite()
+    sequencia = itertools.count()
+    benchmark(lambda: repositorio.criar("Motorista", f"N{next(sequencia):010d}"))
+
+def test_listar_veiculos(benchmark, banco_legado):
+    """Listagem de todos os veículos."""
+    repositorio = veiculo_repo.VeiculoRepositorySQLite()
+    assert len(benchmark(repositorio.listar)) == QUANTIDADE
+
+def test_listar_viagens(benchmark, banco_legado):
+    """Listagem de todas as viagens, convertidas em entidades."""
+    repositorio = viagem_repo.ViagemRepositorySQLite()
+    assert len(benchmark(repositorio.listar)) == QUANTIDADE
+
+def test_finalizar_viagem(benchmark, banco_legado):
+    """Finalização de uma viagem por rodada."""
+    repositorio = viagem_repo.ViagemRepositorySQLite()
+    viagens = iter(range(1, QUANTIDADE + 1))
+    benchmark.pedantic(lambda: repositorio.finalizar(next(viagens), 350.0), rounds=QUANTIDADE // 2)
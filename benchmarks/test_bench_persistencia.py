@@ -0,0 +1,105 @@
+"""
+Benchmarks da persistência: inserções, listagens e encerramento de viagens.
+"""
+
+import itertools
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.application.use_cases.viagem.encerrar_viagem import EncerrarViagemUseCase
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Motorista,
+    StatusVeiculo,
+    StatusViagem,
+    TipoCNH,
+    Veiculo,
+    Viagem,
+)
+
+LOTE = 1000
+
+_sequencia = itertools.count(1)
+
+def _motoristas(quantidade):
+    """Gera motoristas com CPF e CNH únicos entre as rodadas."""
+    base = next(_sequencia) * quantidade
+    return [
+        {
+            "nome": f"Motorista {base + i}", "cpf": f"{base + i:011d}", "cnh_numero": f"{base + i:011d}",
+            "cnh_categoria": TipoCNH.B, "cnh_validade": datetime(2030, 1, 1).date(),
+            "cnh_emissao": datetime(2020, 1, 1).date(),
+        }
+        for i in range(quantidade)
+    ]
+
+def test_inserir_motoristas_orm(benchmark, banco_vazio):
+    """Inserção de um lote de motoristas pela unidade de trabalho do ORM."""
+    fabrica = sessionmaker(bind=banco_vazio)
+
+    def inserir():
+        with fabrica() as sessao:
+            sessao.add_all(Motorista(**linha) for linha in _motoristas(LOTE))
+            sessao.commit()
+
+    benchmark(inserir)
+
+def test_inserir_motoristas_lote(benchmark, banco_vazio):
+    """Inserção do mesmo lote em um único INSERT executemany."""
+    def inserir():
+        with banco_vazio.begin() as conexao:
+            conexao.execute(insert(Motorista.__table__), _motoristas(LOTE))
+
+    benchmark(inserir)
+
+def test_listar_viagens_com_relacionamentos(benchmark, sessao_frota):
+    """Listagem paginada de viagens com motorista e veículo carregados."""
+    consulta = (
+        select(Viagem)
+        .options(joinedload(Viagem.motorista), joinedload(Viagem.veiculo))
+        .order_by(Viagem.data_saida_real.desc())
+        .limit(100)
+    )
+
+    def listar():
+        sessao_frota.expunge_all()
+        return sessao_frota.execute(consulta).scalars().all()
+
+    assert len(benchmark(listar)) == 100
+
+def test_listar_veiculos_disponiveis(benchmark, sessao_frota):
+    """Listagem dos veículos disponíveis."""
+    consulta = select(Veiculo).where(Veiculo.status == StatusVeiculo.DISPONIVEL).order_by(Veiculo.placa)
+
+    def listar():
+        sessao_frota.expunge_all()
+        return sessao_frota.execute(consulta).scalars().all()
+
+    assert benchmark(listar)
+
+def test_encerrar_viagem(benchmark, fabrica_frota, ids_frota):
+    """Encerramento de uma viagem em andamento, com evento no outbox."""
+    veiculos = itertools.cycle(ids_frota["veiculos"])
+
+    def preparar():
+        sessao = fabrica_frota()
+        veiculo = sessao.get(Veiculo, next(veiculos))
+        veiculo.status = StatusVeiculo.EM_USO
+        viagem = Viagem(
+            codigo=f"B{next(_sequencia):011d}", motorista_id=1, veiculo_id=veiculo.id,
+            origem="Campinas", destino="Santos", data_saida_prevista=datetime.now(),
+            data_saida_real=datetime.now(), km_inicial=veiculo.quilometragem_atual,
+            status=StatusViagem.EM_ANDAMENTO, versao=1,
+        )
+        sessao.add(viagem)
+        sessao.commit()
+        return (sessao, viagem.id, viagem.km_inicial + 350.0), {}
+
+    def encerrar(sessao, viagem_id, km_final):
+        try:
+            EncerrarViagemUseCase(sessao).executar(viagem_id, km_final, 40.0, 240.0)
+        finally:
+            sessao.close()
+
+    benchmark.pedantic(encerrar, setup=preparar, rounds=50)
@@ -0,0 +1,44 @@
+"""
+Benchmarks dos serviços de cálculo e das verificações de elegibilidade.
+"""
+
+import itertools
+from datetime import date
+
+from sqlalchemy import select
+
+from app.application.services.calculo_consumo_service import CalculoConsumoService
+from app.application.use_cases.motorista.alertas_cnh import AlertasCNHUseCase
+from app.application.use_cases.veiculo.validar_licenciamento import ValidarLicenciamentoUseCase
+from app.infrastructure.persistence.sqlalchemy.models import Viagem
+
+HOJE = date(2024, 3, 1)
+
+def test_calculo_consumo_e_custo(benchmark, sessao_frota):
+    """Consumo médio e custo de todas as viagens da frota."""
+    viagens = sessao_frota.execute(
+        select(Viagem.km_total, Viagem.combustivel_consumido, Viagem.pedagio, Viagem.alimentacao)
+    ).all()
+    servico = CalculoConsumoService()
+
+    def calcular():
+        total = 0.0
+        for km_total, litros, pedagio, alimentacao in viagens:
+            servico.calcular_consumo_medio(km_total, litros)
+            total += servico.calcular_custo_viagem(
+                litros, 6.0, {"pedagio": pedagio or 0.0, "alimentacao": alimentacao or 0.0}
+            )
+        return total
+
+    assert benchmark(calcular) > 0
+
+def test_validar_licenciamento(benchmark, sessao_frota, ids_frota):
+    """Verificação da documentação de um veículo por rodada."""
+    caso_de_uso = ValidarLicenciamentoUseCase(sessao_frota)
+    veiculos = itertools.cycle(ids_frota["veiculos"])
+    benchmark(lambda: caso_de_uso.executar(next(veiculos), HOJE))
+
+def test_cnh_vencendo(benchmark, sessao_frota):
+    """Motoristas com CNH vencendo nos próximos 30 dias."""
+    caso_de_uso = AlertasCNHUseCase(sessao_frota)
+    benchmark(caso_de_uso.vencendo_em, 30, HOJE)
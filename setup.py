@@ -26,7 +26,7 @@ setup(
     long_description=readme(),
     long_description_content_type="text/markdown",
     url="https://github.com/gabrielhastec/sistema_frota",
-    packages=find_packages(exclude=["tests", "tests.*", "examples"]),
+    packages=find_packages(exclude=["tests", "tests.*", "examples", "benchmarks", "benchmarks.*"]),
     include_package_data=True,
     install_requires=[
         # Nenhuma dependência externa necessária, usa apenas biblioteca padrão
@@ -35,11 +35,15 @@ setup(
         "test": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
+            "pytest-benchmark>=4.0.0",
         ],
         "dev": [
             "black>=23.0.0",
             "flake8>=6.0.0",
         ],
+        "analytics": [
+            "numpy>=1.22",
+        ],
     },
     entry_points={
         "console_scripts": [
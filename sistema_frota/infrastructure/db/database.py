@@ -7,6 +7,8 @@ garantindo consistência e reutilização em outras partes do sistema.
 
 import sqlite3
 
+from sistema_frota.infrastructure.db.profiler import ConexaoPerfilada
+
 # Nome do arquivo do banco de dados SQLite
 DB_NAME = "sistema_frota.db"
 
@@ -14,7 +16,8 @@ def get_connection() -> sqlite3.Connection:
     """Estabelece uma conexão com o banco de dados SQLite.
 
     Cria e retorna uma conexão com o banco de dados especificado pela constante
-    DB_NAME. A conexão é configurada para uso em operações de leitura e escrita.
+    DB_NAME. A conexão é configurada para uso em operações de leitura e escrita e
+    mede cada comando executado para o perfil de consultas (`profiler.PERFIL`).
 
     Returns:
         sqlite3.Connection: Objeto de conexão com o banco de dados SQLite.
@@ -23,4 +26,4 @@ def get_connection() -> sqlite3.Connection:
         sqlite3.Error: Se houver falha ao conectar ao banco de dados, como
             permissões insuficientes ou arquivo de banco corrompido.
     """
-    return sqlite3.connect(DB_NAME)
+    return sqlite3.connect(DB_NAME, factory=ConexaoPerfilada)
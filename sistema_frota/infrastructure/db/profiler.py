@@ -0,0 +1,138 @@
+"""Módulo de perfil das consultas SQL do banco de dados SQLite do sistema de frota.
+
+Este módulo define a classe `ConexaoPerfilada`, usada por `get_connection()` como
+fábrica das conexões sqlite3, que mede cada comando executado e alimenta o perfil
+global `PERFIL`. O perfil agrupa os comandos pela impressão digital (o SQL sem
+literais, comentários e listas de parâmetros) e acumula chamadas e tempo de cada
+grupo. Os comandos acima do limite vão para o log de consultas lentas, uma linha
+JSON por comando, com os parâmetros redigidos e o `EXPLAIN QUERY PLAN`.
+
+A normalização, a redação dos parâmetros e o plano vêm do módulo
+`app.infrastructure.observabilidade.normalizacao_sql`, o mesmo do perfil da aplicação
+web, de modo que os dois logs podem ser agregados juntos por
+`python -m app.infrastructure.observabilidade.perfil_consultas`. Como aquele módulo,
+este usa apenas a biblioteca padrão.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from app.infrastructure.observabilidade.normalizacao_sql import impressao_digital, plano_sqlite, redigir_parametros
+
+# Duração, em milissegundos, a partir da qual o comando vai para o log de consultas lentas
+LIMITE_LENTA_MS = 100.0
+
+# Logger do log de consultas lentas
+LOGGER_CONSULTAS_LENTAS = "sistema_frota.consultas_lentas"
+
+class PerfilConsultas:
+    """Perfil das consultas agrupadas por impressão digital.
+
+    Acumula, para cada impressão digital, chamadas, tempo total, tempo máximo e
+    execuções lentas, e grava os comandos lentos no log de consultas lentas.
+    """
+
+    def __init__(self, limite_lenta_ms: float = LIMITE_LENTA_MS, explicar: bool = True) -> None:
+        """Inicializa o perfil.
+
+        Args:
+            limite_lenta_ms (float): Duração a partir da qual o comando é considerado lento.
+            explicar (bool): Inclui o plano de execução no log de consultas lentas.
+        """
+        self.limite_lenta_ms = limite_lenta_ms
+        self.explicar = explicar
+        self.logger = logging.getLogger(LOGGER_CONSULTAS_LENTAS)
+        self._estatisticas: Dict[str, Dict[str, Any]] = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, conexao: sqlite3.Connection, sql: str, parametros: Any, duracao: float) -> None:
+        """Acumula a execução de um comando e, se lenta, grava o comando no log.
+
+        Args:
+            conexao (sqlite3.Connection): Conexão em que o comando foi executado.
+            sql (str): Comando executado.
+            parametros (Any): Parâmetros do comando.
+            duracao (float): Duração, em segundos.
+        """
+        normalizado, impressao = impressao_digital(sql)
+        duracao_ms = duracao * 1000
+        lenta = duracao_ms >= self.limite_lenta_ms
+        with self._trava:
+            estatistica = self._estatisticas.setdefault(impressao, {
+                "impressao": impressao, "sql": normalizado, "chamadas": 0,
+                "total_ms": 0.0, "maximo_ms": 0.0, "lentas": 0,
+            })
+            estatistica["chamadas"] += 1
+            estatistica["total_ms"] += duracao_ms
+            estatistica["maximo_ms"] = max(estatistica["maximo_ms"], duracao_ms)
+            estatistica["lentas"] += lenta
+        if lenta:
+            primeiro = parametros
+            if isinstance(parametros, (list, tuple)) and parametros and isinstance(parametros[0], (list, tuple, dict)):
+                primeiro = parametros[0]
+            registro = {
+                "momento": datetime.now(timezone.utc).isoformat(),
+                "impressao": impressao,
+                "sql": normalizado,
+                "duracao_ms": round(duracao_ms, 3),
+                "parametros": redigir_parametros(parametros),
+                "plano": plano_sqlite(conexao, sql, primeiro) if self.explicar else None,
+            }
+            self.logger.warning(json.dumps(registro, ensure_ascii=False, default=str))
+
+    def mais_custosas(self, quantidade: int = 10) -> List[Dict[str, Any]]:
+        """Retorna as impressões digitais de maior tempo total.
+
+        Args:
+            quantidade (int): Quantidade de impressões digitais.
+
+        Returns:
+            List[Dict[str, Any]]: Cópias das estatísticas, em ordem decrescente de tempo total.
+        """
+        with self._trava:
+            estatisticas = [dict(item) for item in self._estatisticas.values()]
+        estatisticas.sort(key=lambda item: item["total_ms"], reverse=True)
+        return estatisticas[:quantidade]
+
+    def limpar(self) -> None:
+        """Descarta as estatísticas acumuladas."""
+        with self._trava:
+            self._estatisticas.clear()
+
+# Perfil alimentado pelas conexões de `get_connection()`
+PERFIL = PerfilConsultas()
+
+class CursorPerfilado(sqlite3.Cursor):
+    """Cursor sqlite3 que mede cada comando executado e alimenta o perfil global."""
+
+    def execute(self, sql: str, parametros: Any = ()) -> "CursorPerfilado":
+        inicio = time.perf_counter()
+        super().execute(sql, parametros)
+        PERFIL.registrar(self.connection, sql, parametros, time.perf_counter() - inicio)
+        return self
+
+    def executemany(self, sql: str, parametros: Any) -> "CursorPerfilado":
+        # Geradores seriam consumidos pela execução; o perfil precisa do primeiro conjunto
+        if not isinstance(parametros, (list, tuple)):
+            parametros = list(parametros)
+        inicio = time.perf_counter()
+        super().executemany(sql, parametros)
+        PERFIL.registrar(self.connection, sql, parametros, time.perf_counter() - inicio)
+        return self
+
+class ConexaoPerfilada(sqlite3.Connection):
+    """Conexão sqlite3 cujos cursores medem cada comando executado."""
+
+    def cursor(self, factory: type = CursorPerfilado) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parametros: Any = ()) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql: str, parametros: Any) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, parametros)
@@ -0,0 +1,94 @@
+"""Módulo de métricas dos repositórios SQLite do sistema de frota.
+
+Este módulo define o decorador de classe `instrumentar_repositorio`, aplicado aos
+repositórios de motoristas, veículos e viagens, que mede cada método público:
+chamadas, falhas (exceções propagadas ao chamador) e tempo gasto, rotulados pelo
+nome do repositório e do método. Os contadores são os da aplicação web
+(`app.infrastructure.observabilidade.metricas`), que usa apenas a biblioteca padrão,
+em um registro próprio; `exportar_prometheus` gera o texto que o endpoint `/metrics`
+anexa ao da aplicação quando este módulo está carregado.
+"""
+
+import functools
+import time
+from typing import Callable, Dict, Tuple
+
+from app.infrastructure.observabilidade.metricas import RegistroMetricas
+
+# Registro das métricas dos repositórios, separado do registro da aplicação
+REGISTRO_REPOSITORIOS = RegistroMetricas()
+
+_ROTULOS = ("repositorio", "operacao")
+_chamadas = REGISTRO_REPOSITORIOS.contador("repositorio_chamadas", "Chamadas aos repositórios SQLite.", _ROTULOS)
+_erros = REGISTRO_REPOSITORIOS.contador(
+    "repositorio_erros", "Chamadas aos repositórios SQLite que falharam.", _ROTULOS
+)
+_duracao = REGISTRO_REPOSITORIOS.contador(
+    "repositorio_duracao_segundos", "Tempo acumulado nas chamadas aos repositórios SQLite.", _ROTULOS
+)
+
+def registrar(repositorio: str, operacao: str, duracao: float, erro: bool = False) -> None:
+    """Registra uma chamada de repositório.
+
+    Args:
+        repositorio (str): Nome do repositório (por exemplo, "motoristas").
+        operacao (str): Nome do método chamado.
+        duracao (float): Duração da chamada, em segundos.
+        erro (bool): Indica se a chamada levantou uma exceção.
+    """
+    _chamadas.inc(repositorio, operacao)
+    # Incremento zero nas chamadas bem-sucedidas, para que a série exista desde a primeira
+    _erros.inc(repositorio, operacao, valor=float(erro))
+    _duracao.inc(repositorio, operacao, valor=duracao)
+
+def estatisticas() -> Dict[Tuple[str, str], Tuple[int, int, float]]:
+    """Soma os contadores de todas as threads.
+
+    Returns:
+        Dict[Tuple[str, str], Tuple[int, int, float]]: Chamadas, erros e segundos
+            acumulados por (repositório, operação).
+    """
+    chamadas, erros, duracao = _chamadas.valores(), _erros.valores(), _duracao.valores()
+    return {
+        chave: (int(total), int(erros.get(chave, 0)), duracao.get(chave, 0.0))
+        for chave, total in chamadas.items()
+    }
+
+def exportar_prometheus() -> str:
+    """Exporta os contadores dos repositórios no formato texto do Prometheus.
+
+    Returns:
+        str: Texto de exposição com as chamadas, os erros e a duração acumulada.
+    """
+    return REGISTRO_REPOSITORIOS.exportar()
+
+def instrumentar_repositorio(nome: str) -> Callable[[type], type]:
+    """Cria um decorador de classe que instrumenta os métodos públicos do repositório.
+
+    Args:
+        nome (str): Nome do repositório usado nos rótulos das métricas.
+
+    Returns:
+        Callable[[type], type]: Decorador que substitui cada método público por
+            uma versão que registra a chamada.
+    """
+    def decorar(classe: type) -> type:
+        for atributo, metodo in list(vars(classe).items()):
+            if not atributo.startswith("_") and callable(metodo):
+                setattr(classe, atributo, _medir(nome, atributo, metodo))
+        return classe
+    return decorar
+
+def _medir(repositorio: str, operacao: str, metodo: Callable) -> Callable:
+    """Envolve o método medindo a duração e registrando falhas."""
+    @functools.wraps(metodo)
+    def medido(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            resultado = metodo(*args, **kwargs)
+        except Exception:
+            registrar(repositorio, operacao, time.perf_counter() - inicio, erro=True)
+            raise
+        registrar(repositorio, operacao, time.perf_counter() - inicio)
+        return resultado
+    return medido
@@ -7,8 +7,10 @@ pelo módulo `database`.
 """
 
 from sistema_frota.infrastructure.db.database import get_connection
+from sistema_frota.infrastructure.metricas import instrumentar_repositorio
 from typing import List, Tuple
 
+@instrumentar_repositorio("motoristas")
 class MotoristaRepositorySQLite:
     """Repositório para gerenciamento de motoristas no banco de dados SQLite.
 
@@ -7,10 +7,12 @@ módulo `database`.
 """
 
 from sistema_frota.infrastructure.db.database import get_connection
+from sistema_frota.infrastructure.metricas import instrumentar_repositorio
 from sistema_frota.core.entities.viagem import Viagem
 from datetime import datetime
 from typing import List, Tuple
 
+@instrumentar_repositorio("viagens")
 class ViagemRepositorySQLite:
     """Repositório para gerenciamento de viagens no banco de dados SQLite.
 
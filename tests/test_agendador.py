@@ -0,0 +1,129 @@
+"""Módulo de testes unitários para o agendador de tarefas recorrentes.
+
+Este módulo contém testes para a `ExpressaoCron`, verificando listas,
+intervalos, passos, atalhos e a regra de dia do mês ou dia da semana, e para
+o `Agendador`, verificando que, com duas instâncias sobre o mesmo banco,
+apenas uma executa cada ocorrência, que o lease é liberado com o resultado
+da execução e que duração e atraso são registrados nas métricas.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.infrastructure.agendamento.agendador import STATUS_FALHA, STATUS_SUCESSO, Agendador
+from app.infrastructure.agendamento.cron import ExpressaoCron
+from app.infrastructure.observabilidade.metricas import RegistroMetricas
+from app.infrastructure.persistence.sqlalchemy.models import Base, LeaseTarefa
+
+class TestExpressaoCron(unittest.TestCase):
+    """Classe de testes para a ExpressaoCron."""
+
+    def test_proxima(self) -> None:
+        """Testa passos, intervalos, dias úteis e a virada de ano."""
+        cron = ExpressaoCron("*/15 9-17 * * 1-5")
+        # Sexta-feira, 16 de outubro de 2026
+        self.assertEqual(cron.proxima(datetime(2026, 10, 16, 9, 7, 30)), datetime(2026, 10, 16, 9, 15))
+        self.assertEqual(cron.proxima(datetime(2026, 10, 16, 17, 45)), datetime(2026, 10, 19, 9, 0))
+        self.assertEqual(ExpressaoCron("@yearly").proxima(datetime(2026, 12, 31, 23, 59)), datetime(2027, 1, 1))
+        self.assertEqual(ExpressaoCron("0 6 * * *").proxima(datetime(2026, 10, 16, 6, 0)), datetime(2026, 10, 17, 6, 0))
+
+    def test_dia_do_mes_ou_da_semana(self) -> None:
+        """Testa que, com os dois campos restritos, basta um deles coincidir."""
+        cron = ExpressaoCron("0 0 13 * 5")
+        self.assertEqual(cron.proxima(datetime(2026, 10, 1)), datetime(2026, 10, 2))
+        self.assertEqual(cron.proxima(datetime(2026, 10, 9)), datetime(2026, 10, 13))
+        self.assertEqual(ExpressaoCron("0 0 * * 7").proxima(datetime(2026, 10, 16)), datetime(2026, 10, 18))
+
+    def test_invalidas(self) -> None:
+        """Testa a recusa de expressões inválidas ou sem ocorrência."""
+        for texto in ("* * * *", "60 * * * *", "*/0 * * * *", "5-1 * * * *", "a * * * *"):
+            with self.assertRaises(ValueError, msg=texto):
+                ExpressaoCron(texto)
+        with self.assertRaises(ValueError):
+            ExpressaoCron("0 0 30 2 *").proxima(datetime(2026, 1, 1))
+
+class TestAgendador(unittest.TestCase):
+    """Classe de testes para o Agendador."""
+
+    def setUp(self) -> None:
+        """Cria o banco temporário compartilhado por duas instâncias."""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.diretorio.name, 'leases.db')}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.agora = datetime(2026, 10, 16, 5, 58)
+        self.execucoes = []
+        self.trava = threading.Lock()
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        self.diretorio.cleanup()
+
+    def _instancia(self, nome):
+        agendador = Agendador(self.Session, workers=2, instancia=nome, relogio=lambda: self.agora)
+        agendador.agendar("alertas", lambda: self._registrar(nome), "0 6 * * *")
+        agendador.agendar("limpeza", lambda: self._registrar(f"limpeza@{nome}"), "0 6 * * *", exclusiva=False)
+        return agendador
+
+    def _registrar(self, execucao):
+        with self.trava:
+            self.execucoes.append(execucao)
+
+    def _lease(self, nome):
+        with self.Session() as session:
+            return session.get(LeaseTarefa, nome)
+
+    def test_uma_instancia_por_ocorrencia(self) -> None:
+        """Testa o lease compartilhado, a liberação e as métricas de atraso."""
+        a, b = self._instancia("a"), self._instancia("b")
+        self.assertEqual(a.verificar() + b.verificar(), [])
+        self.assertEqual(self._lease("alertas").proxima_execucao, datetime(2026, 10, 16, 6, 0))
+
+        self.agora = datetime(2026, 10, 16, 6, 0, 5)
+        self.assertEqual(a.verificar(), ["alertas", "limpeza"])
+        self.assertEqual(b.verificar(), ["limpeza"])
+        a.encerrar()
+        b.encerrar()
+
+        self.assertEqual(sorted(self.execucoes), ["a", "limpeza@a", "limpeza@b"])
+        lease = self._lease("alertas")
+        self.assertEqual((lease.dono, lease.expira_em, lease.ultimo_status), (None, None, STATUS_SUCESSO))
+        self.assertEqual(lease.proxima_execucao, datetime(2026, 10, 17, 6, 0))
+
+        metricas = {m.nome: m for m in a.metricas()}["alertas"]
+        self.assertEqual((metricas.execucoes, metricas.falhas, metricas.em_execucao), (1, 0, False))
+        self.assertAlmostEqual(metricas.atraso_ultimo, 5.0)
+        self.assertEqual(metricas.proxima_execucao, datetime(2026, 10, 17, 6, 0))
+
+    def test_lease_ativo_e_falha(self) -> None:
+        """Testa que um lease ativo bloqueia a ocorrência e o registro da falha."""
+        with self.Session() as session:
+            session.add(LeaseTarefa(
+                nome="falha", dono="outra", proxima_execucao=datetime(2026, 10, 16, 5, 0),
+                expira_em=datetime(2026, 10, 16, 6, 30),
+            ))
+            session.commit()
+        registro = RegistroMetricas()
+        agendador = Agendador(self.Session, instancia="a", relogio=lambda: self.agora, registro=registro)
+        agendador.agendar("falha", lambda: 1 / 0, "@hourly")
+
+        self.assertEqual(agendador.verificar(), [])
+        self.agora = datetime(2026, 10, 16, 6, 31)
+        self.assertEqual(agendador.verificar(), ["falha"])
+        agendador.encerrar()
+
+        self.assertEqual(self._lease("falha").ultimo_status, STATUS_FALHA)
+        self.assertEqual(agendador.metricas()[0].falhas, 1)
+        self.assertAlmostEqual(agendador.metricas()[0].atraso_ultimo, timedelta(minutes=91).total_seconds())
+
+        exportado = registro.exportar()
+        self.assertIn('agendador_tarefas_falhas_total{tarefa="falha"} 1', exportado)
+        self.assertIn('agendador_tarefa_duracao_segundos_count{tarefa="falha"} 1', exportado)
+        self.assertIn('agendador_tarefa_atraso_segundos_bucket{tarefa="falha",le="+Inf"} 1', exportado)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Módulo de testes unitários para o feed de vencimentos de documentos.
+
+Este módulo contém testes para o `AlertaService`, verificando que os
+vencimentos de documentos de motoristas, documentos de veículos e seguros são
+intercalados em ordem de data e que a varredura incremental lê apenas a nova
+janela, e para o `ValidarLicenciamentoUseCase`. Os testes utilizam um banco de
+dados SQLite em memória.
+"""
+
+import unittest
+from datetime import date, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.application.services.alerta_service import (
+    ORIGEM_DOCUMENTO_MOTORISTA, ORIGEM_DOCUMENTO_VEICULO, ORIGEM_SEGURO, AlertaService,
+)
+from app.application.use_cases.veiculo.validar_licenciamento import ValidarLicenciamentoUseCase
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Base, DocumentoMotorista, DocumentoVeiculo, TipoCombustivel, TipoVeiculo, Veiculo,
+)
+
+HOJE = date(2026, 5, 10)
+
+def _dia(dias: int) -> date:
+    return HOJE + timedelta(days=dias)
+
+class TestAlertaService(unittest.TestCase):
+    """Classe de testes para o feed unificado de vencimentos."""
+
+    def setUp(self) -> None:
+        """Cria o banco em memória com documentos das três origens."""
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+
+        self.veiculo = Veiculo(
+            placa="QWE4R56", marca="Mercedes", modelo="Atego", ano_fabricacao=2020, ano_modelo=2020,
+            tipo_veiculo=TipoVeiculo.CAMINHAO, tipo_combustivel=TipoCombustivel.DIESEL,
+            vencimento_seguro=_dia(20),
+        )
+        self.session.add(self.veiculo)
+        self.session.flush()
+        self.session.add_all([
+            DocumentoVeiculo(veiculo_id=self.veiculo.id, tipo="CRLV", data_validade=_dia(45)),
+            DocumentoVeiculo(veiculo_id=self.veiculo.id, tipo="IPVA", data_validade=_dia(-2)),
+            DocumentoVeiculo(veiculo_id=self.veiculo.id, tipo="Licenciamento", data_validade=_dia(10)),
+            DocumentoMotorista(motorista_id=1, tipo="ASO", data_validade=_dia(5)),
+            DocumentoMotorista(motorista_id=2, tipo="Curso MOPP", data_validade=_dia(20)),
+            DocumentoMotorista(motorista_id=3, tipo="RG"),
+        ])
+        self.session.commit()
+
+    def tearDown(self) -> None:
+        """Fecha a sessão e libera o banco em memória."""
+        self.session.close()
+        self.engine.dispose()
+
+    def test_feed_ordenado_entre_origens(self) -> None:
+        """Testa o merge das três origens em ordem de data e origem."""
+        feed = list(AlertaService(self.session, tamanho_lote=2).vencimentos(None, _dia(30)))
+        self.assertEqual(
+            [(v.data_validade, v.origem, v.tipo) for v in feed],
+            [
+                (_dia(-2), ORIGEM_DOCUMENTO_VEICULO, "IPVA"),
+                (_dia(5), ORIGEM_DOCUMENTO_MOTORISTA, "ASO"),
+                (_dia(10), ORIGEM_DOCUMENTO_VEICULO, "Licenciamento"),
+                (_dia(20), ORIGEM_DOCUMENTO_MOTORISTA, "Curso MOPP"),
+                (_dia(20), ORIGEM_SEGURO, "Seguro"),
+            ],
+        )
+        self.assertEqual(feed[-1].titular_id, self.veiculo.id)
+
+    def test_varredura_incremental(self) -> None:
+        """Testa que cada varredura lê somente a janela nova após o checkpoint."""
+        self.session.add(DocumentoMotorista(motorista_id=4, tipo="CNH", data_validade=_dia(-400)))
+        self.session.commit()
+        servico = AlertaService(self.session)
+        primeira = list(servico.varrer(antecedencia=10, hoje=HOJE))
+        self.assertEqual([v.tipo for v in primeira], ["IPVA", "ASO", "Licenciamento"])
+        self.assertEqual(list(servico.varrer(antecedencia=10, hoje=HOJE)), [])
+
+        novos = list(servico.varrer(antecedencia=10, hoje=_dia(10)))
+        self.assertEqual([v.tipo for v in novos], ["Curso MOPP", "Seguro"])
+
+    def test_varredura_interrompida_nao_avanca_checkpoint(self) -> None:
+        """Testa que um feed consumido pela metade é repetido na próxima execução."""
+        servico = AlertaService(self.session)
+        next(servico.varrer(antecedencia=10, hoje=HOJE))
+        self.assertEqual(len(list(servico.varrer(antecedencia=10, hoje=HOJE))), 3)
+
+    def test_validar_licenciamento(self) -> None:
+        """Testa as pendências de documentação do veículo."""
+        caso_de_uso = ValidarLicenciamentoUseCase(self.session)
+        situacao = caso_de_uso.executar(self.veiculo.id, data_referencia=HOJE)
+        self.assertFalse(situacao.regular)
+        self.assertEqual(situacao.pendencias, [f"IPVA vencido em {_dia(-2):%d/%m/%Y}"])
+
+        self.session.add(DocumentoVeiculo(veiculo_id=self.veiculo.id, tipo="ipva", data_validade=_dia(300)))
+        self.session.commit()
+        self.assertTrue(caso_de_uso.executar(self.veiculo.id, data_referencia=HOJE).regular)
+        self.assertEqual(
+            caso_de_uso.executar(self.veiculo.id, data_referencia=_dia(30)).pendencias,
+            [f"LICENCIAMENTO vencido em {_dia(10):%d/%m/%Y}", f"Seguro vencido em {_dia(20):%d/%m/%Y}"],
+        )
+
+if __name__ == "__main__":
+    unittest.main()
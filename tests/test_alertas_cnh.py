@@ -0,0 +1,89 @@
+"""Módulo de testes unitários para os alertas de vencimento de CNH.
+
+Este módulo contém testes para o `IndiceValidadeCNH` e para o
+`AlertasCNHUseCase`, verificando a consulta por janela de vencimento, a emissão
+incremental apenas dos novos cruzamentos de antecedência entre execuções e o
+checkpoint gravado em `configuracoes_sistema`. Os testes utilizam um banco de
+dados SQLite em memória.
+"""
+
+import unittest
+from datetime import date, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.application.services.checkpoint_service import ler_checkpoint
+from app.application.use_cases.motorista.alertas_cnh import (
+    CHAVE_CHECKPOINT, AlertasCNHUseCase, IndiceValidadeCNH,
+)
+from app.infrastructure.persistence.sqlalchemy.models import Base, Motorista, TipoCNH
+
+HOJE = date(2026, 3, 1)
+
+class TestAlertasCNH(unittest.TestCase):
+    """Classe de testes para os alertas de vencimento de CNH."""
+
+    def setUp(self) -> None:
+        """Cria o banco em memória com motoristas em várias faixas de vencimento."""
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        # dias até o vencimento em HOJE, por motorista
+        self.dias = {"Ana": 5, "Bruno": 8, "Carla": 31, "Davi": 60, "Eva": 120, "Fabio": -3}
+        for posicao, (nome, dias) in enumerate(self.dias.items()):
+            self.session.add(Motorista(
+                nome=nome, cpf=f"{posicao:011d}", cnh_numero=f"CNH{posicao}",
+                cnh_categoria=TipoCNH.D, cnh_validade=HOJE + timedelta(days=dias),
+                cnh_emissao=date(2020, 1, 1),
+            ))
+        self.session.add(Motorista(
+            nome="Inativo", cpf="99999999999", cnh_numero="CNH99", cnh_categoria=TipoCNH.B,
+            cnh_validade=HOJE + timedelta(days=2), cnh_emissao=date(2020, 1, 1), ativo=False,
+        ))
+        self.session.commit()
+
+    def tearDown(self) -> None:
+        """Fecha a sessão e libera o banco em memória."""
+        self.session.close()
+        self.engine.dispose()
+
+    def _resumo(self, alertas):
+        return [(alerta.nome, alerta.antecedencia) for alerta in alertas]
+
+    def test_indice_por_faixa(self) -> None:
+        """Testa a busca por faixa de validade nos baldes ordenados."""
+        indice = IndiceValidadeCNH.carregar(self.session, HOJE, HOJE + timedelta(days=60))
+        self.assertEqual(len(indice), 4)
+        nomes = [nome for _, _, nome in indice.intervalo(HOJE + timedelta(days=5), HOJE + timedelta(days=31))]
+        self.assertEqual(nomes, ["Bruno", "Carla"])
+
+    def test_vencendo_em(self) -> None:
+        """Testa a consulta das CNHs ativas que vencem na janela."""
+        alertas = AlertasCNHUseCase(self.session).vencendo_em(30, hoje=HOJE)
+        self.assertEqual([(a.nome, a.dias_restantes) for a in alertas], [("Ana", 5), ("Bruno", 8)])
+
+    def test_primeira_execucao_emite_antecedencia_mais_urgente(self) -> None:
+        """Testa que a primeira execução alerta todos dentro das janelas, uma vez cada."""
+        alertas = AlertasCNHUseCase(self.session).executar(hoje=HOJE)
+        self.assertEqual(
+            self._resumo(alertas), [("Ana", 7), ("Bruno", 30), ("Carla", 90), ("Davi", 90)]
+        )
+        self.assertEqual(ler_checkpoint(self.session, CHAVE_CHECKPOINT), HOJE)
+        self.assertEqual(AlertasCNHUseCase(self.session).executar(hoje=HOJE), [])
+
+    def test_execucoes_incrementais(self) -> None:
+        """Testa que execuções seguintes emitem apenas os novos cruzamentos."""
+        caso_de_uso = AlertasCNHUseCase(self.session, antecedencias=(90, 30, 7, 0))
+        caso_de_uso.executar(hoje=HOJE)
+
+        # Bruno cruza 7 dias e Carla cruza 30 dias no dia seguinte
+        alertas = caso_de_uso.executar(hoje=HOJE + timedelta(days=1))
+        self.assertEqual(self._resumo(alertas), [("Bruno", 7), ("Carla", 30)])
+
+        # Execuções puladas: cada motorista recebe só o cruzamento mais urgente
+        alertas = caso_de_uso.executar(hoje=HOJE + timedelta(days=30))
+        self.assertEqual(
+            self._resumo(alertas), [("Ana", 0), ("Bruno", 0), ("Carla", 7), ("Davi", 30), ("Eva", 90)]
+        )
+
+if __name__ == "__main__":
+    unittest.main()
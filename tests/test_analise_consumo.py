@@ -0,0 +1,119 @@
+"""Módulo de testes unitários para a análise vetorizada de consumo.
+
+Este módulo contém testes para o `AnaliseConsumoService`, verificando o consumo
+entre abastecimentos, a média móvel que não cruza veículos, o descarte de
+trechos com hodômetro inválido, o resumo por veículo com desvio em relação ao
+consumo de referência e a carga dos abastecimentos de um banco SQLite em
+memória. Os testes são ignorados quando o NumPy não está instalado.
+"""
+
+import math
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Abastecimento, Base, TipoCombustivel, TipoVeiculo, Veiculo,
+)
+
+if np is not None:
+    from app.application.services.analise_consumo_service import (
+        AnaliseConsumoService, DadosAbastecimento,
+    )
+
+INICIO = datetime(2026, 1, 1)
+
+def _dados(veiculos, km, litros, valor_litro=None, referencia=None):
+    n = len(veiculos)
+    return DadosAbastecimento(
+        veiculo_id=np.array(veiculos, dtype=np.int64),
+        quilometragem=np.array(km, dtype=np.float64),
+        litros=np.array(litros, dtype=np.float64),
+        valor_litro=np.array(valor_litro or [6.0] * n, dtype=np.float64),
+        consumo_referencia=referencia or {},
+    )
+
+@unittest.skipIf(np is None, "NumPy não instalado")
+class TestAnaliseConsumo(unittest.TestCase):
+    """Classe de testes para o AnaliseConsumoService."""
+
+    def test_consumo_entre_abastecimentos(self) -> None:
+        """Testa km/l, custo por km e o primeiro abastecimento de cada veículo."""
+        dados = _dados([1, 1, 1, 2, 2], [1000, 1400, 1900, 500, 800], [40, 40, 50, 30, 30])
+        consumo = AnaliseConsumoService().calcular(dados)
+
+        self.assertTrue(math.isnan(consumo.consumo_km_l[0]))
+        self.assertTrue(math.isnan(consumo.consumo_km_l[3]))
+        np.testing.assert_allclose(consumo.consumo_km_l[[1, 2, 4]], [10.0, 10.0, 10.0])
+        np.testing.assert_allclose(consumo.custo_km[[1, 4]], [0.6, 0.6])
+
+    def test_media_movel_ponderada_por_veiculo(self) -> None:
+        """Testa a média móvel pela razão de somas e sem cruzar veículos."""
+        dados = _dados(
+            [1, 1, 1, 1, 2, 2],
+            [0, 100, 300, 400, 0, 120],
+            [10, 10, 10, 20, 10, 10],
+        )
+        consumo = AnaliseConsumoService(janela_media=2).calcular(dados)
+        # trechos do veículo 1: 100/10, 200/10, 100/20
+        np.testing.assert_allclose(consumo.media_movel_km_l[1:4], [10.0, 15.0, 10.0])
+        np.testing.assert_allclose(consumo.media_movel_km_l[5], 12.0)
+
+    def test_hodometro_invalido_e_descartado(self) -> None:
+        """Testa que trechos com hodômetro regredido não entram nos indicadores."""
+        dados = _dados([1, 1, 1, 1], [1000, 1500, 1400, 1900], [30, 50, 20, 50])
+        service = AnaliseConsumoService(janela_media=3)
+        consumo = service.calcular(dados)
+        self.assertTrue(math.isnan(consumo.consumo_km_l[2]))
+        self.assertTrue(math.isnan(consumo.media_movel_km_l[2]))
+        np.testing.assert_allclose(consumo.media_movel_km_l[3], 1000 / 100)
+
+        resumo, = service.resumir(dados, consumo)
+        self.assertEqual((resumo.abastecimentos, resumo.km_rodados, resumo.litros), (4, 1000.0, 100.0))
+
+    def test_resumo_com_desvio_da_referencia(self) -> None:
+        """Testa o resumo por veículo e o desvio em relação ao consumo de referência."""
+        dados = _dados([3, 3, 3, 7, 7], [0, 400, 800, 0, 300], [40, 50, 50, 20, 25],
+                       valor_litro=[6.0, 6.0, 5.0, 6.0, 6.0], referencia={3: 10.0})
+        resumos = AnaliseConsumoService().resumir(dados)
+
+        self.assertEqual([r.veiculo_id for r in resumos], [3, 7])
+        self.assertAlmostEqual(resumos[0].consumo_km_l, 8.0)
+        self.assertAlmostEqual(resumos[0].custo_km, (50 * 6.0 + 50 * 5.0) / 800)
+        self.assertAlmostEqual(resumos[0].desvio_percentual, -20.0)
+        self.assertIsNone(resumos[1].desvio_percentual)
+
+    def test_carga_do_banco(self) -> None:
+        """Testa a carga ordenada por veículo e data e a referência do veículo."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as session:
+            veiculo = Veiculo(
+                placa="ZXC1V23", marca="Fiat", modelo="Ducato", ano_fabricacao=2022, ano_modelo=2022,
+                tipo_veiculo=TipoVeiculo.VAN, tipo_combustivel=TipoCombustivel.DIESEL, consumo_medio=9.0,
+            )
+            session.add(veiculo)
+            session.flush()
+            for dia, km in ((2, 1450), (0, 1000), (5, 1900)):
+                session.add(Abastecimento(
+                    veiculo_id=veiculo.id, data=INICIO + timedelta(days=dia), quilometragem=km,
+                    litros=50, valor_litro=6.0, valor_total=300,
+                ))
+            session.commit()
+
+            dados = DadosAbastecimento.carregar(session, inicio=INICIO)
+        engine.dispose()
+
+        self.assertEqual(dados.quilometragem.tolist(), [1000, 1450, 1900])
+        resumo, = AnaliseConsumoService().resumir(dados)
+        self.assertAlmostEqual(resumo.consumo_km_l, 9.0)
+        self.assertAlmostEqual(resumo.desvio_percentual, 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+"""Módulo de testes unitários para a detecção de anomalias em abastecimentos.
+
+Este módulo contém testes para o `DetectorAnomaliasAbastecimento`, verificando
+os códigos de tanque excedido, hodômetro regredido ou parado, combustível
+incompatível (inclusive veículos flex), consumo e preço atípicos pelas
+estatísticas acumuladas, a varredura do histórico com gravação dos códigos, a
+análise dos abastecimentos no flush, o descarte do estado das transações
+desfeitas e o detector separado de cada tenant com banco próprio, usando
+bancos SQLite em memória e temporários.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.application.services.anomalia_abastecimento_service import (
+    CodigoAnomalia,
+    DetectorAnomaliasAbastecimento,
+    DetectoresTenants,
+    EstatisticaAcumulada,
+    ativar_deteccao_anomalias,
+)
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Abastecimento, Base, TipoCombustivel, TipoVeiculo, Veiculo,
+)
+from app.infrastructure.persistence.sqlalchemy.tenant_router import RoteadorTenants
+
+INICIO = datetime(2026, 3, 1)
+DIESEL = TipoCombustivel.DIESEL
+
+class Evento(NamedTuple):
+    id: int
+    veiculo_id: int
+    quilometragem: float
+    litros: float
+    valor_litro: float
+    tipo_combustivel: Optional[TipoCombustivel] = DIESEL
+    cidade: Optional[str] = "Curitiba"
+
+def _rotina(detector, veiculo_id=1, quantidade=10, km_inicial=0.0):
+    """Processa abastecimentos regulares: 500 km com 50 litros a R$ 6,00."""
+    for i in range(quantidade):
+        detector.processar(Evento(i, veiculo_id, km_inicial + 500 * (i + 1), 50, 6.0 + 0.01 * (i % 3)))
+    return km_inicial + 500 * quantidade
+
+class TestDetectorAnomalias(unittest.TestCase):
+    """Classe de testes para o DetectorAnomaliasAbastecimento."""
+
+    def setUp(self) -> None:
+        """Cria o detector com um caminhão a diesel de tanque de 200 litros."""
+        self.detector = DetectorAnomaliasAbastecimento(amostras_minimas=5)
+        self.detector.registrar_veiculo(1, capacidade_tanque=200, tipo_combustivel=DIESEL)
+
+    def _motivos(self, evento):
+        anomalia = self.detector.processar(evento)
+        return anomalia.motivos if anomalia else ()
+
+    def test_estatistica_acumulada(self) -> None:
+        """Testa média e desvio padrão amostral pelo algoritmo de Welford."""
+        estatistica = EstatisticaAcumulada()
+        for valor in (2, 4, 4, 4, 5, 5, 7, 9):
+            estatistica.adicionar(valor)
+        self.assertAlmostEqual(estatistica.media, 5.0)
+        self.assertAlmostEqual(estatistica.desvio_padrao, (32 / 7) ** 0.5)
+
+    def test_regras_de_cadastro(self) -> None:
+        """Testa tanque excedido, combustível incompatível e veículos flex."""
+        self.assertEqual(self._motivos(Evento(1, 1, 1000, 209, 6.0)), ())
+        self.assertEqual(
+            self._motivos(Evento(2, 1, 2000, 260, 6.0, TipoCombustivel.GASOLINA, "Londrina")),
+            (CodigoAnomalia.TANQUE_EXCEDIDO, CodigoAnomalia.COMBUSTIVEL_INCOMPATIVEL),
+        )
+        self.detector.registrar_veiculo(2, tipo_combustivel=TipoCombustivel.FLEX)
+        self.assertEqual(self._motivos(Evento(3, 2, 100, 40, 5.0, TipoCombustivel.ETANOL)), ())
+        self.assertEqual(
+            self._motivos(Evento(4, 2, 200, 40, 6.0, DIESEL)),
+            (CodigoAnomalia.COMBUSTIVEL_INCOMPATIVEL,),
+        )
+
+    def test_hodometro(self) -> None:
+        """Testa hodômetro regredido ou parado, mantendo a última leitura válida."""
+        km = _rotina(self.detector)
+        self.assertEqual(self._motivos(Evento(20, 1, km - 300, 50, 6.0)), (CodigoAnomalia.HODOMETRO_REGREDIU,))
+        self.assertEqual(self._motivos(Evento(21, 1, km, 50, 6.0)), (CodigoAnomalia.HODOMETRO_PARADO,))
+        self.assertEqual(self._motivos(Evento(22, 1, km + 500, 50, 6.0)), ())
+
+    def test_consumo_e_preco_atipicos(self) -> None:
+        """Testa consumo e preço fora do padrão, sem contaminar as estatísticas."""
+        km = _rotina(self.detector)
+        # 500 km com 150 litros: consumo de 3,3 km/l contra 10 km/l
+        self.assertEqual(self._motivos(Evento(30, 1, km + 500, 150, 6.0)), (CodigoAnomalia.CONSUMO_ATIPICO,))
+        self.assertEqual(self._motivos(Evento(31, 1, km + 1000, 50, 9.5)), (CodigoAnomalia.PRECO_ATIPICO,))
+        self.assertEqual(self._motivos(Evento(32, 1, km + 1500, 50, 6.0)), ())
+        # Outra cidade tem estatística de preço própria, ainda sem amostras
+        self.assertEqual(self._motivos(Evento(33, 1, km + 2000, 50, 9.5, cidade="Manaus")), ())
+
+    def test_lote(self) -> None:
+        """Testa que o processamento em lote produz apenas os suspeitos."""
+        eventos = [Evento(i, 1, 500 * (i + 1), 50, 6.0) for i in range(6)]
+        eventos.append(Evento(99, 1, 100, 300, 6.0))
+        anomalias = list(self.detector.processar_lote(eventos))
+        self.assertEqual([a.abastecimento_id for a in anomalias], [99])
+        self.assertEqual(anomalias[0].codificar(), "tanque_excedido,hodometro_regrediu")
+
+class TestDeteccaoNoBanco(unittest.TestCase):
+    """Classe de testes da varredura do histórico e da análise no flush."""
+
+    def setUp(self) -> None:
+        """Cria o banco em memória com um veículo de tanque de 80 litros."""
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            veiculo = Veiculo(
+                placa="QWE4R56", marca="Renault", modelo="Master", ano_fabricacao=2022, ano_modelo=2022,
+                tipo_veiculo=TipoVeiculo.VAN, tipo_combustivel=DIESEL, capacidade_tanque=80,
+            )
+            session.add(veiculo)
+            session.commit()
+            self.veiculo_id = veiculo.id
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+
+    def _abastecimento(self, dia, km, litros):
+        return Abastecimento(
+            veiculo_id=self.veiculo_id, data=INICIO + timedelta(days=dia), quilometragem=km,
+            litros=litros, valor_litro=6.0, valor_total=litros * 6.0, tipo_combustivel=DIESEL,
+        )
+
+    def test_varredura_do_historico(self) -> None:
+        """Testa a gravação dos códigos e a limpeza de sinalizações antigas."""
+        with self.Session() as session:
+            session.add_all([
+                self._abastecimento(0, 1000, 50),
+                self._abastecimento(2, 900, 50),
+                self._abastecimento(1, 1500, 120),
+            ])
+            antigo = self._abastecimento(3, 2000, 50)
+            antigo.anomalias = "preco_atipico"
+            session.add(antigo)
+            session.commit()
+
+            anomalias = DetectorAnomaliasAbastecimento().varrer_historico(session, tamanho_lote=2)
+            self.assertEqual(len(anomalias), 2)
+            gravados = {a.quilometragem: a.anomalias for a in session.query(Abastecimento)}
+
+        self.assertEqual(gravados, {
+            1000: None, 1500: "tanque_excedido", 900: "hodometro_regrediu", 2000: None,
+        })
+
+    def test_analise_no_flush(self) -> None:
+        """Testa que os abastecimentos incluídos recebem os códigos no mesmo flush."""
+        ativar_deteccao_anomalias(self.Session, DetectorAnomaliasAbastecimento())
+        with self.Session() as session:
+            session.add_all([self._abastecimento(1, 1500, 40), self._abastecimento(0, 1000, 40)])
+            session.commit()
+            session.add(self._abastecimento(2, 1400, 95))
+            session.commit()
+            gravados = [a.anomalias for a in session.query(Abastecimento).order_by(Abastecimento.data)]
+
+        self.assertEqual(gravados, [None, None, "tanque_excedido,hodometro_regrediu"])
+
+    def test_rollback_nao_altera_o_detector(self) -> None:
+        """Testa que só as transações confirmadas alteram o estado do detector."""
+        detector = DetectorAnomaliasAbastecimento()
+        ativar_deteccao_anomalias(self.Session, detector)
+        with self.Session() as session:
+            session.add(self._abastecimento(0, 1000, 40))
+            session.flush()
+            session.add(self._abastecimento(1, 5000, 40))
+            session.flush()
+            session.rollback()
+        self.assertIsNone(detector._veiculos[self.veiculo_id].ultimo_km)
+        self.assertEqual(detector._precos, {})
+
+        with self.Session() as session:
+            session.add(self._abastecimento(0, 1000, 40))
+            session.flush()
+            # O segundo flush enxerga o hodômetro do primeiro, ainda não confirmado
+            session.add(self._abastecimento(1, 900, 40))
+            session.flush()
+            self.assertIsNone(detector._veiculos[self.veiculo_id].ultimo_km)
+            session.commit()
+            gravados = [a.anomalias for a in session.query(Abastecimento).order_by(Abastecimento.data)]
+        self.assertEqual(gravados, [None, "hodometro_regrediu"])
+        self.assertEqual(detector._veiculos[self.veiculo_id].ultimo_km, 1000)
+        self.assertEqual(detector._precos[(None, DIESEL)].n, 2)
+
+        # Sessão fechada sem commit também descarta o rascunho
+        session = self.Session()
+        session.add(self._abastecimento(2, 3000, 40))
+        session.flush()
+        session.close()
+        self.assertEqual(detector._veiculos[self.veiculo_id].ultimo_km, 1000)
+
+    def test_detector_por_tenant(self) -> None:
+        """Testa que o mesmo veículo em bancos de tenants diferentes não mistura estado."""
+        with tempfile.TemporaryDirectory() as diretorio:
+            roteador = RoteadorTenants(os.path.join(diretorio, "tenants"), fabrica_sessao=self.Session, tenants=["sul"])
+            detector, tenants = DetectorAnomaliasAbastecimento(), DetectoresTenants()
+            ativar_deteccao_anomalias(self.Session, detector, tenants)
+            try:
+                with roteador.sessao("sul") as session:
+                    session.add(Veiculo(
+                        placa="ZXC9V87", marca="Iveco", modelo="Daily", ano_fabricacao=2023, ano_modelo=2023,
+                        tipo_veiculo=TipoVeiculo.VAN, tipo_combustivel=DIESEL, capacidade_tanque=80,
+                    ))
+                    session.commit()
+                    session.add(self._abastecimento(0, 50_000, 40))
+                    session.commit()
+                with self.Session() as session:
+                    # No tenant padrão, o hodômetro do veículo 1 do tenant sul não conta
+                    session.add(self._abastecimento(0, 1_000, 40))
+                    session.commit()
+                    self.assertIsNone(session.query(Abastecimento).one().anomalias)
+            finally:
+                roteador.encerrar()
+        self.assertEqual(detector._veiculos[self.veiculo_id].ultimo_km, 1_000)
+        self.assertEqual(tenants.obter("sul")._veiculos[self.veiculo_id].ultimo_km, 50_000)
+
+if __name__ == "__main__":
+    unittest.main()
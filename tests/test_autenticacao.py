@@ -0,0 +1,144 @@
+"""Módulo de testes unitários para a autenticação das requisições.
+
+Este módulo contém testes para o `VerificadorTokens`, verificando o cache das
+claims até o `exp` e a recusa de tokens inválidos, para o `CacheUsuarios`,
+verificando que a desativação de um usuário invalida o cache após o commit,
+para as permissões por perfil e para as dependências `get_current_user` e
+`exigir_permissao`, usando um banco SQLite temporário.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.api.v1.dependencies import exigir_permissao, get_current_user
+from app.application.services.usuario_cache_service import CacheUsuarios, ativar_invalidacao_usuarios
+from app.infrastructure.auth.jwt_service import (
+    ALGORITHM, SECRET_KEY, TokenInvalido, VerificadorTokens, create_access_token,
+)
+from app.infrastructure.auth.permissions import permissoes_do_perfil, possui_permissoes
+from app.infrastructure.persistence.sqlalchemy.models import Base, Usuario
+
+class TestVerificadorTokens(unittest.TestCase):
+    """Classe de testes do verificador de tokens."""
+
+    def test_cache_ate_exp(self) -> None:
+        """Testa o acerto no cache e a expiração pelo relógio."""
+        agora = [time.time()]
+        verificador = VerificadorTokens(relogio=lambda: agora[0])
+        token = create_access_token({"sub": "7"})
+        self.assertEqual(verificador.verificar(token)["sub"], "7")
+        self.assertEqual(verificador.verificar(token)["sub"], "7")
+        self.assertEqual((verificador.acertos, verificador.falhas), (1, 1))
+
+        agora[0] += 3600
+        self.assertEqual(verificador.limpar(), 1)
+        with self.assertRaises(TokenInvalido):
+            verificador.verificar(jwt.encode({"sub": "7", "exp": int(time.time()) - 10}, SECRET_KEY, ALGORITHM))
+
+    def test_tokens_invalidos(self) -> None:
+        """Testa a recusa de assinatura errada, token sem exp e texto qualquer."""
+        verificador = VerificadorTokens()
+        for token in (
+            jwt.encode({"sub": "7", "exp": int(time.time()) + 60}, "outra-chave", ALGORITHM),
+            jwt.encode({"sub": "7"}, SECRET_KEY, ALGORITHM),
+            "abc.def.ghi",
+        ):
+            with self.assertRaises(TokenInvalido):
+                verificador.verificar(token)
+
+class TestPermissoes(unittest.TestCase):
+    """Classe de testes das permissões por perfil."""
+
+    def test_perfis(self) -> None:
+        """Testa o curinga do admin, o gestor, o operador e perfis desconhecidos."""
+        self.assertTrue(possui_permissoes(permissoes_do_perfil("admin"), ["qualquer:coisa"]))
+        self.assertTrue(possui_permissoes(permissoes_do_perfil("gestor"), ["configuracoes:editar", "viagens:ler"]))
+        self.assertFalse(possui_permissoes(permissoes_do_perfil("operador"), ["configuracoes:editar"]))
+        self.assertFalse(possui_permissoes(permissoes_do_perfil("visitante"), ["viagens:ler"]))
+
+class TestUsuarioAutenticado(unittest.TestCase):
+    """Classe de testes do cache de usuários e das dependências de autenticação."""
+
+    def setUp(self) -> None:
+        """Cria o banco temporário, os caches e uma aplicação mínima."""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.diretorio.name, 'auth.db')}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            gestor = Usuario(nome="Ana", email="ana@frota.com", senha_hash="x", perfil="gestor")
+            operador = Usuario(nome="Rui", email="rui@frota.com", senha_hash="x", perfil="operador")
+            session.add_all([gestor, operador])
+            session.commit()
+            self.gestor_id, self.operador_id = gestor.id, operador.id
+        self.cache = CacheUsuarios(self.Session)
+        ativar_invalidacao_usuarios(self.Session, self.cache)
+
+        app = FastAPI()
+        app.state.verificador_tokens = VerificadorTokens()
+        app.state.cache_usuarios = self.cache
+
+        @app.get("/eu")
+        async def eu(usuario=Depends(get_current_user)):
+            return {"nome": usuario.nome}
+
+        @app.post("/editar", dependencies=[Depends(exigir_permissao("configuracoes:editar"))])
+        async def editar():
+            return {"ok": True}
+
+        self.cliente = TestClient(app)
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        self.diretorio.cleanup()
+
+    def _cabecalho(self, usuario_id):
+        return {"Authorization": f"Bearer {create_access_token({'sub': str(usuario_id)})}"}
+
+    def test_dependencias(self) -> None:
+        """Testa a resolução do usuário, as permissões e os tokens recusados."""
+        resposta = self.cliente.get("/eu", headers=self._cabecalho(self.gestor_id))
+        self.assertEqual((resposta.status_code, resposta.json()), (200, {"nome": "Ana"}))
+        self.assertEqual(self.cliente.post("/editar", headers=self._cabecalho(self.gestor_id)).status_code, 200)
+        self.assertEqual(self.cliente.post("/editar", headers=self._cabecalho(self.operador_id)).status_code, 403)
+        self.assertEqual(self.cliente.get("/eu", headers={"Authorization": "Bearer abc"}).status_code, 401)
+        self.assertEqual(self.cliente.get("/eu", headers=self._cabecalho(999)).status_code, 401)
+        self.assertIn(self.cliente.get("/eu").status_code, (401, 403))
+
+    def test_desativacao_invalida_cache(self) -> None:
+        """Testa que a desativação só vale após o commit e dispensa o banco depois."""
+        self.assertEqual(self.cache.obter(self.gestor_id).perfil, "gestor")
+        with self.Session() as session:
+            usuario = session.get(Usuario, self.gestor_id)
+            usuario.perfil = "operador"
+            session.flush()
+            session.rollback()
+            self.assertTrue(self.cache.obter_em_cache(self.gestor_id)[0])
+            session.get(Usuario, self.gestor_id).ativo = False
+            session.commit()
+        self.assertEqual(self.cache.obter_em_cache(self.gestor_id), (False, None))
+        self.assertIsNone(self.cache.obter(self.gestor_id))
+        self.assertEqual(self.cache.obter_em_cache(self.gestor_id), (True, None))
+        self.assertEqual(self.cliente.get("/eu", headers=self._cabecalho(self.gestor_id)).status_code, 401)
+
+    def test_segundo_cache_tambem_invalidado(self) -> None:
+        """Testa que um cache novo registrado na mesma fábrica também é invalidado."""
+        novo = CacheUsuarios(self.Session)
+        ativar_invalidacao_usuarios(self.Session, novo)
+        ativar_invalidacao_usuarios(self.Session, novo)
+        self.assertEqual(self.cache.obter(self.operador_id).perfil, "operador")
+        self.assertEqual(novo.obter(self.operador_id).perfil, "operador")
+        with self.Session() as session:
+            session.get(Usuario, self.operador_id).perfil = "gestor"
+            session.commit()
+        self.assertEqual(self.cache.obter(self.operador_id).perfil, "gestor")
+        self.assertEqual(novo.obter(self.operador_id).perfil, "gestor")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Módulo de testes unitários para o teste de carga HTTP.
+
+Este módulo contém testes para a interpretação da mistura de tráfego, para os
+percentis e o resumo das amostras, para a comparação de resultados e para a
+alternância dos veículos entre livres e em viagem conforme as respostas.
+"""
+
+import random
+import unittest
+from collections import deque
+from datetime import date
+import httpx
+from benchmarks.carga_http import (
+    OPERACOES,
+    Cenario,
+    Coletor,
+    comparar,
+    interpretar_mistura,
+    percentil,
+)
+
+class TestResumo(unittest.TestCase):
+    """Classe de testes da mistura, dos percentis e do resumo."""
+
+    def test_interpretar_mistura(self) -> None:
+        """Testa os pesos informados e a rejeição de operações e pesos inválidos."""
+        self.assertEqual(interpretar_mistura("abastecer=3, painel_custos=1"), {"abastecer": 3, "painel_custos": 1})
+        for texto in ("desconhecida=1", "abastecer=0", "abastecer=x", ""):
+            with self.assertRaises(ValueError):
+                interpretar_mistura(texto)
+
+    def test_percentil(self) -> None:
+        """Testa o posto mais próximo."""
+        valores = list(range(1, 101))
+        self.assertEqual(percentil(valores, 50), 50)
+        self.assertEqual(percentil(valores, 99), 99)
+        self.assertEqual(percentil([7.0], 95), 7.0)
+        self.assertEqual(percentil([], 50), 0.0)
+
+    def test_resumir_e_comparar(self) -> None:
+        """Testa vazão, erros por status e a variação entre duas execuções."""
+        coletor = Coletor()
+        for _ in range(8):
+            coletor.registrar("consultar_veiculo", 200, 0.010)
+        coletor.registrar("iniciar_viagem", 409, 0.050)
+        coletor.registrar("iniciar_viagem", 0, 0.100)
+        nivel = coletor.resumir(4, 2.0)
+        self.assertEqual(nivel["requisicoes"], 10)
+        self.assertEqual(nivel["vazao_rps"], 5.0)
+        self.assertEqual(nivel["erros"], 2)
+        self.assertEqual(nivel["latencia_ms"]["p50"], 10.0)
+        self.assertEqual(nivel["latencia_ms"]["maximo"], 100.0)
+        self.assertEqual(nivel["operacoes"]["iniciar_viagem"]["status"], {"0": 1, "409": 1})
+
+        nova = dict(nivel, vazao_rps=7.5)
+        linhas = comparar({"niveis": [nivel]}, {"niveis": [nova, dict(nivel, concorrencia=64)]})
+        self.assertEqual(len(linhas), 2)
+        self.assertIn("+50.0%", linhas[1])
+
+class TestCenario(unittest.TestCase):
+    """Classe de testes das operações de saída e chegada."""
+
+    def setUp(self) -> None:
+        """Cria um cenário com um veículo e duas viagens agendadas."""
+        self.cenario = Cenario(
+            veiculos=[1], viagens=[10], agendadas={1: deque([20, 21])},
+            combustiveis={1: "diesel"}, inicio_periodo=date(2024, 1, 1), fim_periodo=date(2024, 3, 1),
+        )
+        self.aleatorio = random.Random(1)
+
+    def test_saida_e_chegada(self) -> None:
+        """Testa que o veículo só parte de novo depois de chegar."""
+        saida = OPERACOES["iniciar_viagem"](self.cenario, self.aleatorio)
+        self.assertEqual(saida.caminho, "/api/v1/viagens/20/iniciar")
+        self.assertIsNone(OPERACOES["iniciar_viagem"](self.cenario, self.aleatorio))
+        saida.concluir(httpx.Response(200, json={"km_inicial": 1000.0}))
+        self.assertEqual(list(self.cenario.em_viagem), [(1, 20, 1000.0)])
+
+        chegada = OPERACOES["encerrar_viagem"](self.cenario, self.aleatorio)
+        self.assertGreater(chegada.corpo["km_final"], 1000.0)
+        chegada.concluir(httpx.Response(200, json={}))
+        self.assertEqual(list(self.cenario.livres), [1])
+        self.assertEqual(OPERACOES["iniciar_viagem"](self.cenario, self.aleatorio).caminho, "/api/v1/viagens/21/iniciar")
+
+    def test_falhas_devolvem_o_estado(self) -> None:
+        """Testa que uma chegada com falha volta para a fila e uma saída recusada libera o veículo."""
+        saida = OPERACOES["iniciar_viagem"](self.cenario, self.aleatorio)
+        saida.concluir(httpx.Response(409, json={}))
+        self.assertEqual(list(self.cenario.livres), [1])
+
+        saida = OPERACOES["iniciar_viagem"](self.cenario, self.aleatorio)
+        saida.concluir(httpx.Response(200, json={"km_inicial": 5.0}))
+        chegada = OPERACOES["encerrar_viagem"](self.cenario, self.aleatorio)
+        chegada.concluir(None)
+        self.assertEqual(list(self.cenario.em_viagem), [(1, 21, 5.0)])
+        self.assertFalse(self.cenario.livres)
@@ -0,0 +1,186 @@
+"""Módulo de testes unitários para o controle de concorrência otimista.
+
+Este módulo contém testes para a coluna de versão de veículos e viagens, para
+os casos de uso que recebem a versão esperada (If-Match) e para os utilitários
+de nova tentativa, verificando que atualizações concorrentes não se sobrescrevem
+silenciosamente, e o ciclo ETag/If-Match das rotas. Os testes utilizam um banco SQLite em memória compartilhado
+entre duas sessões.
+"""
+
+import unittest
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.dependencies import get_tenant_db
+from app.api.v1.routes import veiculos
+from app.application.services.concorrencia_service import executar_com_retentativa
+from app.application.use_cases.veiculo.atualizar_veiculo import AtualizarVeiculoUseCase
+from app.application.use_cases.viagem.encerrar_viagem import EncerrarViagemUseCase
+from app.application.use_cases.viagem.iniciar_viagem import IniciarViagemUseCase
+from app.domain.events import ConcurrencyConflict
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Base, OutboxEvento, StatusVeiculo, StatusViagem, TipoCombustivel, TipoVeiculo, Veiculo, Viagem,
+)
+from app.infrastructure.persistence.sqlalchemy.session import confirmar
+
+class TestConcorrenciaOtimista(unittest.TestCase):
+    """Classe de testes para a concorrência otimista de veículos e viagens."""
+
+    def setUp(self) -> None:
+        """Cria o banco em memória com um veículo e uma viagem agendada."""
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(self.engine)
+        self.fabrica = sessionmaker(bind=self.engine)
+
+        with self.fabrica() as session:
+            veiculo = Veiculo(
+                placa="ABC1D23", marca="Volvo", modelo="FH540", ano_fabricacao=2022, ano_modelo=2022,
+                tipo_veiculo=TipoVeiculo.CAMINHAO, tipo_combustivel=TipoCombustivel.DIESEL,
+                quilometragem_atual=1000.0,
+            )
+            session.add(veiculo)
+            session.flush()
+            viagem = Viagem(
+                codigo="V-001", motorista_id=1, veiculo_id=veiculo.id, origem="Recife",
+                destino="Natal", data_saida_prevista=datetime(2026, 1, 5, 8), pedagio=25.0,
+            )
+            session.add(viagem)
+            session.commit()
+            self.veiculo_id, self.viagem_id = veiculo.id, viagem.id
+
+    def tearDown(self) -> None:
+        """Libera as conexões do banco em memória."""
+        self.engine.dispose()
+
+    def test_atualizacao_perdida_e_detectada(self) -> None:
+        """Testa que a segunda gravação sobre a mesma versão é rejeitada."""
+        with self.fabrica() as primeira, self.fabrica() as segunda:
+            a = primeira.get(Veiculo, self.veiculo_id)
+            b = segunda.get(Veiculo, self.veiculo_id)
+            self.assertEqual((a.versao, b.versao), (1, 1))
+
+            a.quilometragem_atual = 1100.0
+            confirmar(primeira)
+            b.quilometragem_atual = 1050.0
+            with self.assertRaises(ConcurrencyConflict):
+                confirmar(segunda)
+
+        with self.fabrica() as session:
+            veiculo = session.get(Veiculo, self.veiculo_id)
+            self.assertEqual((veiculo.quilometragem_atual, veiculo.versao), (1100.0, 2))
+
+    def test_versao_esperada_desatualizada(self) -> None:
+        """Testa que o If-Match com versão antiga não altera o veículo."""
+        with self.fabrica() as session:
+            caso_de_uso = AtualizarVeiculoUseCase(session)
+            veiculo = caso_de_uso.atualizar_quilometragem(self.veiculo_id, 1200.0, versao_esperada=1)
+            self.assertEqual(veiculo.versao, 2)
+            with self.assertRaises(ConcurrencyConflict):
+                caso_de_uso.atualizar_quilometragem(self.veiculo_id, 1300.0, versao_esperada=1)
+            self.assertEqual(session.get(Veiculo, self.veiculo_id).quilometragem_atual, 1200.0)
+
+    def test_retentativa_reaplica_sobre_versao_recente(self) -> None:
+        """Testa que a nova tentativa relê o registro e conclui a gravação."""
+        chamadas = []
+
+        with self.fabrica() as session:
+            def operacao():
+                veiculo = session.get(Veiculo, self.veiculo_id)
+                veiculo.quilometragem_atual += 10.0
+                if not chamadas:
+                    # Outra transação grava o veículo entre a leitura e o commit
+                    with self.fabrica() as concorrente:
+                        concorrente.get(Veiculo, self.veiculo_id).quilometragem_atual += 5.0
+                        concorrente.commit()
+                chamadas.append(1)
+                confirmar(session)
+                return veiculo
+
+            veiculo = executar_com_retentativa(operacao, espera_base=0)
+            self.assertEqual(len(chamadas), 2)
+            self.assertEqual((veiculo.quilometragem_atual, veiculo.versao), (1015.0, 3))
+
+    def test_ciclo_da_viagem_versiona_e_registra_eventos(self) -> None:
+        """Testa o início e o encerramento da viagem com a versão esperada."""
+        with self.fabrica() as session:
+            viagem = IniciarViagemUseCase(session).executar(self.viagem_id, versao_esperada=1)
+            self.assertEqual((viagem.status, viagem.versao), (StatusViagem.EM_ANDAMENTO, 2))
+            self.assertEqual(viagem.veiculo.status, StatusVeiculo.EM_USO)
+
+            with self.assertRaises(ConcurrencyConflict):
+                EncerrarViagemUseCase(session).executar(self.viagem_id, 1350.0, versao_esperada=1)
+
+            viagem = EncerrarViagemUseCase(session).executar(
+                self.viagem_id, 1350.0, custo_combustivel=300.0, versao_esperada=2
+            )
+            self.assertEqual((viagem.km_total, viagem.custo_total), (350.0, 325.0))
+            self.assertEqual(viagem.veiculo.quilometragem_atual, 1350.0)
+            eventos = session.execute(select(OutboxEvento.tipo_evento)).scalars().all()
+            self.assertEqual(eventos, ["ViagemIniciada", "ViagemEncerrada"])
+
+class TestConcorrenciaApi(unittest.TestCase):
+    """Classe de testes do ETag e do If-Match nas rotas de veículos."""
+
+    def setUp(self) -> None:
+        """Cria o banco e o cliente HTTP com a rota de veículos."""
+        TestConcorrenciaOtimista.setUp(self)
+        self.concorrentes = 0
+        app = FastAPI()
+        app.include_router(veiculos.router, prefix="/api/v1")
+
+        def sessao():
+            with self.fabrica() as session:
+                event.listen(session, "before_flush", self._gravar_concorrente)
+                yield session
+
+        app.dependency_overrides[get_tenant_db] = sessao
+        self.cliente = TestClient(app)
+        self.url = f"/api/v1/veiculos/{self.veiculo_id}"
+
+    def tearDown(self) -> None:
+        """Libera as conexões do banco em memória."""
+        self.engine.dispose()
+
+    def _gravar_concorrente(self, session, contexto, instancias) -> None:
+        # Outra transação grava o veículo entre a leitura e o commit da requisição
+        if self.concorrentes:
+            self.concorrentes -= 1
+            with self.fabrica() as concorrente:
+                concorrente.get(Veiculo, self.veiculo_id).cor = "azul"
+                concorrente.commit()
+
+    def test_etag_na_leitura(self) -> None:
+        """Testa que a leitura devolve a versão atual no ETag."""
+        resposta = self.cliente.get(self.url)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.headers["ETag"], '"1"')
+
+    def test_if_match_desatualizado(self) -> None:
+        """Testa que uma escrita com If-Match antigo recebe 412 sem gravar."""
+        etag = self.cliente.get(self.url).headers["ETag"]
+        self.concorrentes = 1
+        resposta = self.cliente.patch(
+            f"{self.url}/quilometragem", json={"quilometragem": 1100.0}, headers={"If-Match": etag}
+        )
+        self.assertEqual(resposta.status_code, 412)
+        self.assertEqual(self.cliente.patch(
+            f"{self.url}/quilometragem", json={"quilometragem": 1100.0}, headers={"If-Match": etag}
+        ).status_code, 412)
+        self.assertEqual(self.cliente.get(self.url).json()["quilometragem_atual"], 1000.0)
+
+    def test_sem_if_match_repete_a_escrita(self) -> None:
+        """Testa que, sem If-Match, o conflito é repetido e a escrita concluída."""
+        self.concorrentes = 1
+        resposta = self.cliente.patch(f"{self.url}/quilometragem", json={"quilometragem": 1100.0})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(self.concorrentes, 0)
+        self.assertEqual(resposta.headers["ETag"], '"3"')
+        self.assertEqual(resposta.json()["quilometragem_atual"], 1100.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""Módulo de testes unitários para o cache de configurações por tenant.
+
+Este módulo contém testes para a conversão de `valor` pelo `tipo`, para o
+`CacheConfiguracoes`, verificando acertos, falhas, expiração pelo TTL e a
+separação entre tenants, para os casos de uso de criação e atualização, que
+invalidam o cache do tenant, e para o `BackendCompartilhado`, usando um
+banco SQLite temporário e um cliente chave-valor em memória.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.application.dto.tenant_config_dto import AtualizarConfiguracaoDTO, CriarConfiguracaoDTO
+from app.application.services.checkpoint_service import gravar_checkpoint, ler_checkpoint
+from app.application.services.configuracao_cache_service import (
+    BackendCompartilhado, CacheConfiguracoes, carregador_banco,
+)
+from app.application.use_cases.configuracao.atualizar_configuracao import AtualizarConfiguracaoUseCase
+from app.application.use_cases.configuracao.criar_configuracao import CriarConfiguracaoUseCase
+from app.application.use_cases.configuracao.obter_configuracao import ObterConfiguracaoUseCase
+from app.domain.entities.tenant_config import converter_valor, serializar_valor
+from app.domain.events import BusinessRuleViolation
+from app.infrastructure.persistence.sqlalchemy.models import Base, ConfiguracaoSistema
+
+class ClienteMemoria:
+    """Cliente chave-valor com a interface get/set/delete do Redis."""
+
+    def __init__(self):
+        self.dados = {}
+
+    def get(self, nome):
+        return self.dados.get(nome)
+
+    def set(self, nome, valor, ex=None):
+        self.dados[nome] = valor.encode("utf-8")
+
+    def delete(self, nome):
+        self.dados.pop(nome, None)
+
+class TestConversao(unittest.TestCase):
+    """Classe de testes da conversão de valores pelo tipo."""
+
+    def test_tipos(self) -> None:
+        """Testa a conversão e a serialização de cada tipo."""
+        self.assertEqual(converter_valor("42", "integer"), 42)
+        self.assertEqual(converter_valor("2.5", "float"), 2.5)
+        self.assertIs(converter_valor("Sim", "boolean"), True)
+        self.assertEqual(converter_valor('{"a": [1]}', "json"), {"a": [1]})
+        self.assertEqual(converter_valor("2026-10-19", "date"), date(2026, 10, 19))
+        self.assertEqual(converter_valor("x", None), "x")
+        self.assertEqual(serializar_valor({"a": 1}, "json"), '{"a":1}')
+        self.assertEqual(serializar_valor("0", "boolean"), "false")
+
+    def test_invalidos(self) -> None:
+        """Testa a recusa de valores incompatíveis e tipos desconhecidos."""
+        for texto, tipo in (("abc", "integer"), ("talvez", "boolean"), ("{", "json"), ("1", "decimal")):
+            with self.assertRaises(ValueError, msg=(texto, tipo)):
+                converter_valor(texto, tipo)
+        with self.assertRaises(ValueError):
+            serializar_valor("1,5", "float")
+
+class TestCacheConfiguracoes(unittest.TestCase):
+    """Classe de testes do cache e dos casos de uso de configuração."""
+
+    def setUp(self) -> None:
+        """Cria o banco temporário com configurações de dois tenants."""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.diretorio.name, 'config.db')}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            session.add_all([
+                ConfiguracaoSistema(tenant_id="sul", chave="limite_km", valor="800", tipo="integer"),
+                ConfiguracaoSistema(tenant_id="sul", chave="alertas", valor="true", tipo="boolean"),
+                ConfiguracaoSistema(tenant_id="norte", chave="limite_km", valor="1200", tipo="integer"),
+            ])
+            session.commit()
+        self.agora = 0.0
+        self.consultas = []
+        carregar = carregador_banco(self.Session)
+
+        def carregar_contando(tenant_id):
+            self.consultas.append(tenant_id)
+            return carregar(tenant_id)
+
+        self.carregar = carregar_contando
+        self.cache = CacheConfiguracoes(self.carregar, ttl=30, relogio=lambda: self.agora)
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        self.diretorio.cleanup()
+
+    def test_acertos_e_ttl(self) -> None:
+        """Testa uma carga por tenant, os contadores e a expiração."""
+        self.assertEqual(self.cache.obter("sul", "limite_km"), 800)
+        self.assertIs(self.cache.obter("sul", "alertas"), True)
+        self.assertEqual(self.cache.obter("norte", "limite_km"), 1200)
+        self.assertEqual(self.cache.obter("norte", "ausente", 7), 7)
+        self.assertEqual(self.consultas, ["sul", "norte"])
+        estatisticas = self.cache.estatisticas()
+        self.assertEqual((estatisticas.acertos, estatisticas.falhas, estatisticas.carregamentos), (2, 2, 2))
+        self.assertAlmostEqual(estatisticas.taxa_acerto, 0.5)
+
+        self.agora = 30.0
+        self.cache.obter("sul", "limite_km")
+        self.assertEqual(self.consultas, ["sul", "norte", "sul"])
+
+    def test_invalidacao_na_escrita(self) -> None:
+        """Testa que criar e atualizar invalidam apenas o tenant alterado."""
+        self.assertEqual(self.cache.obter("sul", "limite_km"), 800)
+        self.assertEqual(self.cache.obter("norte", "limite_km"), 1200)
+        with self.Session() as session:
+            atualizada = AtualizarConfiguracaoUseCase(session, self.cache).executar(
+                "sul", "limite_km", AtualizarConfiguracaoDTO(valor=950)
+            )
+            self.assertEqual((atualizada.valor, atualizada.tipo), (950, "integer"))
+            CriarConfiguracaoUseCase(session, self.cache).executar(
+                CriarConfiguracaoDTO("sul", "rotas", {"padrao": ["PR", "SC"]}, tipo="json")
+            )
+            with self.assertRaises(BusinessRuleViolation):
+                CriarConfiguracaoUseCase(session, self.cache).executar(CriarConfiguracaoDTO("sul", "rotas", "{}"))
+            with self.assertRaises(ValueError):
+                AtualizarConfiguracaoUseCase(session, self.cache).executar(
+                    "sul", "limite_km", AtualizarConfiguracaoDTO(valor="muito")
+                )
+            with self.assertRaises(LookupError):
+                AtualizarConfiguracaoUseCase(session, self.cache).executar(
+                    "norte", "rotas", AtualizarConfiguracaoDTO(valor=1)
+                )
+
+        self.assertEqual(self.cache.obter("sul", "limite_km"), 950)
+        self.assertEqual(self.cache.obter("sul", "rotas"), {"padrao": ["PR", "SC"]})
+        self.assertEqual(self.cache.obter("norte", "limite_km"), 1200)
+        self.assertEqual(self.consultas, ["sul", "norte", "sul"])
+        self.assertEqual(self.cache.estatisticas().invalidacoes, 2)
+        self.assertEqual([c.chave for c in ObterConfiguracaoUseCase(self.cache).listar("sul")], ["alertas", "limite_km", "rotas"])
+        with self.assertRaises(LookupError):
+            ObterConfiguracaoUseCase(self.cache).executar("norte", "rotas")
+
+    def test_carga_anterior_a_invalidacao(self) -> None:
+        """Testa que uma carga concorrente com a invalidação não é guardada."""
+        def carregar_invalidando(tenant_id):
+            configuracoes = self.carregar(tenant_id)
+            cache.invalidar(tenant_id)
+            return configuracoes
+
+        cache = CacheConfiguracoes(carregar_invalidando, relogio=lambda: self.agora)
+        cache.obter("sul", "limite_km")
+        cache.obter("sul", "limite_km")
+        self.assertEqual(self.consultas, ["sul", "sul"])
+
+    def test_backend_compartilhado(self) -> None:
+        """Testa que dois processos compartilham a carga e a invalidação."""
+        cliente = ClienteMemoria()
+        a = CacheConfiguracoes(self.carregar, ttl=30, backend=BackendCompartilhado(cliente), relogio=lambda: self.agora)
+        b = CacheConfiguracoes(self.carregar, ttl=30, backend=BackendCompartilhado(cliente), relogio=lambda: self.agora)
+        self.assertIs(a.obter("sul", "alertas"), True)
+        self.assertIs(b.obter("sul", "alertas"), True)
+        self.assertEqual(self.consultas, ["sul"])
+        self.assertEqual(b.estatisticas().carregamentos, 0)
+
+        a.invalidar("sul")
+        self.assertEqual(cliente.dados, {})
+        # A cópia local de b expira pelo TTL curto e relê do banco
+        self.agora = 5.0
+        self.assertEqual(b.obter("sul", "limite_km"), 800)
+        self.assertEqual(self.consultas, ["sul", "sul"])
+
+    def test_checkpoint_no_tenant_padrao(self) -> None:
+        """Testa que os checkpoints não colidem com chaves de outros tenants."""
+        with self.Session() as session:
+            session.add(ConfiguracaoSistema(tenant_id="sul", chave="checkpoint.cnh", valor="x"))
+            gravar_checkpoint(session, "checkpoint.cnh", date(2026, 10, 19))
+            session.commit()
+            self.assertEqual(ler_checkpoint(session, "checkpoint.cnh"), date(2026, 10, 19))
+
+if __name__ == "__main__":
+    unittest.main()
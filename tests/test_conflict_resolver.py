@@ -0,0 +1,174 @@
+"""Módulo de testes unitários para a resolução de conflitos de sincronização.
+
+Este módulo contém testes para o `VetorVersao` e para a mesclagem em três vias,
+verificando edições concorrentes de viagens (custos alterados em um dispositivo
+e status em outro) e de veículos, tanto diretamente no resolvedor quanto pelo
+`SyncService`, que usa o vetor de versão e os valores base registrados no log
+de alterações. Os testes de integração utilizam um banco SQLite em memória.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Base, StatusViagem, TipoCombustivel, TipoVeiculo, Veiculo, Viagem,
+)
+from app.infrastructure.sync.conflict_resolver import (
+    Conflito, MesclagemTresVias, UltimaEscritaVence, VetorVersao,
+)
+from app.infrastructure.sync.sync_service import (
+    AlteracaoCliente, SyncService, ativar_rastreamento_alteracoes,
+)
+
+class TestVetorVersao(unittest.TestCase):
+    """Classe de testes para o VetorVersao."""
+
+    def test_codificacao(self) -> None:
+        """Testa que o vetor serializado é compacto e reversível."""
+        vetor = VetorVersao().incrementar("srv").incrementar("tablet").incrementar("srv")
+        self.assertEqual(vetor.codificar(), "srv=2,tablet=1")
+        self.assertEqual(VetorVersao.decodificar(vetor.codificar()), vetor)
+
+    def test_dominancia_e_concorrencia(self) -> None:
+        """Testa a comparação entre vetores descendentes e concorrentes."""
+        base = VetorVersao.decodificar("srv=1")
+        servidor = base.incrementar("srv")
+        cliente = base.incrementar("tablet")
+        self.assertTrue(servidor.domina(base))
+        self.assertFalse(base.domina(servidor))
+        self.assertTrue(servidor.concorrente(cliente))
+        self.assertEqual(servidor.mesclar(cliente).codificar(), "srv=2,tablet=1")
+
+class TestMesclagemTresVias(unittest.TestCase):
+    """Classe de testes para a MesclagemTresVias."""
+
+    def _conflito(self, base, servidor, cliente, cliente_mais_recente=True) -> Conflito:
+        agora = datetime.now()
+        return Conflito(
+            tabela="viagens", registro_id=1,
+            valores_servidor=servidor, alteracoes_cliente=cliente,
+            campos_alterados_servidor=set(servidor),
+            data_cliente=agora if cliente_mais_recente else agora - timedelta(hours=1),
+            data_servidor=agora - timedelta(minutes=30),
+            valores_base=base,
+        )
+
+    def test_campos_alterados_em_um_so_lado(self) -> None:
+        """Testa que o valor do cliente vale quando o servidor não alterou o campo."""
+        conflito = self._conflito(
+            base={"pedagio": 10.0, "status": "em_andamento"},
+            servidor={"pedagio": 10.0, "status": "concluida"},
+            cliente={"pedagio": 35.0, "status": "em_andamento"},
+        )
+        self.assertEqual(MesclagemTresVias().resolver(conflito), {"pedagio": 35.0})
+
+    def test_conflito_real_usa_desempate(self) -> None:
+        """Testa que o mesmo campo alterado nos dois lados vai para o desempate."""
+        conflito = self._conflito(
+            base={"pedagio": 10.0}, servidor={"pedagio": 20.0}, cliente={"pedagio": 30.0},
+            cliente_mais_recente=False,
+        )
+        self.assertEqual(MesclagemTresVias(UltimaEscritaVence()).resolver(conflito), {})
+
+    def test_valores_convergentes(self) -> None:
+        """Testa que alterações iguais nos dois lados não geram gravação."""
+        conflito = self._conflito(
+            base={"pedagio": 10.0}, servidor={"pedagio": 20.0}, cliente={"pedagio": 20.0},
+        )
+        self.assertEqual(MesclagemTresVias().resolver(conflito), {})
+
+class TestEdicoesConcorrentes(unittest.TestCase):
+    """Classe de testes de edições concorrentes aplicadas pelo SyncService."""
+
+    def setUp(self) -> None:
+        """Cria o banco em memória com um veículo e uma viagem em andamento."""
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        fabrica = sessionmaker(bind=self.engine)
+        ativar_rastreamento_alteracoes(fabrica)
+        self.session = fabrica()
+
+        self.veiculo = Veiculo(
+            placa="ABC1D23", marca="Scania", modelo="R450", ano_fabricacao=2021, ano_modelo=2021,
+            tipo_veiculo=TipoVeiculo.CAMINHAO, tipo_combustivel=TipoCombustivel.DIESEL,
+            quilometragem_atual=5000.0, cor="azul",
+        )
+        self.session.add(self.veiculo)
+        self.session.flush()
+        self.viagem = Viagem(
+            codigo="V-001", motorista_id=1, veiculo_id=self.veiculo.id,
+            origem="Recife", destino="Natal", data_saida_prevista=datetime(2026, 1, 5, 8),
+            pedagio=10.0, alimentacao=0.0, status=StatusViagem.EM_ANDAMENTO,
+        )
+        self.session.add(self.viagem)
+        self.session.commit()
+
+        self.service = SyncService(self.session)
+        self.token = self.service.puxar().token
+
+    def tearDown(self) -> None:
+        """Fecha a sessão e libera o banco em memória."""
+        self.session.close()
+        self.engine.dispose()
+
+    def test_custos_e_status_concorrentes_em_viagem(self) -> None:
+        """Testa a mesclagem de custos (dispositivo) com status (servidor)."""
+        vetor_base = self.viagem.vetor_versao
+        self.viagem.status = StatusViagem.CONCLUIDA  # despachante no servidor
+        self.session.commit()
+
+        resultado = self.service.enviar(
+            [AlteracaoCliente(
+                tabela="viagens", registro_id=self.viagem.id,
+                campos={"pedagio": 42.5, "alimentacao": 30.0, "status": "em_andamento"},
+                data_alteracao=datetime.now() - timedelta(hours=1),
+                vetor_base=vetor_base,
+            )],
+            token_base=self.token,
+            dispositivo_id="tablet-07",
+        )
+
+        self.session.refresh(self.viagem)
+        self.assertEqual(resultado.mescladas, [0])
+        self.assertEqual(self.viagem.pedagio, 42.5)
+        self.assertEqual(self.viagem.alimentacao, 30.0)
+        self.assertEqual(self.viagem.status, StatusViagem.CONCLUIDA)
+        self.assertEqual(self.viagem.vetor_versao, "srv=2,tablet-07=1")
+
+    def test_mesmo_campo_concorrente_em_veiculo(self) -> None:
+        """Testa que a quilometragem alterada nos dois lados segue o desempate."""
+        vetor_base = self.veiculo.vetor_versao
+        self.veiculo.quilometragem_atual = 5300.0
+        self.session.commit()
+
+        resultado = self.service.enviar(
+            [AlteracaoCliente(
+                tabela="veiculos", registro_id=self.veiculo.id,
+                campos={"quilometragem_atual": 5200.0, "cor": "prata"},
+                data_alteracao=datetime.now() - timedelta(days=1),
+                vetor_base=vetor_base,
+            )],
+            token_base=self.token,
+        )
+
+        self.session.refresh(self.veiculo)
+        self.assertEqual(resultado.rejeitadas, [0])
+        self.assertEqual(self.veiculo.quilometragem_atual, 5300.0)
+        self.assertEqual(self.veiculo.cor, "prata")
+
+    def test_sem_concorrencia_pelo_vetor(self) -> None:
+        """Testa o caminho rápido quando o servidor não alterou o registro."""
+        resultado = self.service.enviar(
+            [AlteracaoCliente(
+                tabela="veiculos", registro_id=self.veiculo.id,
+                campos={"quilometragem_atual": 5100.0},
+                data_alteracao=datetime.now(),
+                vetor_base=self.veiculo.vetor_versao,
+            )],
+            token_base=self.token,
+        )
+        self.assertEqual(resultado.aplicadas, [0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Módulo de testes unitários para o dispatcher de eventos de domínio.
+
+Este módulo contém testes para a classe `EventDispatcher`, verificando o roteamento
+de eventos por tipo, a execução dos handlers fora do produtor, o backpressure das
+filas limitadas e as métricas de latência e profundidade de fila.
+"""
+
+import asyncio
+import unittest
+from app.domain.events import DomainEvent, ViagemEncerrada, ViagemIniciada
+from app.infrastructure.messaging.event_dispatcher import EventDispatcher
+
+class TestEventDispatcher(unittest.IsolatedAsyncioTestCase):
+    """Classe de testes para o EventDispatcher.
+
+    Cada teste cria um dispatcher próprio e o encerra ao final, garantindo que
+    nenhum worker permaneça ativo entre os testes.
+    """
+
+    async def asyncSetUp(self) -> None:
+        """Cria um dispatcher com filas pequenas para os testes."""
+        self.dispatcher = EventDispatcher(tamanho_fila=2)
+
+    async def asyncTearDown(self) -> None:
+        """Encerra o dispatcher, aguardando o esvaziamento das filas."""
+        await self.dispatcher.parar(timeout=1.0)
+
+    async def test_roteia_por_tipo_e_classe_base(self) -> None:
+        """Testa que handlers da classe base recebem eventos das subclasses."""
+        iniciadas, todos = [], []
+
+        async def handler_iniciadas(evento):
+            iniciadas.append(evento)
+
+        async def handler_todos(evento):
+            todos.append(evento)
+
+        self.dispatcher.registrar(ViagemIniciada, handler_iniciadas)
+        self.dispatcher.registrar(DomainEvent, handler_todos)
+        await self.dispatcher.iniciar()
+
+        await self.dispatcher.publicar([
+            ViagemIniciada(viagem_id="v1", motorista_id="m1"),
+            ViagemEncerrada(viagem_id="v1"),
+        ])
+        await self.dispatcher.parar()
+
+        self.assertEqual([e.viagem_id for e in iniciadas], ["v1"])
+        self.assertEqual(len(todos), 2)
+
+    async def test_backpressure_com_fila_cheia(self) -> None:
+        """Testa que a publicação aguarda quando a fila do handler está cheia."""
+        liberar = asyncio.Event()
+
+        async def handler_lento(evento):
+            await liberar.wait()
+
+        self.dispatcher.registrar(ViagemEncerrada, handler_lento, tamanho_fila=1)
+        await self.dispatcher.iniciar()
+
+        # Um evento em processamento e outro na fila: o terceiro deve aguardar
+        eventos = [ViagemEncerrada(viagem_id=str(i)) for i in range(3)]
+        publicacao = asyncio.ensure_future(self.dispatcher.publicar(eventos))
+        await asyncio.sleep(0.05)
+        self.assertFalse(publicacao.done())
+
+        liberar.set()
+        await asyncio.wait_for(publicacao, timeout=1.0)
+
+    async def test_metricas_por_handler(self) -> None:
+        """Testa a contagem de processados, falhas e a profundidade da fila."""
+        async def handler_falho(evento):
+            raise RuntimeError("falha simulada")
+
+        async def handler_ok(evento):
+            return None
+
+        self.dispatcher.registrar(ViagemEncerrada, handler_falho, nome="falho")
+        self.dispatcher.registrar(ViagemEncerrada, handler_ok, nome="ok")
+        await self.dispatcher.iniciar()
+
+        await self.dispatcher.publicar([ViagemEncerrada(viagem_id="v1")])
+        await self.dispatcher.parar()
+
+        metricas = {m.nome: m for m in self.dispatcher.metricas()}
+        self.assertEqual(metricas["falho"].falhas, 1)
+        self.assertEqual(metricas["ok"].processados, 1)
+        self.assertEqual(metricas["ok"].profundidade_fila, 0)
+        self.assertGreaterEqual(metricas["ok"].latencia_max, 0.0)
+
+    async def test_publicar_sem_iniciar(self) -> None:
+        """Testa que publicar antes de iniciar levanta RuntimeError."""
+        with self.assertRaises(RuntimeError):
+            await self.dispatcher.publicar([ViagemEncerrada(viagem_id="v1")])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,229 @@
+"""Módulo de testes unitários para a geometria das trilhas de GPS.
+
+Este módulo contém testes para a distância de haversine vetorizada, para a
+importância dos pontos por Douglas–Peucker e por Visvalingam–Whyatt,
+comparadas às versões recursiva e ingênua dos algoritmos, para a detecção de
+paradas, para o cache das análises por viagem e sua idade mínima e para a
+validação da quilometragem no encerramento da viagem. Os testes são ignorados
+quando o NumPy não está instalado.
+"""
+
+import math
+import unittest
+from array import array
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from app.api.v1.dependencies import get_tenant_db
+from app.api.v1.routes import telemetria
+from app.application.use_cases.viagem.encerrar_viagem import EncerrarViagemUseCase
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Base, StatusViagem, TipoCombustivel, TipoVeiculo, Veiculo, Viagem,
+)
+from app.infrastructure.telemetria.armazem import ArmazemPosicoes, Trilha
+
+if np is not None:
+    from app.application.services import geometria_service as geometria
+    from app.application.services.trilha_service import CacheTrilhas, distancia_km
+
+INICIO_MS = 1_704_103_200_000
+
+def _percurso(segundos_parado=600, segundos_andando=1200, semente=3):
+    """Trilha a 1 Hz: andando, parado com oscilação do GPS e andando de novo."""
+    aleatorio = np.random.default_rng(semente)
+    velocidades = np.concatenate((
+        np.full(segundos_andando, 20.0), np.zeros(segundos_parado), np.full(segundos_andando, 20.0),
+    ))
+    rumo = np.cumsum(aleatorio.normal(0, 0.03, velocidades.size))
+    x = np.cumsum(velocidades * np.cos(rumo)) + aleatorio.normal(0, 2.0, velocidades.size)
+    y = np.cumsum(velocidades * np.sin(rumo)) + aleatorio.normal(0, 2.0, velocidades.size)
+    latitudes = -8.05 + y / 111_195.0
+    longitudes = -34.9 + x / (111_195.0 * math.cos(math.radians(8.05)))
+    instantes = INICIO_MS + np.arange(velocidades.size, dtype=np.int64) * 1000
+    return instantes, latitudes, longitudes
+
+def _douglas_peucker_recursivo(x, y, tolerancia):
+    mantidos = np.zeros(len(x), dtype=bool)
+    mantidos[0] = mantidos[-1] = True
+    pilha = [(0, len(x) - 1)]
+    while pilha:
+        inicio, fim = pilha.pop()
+        if fim - inicio < 2:
+            continue
+        desvios = [
+            geometria._distancia_segmento(x[k], y[k], x[inicio], y[inicio], x[fim], y[fim])
+            for k in range(inicio + 1, fim)
+        ]
+        posicao = int(np.argmax(desvios))
+        if desvios[posicao] > tolerancia:
+            escolhido = inicio + 1 + posicao
+            mantidos[escolhido] = True
+            pilha += [(inicio, escolhido), (escolhido, fim)]
+    return mantidos
+
+def _visvalingam_ingenuo(x, y):
+    restantes = list(range(len(x)))
+    efetiva = np.full(len(x), np.inf)
+    maior = 0.0
+    while len(restantes) > 2:
+        areas = [
+            0.5 * abs((x[a] - x[c]) * (y[b] - y[a]) - (x[a] - x[b]) * (y[c] - y[a]))
+            for a, b, c in zip(restantes, restantes[1:], restantes[2:])
+        ]
+        posicao = int(np.argmin(areas))
+        maior = max(maior, areas[posicao])
+        efetiva[restantes.pop(posicao + 1)] = maior
+    return efetiva
+
+@unittest.skipIf(np is None, "NumPy não instalado")
+class TestGeometria(unittest.TestCase):
+    """Classe de testes das funções vetorizadas."""
+
+    def test_distancias(self) -> None:
+        """Testa um grau de latitude e a concordância com a soma ponto a ponto."""
+        latitudes = np.linspace(0.0, 1.0, 1001)
+        self.assertAlmostEqual(geometria.distancias_m(latitudes, np.zeros(1001)).sum(), 111_195.08, places=1)
+        instantes, latitudes, longitudes = _percurso()
+        trilha = Trilha(array("q", instantes.tobytes()), array("d", latitudes.tobytes()), array("d", longitudes.tobytes()))
+        self.assertAlmostEqual(distancia_km(trilha), geometria.distancias_m(latitudes, longitudes).sum() / 1000)
+
+    def test_douglas_peucker_por_limiar(self) -> None:
+        """Testa que cada limiar reproduz a simplificação recursiva com a mesma tolerância."""
+        _, latitudes, longitudes = _percurso(120, 300)
+        x, y = geometria.projetar_m(latitudes, longitudes)
+        importancia = geometria.importancia_douglas_peucker(x, y)
+        for tolerancia in (1.0, 5.0, 25.0, 200.0):
+            np.testing.assert_array_equal(importancia > tolerancia, _douglas_peucker_recursivo(x, y, tolerancia))
+        indices = geometria.selecionar(importancia, 0.0, max_pontos=20)
+        self.assertEqual(len(indices), 20)
+        self.assertEqual((indices[0], indices[-1]), (0, len(x) - 1))
+
+    def test_visvalingam_por_limiar(self) -> None:
+        """Testa as áreas efetivas contra a eliminação ingênua."""
+        _, latitudes, longitudes = _percurso(60, 100)
+        x, y = geometria.projetar_m(latitudes, longitudes)
+        np.testing.assert_allclose(geometria.areas_visvalingam(x, y), _visvalingam_ingenuo(x, y))
+
+    def test_tolerancia_zoom(self) -> None:
+        """Testa que cada nível de zoom reduz a tolerância à metade."""
+        self.assertAlmostEqual(geometria.tolerancia_zoom(10, 0.0), 152.874, places=3)
+        self.assertAlmostEqual(geometria.tolerancia_zoom(11, -8.0) * 2, geometria.tolerancia_zoom(10, -8.0))
+
+    def test_paradas(self) -> None:
+        """Testa que a parada longa é detectada apesar da oscilação e a curta é ignorada."""
+        instantes, latitudes, longitudes = _percurso(segundos_parado=600)
+        paradas = geometria.detectar_paradas(instantes, latitudes, longitudes)
+        self.assertEqual(len(paradas), 1)
+        self.assertAlmostEqual(paradas[0].duracao_segundos, 600, delta=60)
+        self.assertTrue(1150 <= paradas[0].inicio <= 1260)
+        instantes, latitudes, longitudes = _percurso(segundos_parado=120)
+        self.assertEqual(geometria.detectar_paradas(instantes, latitudes, longitudes), [])
+
+@unittest.skipIf(np is None, "NumPy não instalado")
+class TestCacheTrilhas(unittest.TestCase):
+    """Classe de testes do cache por viagem, do encerramento e da rota de resumo."""
+
+    def setUp(self) -> None:
+        """Cria o banco com uma viagem em andamento e a trilha em memória."""
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.fabrica = sessionmaker(bind=self.engine)
+        with self.fabrica() as session:
+            veiculo = Veiculo(
+                placa="ABC1D23", marca="Volvo", modelo="FH540", ano_fabricacao=2022, ano_modelo=2022,
+                tipo_veiculo=TipoVeiculo.CAMINHAO, tipo_combustivel=TipoCombustivel.DIESEL,
+                quilometragem_atual=1000.0,
+            )
+            session.add(veiculo)
+            session.flush()
+            session.add(Viagem(
+                codigo="V-001", motorista_id=1, veiculo_id=veiculo.id, origem="Recife", destino="Natal",
+                data_saida_prevista=datetime(2026, 1, 5, 8), data_saida_real=datetime(2026, 1, 5, 8),
+                km_inicial=1000.0, status=StatusViagem.EM_ANDAMENTO,
+            ))
+            session.commit()
+        self.armazem = ArmazemPosicoes(capacidade_bloco=1000)
+        self.cache = CacheTrilhas(self.armazem, capacidade=4)
+        self.instantes, self.latitudes, self.longitudes = _percurso()
+        with self.fabrica() as session:
+            self.armazem.registrar(session, 1, self.instantes[:-10].tolist(), self.latitudes[:-10], self.longitudes[:-10])
+            session.commit()
+
+    def tearDown(self) -> None:
+        """Libera as conexões do banco em memória."""
+        self.engine.dispose()
+
+    def test_cache_e_simplificacao(self) -> None:
+        """Testa o acerto, a invalidação por novos pontos e os níveis de zoom."""
+        with self.fabrica() as session:
+            analise = self.cache.analisar(session, 1)
+            self.assertIs(self.cache.analisar(session, 1), analise)
+            self.assertEqual(self.cache.acertos, 1)
+            self.armazem.registrar(session, 1, self.instantes[-10:].tolist(), self.latitudes[-10:], self.longitudes[-10:])
+            analise = self.cache.analisar(session, 1)
+        self.assertEqual(analise.quantidade, len(self.instantes))
+        self.assertAlmostEqual(analise.tempo_parado_segundos, 600, delta=60)
+
+        for metodo in ("douglas_peucker", "visvalingam"):
+            quantidades = [len(analise.simplificar(metodo, zoom)) for zoom in (6, 10, 14, 18)]
+            self.assertEqual(quantidades, sorted(quantidades))
+            self.assertLess(quantidades[0], 10)
+            self.assertLessEqual(len(analise.simplificar(metodo, 18, max_pontos=50)), 50)
+        with self.assertRaises(ValueError):
+            analise.simplificar("radial")
+
+    def test_idade_minima(self) -> None:
+        """Testa a análise servida antes da idade mínima e o recálculo depois dela."""
+        agora = [0.0]
+        cache = CacheTrilhas(self.armazem, idade_minima_segundos=5.0, relogio=lambda: agora[0])
+        with self.fabrica() as session:
+            analise = cache.analisar(session, 1)
+            self.armazem.registrar(session, 1, self.instantes[-10:].tolist(), self.latitudes[-10:], self.longitudes[-10:])
+            agora[0] = 4.0
+            self.assertIs(cache.analisar(session, 1), analise)
+            self.assertEqual(cache.analisar(session, 1, atual=True).quantidade, len(self.instantes))
+            agora[0] = 8.0
+            self.assertIs(cache.analisar(session, 1), cache.analisar(session, 1, atual=True))
+        self.assertEqual((cache.acertos, cache.falhas), (3, 2))
+
+    def test_encerramento_e_resumo(self) -> None:
+        """Testa a divergência do hodômetro, o tempo parado e a rota de resumo."""
+        with self.fabrica() as session:
+            km_rastreado = self.cache.analisar(session, 1).distancia_km
+            viagem = EncerrarViagemUseCase(session, trilhas=self.cache).executar(1, 1000.0 + km_rastreado * 1.3)
+            self.assertAlmostEqual(viagem.km_divergencia, 30.0, places=6)
+            self.assertTrue(viagem.km_divergente)
+            self.assertAlmostEqual(viagem.tempo_parado_minutos, 10, delta=1)
+        self.assertEqual(self.armazem.estatisticas().viagens_abertas, 0)
+
+        app = FastAPI()
+        app.include_router(telemetria.router, prefix="/api/v1")
+        app.state.armazem_posicoes = self.armazem
+
+        def sessao():
+            with self.fabrica() as session:
+                yield session
+
+        app.dependency_overrides[get_tenant_db] = sessao
+        cliente = TestClient(app)
+        self.assertEqual(cliente.get("/api/v1/telemetria/viagens/1/resumo").status_code, 501)
+        app.state.cache_trilhas = self.cache
+        resumo = cliente.get("/api/v1/telemetria/viagens/1/resumo").json()
+        self.assertEqual(len(resumo["paradas"]), 1)
+        self.assertAlmostEqual(resumo["km_divergencia"], 30.0, places=6)
+        trilha = cliente.get("/api/v1/telemetria/viagens/1/trilha", params={"zoom": 8, "metodo": "visvalingam"}).json()
+        self.assertEqual(trilha["metodo"], "visvalingam")
+        self.assertLess(len(trilha["instantes"]), trilha["total_pontos"])
+        self.assertEqual(self.cache.acertos, 3)
+
+if __name__ == "__main__":
+    unittest.main()
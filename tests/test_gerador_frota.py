@@ -0,0 +1,114 @@
+"""Módulo de testes unitários para o gerador de frotas sintéticas.
+
+Este módulo contém testes para os documentos e placas gerados, para a
+determinação pela semente, para o encadeamento de hodômetros e horários das
+viagens de cada veículo e para a gravação nos esquemas legado e da aplicação,
+usando bancos SQLite temporários.
+"""
+
+import os
+import re
+import sqlite3
+import tempfile
+import unittest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from app.infrastructure.persistence.sqlalchemy.models import Base, DocumentoVeiculo, TipoVeiculo, Veiculo, Viagem
+from benchmarks.gerador_frota import (
+    GeradorFrota,
+    cnh_valida,
+    cpf_valido,
+    digitos_cpf,
+    gerar_placa,
+    gravar_app,
+    gravar_legado,
+)
+
+class TestGeradorFrota(unittest.TestCase):
+    """Classe de testes dos registros gerados."""
+
+    def test_documentos_validos_e_unicos(self) -> None:
+        """Testa dígitos verificadores e unicidade de CPFs e CNHs."""
+        self.assertEqual(digitos_cpf("529982247"), "25")
+        motoristas = list(GeradorFrota(2000, 1).motoristas())
+        self.assertTrue(all(cpf_valido(m.cpf) and cnh_valida(m.cnh_numero) for m in motoristas))
+        self.assertEqual(len({m.cpf for m in motoristas}), 2000)
+        self.assertEqual(len({m.cnh_numero for m in motoristas}), 2000)
+        self.assertFalse(cpf_valido(motoristas[0].cpf[:10] + str((int(motoristas[0].cpf[10]) + 1) % 10)))
+
+    def test_placas_nos_dois_formatos(self) -> None:
+        """Testa os formatos ABC1234 e ABC1D23, a unicidade e os tipos de veículo."""
+        self.assertRegex(gerar_placa(0, False), r"^[A-Z]{3}\d{4}$")
+        self.assertRegex(gerar_placa(0, True), r"^[A-Z]{3}\d[A-Z]\d{2}$")
+        veiculos = GeradorFrota(1, 3000).veiculos
+        placas = [v.placa for v in veiculos]
+        self.assertEqual(len(set(placas)), 3000)
+        mercosul = sum(1 for p in placas if re.match(r"^[A-Z]{3}\d[A-Z]\d{2}$", p))
+        self.assertTrue(0 < mercosul < 3000)
+        self.assertEqual({v.tipo_veiculo for v in veiculos}, set(TipoVeiculo))
+
+    def test_determinismo(self) -> None:
+        """Testa que a semente determina a frota e que as viagens não alteram os cadastros."""
+        a, b = GeradorFrota(50, 20, semente=7), GeradorFrota(50, 20, semente=7)
+        self.assertEqual(list(a.viagens(500)), list(b.viagens(500)))
+        self.assertEqual(list(a.motoristas()), list(b.motoristas()))
+        self.assertEqual(a.veiculos, GeradorFrota(50, 20, semente=7).veiculos)
+        self.assertNotEqual(a.veiculos, GeradorFrota(50, 20, semente=8).veiculos)
+
+    def test_viagens_encadeadas_por_veiculo(self) -> None:
+        """Testa hodômetros e horários contínuos nas viagens de cada veículo."""
+        gerador = GeradorFrota(10, 5)
+        ultima = {}
+        for viagem in gerador.viagens(2000):
+            self.assertLess(viagem.km_inicial, viagem.km_final)
+            self.assertLess(viagem.saida, viagem.chegada)
+            self.assertNotEqual(viagem.origem, viagem.destino)
+            anterior = ultima.get(viagem.veiculo)
+            if anterior is None:
+                self.assertEqual(viagem.km_inicial, gerador.veiculos[viagem.veiculo].quilometragem)
+            else:
+                self.assertEqual(viagem.km_inicial, anterior.km_final)
+                self.assertGreater(viagem.saida, anterior.chegada)
+            ultima[viagem.veiculo] = viagem
+        for veiculo, viagem in ultima.items():
+            self.assertEqual(gerador.quilometragem[veiculo], viagem.km_final)
+
+class TestGravacao(unittest.TestCase):
+    """Classe de testes da gravação nos esquemas legado e da aplicação."""
+
+    def setUp(self) -> None:
+        """Cria o diretório dos bancos."""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.diretorio.cleanup)
+
+    def test_gravar_legado(self) -> None:
+        """Testa as contagens e a quilometragem final dos veículos no esquema legado."""
+        caminho = os.path.join(self.diretorio.name, "legado.db")
+        gerador = GeradorFrota(30, 10)
+        gravar_legado(caminho, gerador, 300, lote=64)
+        conexao = sqlite3.connect(caminho)
+        self.addCleanup(conexao.close)
+        contagens = [conexao.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("motoristas", "veiculos", "viagens")]
+        self.assertEqual(contagens, [30, 10, 300])
+        maximo = conexao.execute(
+            "SELECT v.km, MAX(g.km_final) FROM veiculos v JOIN viagens g ON g.veiculo_id = v.veiculo_id"
+            " GROUP BY v.veiculo_id"
+        ).fetchall()
+        self.assertTrue(all(km == final for km, final in maximo))
+
+    def test_gravar_app_acrescenta(self) -> None:
+        """Testa a leitura pelo ORM e o deslocamento dos ids em uma segunda carga."""
+        engine = create_engine(f"sqlite:///{os.path.join(self.diretorio.name, 'app.db')}")
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(engine)
+        gravados = gravar_app(engine, GeradorFrota(20, 5), 100, lote=32, abastecimentos=True)
+        self.assertEqual(gravados["documentos_veiculos"], 15)
+        gravar_app(engine, GeradorFrota(20, 5, semente=1), 100, lote=32)
+        with Session(engine) as sessao:
+            self.assertEqual(sessao.scalar(select(func.count(Viagem.id))), 200)
+            self.assertEqual(sessao.scalar(select(func.count(DocumentoVeiculo.id))), 30)
+            viagem = sessao.scalars(select(Viagem).order_by(Viagem.id.desc())).first()
+            self.assertGreater(viagem.veiculo_id, 5)
+            self.assertLess(viagem.data_saida_real, viagem.data_chegada_real)
+            veiculo = sessao.get(Veiculo, viagem.veiculo_id)
+            self.assertGreaterEqual(veiculo.quilometragem_atual, viagem.km_final)
@@ -0,0 +1,177 @@
+"""Módulo de testes unitários para a previsão de manutenção preventiva.
+
+Este módulo contém testes para o `PrevisaoManutencaoService`, verificando a
+projeção da data prevista pela taxa de km/dia, a emissão de eventos
+`ManutencaoNecessaria` apenas quando a criticidade aumenta (por leitura de
+hodômetro ou pela passagem do tempo), o reinício após a manutenção, a carga
+inicial a partir de um banco SQLite em memória e a gravação no outbox dos
+alertas gerados pelas leituras dos casos de uso.
+"""
+
+import unittest
+from datetime import date, datetime, timedelta
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from app.application.services.manutencao_service import PlanoManutencao, PrevisaoManutencaoService
+from app.application.services.tarefas_agendadas import prever_manutencoes
+from app.application.use_cases.veiculo.atualizar_veiculo import AtualizarVeiculoUseCase
+from app.application.use_cases.viagem.encerrar_viagem import EncerrarViagemUseCase
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Base, Manutencao, OutboxEvento, StatusViagem, TipoCombustivel, TipoManutencao, TipoVeiculo, Veiculo, Viagem,
+)
+
+HOJE = date(2026, 4, 1)
+OLEO = TipoManutencao.TROCA_OLEO
+
+class TestPrevisaoManutencao(unittest.TestCase):
+    """Classe de testes para o PrevisaoManutencaoService."""
+
+    def setUp(self) -> None:
+        """Cria a agenda com troca de óleo a cada 10.000 km ou 180 dias."""
+        self.servico = PrevisaoManutencaoService({OLEO: PlanoManutencao(10_000, 180)})
+
+    def _criticidades(self, eventos):
+        return [(evento.veiculo_id, evento.criticidade) for evento in eventos]
+
+    def test_projecao_pela_taxa_de_uso(self) -> None:
+        """Testa que a data prevista é a primeira entre km projetado e prazo."""
+        self.servico.adicionar_veiculo(1, 4_000, HOJE, taxa_km_dia=200, ultimas={OLEO: (2_000, HOJE)})
+        self.servico.adicionar_veiculo(2, 4_000, HOJE, taxa_km_dia=10, ultimas={OLEO: (2_000, HOJE)})
+
+        self.assertEqual(self.servico.previsao(1, OLEO).data_prevista, HOJE + timedelta(days=40))
+        self.assertEqual(self.servico.previsao(2, OLEO).data_prevista, HOJE + timedelta(days=180))
+        self.assertEqual([p.veiculo_id for p in self.servico.proximas(2)], [1, 2])
+
+    def test_escalonamento_pelo_tempo(self) -> None:
+        """Testa que a passagem do tempo eleva a criticidade uma vez por nível."""
+        self.servico.adicionar_veiculo(1, 4_000, HOJE, taxa_km_dia=200, ultimas={OLEO: (2_000, HOJE)})
+
+        self.assertEqual(self.servico.avancar(HOJE + timedelta(days=9)), [])
+        self.assertEqual(self._criticidades(self.servico.avancar(HOJE + timedelta(days=10))), [(1, "baixa")])
+        self.assertEqual(self.servico.avancar(HOJE + timedelta(days=20)), [])
+        self.assertEqual(self._criticidades(self.servico.avancar(HOJE + timedelta(days=35))), [(1, "media")])
+        eventos = self.servico.avancar(HOJE + timedelta(days=60))
+        self.assertEqual(self._criticidades(eventos), [(1, "alta")])
+        self.assertEqual(eventos[0].km_proxima_manutencao, 12_000)
+        self.assertEqual(self.servico.avancar(HOJE + timedelta(days=90)), [])
+
+    def test_leitura_de_hodometro_e_manutencao(self) -> None:
+        """Testa o alerta disparado por leitura e o reinício após a manutenção."""
+        self.servico.adicionar_veiculo(1, 4_000, HOJE, ultimas={OLEO: (2_000, HOJE)})
+        self.servico.adicionar_veiculo(2, 1_000, HOJE)
+
+        eventos = self.servico.registrar_leitura(1, 12_500, HOJE + timedelta(days=60))
+        self.assertEqual(self._criticidades(eventos), [(1, "alta")])
+        self.assertEqual(eventos[0].tipo_manutencao.value, "troca_oleo")
+        self.assertEqual(self.servico.registrar_leitura(1, 12_600, HOJE + timedelta(days=61)), [])
+
+        self.servico.registrar_manutencao(1, OLEO, 12_600, HOJE + timedelta(days=61))
+        self.assertEqual(self.servico.previsao(1, OLEO).km_prevista, 22_600)
+        self.assertEqual(self.servico.registrar_leitura(1, 13_000, HOJE + timedelta(days=63)), [])
+        self.assertEqual(self.servico.previsao(2, OLEO).km_base, 0)
+
+    def test_desfazer_reemite_o_alerta(self) -> None:
+        """Testa que um alerta de transação desfeita é emitido de novo."""
+        self.servico.adicionar_veiculo(1, 4_000, HOJE, ultimas={OLEO: (2_000, HOJE)})
+        eventos = self.servico.registrar_leitura(1, 12_500, HOJE)
+        self.servico.desfazer(eventos)
+        self.assertEqual(self._criticidades(self.servico.registrar_leitura(1, 12_500, HOJE)), [(1, "alta")])
+
+    def test_revisao_usa_o_tipo_periodico_do_evento(self) -> None:
+        """Testa que a revisão gravada gera o evento de revisão periódica."""
+        servico = PrevisaoManutencaoService({TipoManutencao.REVISAO: PlanoManutencao(20_000, 365)})
+        servico.adicionar_veiculo(1, 4_000, HOJE, ultimas={TipoManutencao.REVISAO: (2_000, HOJE)})
+        eventos = servico.registrar_leitura(1, 22_500, HOJE)
+        self.assertEqual(eventos[0].tipo_manutencao.value, "revisao_periodica")
+        servico.desfazer(eventos)
+        self.assertEqual(len(servico.registrar_leitura(1, 22_500, HOJE)), 1)
+
+    def test_tarefa_agendada_mantem_a_agenda(self) -> None:
+        """Testa que a tarefa agendada não repete os alertas da agenda compartilhada."""
+        hoje = date.today()
+        self.servico.adicionar_veiculo(1, 12_500, hoje, ultimas={OLEO: (2_000, hoje)})
+        # Agenda montada à mão: a tarefa não deve recarregá-la do banco
+        self.servico.carregado = True
+
+        self.assertEqual(prever_manutencoes(self.servico), 1)
+        self.assertEqual(prever_manutencoes(self.servico), 0)
+
+    def test_carga_do_banco(self) -> None:
+        """Testa a carga das últimas manutenções e da taxa de uso recente."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as session:
+            veiculo = Veiculo(
+                placa="JKL7M89", marca="Iveco", modelo="Daily", ano_fabricacao=2023, ano_modelo=2023,
+                tipo_veiculo=TipoVeiculo.VAN, tipo_combustivel=TipoCombustivel.DIESEL,
+                quilometragem_atual=9_000,
+            )
+            session.add(veiculo)
+            session.flush()
+            session.add_all([
+                Manutencao(veiculo_id=veiculo.id, tipo=OLEO, descricao="Troca", quilometragem=1_000,
+                           data_manutencao=date(2026, 1, 10), custo_total=300),
+                Manutencao(veiculo_id=veiculo.id, tipo=OLEO, descricao="Troca", quilometragem=5_000,
+                           data_manutencao=date(2026, 3, 1), custo_total=300),
+                Viagem(codigo="V-1", motorista_id=1, veiculo_id=veiculo.id, origem="A", destino="B",
+                       data_saida_prevista=datetime(2026, 3, 20), data_chegada_real=datetime(2026, 3, 21),
+                       km_total=3_000, status=StatusViagem.CONCLUIDA),
+            ])
+            session.commit()
+            veiculo_id = veiculo.id
+
+            self.servico.carregar(session, hoje=HOJE, janela_dias=30)
+        engine.dispose()
+
+        previsao = self.servico.previsao(veiculo_id, OLEO)
+        self.assertEqual((previsao.km_base, previsao.km_prevista), (5_000, 15_000))
+        # 6.000 km restantes a 100 km/dia
+        self.assertEqual(previsao.data_prevista, HOJE + timedelta(days=60))
+
+    def test_leituras_dos_casos_de_uso_vao_para_o_outbox(self) -> None:
+        """Testa que a quilometragem e o encerramento publicam ManutencaoNecessaria."""
+        servico = PrevisaoManutencaoService({OLEO: PlanoManutencao(10_000)})
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as session:
+            veiculos = [
+                Veiculo(
+                    placa=placa, marca="Iveco", modelo="Daily", ano_fabricacao=2023, ano_modelo=2023,
+                    tipo_veiculo=TipoVeiculo.VAN, tipo_combustivel=TipoCombustivel.DIESEL,
+                    quilometragem_atual=5_000,
+                )
+                for placa in ("JKL7M89", "MNO1P23")
+            ]
+            session.add_all(veiculos)
+            session.flush()
+            viagem = Viagem(
+                codigo="V-1", motorista_id=1, veiculo_id=veiculos[1].id, origem="A", destino="B",
+                data_saida_prevista=datetime(2026, 3, 20), data_saida_real=datetime(2026, 3, 20),
+                km_inicial=5_000, status=StatusViagem.EM_ANDAMENTO,
+            )
+            session.add(viagem)
+            session.commit()
+            ids = [veiculos[0].id, veiculos[1].id, viagem.id]
+            servico.carregar(session)
+
+            AtualizarVeiculoUseCase(session, servico).atualizar_quilometragem(ids[0], 6_000)
+            self.assertEqual(session.scalars(select(OutboxEvento)).all(), [])
+            AtualizarVeiculoUseCase(session, servico).atualizar_quilometragem(ids[0], 10_200)
+            EncerrarViagemUseCase(session, manutencoes=servico).executar(ids[2], 10_100)
+
+            eventos = session.execute(
+                select(OutboxEvento.tipo_evento, OutboxEvento.agregado_id).order_by(OutboxEvento.id)
+            ).all()
+        engine.dispose()
+
+        self.assertEqual(
+            [tuple(evento) for evento in eventos],
+            [
+                ("ManutencaoNecessaria", str(ids[0])),
+                ("ViagemEncerrada", str(ids[2])),
+                ("ManutencaoNecessaria", str(ids[1])),
+            ],
+        )
+
+if __name__ == "__main__":
+    unittest.main()
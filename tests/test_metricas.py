@@ -0,0 +1,142 @@
+"""Módulo de testes unitários para as métricas da aplicação.
+
+Este módulo contém testes para os contadores e histogramas por thread e para a
+exportação no formato do Prometheus, para o middleware que mede as rotas e
+conta as consultas por requisição e para o endpoint `/metrics`, usando um banco
+SQLite em memória.
+"""
+
+import threading
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from app.api import metricas
+from app.infrastructure.observabilidade.instrumentacao import (
+    MetricasAplicacao,
+    MiddlewareMetricas,
+    ativar_metricas_sql,
+    consultas_da_requisicao,
+)
+from app.infrastructure.observabilidade.metricas import RegistroMetricas
+
+class TestRegistroMetricas(unittest.TestCase):
+    """Classe de testes dos contadores, histogramas e da exportação."""
+
+    def setUp(self) -> None:
+        self.registro = RegistroMetricas()
+
+    def test_contador_soma_threads(self) -> None:
+        """Testa a soma dos fragmentos de várias threads, inclusive encerradas."""
+        contador = self.registro.contador("eventos", "Eventos.", ("tipo",))
+
+        def incrementar() -> None:
+            for _ in range(1000):
+                contador.inc("a")
+
+        threads = [threading.Thread(target=incrementar) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        contador.inc("b", valor=2.5)
+        self.assertEqual(contador.valores(), {("a",): 8000.0, ("b",): 2.5})
+        self.assertIs(self.registro.contador("eventos", "Eventos.", ("tipo",)), contador)
+
+    def test_histograma_exportado(self) -> None:
+        """Testa as faixas cumulativas, a soma e a contagem exportadas."""
+        histograma = self.registro.histograma("duracao_segundos", "Duração.", ("rota",), (0.1, 1.0))
+        for valor in (0.05, 0.1, 0.5, 3.0):
+            histograma.observar(valor, "/x")
+        texto = self.registro.exportar()
+        self.assertIn("# TYPE duracao_segundos histogram", texto)
+        self.assertIn('duracao_segundos_bucket{rota="/x",le="0.1"} 2', texto)
+        self.assertIn('duracao_segundos_bucket{rota="/x",le="1"} 3', texto)
+        self.assertIn('duracao_segundos_bucket{rota="/x",le="+Inf"} 4', texto)
+        self.assertIn('duracao_segundos_sum{rota="/x"} 3.65', texto)
+        self.assertIn('duracao_segundos_count{rota="/x"} 4', texto)
+
+    def test_exportacao_contador_e_medidor(self) -> None:
+        """Testa o sufixo dos contadores, o escape dos rótulos e os medidores."""
+        self.registro.contador("erros", "Erros.", ("detalhe",)).inc('a"b')
+        self.registro.medidor("conexoes", "Conexões.", lambda: 3)
+        self.registro.medidor("ausente", "Sem valor.", lambda: None)
+        texto = self.registro.exportar()
+        self.assertIn('erros_total{detalhe="a\\"b"} 1', texto)
+        self.assertIn("# TYPE conexoes gauge\nconexoes 3\n", texto)
+        self.assertIn("# TYPE ausente gauge\n", texto)
+        self.assertNotIn("\nausente ", texto)
+
+class TestMiddlewareMetricas(unittest.TestCase):
+    """Classe de testes do middleware, das consultas por requisição e do `/metrics`."""
+
+    def setUp(self) -> None:
+        self.registro = RegistroMetricas()
+        self.metricas = MetricasAplicacao(self.registro)
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        ativar_metricas_sql(self.engine, self.metricas)
+        self.observadas = []
+
+        app = FastAPI()
+        app.add_middleware(MiddlewareMetricas, metricas=self.metricas, limite_consultas=3)
+
+        @app.get("/itens/{item_id}")
+        def item(item_id: int):
+            with self.engine.connect() as conexao:
+                for _ in range(item_id):
+                    conexao.execute(text("SELECT 1"))
+            self.observadas.append(consultas_da_requisicao())
+            return {"id": item_id}
+
+        @app.get("/falha")
+        def falha():
+            with self.engine.connect() as conexao:
+                conexao.execute(text("SELECT * FROM inexistente"))
+
+        self.cliente = TestClient(app, raise_server_exceptions=False)
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+
+    def test_rota_por_modelo(self) -> None:
+        """Testa os rótulos pelo modelo da rota e a contagem de consultas."""
+        self.assertEqual(self.cliente.get("/itens/1").status_code, 200)
+        self.assertEqual(self.cliente.get("/itens/2").status_code, 200)
+        self.assertEqual(self.cliente.get("/nada").status_code, 404)
+        self.assertEqual(self.observadas, [1, 2])
+        self.assertEqual(
+            self.metricas.requisicoes.valores(),
+            {("GET", "/itens/{item_id}", "200"): 2.0, ("GET", "desconhecida", "404"): 1.0},
+        )
+        self.assertEqual(self.metricas.consultas.valores(), {("SELECT",): 3.0})
+        contagens = self.metricas.duracao_requisicao.valores()[("GET", "/itens/{item_id}")]
+        self.assertEqual(sum(contagens[:-1]), 2)
+        self.assertIsNone(consultas_da_requisicao())
+
+    def test_consultas_excessivas(self) -> None:
+        """Testa o registro das requisições acima do limite de consultas."""
+        with self.assertLogs("app.infrastructure.observabilidade.instrumentacao", "WARNING"):
+            self.cliente.get("/itens/5")
+        self.cliente.get("/itens/3")
+        self.assertEqual(self.metricas.requisicoes_excessivas.valores(), {("GET", "/itens/{item_id}"): 1.0})
+
+    def test_erro_sql_e_status_500(self) -> None:
+        """Testa a contagem de comandos que falharam e o status da exceção."""
+        self.assertEqual(self.cliente.get("/falha").status_code, 500)
+        self.assertEqual(self.metricas.erros_consulta.valores(), {("SELECT",): 1.0})
+        self.assertEqual(self.metricas.requisicoes.valores(), {("GET", "/falha", "500"): 1.0})
+
+    def test_endpoint_metrics(self) -> None:
+        """Testa o formato de exposição retornado pelo `/metrics`."""
+        app = FastAPI()
+        app.include_router(metricas.router)
+        resposta = TestClient(app).get("/metrics")
+        self.assertEqual(resposta.status_code, 200)
+        self.assertTrue(resposta.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn("# TYPE http_requisicoes counter", resposta.text)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Módulo de testes unitários para o outbox transacional.
+
+Este módulo contém testes para `registrar_eventos` e `OutboxRelay`, verificando
+que os eventos só ficam visíveis após o commit, que o relay os drena em ordem e
+em lotes, e que falhas de publicação mantêm os eventos para nova tentativa.
+Também verifica o caminho completo de uma linha do outbox até o alerta, com as
+entregas repetidas descartadas. Os testes utilizam um banco de dados SQLite em
+memória.
+"""
+
+import asyncio
+import unittest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.domain.events import ViagemEncerrada, ViagemIniciada
+from app.infrastructure.messaging.event_dispatcher import EventDispatcher
+from app.infrastructure.messaging.handlers.alerta_handler import AlertaHandler
+from app.infrastructure.persistence.sqlalchemy.models import OutboxEvento
+from app.infrastructure.sync.outbox import FiltroIdempotencia, MensagemOutbox, OutboxRelay, registrar_eventos
+
+class TestOutbox(unittest.TestCase):
+    """Classe de testes para o outbox transacional e seu relay."""
+
+    def setUp(self) -> None:
+        """Cria um banco SQLite em memória com a tabela do outbox."""
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        OutboxEvento.__table__.create(self.engine)
+        self.fabrica = sessionmaker(bind=self.engine)
+        self.publicadas = []
+
+    def tearDown(self) -> None:
+        """Libera as conexões do banco em memória."""
+        self.engine.dispose()
+
+    def _contar(self) -> int:
+        with self.fabrica() as session:
+            return session.execute(select(func.count()).select_from(OutboxEvento)).scalar()
+
+    def _gravar(self, quantidade: int) -> None:
+        with self.fabrica() as session:
+            registrar_eventos(
+                session,
+                [ViagemEncerrada(viagem_id=f"v{i}") for i in range(quantidade)],
+                agregado_id="frota",
+            )
+            session.commit()
+
+    def test_rollback_descarta_eventos(self) -> None:
+        """Testa que eventos de uma transação desfeita não chegam ao outbox."""
+        with self.fabrica() as session:
+            registrar_eventos(session, [ViagemEncerrada(viagem_id="v1")])
+            session.rollback()
+        self.assertEqual(self._contar(), 0)
+
+    def test_drena_em_ordem_e_em_lotes(self) -> None:
+        """Testa que o relay publica todos os eventos em ordem e esvazia o outbox."""
+        self._gravar(25)
+        relay = OutboxRelay(self.fabrica, self.publicadas.append, tamanho_lote=10)
+
+        self.assertEqual(relay.drenar(), 25)
+        self.assertEqual([len(lote) for lote in self.publicadas], [10, 10, 5])
+        viagens = [m.payload["viagem_id"] for lote in self.publicadas for m in lote]
+        self.assertEqual(viagens, [f"v{i}" for i in range(25)])
+        self.assertEqual(self._contar(), 0)
+
+    def test_falha_na_publicacao_mantem_eventos(self) -> None:
+        """Testa a entrega at-least-once quando o publicador falha."""
+        self._gravar(3)
+
+        def publicar_com_falha(mensagens):
+            raise ConnectionError("broker indisponível")
+
+        with self.assertRaises(ConnectionError):
+            OutboxRelay(self.fabrica, publicar_com_falha).drenar_lote()
+        self.assertEqual(self._contar(), 3)
+        with self.fabrica() as session:
+            tentativas = session.execute(select(OutboxEvento.tentativas)).scalars().all()
+        self.assertEqual(tentativas, [1, 1, 1])
+
+        self.assertEqual(OutboxRelay(self.fabrica, self.publicadas.append).drenar(), 3)
+
+    def test_filtro_idempotencia(self) -> None:
+        """Testa que entregas repetidas são reconhecidas pela chave."""
+        filtro = FiltroIdempotencia(capacidade=2)
+        self.assertTrue(filtro.primeira_entrega("a"))
+        self.assertFalse(filtro.primeira_entrega("a"))
+        filtro.primeira_entrega("b")
+        filtro.primeira_entrega("c")
+        self.assertTrue(filtro.primeira_entrega("a"))
+
+class TestOutboxAlertas(unittest.IsolatedAsyncioTestCase):
+    """Classe de testes da entrega das mensagens do outbox ao handler de alertas."""
+
+    async def asyncSetUp(self) -> None:
+        """Cria o banco do outbox e o dispatcher com o handler de alertas."""
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        OutboxEvento.__table__.create(self.engine)
+        self.fabrica = sessionmaker(bind=self.engine)
+        self.dispatcher = EventDispatcher()
+        self.dispatcher.registrar(MensagemOutbox, AlertaHandler("teste.alertas"), nome="alertas.outbox")
+        await self.dispatcher.iniciar()
+
+    async def asyncTearDown(self) -> None:
+        """Encerra o dispatcher e libera o banco."""
+        await self.dispatcher.parar(timeout=1.0)
+        self.engine.dispose()
+
+    async def test_linha_do_outbox_gera_alerta_uma_vez(self) -> None:
+        """Testa que o alerta sai do outbox e que a reentrega é ignorada."""
+        with self.fabrica() as session:
+            registrar_eventos(session, [
+                ViagemIniciada(viagem_id="v1", motorista_id="m1"),
+                ViagemEncerrada(viagem_id="v1"),
+            ])
+            session.commit()
+
+        entregues = []
+
+        def publicar(mensagens):
+            entregues.extend(mensagens)
+            self.dispatcher.publicar_threadsafe(mensagens, timeout=1.0)
+
+        relay = OutboxRelay(self.fabrica, publicar)
+        with self.assertLogs("teste.alertas", level="INFO") as logs:
+            self.assertEqual(await asyncio.get_running_loop().run_in_executor(None, relay.drenar), 2)
+            # Reentrega das mesmas mensagens, como após uma falha antes do delete
+            await self.dispatcher.publicar(entregues)
+            await self.dispatcher.parar()
+
+        self.assertEqual(logs.output, [
+            "INFO:teste.alertas:Viagem v1 iniciada pelo motorista m1",
+            "INFO:teste.alertas:Viagem v1 encerrada",
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
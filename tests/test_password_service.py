@@ -0,0 +1,135 @@
+"""Módulo de testes unitários para o serviço de senhas.
+
+Este módulo contém testes para o `ServicoSenhas`, verificando o hash e a
+verificação no pool, o novo hash gerado quando o custo configurado muda e a
+recusa de senhas que o bcrypt truncaria, para o `LimitadorTentativas`, que
+bloqueia a conta após falhas seguidas, e para o `AutenticarUsuarioUseCase`,
+que grava o novo hash no banco, usando um banco SQLite temporário.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.application.use_cases.usuario.autenticar_usuario import AutenticarUsuarioUseCase
+from app.infrastructure.auth.password_service import (
+    LimitadorTentativas, ServicoSenhas, TentativasExcedidas, custo_do_hash,
+)
+from app.infrastructure.persistence.sqlalchemy.models import Base, Usuario
+
+class TestServicoSenhas(unittest.TestCase):
+    """Classe de testes do serviço de senhas."""
+
+    def setUp(self) -> None:
+        self.servico = ServicoSenhas(custo=4, workers=2)
+
+    def tearDown(self) -> None:
+        self.servico.encerrar()
+
+    def test_hash_e_rehash(self) -> None:
+        """Testa a verificação e o novo hash quando o custo muda."""
+        hash_senha = asyncio.run(self.servico.gerar_hash("segredo"))
+        self.assertEqual(custo_do_hash(hash_senha), 4)
+        self.assertEqual(asyncio.run(self.servico.verificar("segredo", hash_senha)), (True, None))
+        self.assertEqual(asyncio.run(self.servico.verificar("errada", hash_senha)), (False, None))
+        self.assertFalse(asyncio.run(self.servico.verificar("segredo", "não é bcrypt")).valida)
+
+        novo = ServicoSenhas(custo=5, workers=1)
+        try:
+            valida, novo_hash = asyncio.run(novo.verificar("segredo", hash_senha))
+        finally:
+            novo.encerrar()
+        self.assertTrue(valida)
+        self.assertEqual(custo_do_hash(novo_hash), 5)
+        self.assertTrue(asyncio.run(self.servico.verificar("segredo", novo_hash)).valida)
+
+    def test_senhas_invalidas(self) -> None:
+        """Testa a recusa de senhas vazias ou maiores que 72 bytes."""
+        for senha in ("", "ç" * 37):
+            with self.assertRaises(ValueError):
+                asyncio.run(self.servico.gerar_hash(senha))
+        hash_senha = asyncio.run(self.servico.gerar_hash("a" * 72))
+        self.assertFalse(asyncio.run(self.servico.verificar("a" * 73, hash_senha)).valida)
+        with self.assertRaises(ValueError):
+            ServicoSenhas(custo=3)
+
+    def test_limite_de_tentativas(self) -> None:
+        """Testa o bloqueio após falhas seguidas e a liberação após o prazo."""
+        agora = [0.0]
+        limitador = LimitadorTentativas(max_tentativas=3, janela=60, bloqueio=120, relogio=lambda: agora[0])
+        servico = ServicoSenhas(custo=4, workers=1, limitador=limitador)
+        try:
+            hash_senha = asyncio.run(servico.gerar_hash("segredo"))
+            asyncio.run(servico.autenticar("Ana@Frota.com", "x", hash_senha))
+            asyncio.run(servico.autenticar("ana@frota.com", "segredo", hash_senha))
+            for _ in range(3):
+                self.assertFalse(asyncio.run(servico.autenticar("ana@frota.com", "x", hash_senha)).valida)
+            with self.assertRaises(TentativasExcedidas) as contexto:
+                asyncio.run(servico.autenticar("ana@frota.com", "segredo", hash_senha))
+            self.assertEqual(contexto.exception.espera, 120)
+            self.assertFalse(asyncio.run(servico.autenticar("ninguem@frota.com", "segredo", None)).valida)
+
+            agora[0] = 121.0
+            self.assertTrue(asyncio.run(servico.autenticar("ana@frota.com", "segredo", hash_senha)).valida)
+            self.assertEqual(limitador.limpar(), 1)
+        finally:
+            servico.encerrar()
+
+    def test_pool_de_processos(self) -> None:
+        """Testa o hash em processos iniciados por spawn."""
+        servico = ServicoSenhas(custo=4, workers=1, processos=True)
+        try:
+            self.assertEqual(servico._executor._mp_context.get_start_method(), "spawn")
+            hash_senha = asyncio.run(servico.gerar_hash("segredo"))
+            self.assertTrue(asyncio.run(servico.verificar("segredo", hash_senha)).valida)
+        finally:
+            servico.encerrar()
+
+    def test_contas_expiradas_removidas_na_falha(self) -> None:
+        """Testa que o histórico das contas não cresce sem limite."""
+        agora = [0.0]
+        limitador = LimitadorTentativas(max_tentativas=3, janela=60, relogio=lambda: agora[0], max_contas=100)
+        for indice in range(1_000):
+            agora[0] = float(indice)
+            limitador.registrar_falha(f"conta{indice}@frota.com")
+        # Ficam as contas da última janela, no máximo o dobro delas entre limpezas
+        self.assertLessEqual(len(limitador._falhas), 2 * 61)
+        self.assertIn("conta999@frota.com", limitador._falhas)
+
+class TestAutenticarUsuario(unittest.TestCase):
+    """Classe de testes do caso de uso de autenticação."""
+
+    def test_autenticacao_e_rehash(self) -> None:
+        """Testa o login, a gravação do novo hash e o usuário inativo."""
+        with tempfile.TemporaryDirectory() as diretorio:
+            engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'usuarios.db')}")
+            Base.metadata.create_all(engine)
+            Session = sessionmaker(bind=engine)
+            antigo = ServicoSenhas(custo=4, workers=1)
+            servico = ServicoSenhas(custo=5, workers=1)
+            try:
+                hash_senha = asyncio.run(antigo.gerar_hash("segredo"))
+                with Session() as session:
+                    session.add_all([
+                        Usuario(nome="Ana", email="ana@frota.com", senha_hash=hash_senha),
+                        Usuario(nome="Rui", email="rui@frota.com", senha_hash=hash_senha, ativo=False),
+                    ])
+                    session.commit()
+
+                caso_de_uso = AutenticarUsuarioUseCase(Session, servico)
+                usuario = asyncio.run(caso_de_uso.executar(" ANA@frota.com", "segredo"))
+                self.assertEqual(usuario.nome, "Ana")
+                self.assertIsNone(asyncio.run(caso_de_uso.executar("ana@frota.com", "errada")))
+                self.assertIsNone(asyncio.run(caso_de_uso.executar("rui@frota.com", "segredo")))
+                with Session() as session:
+                    gravado = session.query(Usuario).filter_by(email="ana@frota.com").one().senha_hash
+                self.assertEqual(custo_do_hash(gravado), 5)
+            finally:
+                antigo.encerrar()
+                servico.encerrar()
+                engine.dispose()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+"""Módulo de testes unitários para o perfil das consultas SQL.
+
+Este módulo contém testes para a impressão digital e a redação dos parâmetros,
+para o `PerfilConsultas` alimentado pelos listeners do SQLAlchemy, verificando o
+log de consultas lentas com o `EXPLAIN QUERY PLAN` e o ranking por tempo total,
+para a agregação do log pela linha de comando e para a rota `/admin/consultas`,
+usando um banco SQLite em memória.
+"""
+
+import gc
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from app.api.v1.dependencies import get_current_user
+from app.api.v1.routes import admin
+from app.application.services.usuario_cache_service import UsuarioAutenticado
+from app.infrastructure.auth.permissions import permissoes_do_perfil
+from app.infrastructure.observabilidade.perfil_consultas import (
+    _PERFIS_ATIVOS,
+    PerfilConsultas,
+    agregar_log,
+    ativar_perfil_sql,
+    impressao_digital,
+    main,
+    redigir_parametros,
+)
+
+class TestNormalizacao(unittest.TestCase):
+    """Classe de testes da impressão digital e da redação dos parâmetros."""
+
+    def test_impressao_digital(self) -> None:
+        """Testa a remoção de literais, comentários e listas de parâmetros."""
+        a = impressao_digital("SELECT * FROM viagens WHERE id IN (?, ?, ?) AND origem = 'Recife' -- x")
+        b = impressao_digital("select * from viagens where id in (?) and origem = 'Natal'")
+        self.assertEqual(a[0], "SELECT * FROM viagens WHERE id IN (?+) AND origem = ?")
+        self.assertNotEqual(a[1], b[1])
+        self.assertEqual(
+            impressao_digital("SELECT * FROM t1 WHERE km > 10.5 LIMIT :limite;")[0],
+            "SELECT * FROM t1 WHERE km > ? LIMIT ?",
+        )
+        self.assertEqual(
+            impressao_digital("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)"),
+            impressao_digital("INSERT INTO t (a, b) VALUES (1, 'x')"),
+        )
+
+    def test_redacao(self) -> None:
+        """Testa a redação de textos e a manutenção de números e nulos."""
+        self.assertEqual(redigir_parametros((7, "12345678900", None, 1.5)), [7, "<str:11>", None, 1.5])
+        self.assertEqual(redigir_parametros({"email": "a@b.c"}), {"email": "<str:5>"})
+        self.assertEqual(
+            redigir_parametros([(1, "x"), (2, "y")]),
+            {"conjuntos": 2, "primeiro": [1, "<str:1>"]},
+        )
+
+class TestPerfilConsultas(unittest.TestCase):
+    """Classe de testes do perfil alimentado pelo SQLAlchemy."""
+
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        with self.engine.begin() as conexao:
+            conexao.execute(text("CREATE TABLE viagens (id INTEGER PRIMARY KEY, origem TEXT)"))
+        self.logger = logging.getLogger("tests.consultas_lentas")
+        self.perfil = PerfilConsultas(limite_lenta_ms=float("inf"), logger=self.logger)
+        ativar_perfil_sql(self.engine, self.perfil)
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+
+    def test_ranking(self) -> None:
+        """Testa o agrupamento por impressão digital e a ordenação."""
+        with self.engine.begin() as conexao:
+            for i in range(5):
+                conexao.execute(text("INSERT INTO viagens (origem) VALUES (:o)"), {"o": f"cidade {i}"})
+            conexao.execute(text("SELECT * FROM viagens WHERE id = 1"))
+        chamadas = {item.sql: item.chamadas for item in self.perfil.mais_custosas(10, "chamadas")}
+        self.assertEqual(chamadas["INSERT INTO viagens (origem) VALUES (?+)"], 5)
+        self.assertEqual(chamadas["SELECT * FROM viagens WHERE id = ?"], 1)
+        self.assertEqual(self.perfil.mais_custosas(1, "chamadas")[0].chamadas, 5)
+        with self.assertRaises(ValueError):
+            self.perfil.mais_custosas(ordem="nome")
+        self.perfil.limpar()
+        self.assertEqual(self.perfil.mais_custosas(), [])
+
+    def test_log_consulta_lenta(self) -> None:
+        """Testa o registro JSON com parâmetros redigidos e plano de execução."""
+        self.perfil.limite_lenta_ms = 0.0
+        with self.assertLogs(self.logger, "WARNING") as logs:
+            with self.engine.connect() as conexao:
+                conexao.execute(text("SELECT * FROM viagens WHERE origem = :o"), {"o": "Recife"})
+        registro = json.loads(logs.records[0].getMessage())
+        self.assertEqual(registro["sql"], "SELECT * FROM viagens WHERE origem = ?")
+        self.assertEqual(registro["parametros"], ["<str:6>"])
+        self.assertTrue(any("viagens" in linha for linha in registro["plano"]))
+
+        # Reativar o mesmo alvo troca o perfil, sem duplicar os listeners
+        outro = PerfilConsultas(limite_lenta_ms=float("inf"))
+        ativar_perfil_sql(self.engine, outro)
+        with self.engine.connect() as conexao:
+            conexao.execute(text("SELECT 1"))
+        self.assertEqual([item.chamadas for item in outro.mais_custosas()], [1])
+
+    def test_engine_nova_nao_herda_o_perfil(self) -> None:
+        """Testa que o registro do perfil não sobrevive à engine descartada."""
+        gc.collect()
+        engine = create_engine("sqlite://")
+        ativar_perfil_sql(engine, PerfilConsultas(limite_lenta_ms=float("inf")))
+        quantidade = len(_PERFIS_ATIVOS)
+        engine.dispose()
+        del engine
+        gc.collect()
+        self.assertEqual(len(_PERFIS_ATIVOS), quantidade - 1)
+
+        # Uma engine nova, mesmo que reaproveite o endereço, recebe os próprios listeners
+        nova = create_engine("sqlite://")
+        perfil = PerfilConsultas(limite_lenta_ms=float("inf"))
+        ativar_perfil_sql(nova, perfil)
+        with nova.connect() as conexao:
+            conexao.execute(text("SELECT 1"))
+        self.assertEqual([item.chamadas for item in perfil.mais_custosas()], [1])
+        nova.dispose()
+
+    def test_capacidade(self) -> None:
+        """Testa o descarte da impressão digital de menor tempo total."""
+        perfil = PerfilConsultas(capacidade=2, limite_lenta_ms=float("inf"))
+        perfil.registrar("SELECT a FROM t", (), 0.003)
+        perfil.registrar("SELECT b FROM t", (), 0.001)
+        perfil.registrar("SELECT c FROM t", (), 0.002)
+        self.assertEqual([item.sql for item in perfil.mais_custosas()], ["SELECT a FROM t", "SELECT c FROM t"])
+
+class TestLinhaDeComando(unittest.TestCase):
+    """Classe de testes da agregação do log de consultas lentas."""
+
+    def test_agregar_log(self) -> None:
+        """Testa a agregação de linhas com prefixo e a tabela impressa."""
+        linhas = [
+            'WARNING:app.consultas_lentas:{"impressao": "aaa", "sql": "SELECT ?", "duracao_ms": 150.0}\n',
+            '{"impressao": "aaa", "sql": "SELECT ?", "duracao_ms": 250.0}\n',
+            '{"impressao": "bbb", "sql": "UPDATE t SET a = ?", "duracao_ms": 300.0}\n',
+            "linha de outro logger\n",
+        ]
+        estatisticas = {item.impressao: item for item in agregar_log(linhas)}
+        self.assertEqual(estatisticas["aaa"].chamadas, 2)
+        self.assertEqual(estatisticas["aaa"].total_ms, 400.0)
+        self.assertEqual(estatisticas["aaa"].maximo_ms, 250.0)
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "lentas.log")
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                arquivo.writelines(linhas)
+            saida = io.StringIO()
+            with redirect_stdout(saida):
+                main([caminho, "--top", "1"])
+        tabela = saida.getvalue().splitlines()
+        self.assertEqual(len(tabela), 2)
+        self.assertTrue(tabela[1].startswith("aaa"))
+
+class TestRotaAdmin(unittest.TestCase):
+    """Classe de testes da rota de consultas mais custosas."""
+
+    def _cliente(self, perfil_usuario: str, perfil_consultas) -> TestClient:
+        app = FastAPI()
+        app.include_router(admin.router, prefix="/api/v1")
+        app.state.perfil_consultas = perfil_consultas
+        usuario = UsuarioAutenticado(1, "Ana", "ana@frota", perfil_usuario, permissoes_do_perfil(perfil_usuario))
+        app.dependency_overrides[get_current_user] = lambda: usuario
+        return TestClient(app)
+
+    def test_listar_e_limpar(self) -> None:
+        """Testa a listagem, a validação da ordem, a limpeza e a permissão."""
+        perfil = PerfilConsultas(limite_lenta_ms=float("inf"))
+        perfil.registrar("SELECT * FROM motoristas", (), 0.01)
+        cliente = self._cliente("admin", perfil)
+        resposta = cliente.get("/api/v1/admin/consultas", params={"top": 5, "ordem": "media"})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.json()[0]["chamadas"], 1)
+        self.assertAlmostEqual(resposta.json()[0]["media_ms"], 10.0)
+        self.assertEqual(cliente.get("/api/v1/admin/consultas", params={"ordem": "x"}).status_code, 422)
+        self.assertEqual(cliente.delete("/api/v1/admin/consultas").status_code, 204)
+        self.assertEqual(perfil.mais_custosas(), [])
+
+        self.assertEqual(self._cliente("gestor", perfil).get("/api/v1/admin/consultas").status_code, 403)
+        self.assertEqual(self._cliente("admin", None).get("/api/v1/admin/consultas").status_code, 404)
+
+if __name__ == "__main__":
+    unittest.main()
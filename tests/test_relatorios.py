@@ -0,0 +1,182 @@
+"""Módulo de testes unitários para a geração de relatórios em fluxo.
+
+Este módulo contém testes para os escritores CSV, XLSX e PDF, verificando que
+os arquivos gerados são válidos (planilha legível como zip e XML, PDF com a
+tabela de referências cruzadas apontando para os objetos), para o
+`RelatorioViagensClienteUseCase`, que filtra as viagens do cliente no período,
+e para o `GerenciadorRelatorios`, que executa a geração em um pool de threads
+com acompanhamento do progresso e no banco do tenant solicitante, usando
+bancos SQLite temporários.
+"""
+
+import csv
+import io
+import os
+import re
+import tempfile
+import unittest
+import zipfile
+from datetime import date, datetime, timedelta
+from xml.etree import ElementTree
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.application.services.relatorio_job_service import (
+    STATUS_CONCLUIDO, STATUS_ERRO, GerenciadorRelatorios,
+)
+from app.application.use_cases.viagem.relatorio_viagem import RelatorioViagensClienteUseCase
+from app.infrastructure.persistence.sqlalchemy.models import Base, Cliente, StatusViagem, Viagem
+from app.infrastructure.persistence.sqlalchemy.tenant_router import RoteadorTenants
+from app.infrastructure.relatorios.escritores import ColunaRelatorio, ModeloRelatorio, criar_escritor
+
+MODELO = ModeloRelatorio(
+    titulo="Teste {nome}",
+    colunas=(
+        ColunaRelatorio("Código", "codigo", largura=8),
+        ColunaRelatorio("Valor", "valor", "{:,.2f}", largura=10),
+    ),
+)
+NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+def _gerar(formato, linhas):
+    arquivo = io.BytesIO()
+    escritor = criar_escritor(formato, arquivo, MODELO, {"nome": "A&B"})
+    escritor.iniciar()
+    for linha in linhas:
+        escritor.escrever(linha)
+    escritor.finalizar()
+    return arquivo.getvalue()
+
+class TestEscritores(unittest.TestCase):
+    """Classe de testes dos escritores de relatório."""
+
+    def test_csv(self) -> None:
+        """Testa cabeçalho e valores formatados pela coluna."""
+        conteudo = _gerar("csv", [{"codigo": "V-1", "valor": 1234.5}, {"codigo": "V-2", "valor": None}])
+        linhas = list(csv.reader(io.StringIO(conteudo.decode("utf-8-sig"))))
+        self.assertEqual(linhas, [["Código", "Valor"], ["V-1", "1,234.50"], ["V-2", ""]])
+
+    def test_xlsx(self) -> None:
+        """Testa que a planilha é um zip válido com números e texto escapado."""
+        conteudo = _gerar("xlsx", [{"codigo": "<V-1>", "valor": 10.25}])
+        with zipfile.ZipFile(io.BytesIO(conteudo)) as pacote:
+            self.assertIn("xl/workbook.xml", pacote.namelist())
+            planilha = ElementTree.fromstring(pacote.read("xl/worksheets/sheet1.xml"))
+        linhas = planilha.findall("s:sheetData/s:row", NS)
+        self.assertEqual(len(linhas), 3)
+        self.assertEqual(linhas[0].find("s:c/s:is/s:t", NS).text, "Teste A&B")
+        codigo, valor = linhas[2].findall("s:c", NS)
+        self.assertEqual(codigo.find("s:is/s:t", NS).text, "<V-1>")
+        self.assertEqual(valor.find("s:v", NS).text, "10.25")
+
+    def test_pdf(self) -> None:
+        """Testa a paginação e a tabela de referências cruzadas."""
+        conteudo = _gerar("pdf", [{"codigo": f"V-{i}", "valor": float(i)} for i in range(120)])
+        self.assertTrue(conteudo.startswith(b"%PDF-1.4"))
+        self.assertIn(b"/Count 3", conteudo)
+        self.assertIn(b"(Teste A&B) '", conteudo)
+
+        inicio_xref = int(re.search(rb"startxref\n(\d+)", conteudo).group(1))
+        self.assertTrue(conteudo[inicio_xref:].startswith(b"xref"))
+        deslocamentos = re.findall(rb"(\d{10}) 00000 n", conteudo)
+        for numero, deslocamento in enumerate(deslocamentos, start=1):
+            self.assertTrue(conteudo[int(deslocamento):].startswith(b"%d 0 obj" % numero))
+
+    def test_formato_invalido(self) -> None:
+        """Testa a recusa de formatos não suportados."""
+        with self.assertRaises(ValueError):
+            criar_escritor("docx", io.BytesIO(), MODELO)
+
+class TestRelatorioViagensCliente(unittest.TestCase):
+    """Classe de testes do relatório de viagens por cliente e do pool de geração."""
+
+    def setUp(self) -> None:
+        """Cria o banco temporário com dois clientes e suas viagens."""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.diretorio.name, 'frota.db')}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            clientes = [Cliente(nome="Transportes Sul"), Cliente(nome="Agro Norte")]
+            session.add_all(clientes)
+            session.flush()
+            self.cliente_id = clientes[0].id
+            for i in range(25):
+                session.add(Viagem(
+                    codigo=f"V-{i}", motorista_id=1, veiculo_id=1,
+                    cliente_id=clientes[i % 5 == 0].id, origem="Curitiba", destino="Santos",
+                    data_saida_prevista=datetime(2026, 5, 1) + timedelta(days=i),
+                    status=StatusViagem.CONCLUIDA, km_total=400, custo_total=900, valor_frete=1500,
+                ))
+            session.commit()
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        self.diretorio.cleanup()
+
+    def test_linhas_do_cliente(self) -> None:
+        """Testa o filtro por cliente e período, a margem e o progresso."""
+        with self.Session() as session:
+            caso_de_uso = RelatorioViagensClienteUseCase(session, tamanho_lote=5)
+            self.assertEqual(caso_de_uso.contar(self.cliente_id, date(2026, 5, 1), date(2026, 5, 10)), 8)
+            linhas = list(caso_de_uso.linhas(self.cliente_id, date(2026, 5, 1), date(2026, 5, 10)))
+            self.assertEqual(linhas[0]["codigo"], "V-1")
+            self.assertEqual(linhas[0]["margem"], 600)
+            self.assertEqual(linhas[0]["data_saida"], datetime(2026, 5, 2))
+
+            avisos = []
+            arquivo = io.BytesIO()
+            total = caso_de_uso.gerar(self.cliente_id, date(2026, 5, 1), date(2026, 6, 30), "csv", arquivo, avisos.append)
+        self.assertEqual(total, 20)
+        self.assertEqual(avisos, [5, 10, 15, 20, 20])
+
+    def test_gerenciador(self) -> None:
+        """Testa a execução no pool, o progresso e a falha de cliente inexistente."""
+        gerenciador = GerenciadorRelatorios(self.Session, os.path.join(self.diretorio.name, "saida"), workers=2)
+        try:
+            tarefa = gerenciador.enviar(self.cliente_id, "XLSX", date(2026, 5, 1), date(2026, 5, 31))
+            inexistente = gerenciador.enviar(999, "pdf", date(2026, 5, 1), date(2026, 5, 31))
+            with self.assertRaises(ValueError):
+                gerenciador.enviar(self.cliente_id, "pdf", date(2026, 5, 31), date(2026, 5, 1))
+        finally:
+            gerenciador.encerrar()
+
+        concluida = gerenciador.obter(tarefa.id)
+        self.assertEqual((concluida.status, concluida.total, concluida.progresso), (STATUS_CONCLUIDO, 20, 1.0))
+        self.assertTrue(zipfile.is_zipfile(concluida.caminho))
+        falha = gerenciador.obter(inexistente.id)
+        self.assertEqual(falha.status, STATUS_ERRO)
+        self.assertIn("999", falha.erro)
+
+        self.assertEqual(gerenciador.limpar_expiradas(datetime.now() + timedelta(hours=2)), 2)
+        self.assertIsNone(gerenciador.obter(tarefa.id))
+        self.assertFalse(os.path.exists(concluida.caminho))
+
+    def test_gerenciador_por_tenant(self) -> None:
+        """Testa que a tarefa lê o banco do tenant e só é visível para ele."""
+        roteador = RoteadorTenants(
+            os.path.join(self.diretorio.name, "tenants"), fabrica_sessao=self.Session, tenants=["sul"],
+        )
+        with roteador.sessao("sul") as session:
+            session.add(Cliente(nome="Cliente do tenant sul"))
+            session.flush()
+            session.add(Viagem(
+                codigo="S-1", motorista_id=1, veiculo_id=1, cliente_id=self.cliente_id,
+                origem="Pelotas", destino="Rio Grande", data_saida_prevista=datetime(2026, 5, 3),
+                status=StatusViagem.CONCLUIDA, km_total=60, custo_total=200, valor_frete=500,
+            ))
+            session.commit()
+        gerenciador = GerenciadorRelatorios(
+            self.Session, os.path.join(self.diretorio.name, "saida"), workers=1, roteador=roteador,
+        )
+        try:
+            tarefa = gerenciador.enviar(self.cliente_id, "csv", date(2026, 5, 1), date(2026, 5, 31), "sul")
+        finally:
+            gerenciador.encerrar()
+            roteador.encerrar()
+
+        self.assertIsNone(gerenciador.obter(tarefa.id))
+        concluida = gerenciador.obter(tarefa.id, "sul")
+        self.assertEqual((concluida.status, concluida.total, concluida.tenant_id), (STATUS_CONCLUIDO, 1, "sul"))
+
+if __name__ == "__main__":
+    unittest.main()
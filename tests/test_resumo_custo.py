@@ -0,0 +1,122 @@
+"""Módulo de testes unitários para os resumos mensais de custo das viagens.
+
+Este módulo contém testes para o `resumo_custo_service` e o
+`RelatorioCustosUseCase`, verificando a atualização incremental dos resumos
+no flush (conclusão, edição de custos, troca de mês, cancelamento e remoção),
+a reconstrução completa a partir das viagens e as consultas do relatório
+mensal e dos totais por entidade, usando um banco SQLite em memória.
+"""
+
+import unittest
+from datetime import date, datetime
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from app.application.services.resumo_custo_service import ResumoCustoService, ativar_resumo_custos
+from app.application.use_cases.viagem.relatorio_viagem import RelatorioCustosUseCase
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Base, ResumoCustoMensal, StatusViagem, Viagem,
+)
+
+MARCO = date(2026, 3, 1)
+ABRIL = date(2026, 4, 1)
+
+class TestResumoCusto(unittest.TestCase):
+    """Classe de testes dos resumos mensais de custo."""
+
+    def setUp(self) -> None:
+        """Cria o banco em memória com a atualização incremental ativa."""
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        ativar_resumo_custos(self.Session)
+        self.sequencia = 0
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+
+    def _viagem(self, veiculo_id=1, motorista_id=10, cliente_id=None, chegada=datetime(2026, 3, 15), **custos):
+        self.sequencia += 1
+        return Viagem(
+            codigo=f"V-{self.sequencia}", motorista_id=motorista_id, veiculo_id=veiculo_id,
+            cliente_id=cliente_id, origem="A", destino="B", data_saida_prevista=chegada,
+            data_chegada_real=chegada, status=StatusViagem.CONCLUIDA, **custos,
+        )
+
+    def _resumos(self, session, dimensao="veiculo"):
+        consulta = select(ResumoCustoMensal).where(ResumoCustoMensal.dimensao == dimensao)
+        return {
+            (r.entidade_id, r.mes): (r.quantidade_viagens, r.custo_total)
+            for r in session.scalars(consulta)
+        }
+
+    def test_atualizacao_incremental(self) -> None:
+        """Testa inclusão, edição de custo, troca de mês, cancelamento e remoção."""
+        with self.Session() as session:
+            primeira = self._viagem(cliente_id=5, km_total=300, pedagio=40, custo_combustivel=260)
+            segunda = self._viagem(custo_total=100)
+            agendada = self._viagem()
+            agendada.status = StatusViagem.AGENDADA
+            session.add_all([primeira, segunda, agendada])
+            session.commit()
+            self.assertEqual(self._resumos(session), {(1, MARCO): (2, 400.0)})
+            self.assertEqual(self._resumos(session, "cliente"), {(5, MARCO): (1, 300.0)})
+
+            # Após o commit os atributos estão expirados: a edição não os carrega
+            primeira.pedagio = 90
+            primeira.custo_total = 350
+            session.commit()
+            self.assertEqual(self._resumos(session), {(1, MARCO): (2, 450.0)})
+
+            segunda.data_chegada_real = datetime(2026, 4, 2)
+            agendada.status = StatusViagem.CONCLUIDA
+            agendada.custo_total = 70
+            session.commit()
+            self.assertEqual(self._resumos(session), {(1, MARCO): (2, 420.0), (1, ABRIL): (1, 100.0)})
+
+            segunda.status = StatusViagem.CANCELADA
+            session.delete(primeira)
+            session.commit()
+            self.assertEqual(self._resumos(session), {(1, MARCO): (1, 70.0)})
+            self.assertEqual(self._resumos(session, "cliente"), {})
+
+    def test_reconstrucao(self) -> None:
+        """Testa que a reconstrução reproduz os resumos incrementais."""
+        with self.Session() as session:
+            session.add_all([
+                self._viagem(veiculo_id=1, hospedagem=200, alimentacao=50),
+                self._viagem(veiculo_id=2, custo_total=80, chegada=datetime(2026, 4, 30, 23)),
+                self._viagem(veiculo_id=1, motorista_id=11, custo_total=30),
+            ])
+            session.commit()
+            incrementais = self._resumos(session), self._resumos(session, "motorista")
+
+            session.execute(ResumoCustoMensal.__table__.delete())
+            session.commit()
+            self.assertEqual(ResumoCustoService(session, tamanho_lote=2).reconstruir(), 5)
+            self.assertEqual((self._resumos(session), self._resumos(session, "motorista")), incrementais)
+
+    def test_relatorio(self) -> None:
+        """Testa o relatório mês a mês e os totais do período por entidade."""
+        with self.Session() as session:
+            session.add_all([
+                self._viagem(veiculo_id=1, km_total=100, custo_total=50),
+                self._viagem(veiculo_id=1, km_total=300, custo_total=150, chegada=datetime(2026, 4, 3)),
+                self._viagem(veiculo_id=2, km_total=100, custo_total=400),
+                self._viagem(veiculo_id=2, km_total=100, custo_total=900, chegada=datetime(2026, 6, 1)),
+            ])
+            session.commit()
+
+            relatorio = RelatorioCustosUseCase(session)
+            mensal = relatorio.executar("veiculo", date(2026, 3, 20), date(2026, 4, 1))
+            self.assertEqual([(r.mes, r.entidade_id) for r in mensal], [(MARCO, 1), (MARCO, 2), (ABRIL, 1)])
+            self.assertEqual(len(relatorio.executar("veiculo", MARCO, ABRIL, entidade_id=2)), 1)
+
+            totais = relatorio.totalizar("veiculo", MARCO, ABRIL)
+            self.assertEqual([(t.entidade_id, t.custo_total) for t in totais], [(2, 400.0), (1, 200.0)])
+            self.assertEqual(totais[1].quantidade_viagens, 2)
+            self.assertAlmostEqual(totais[1].custo_km, 0.5)
+            with self.assertRaises(ValueError):
+                relatorio.executar("rota", MARCO, ABRIL)
+
+if __name__ == "__main__":
+    unittest.main()
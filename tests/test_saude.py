@@ -0,0 +1,113 @@
+"""Módulo de testes unitários para as sondas de saúde da aplicação.
+
+Este módulo contém testes para o `VerificadorProntidao`, verificando as sondas
+de banco, pool, outbox e agendador, o cache do resultado e os limites
+configuráveis, e para as rotas `/health/live` e `/health/ready`, usando um
+banco SQLite temporário.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.api import healthcheck
+from app.application.services.saude_service import LimitesProntidao, VerificadorProntidao
+from app.infrastructure.agendamento.agendador import Agendador
+from app.infrastructure.persistence.sqlalchemy.models import Base, OutboxEvento
+
+class TestVerificadorProntidao(unittest.TestCase):
+    """Classe de testes das sondas de prontidão."""
+
+    def setUp(self) -> None:
+        """Cria o banco temporário e o verificador com relógio controlado."""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.diretorio.name, 'saude.db')}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.agora = 0.0
+        self.agendador = None
+        self.verificador = VerificadorProntidao(
+            self.engine,
+            agendador=lambda: self.agendador,
+            limites=LimitesProntidao(outbox_pendentes=2, atraso_agendador_segundos=10),
+            relogio=lambda: self.agora,
+        )
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        self.diretorio.cleanup()
+
+    def _sondas(self):
+        relatorio = self.verificador.avaliar()
+        return relatorio.pronto, {sonda.nome: sonda.ok for sonda in relatorio.sondas}
+
+    def test_pronto_e_cache(self) -> None:
+        """Testa todas as sondas positivas e o resultado reaproveitado."""
+        relatorio = self.verificador.avaliar()
+        self.assertTrue(relatorio.pronto)
+        self.assertEqual([sonda.nome for sonda in relatorio.sondas], ["banco", "pool", "outbox", "agendador"])
+        self.assertTrue(all(sonda.latencia_ms >= 0 for sonda in relatorio.sondas))
+        self.assertIs(self.verificador.avaliar(), relatorio)
+        self.agora = 2.0
+        self.assertIsNot(self.verificador.avaliar(), relatorio)
+
+    def test_outbox_acumulado(self) -> None:
+        """Testa a quantidade e a idade dos eventos pendentes."""
+        with self.Session() as session:
+            for i in range(3):
+                session.add(OutboxEvento(chave_idempotencia=f"k{i}", tipo_evento="Teste", payload="{}"))
+            session.commit()
+        self.assertEqual(self._sondas(), (False, {"banco": True, "pool": True, "outbox": False, "agendador": True}))
+
+        self.agora = 10.0
+        with self.Session() as session:
+            session.query(OutboxEvento).filter(OutboxEvento.chave_idempotencia != "k0").delete()
+            session.query(OutboxEvento).update({"data_criacao": datetime.utcnow() - timedelta(hours=1)})
+            session.commit()
+        self.assertEqual(self._sondas()[1]["outbox"], False)
+
+    def test_agendador_atrasado(self) -> None:
+        """Testa o atraso do laço de verificação do agendador."""
+        horario = [datetime(2026, 10, 19, 8, 0)]
+        self.agendador = Agendador(self.Session, instancia="a", intervalo=1.0, relogio=lambda: horario[0])
+        try:
+            self.assertTrue(self._sondas()[1]["agendador"])
+            self.agendador.verificar()
+            horario[0] += timedelta(seconds=5)
+            self.assertEqual(self.agendador.atraso(), 4.0)
+            self.agora = 2.0
+            self.assertTrue(self._sondas()[1]["agendador"])
+            horario[0] += timedelta(seconds=30)
+            self.agora = 4.0
+            self.assertEqual(self._sondas(), (False, {"banco": True, "pool": True, "outbox": True, "agendador": False}))
+        finally:
+            self.agendador.encerrar()
+
+    def test_banco_indisponivel(self) -> None:
+        """Testa que uma falha de conexão torna as sondas do banco negativas."""
+        engine = create_engine(f"sqlite:///{os.path.join(self.diretorio.name, 'inexistente', 'x.db')}")
+        relatorio = VerificadorProntidao(engine).avaliar()
+        self.assertFalse(relatorio.pronto)
+        self.assertIn("OperationalError", relatorio.sondas[0].detalhe)
+
+    def test_rotas(self) -> None:
+        """Testa o status HTTP das rotas de vida e prontidão."""
+        app = FastAPI()
+        app.include_router(healthcheck.router)
+        app.state.verificador_prontidao = self.verificador
+        cliente = TestClient(app)
+        self.assertEqual(cliente.get("/health/live").json(), {"status": "ok"})
+        resposta = cliente.get("/health/ready")
+        self.assertEqual(resposta.status_code, 200)
+        self.assertTrue(resposta.json()["sondas"]["banco"]["ok"])
+
+        app.state.verificador_prontidao = VerificadorProntidao(self.engine, limites=LimitesProntidao(latencia_banco_ms=-1))
+        resposta = cliente.get("/health/ready")
+        self.assertEqual((resposta.status_code, resposta.json()["status"]), (503, "indisponivel"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""Módulo de testes unitários para a sincronização incremental.
+
+Este módulo contém testes para a classe `SyncService`, verificando que o pull
+entrega apenas os registros alterados desde o token do cliente, que alterações
+repetidas de um registro são compactadas no lote e que o envio de alterações
+locais aplica o resolvedor de conflitos quando o servidor também alterou o
+registro, que uma alteração que viola restrições do banco é rejeitada sem
+abortar as demais e que as rotas de sincronização exigem autenticação. Os testes utilizam um banco de dados SQLite em memória.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.dependencies import get_current_user, get_tenant_db
+from app.api.v1.routes import sync
+from app.application.services.usuario_cache_service import UsuarioAutenticado
+from app.infrastructure.auth.permissions import permissoes_do_perfil
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Base, TipoCombustivel, TipoVeiculo, Veiculo, Viagem,
+)
+from app.infrastructure.sync.sync_service import (
+    AlteracaoCliente, SyncService, ativar_rastreamento_alteracoes,
+)
+from app.infrastructure.sync.sync_status import StatusSincronizacao
+
+class TestSyncService(unittest.TestCase):
+    """Classe de testes para o SyncService."""
+
+    def setUp(self) -> None:
+        """Cria o banco em memória com o rastreamento de alterações ativo."""
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        fabrica = sessionmaker(bind=self.engine)
+        ativar_rastreamento_alteracoes(fabrica)
+        self.session = fabrica()
+        self.service = SyncService(self.session)
+
+    def tearDown(self) -> None:
+        """Fecha a sessão e libera o banco em memória."""
+        self.session.close()
+        self.engine.dispose()
+
+    def _criar_veiculo(self, placa: str) -> Veiculo:
+        veiculo = Veiculo(
+            placa=placa, marca="Volvo", modelo="FH", ano_fabricacao=2020, ano_modelo=2021,
+            tipo_veiculo=TipoVeiculo.CAMINHAO, tipo_combustivel=TipoCombustivel.DIESEL,
+            quilometragem_atual=1000.0,
+        )
+        self.session.add(veiculo)
+        self.session.commit()
+        return veiculo
+
+    def test_pull_incremental(self) -> None:
+        """Testa que o segundo pull traz apenas o registro alterado."""
+        veiculos = [self._criar_veiculo(f"ABC123{i}") for i in range(3)]
+        inicial = self.service.puxar()
+        self.assertEqual(len(inicial.alteracoes["veiculos"]), 3)
+
+        veiculos[1].quilometragem_atual = 1500.0
+        self.session.commit()
+        veiculos[1].quilometragem_atual = 1800.0
+        self.session.commit()
+
+        lote = self.service.puxar(inicial.token)
+        self.assertEqual([v["id"] for v in lote.alteracoes["veiculos"]], [veiculos[1].id])
+        self.assertEqual(lote.alteracoes["veiculos"][0]["quilometragem_atual"], 1800.0)
+        self.assertFalse(lote.tem_mais)
+        self.assertEqual(self.service.puxar(lote.token).alteracoes, {})
+
+    def test_pull_paginado_e_remocoes(self) -> None:
+        """Testa a paginação por limite e a entrega de remoções."""
+        veiculos = [self._criar_veiculo(f"XYZ123{i}") for i in range(3)]
+        primeiro = self.service.puxar(limite=2)
+        self.assertTrue(primeiro.tem_mais)
+        segundo = self.service.puxar(primeiro.token, limite=2)
+        self.assertFalse(segundo.tem_mais)
+
+        self.session.delete(veiculos[0])
+        self.session.commit()
+        lote = self.service.puxar(segundo.token)
+        self.assertEqual(lote.removidos, {"veiculos": [veiculos[0].id]})
+
+    def test_envio_com_mesclagem_por_campo(self) -> None:
+        """Testa que campos distintos alterados nos dois lados são mesclados."""
+        veiculo = self._criar_veiculo("DEF4G56")
+        token = self.service.puxar().token
+
+        veiculo.quilometragem_atual = 2000.0  # alteração no servidor
+        self.session.commit()
+
+        resultado = self.service.enviar(
+            [AlteracaoCliente(
+                tabela="veiculos", registro_id=veiculo.id,
+                campos={"cor": "branco", "quilometragem_atual": 1900.0},
+                data_alteracao=datetime.now() - timedelta(days=1),
+            )],
+            token_base=token,
+            dispositivo_id="tablet-01",
+        )
+        # A quilometragem do cliente é mais antiga e não prevalece
+        self.assertEqual(resultado.rejeitadas, [0])
+        self.assertEqual(resultado.status, StatusSincronizacao.CONFLITO)
+        self.session.refresh(veiculo)
+        self.assertEqual(veiculo.cor, "branco")
+        self.assertEqual(veiculo.quilometragem_atual, 2000.0)
+
+    def test_envio_tabela_invalida(self) -> None:
+        """Testa que alterações em tabelas não sincronizadas geram erro."""
+        resultado = self.service.enviar([
+            AlteracaoCliente(tabela="usuarios", registro_id=1, campos={}, data_alteracao=datetime.now()),
+        ])
+        self.assertEqual(resultado.status, StatusSincronizacao.ERRO)
+
+    def test_envio_com_violacao_de_restricao(self) -> None:
+        """Testa que uma alteração que viola o banco é rejeitada sem abortar o lote."""
+        veiculo = self._criar_veiculo("ABC1D23")
+        token = self.service.puxar().token
+        resultado = self.service.enviar([
+            AlteracaoCliente(tabela="viagens", registro_id=None, campos={"origem": "Recife"}, data_alteracao=datetime.now()),
+            AlteracaoCliente(tabela="veiculos", registro_id=veiculo.id, campos={"cor": "azul"}, data_alteracao=datetime.now()),
+        ], token_base=token)
+        self.assertEqual(resultado.rejeitadas, [0])
+        self.assertEqual(resultado.aplicadas, [1])
+        self.assertIn("NOT NULL", resultado.erros[0])
+        self.session.expire_all()
+        self.assertEqual(self.session.get(Veiculo, veiculo.id).cor, "azul")
+        self.assertEqual(self.session.query(Viagem).count(), 0)
+
+class TestRotasSync(unittest.TestCase):
+    """Classe de testes da autorização das rotas de sincronização."""
+
+    def setUp(self) -> None:
+        """Cria a aplicação com as rotas de sincronização e um banco em memória."""
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(self.engine)
+        fabrica = sessionmaker(bind=self.engine)
+        self.app = FastAPI()
+        self.app.include_router(sync.router, prefix="/api/v1")
+
+        def sessao():
+            db = fabrica()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        self.app.dependency_overrides[get_tenant_db] = sessao
+
+    def tearDown(self) -> None:
+        """Libera o banco em memória."""
+        self.engine.dispose()
+
+    def _cliente(self, perfil: str) -> TestClient:
+        usuario = UsuarioAutenticado(1, "Ana", "ana@frota", perfil, permissoes_do_perfil(perfil))
+        self.app.dependency_overrides[get_current_user] = lambda: usuario
+        return TestClient(self.app)
+
+    def test_autenticacao_e_permissao(self) -> None:
+        """Testa que as rotas recusam anônimos e perfis sem permissão."""
+        anonimo = TestClient(self.app)
+        self.assertIn(anonimo.get("/api/v1/sync/alteracoes").status_code, (401, 403))
+        self.assertIn(anonimo.post("/api/v1/sync/alteracoes", json={"dispositivo_id": "d1", "alteracoes": []}).status_code, (401, 403))
+
+        self.assertEqual(self._cliente("visitante").get("/api/v1/sync/alteracoes").status_code, 403)
+        operador = self._cliente("operador")
+        self.assertEqual(operador.get("/api/v1/sync/alteracoes").status_code, 200)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+"""Módulo de testes unitários para as posições de GPS das viagens.
+
+Este módulo contém testes para a codificação dos blocos por diferença, para o
+armazém de posições (descarte de pontos repetidos, selagem por capacidade e
+por inatividade somente após o commit, bloco liberado ao fechar a sessão sem
+commit), para a distância e a amostragem das
+trilhas, para o encerramento da viagem pela trilha e para as rotas de
+telemetria. Os testes utilizam um banco SQLite em memória.
+"""
+
+import unittest
+from array import array
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.dependencies import get_tenant_db
+from app.api.v1.routes import telemetria
+from app.application.services.trilha_service import amostrar, distancia_km
+from app.application.use_cases.viagem.encerrar_viagem import EncerrarViagemUseCase
+from app.domain.events import BusinessRuleViolation
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Base, BlocoPosicoes, StatusViagem, TipoCombustivel, TipoVeiculo, Veiculo, Viagem,
+)
+from app.infrastructure.telemetria.armazem import ArmazemPosicoes, BlocoAberto, Trilha, decodificar_bloco
+
+INICIO_MS = 1_704_103_200_000
+
+def _pontos(quantidade, inicio=INICIO_MS, passo_ms=1000, passo_graus=0.001):
+    """Pontos rumo ao norte, a partir de Recife."""
+    instantes = [inicio + indice * passo_ms for indice in range(quantidade)]
+    latitudes = [-8.05 + indice * passo_graus for indice in range(quantidade)]
+    longitudes = [-34.9] * quantidade
+    return instantes, latitudes, longitudes
+
+class TestBlocos(unittest.TestCase):
+    """Classe de testes da codificação dos blocos."""
+
+    def test_codificar_e_rebasear(self) -> None:
+        """Testa a ida e volta, com diferenças negativas, e o descarte do início."""
+        pontos = [(INICIO_MS, -8_050_000, -34_900_000), (INICIO_MS + 900, -8_049_100, -34_900_512),
+                  (INICIO_MS + 2100, -8_051_000, -34_899_000), (INICIO_MS + 3000, -8_052_000, -34_898_000)]
+        bloco = BlocoAberto()
+        for ponto in pontos:
+            bloco.acrescentar(*ponto)
+        trilha = decodificar_bloco(bloco.codificar(3))
+        self.assertEqual(list(trilha.instantes), [p[0] for p in pontos[:3]])
+        self.assertEqual(list(trilha.latitudes), [p[1] / 1e6 for p in pontos[:3]])
+        self.assertEqual(list(trilha.longitudes), [p[2] / 1e6 for p in pontos[:3]])
+
+        bloco.descartar_inicio(2)
+        self.assertEqual(bloco.base, pontos[2])
+        self.assertEqual(list(bloco.trilha().instantes), [pontos[2][0], pontos[3][0]])
+        bloco.descartar_inicio(2)
+        self.assertEqual(len(bloco), 0)
+
+class TestArmazem(unittest.TestCase):
+    """Classe de testes do armazém de posições."""
+
+    def setUp(self) -> None:
+        """Cria o banco em memória com uma viagem e o armazém."""
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.fabrica = sessionmaker(bind=self.engine)
+        self.agora = 0.0
+        self.armazem = ArmazemPosicoes(capacidade_bloco=100, selagem_segundos=30.0, relogio=lambda: self.agora)
+
+    def tearDown(self) -> None:
+        """Libera as conexões do banco em memória."""
+        self.engine.dispose()
+
+    def _blocos(self):
+        with self.fabrica() as session:
+            return session.scalar(select(func.count(BlocoPosicoes.id)))
+
+    def test_descarta_pontos_repetidos(self) -> None:
+        """Testa que o reenvio e pontos fora de ordem são descartados."""
+        instantes, latitudes, longitudes = _pontos(10)
+        with self.fabrica() as session:
+            self.assertEqual(self.armazem.registrar(session, 1, instantes, latitudes, longitudes), 10)
+            self.assertEqual(self.armazem.registrar(session, 1, instantes[5:], latitudes[5:], longitudes[5:]), 0)
+            atrasado = [instantes[3] + 1, instantes[-1] + 1000]
+            self.assertEqual(self.armazem.registrar(session, 1, atrasado, [0.0, 0.0], [0.0, 0.0]), 1)
+            self.assertEqual(len(self.armazem.trilha(session, 1)), 11)
+        estatisticas = self.armazem.estatisticas()
+        self.assertEqual((estatisticas.pontos_aceitos, estatisticas.pontos_descartados), (11, 6))
+
+    def test_selagem_apos_commit(self) -> None:
+        """Testa que o bloco cheio sai da memória só após o commit e volta no rollback."""
+        instantes, latitudes, longitudes = _pontos(250)
+        with self.fabrica() as session:
+            self.armazem.registrar(session, 1, instantes[:120], latitudes[:120], longitudes[:120])
+            self.assertEqual(self.armazem.estatisticas().pontos_em_memoria, 120)
+            session.rollback()
+            self.assertEqual(self._blocos(), 0)
+            self.assertEqual(len(self.armazem.trilha(session, 1)), 120)
+
+            self.armazem.registrar(session, 1, instantes[120:], latitudes[120:], longitudes[120:])
+            session.commit()
+            self.assertEqual(self._blocos(), 1)
+            self.assertEqual(self.armazem.estatisticas().pontos_em_memoria, 0)
+            trilha = self.armazem.trilha(session, 1)
+        self.assertEqual(list(trilha.instantes), instantes)
+        self.assertEqual([round(valor, 6) for valor in trilha.latitudes], [round(valor, 6) for valor in latitudes])
+
+        # Após o reinício, o último instante gravado continua valendo
+        armazem = ArmazemPosicoes()
+        with self.fabrica() as session:
+            self.assertEqual(armazem.registrar(session, 1, instantes[-3:], latitudes[-3:], longitudes[-3:]), 0)
+
+    def test_sessao_fechada_sem_commit(self) -> None:
+        """Testa que fechar a sessão sem commit libera o bloco para outra selagem."""
+        instantes, latitudes, longitudes = _pontos(120)
+        with self.fabrica() as session:
+            self.armazem.registrar(session, 1, instantes, latitudes, longitudes)
+        with self.fabrica() as session:
+            self.armazem.selar(session, 1)
+            session.commit()
+        self.assertEqual(self._blocos(), 1)
+        self.assertEqual(self.armazem.estatisticas().viagens_abertas, 0)
+
+    def test_selagem_por_inatividade(self) -> None:
+        """Testa que a viagem parada é selada e deixa a memória na ingestão de outra."""
+        with self.fabrica() as session:
+            self.armazem.registrar(session, 1, *_pontos(5))
+            self.agora = 31.0
+            self.armazem.registrar(session, 2, *_pontos(5))
+            session.commit()
+        self.assertEqual(self._blocos(), 1)
+        self.assertEqual(self.armazem.estatisticas().viagens_abertas, 1)
+
+class TestTrilhaService(unittest.TestCase):
+    """Classe de testes da distância e da amostragem."""
+
+    def test_distancia_e_amostra(self) -> None:
+        """Testa um grau de latitude e a amostra com as extremidades."""
+        trilha = Trilha(*(array(tipo, valores) for tipo, valores in zip("qdd", _pontos(1001))))
+        self.assertAlmostEqual(distancia_km(trilha), 111.195, places=2)
+        self.assertEqual(distancia_km(Trilha.vazia()), 0.0)
+        amostra = amostrar(trilha, 11)
+        self.assertEqual(len(amostra), 11)
+        self.assertEqual((amostra.instantes[0], amostra.instantes[-1]), (trilha.instantes[0], trilha.instantes[-1]))
+        self.assertIs(amostrar(trilha, 5000), trilha)
+        with self.assertRaises(ValueError):
+            amostrar(trilha, 1)
+
+class TestEncerramentoERotas(unittest.TestCase):
+    """Classe de testes do encerramento pela trilha e das rotas de telemetria."""
+
+    def setUp(self) -> None:
+        """Cria o banco com duas viagens, uma em andamento, e o cliente das rotas."""
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.fabrica = sessionmaker(bind=self.engine)
+        with self.fabrica() as session:
+            veiculo = Veiculo(
+                placa="ABC1D23", marca="Volvo", modelo="FH540", ano_fabricacao=2022, ano_modelo=2022,
+                tipo_veiculo=TipoVeiculo.CAMINHAO, tipo_combustivel=TipoCombustivel.DIESEL,
+                quilometragem_atual=1000.0,
+            )
+            session.add(veiculo)
+            session.flush()
+            for codigo, situacao in (("V-001", StatusViagem.EM_ANDAMENTO), ("V-002", StatusViagem.AGENDADA)):
+                session.add(Viagem(
+                    codigo=codigo, motorista_id=1, veiculo_id=veiculo.id, origem="Recife", destino="Natal",
+                    data_saida_prevista=datetime(2026, 1, 5, 8), data_saida_real=datetime(2026, 1, 5, 8),
+                    km_inicial=1000.0, status=situacao,
+                ))
+            session.commit()
+        self.armazem = ArmazemPosicoes(capacidade_bloco=64)
+
+        app = FastAPI()
+        app.include_router(telemetria.router, prefix="/api/v1")
+        app.state.armazem_posicoes = self.armazem
+
+        def sessao():
+            with self.fabrica() as session:
+                yield session
+
+        app.dependency_overrides[get_tenant_db] = sessao
+        self.cliente = TestClient(app)
+
+    def tearDown(self) -> None:
+        """Libera as conexões do banco em memória."""
+        self.engine.dispose()
+
+    def test_ingestao_trilha_e_encerramento(self) -> None:
+        """Testa o lote, as viagens rejeitadas, a trilha reduzida e a quilometragem rastreada."""
+        instantes, latitudes, longitudes = _pontos(101)
+        corpo = {"trechos": [
+            {"viagem_id": 1, "instantes": instantes, "latitudes": latitudes, "longitudes": longitudes},
+            {"viagem_id": 2, "instantes": instantes[:2], "latitudes": latitudes[:2], "longitudes": longitudes[:2]},
+        ]}
+        resposta = self.cliente.post("/api/v1/telemetria/posicoes", json=corpo)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.json(), {"aceitos": 101, "descartados": 0, "viagens_rejeitadas": [2]})
+        invalido = {"trechos": [{"viagem_id": 1, "instantes": [1], "latitudes": [91.0], "longitudes": [0.0]}]}
+        self.assertEqual(self.cliente.post("/api/v1/telemetria/posicoes", json=invalido).status_code, 422)
+        for instante in (-1, 2**62):
+            invalido = {"trechos": [{"viagem_id": 1, "instantes": [instante], "latitudes": [0.0], "longitudes": [0.0]}]}
+            self.assertEqual(self.cliente.post("/api/v1/telemetria/posicoes", json=invalido).status_code, 422)
+
+        trilha = self.cliente.get("/api/v1/telemetria/viagens/1/trilha", params={"max_pontos": 10}).json()
+        self.assertEqual((trilha["total_pontos"], len(trilha["latitudes"])), (101, 10))
+        self.assertAlmostEqual(trilha["km_rastreado"], 11.12, places=2)
+        self.assertEqual(self.cliente.get("/api/v1/telemetria/viagens/9/trilha").status_code, 404)
+
+        with self.fabrica() as session:
+            with self.assertRaises(BusinessRuleViolation):
+                EncerrarViagemUseCase(session).executar(1)
+            session.rollback()
+            viagem = EncerrarViagemUseCase(session, self.armazem).executar(1)
+            self.assertAlmostEqual(viagem.km_rastreado, 11.12, places=2)
+            self.assertAlmostEqual(viagem.km_final, 1000.0 + viagem.km_rastreado)
+            self.assertAlmostEqual(viagem.veiculo.quilometragem_atual, viagem.km_final)
+        self.assertEqual(self.armazem.estatisticas().viagens_abertas, 0)
+        with self.fabrica() as session:
+            self.assertEqual(session.scalar(select(func.sum(BlocoPosicoes.quantidade))), 101)
+        resposta = self.cliente.post("/api/v1/telemetria/posicoes", json=corpo)
+        self.assertEqual(resposta.json()["viagens_rejeitadas"], [1, 2])
+
+if __name__ == "__main__":
+    unittest.main()
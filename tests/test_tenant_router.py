@@ -0,0 +1,168 @@
+"""Módulo de testes unitários para o roteador de bancos por tenant.
+
+Este módulo contém testes para o `RoteadorTenants`, verificando a criação do
+arquivo do tenant apenas no primeiro acesso, a aplicação das migrações
+pendentes uma única vez por arquivo, o descarte das engines menos usadas e
+das travas de abertura, a recusa de identificadores inválidos e de tenants
+não registrados, que uma transação de escrita aberta em um tenant não
+bloqueia a escrita em outro e que as rotas da frota leem e gravam no banco do
+tenant do cabeçalho X-Tenant-ID.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+from app.api.v1.routes import telemetria, veiculos
+from app.application.services.trilha_service import TelemetriaTenants
+from app.infrastructure.persistence.sqlalchemy.models import (
+    Base,
+    ConfiguracaoSistema,
+    StatusViagem,
+    TipoCombustivel,
+    TipoVeiculo,
+    Veiculo,
+    Viagem,
+)
+from app.infrastructure.persistence.sqlalchemy.tenant_router import (
+    MIGRACOES, Migracao, RoteadorTenants, TenantDesconhecido,
+)
+from app.infrastructure.telemetria.armazem import ArmazemPosicoes
+
+class TestRoteadorTenants(unittest.TestCase):
+    """Classe de testes do roteador de tenants."""
+
+    def setUp(self) -> None:
+        """Cria o banco principal e o diretório dos tenants."""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.principal = create_engine(f"sqlite:///{os.path.join(self.diretorio.name, 'principal.db')}")
+        Base.metadata.create_all(self.principal)
+        self.Session = sessionmaker(bind=self.principal)
+        self.pasta_tenants = os.path.join(self.diretorio.name, "tenants")
+        self.roteador = RoteadorTenants(
+            self.pasta_tenants, capacidade=2, fabrica_sessao=self.Session, tenants=("sul", "norte", "a", "b", "c"),
+        )
+
+    def tearDown(self) -> None:
+        self.roteador.encerrar()
+        self.principal.dispose()
+        self.diretorio.cleanup()
+
+    def _gravar(self, tenant_id, chave):
+        with self.roteador.sessao(tenant_id) as session:
+            session.add(ConfiguracaoSistema(tenant_id=tenant_id, chave=chave, valor="1"))
+            session.commit()
+
+    def _chaves(self, tenant_id):
+        with self.roteador.sessao(tenant_id) as session:
+            return sorted(session.execute(select(ConfiguracaoSistema.chave)).scalars())
+
+    def test_criacao_sob_demanda_e_isolamento(self) -> None:
+        """Testa o arquivo criado no primeiro acesso e os dados separados."""
+        self.assertFalse(os.path.exists(self.roteador.caminho("sul")))
+        self._gravar("sul", "a")
+        self._gravar("norte", "b")
+        self._gravar("padrao", "c")
+        self.assertTrue(os.path.exists(self.roteador.caminho("sul")))
+        self.assertEqual((self._chaves("sul"), self._chaves("norte"), self._chaves("padrao")), (["a"], ["b"], ["c"]))
+        self.assertFalse(os.path.exists(self.roteador.caminho("padrao")))
+        with self.assertRaises(ValueError):
+            self.roteador.registrar("../principal")
+        with self.assertRaises(TenantDesconhecido):
+            self.roteador.sessao("oeste")
+        self.assertFalse(os.path.exists(self.roteador.caminho("oeste")))
+        self.roteador.registrar("oeste")
+        self._gravar("oeste", "d")
+        self.assertEqual(self._chaves("oeste"), ["d"])
+
+    def test_lru_e_migracoes(self) -> None:
+        """Testa o descarte da engine menos usada e a migração na reabertura."""
+        for tenant_id in ("a", "b", "a", "c"):
+            self.roteador.engine(tenant_id)
+        estatisticas = self.roteador.estatisticas()
+        self.assertEqual((estatisticas.abertas, estatisticas.aberturas, estatisticas.descartes), (2, 3, 1))
+        self.assertEqual(estatisticas.migracoes, 3 * len(MIGRACOES))
+        self.assertEqual(sorted(self.roteador._travas_tenant), ["a", "c"])
+        self.roteador.encerrar()
+        self.assertEqual(self.roteador._travas_tenant, {})
+
+        proxima = MIGRACOES[-1].versao + 1
+        indice = Migracao(proxima, "índice de categoria", lambda conexao: conexao.execute(text(
+            "CREATE INDEX ix_configuracoes_categoria ON configuracoes_sistema (categoria)"
+        )))
+        roteador = RoteadorTenants(
+            self.pasta_tenants, fabrica_sessao=self.Session, migracoes=MIGRACOES + [indice], tenants=["b"],
+        )
+        try:
+            with roteador.engine("b").connect() as conexao:
+                self.assertEqual(conexao.exec_driver_sql("PRAGMA user_version").scalar(), proxima)
+            roteador.encerrar()
+            roteador.engine("b")
+            self.assertEqual(roteador.estatisticas().migracoes, 1)
+        finally:
+            roteador.encerrar()
+        with self.assertRaises(ValueError):
+            RoteadorTenants(self.pasta_tenants, migracoes=[indice, MIGRACOES[0]])
+
+    def test_escrita_nao_bloqueia_outro_tenant(self) -> None:
+        """Testa que a escrita pendente de um tenant não bloqueia outro."""
+        ocupado = self.roteador.sessao("sul")
+        try:
+            ocupado.add(ConfiguracaoSistema(tenant_id="sul", chave="pendente", valor="1"))
+            ocupado.flush()
+            self._gravar("norte", "livre")
+            self.assertEqual(self._chaves("norte"), ["livre"])
+        finally:
+            ocupado.rollback()
+            ocupado.close()
+        self.assertEqual(self._chaves("sul"), [])
+
+    def test_rotas_da_frota_por_tenant(self) -> None:
+        """Testa que veículos e posições ficam no banco e no armazém do tenant."""
+        for tenant_id, placa in (("padrao", "AAA1A11"), ("sul", "BBB2B22")):
+            with self.roteador.sessao(tenant_id) as session:
+                veiculo = Veiculo(
+                    placa=placa, marca="Iveco", modelo="Daily", ano_fabricacao=2023, ano_modelo=2023,
+                    tipo_veiculo=TipoVeiculo.VAN, tipo_combustivel=TipoCombustivel.DIESEL,
+                )
+                session.add(veiculo)
+                session.flush()
+                session.add(Viagem(
+                    codigo="V-001", motorista_id=1, veiculo_id=veiculo.id, origem="Recife", destino="Natal",
+                    data_saida_prevista=datetime(2026, 1, 5, 8), km_inicial=0.0, status=StatusViagem.EM_ANDAMENTO,
+                ))
+                session.commit()
+        app = FastAPI()
+        app.include_router(veiculos.router, prefix="/api/v1")
+        app.include_router(telemetria.router, prefix="/api/v1")
+        app.state.roteador_tenants = self.roteador
+        app.state.armazem_posicoes = ArmazemPosicoes()
+        app.state.telemetria_tenants = TelemetriaTenants(lambda: (ArmazemPosicoes(), None))
+        cliente = TestClient(app)
+        sul = {"X-Tenant-ID": "sul"}
+
+        self.assertEqual(cliente.get("/api/v1/veiculos/1").json()["placa"], "AAA1A11")
+        self.assertEqual(cliente.get("/api/v1/veiculos/1", headers=sul).json()["placa"], "BBB2B22")
+        trecho = {
+            "viagem_id": 1, "instantes": [0, 60, 120], "latitudes": [-8.0, -8.01, -8.02], "longitudes": [-35.0] * 3,
+        }
+        resposta = cliente.post("/api/v1/telemetria/posicoes", json={"trechos": [trecho]}, headers=sul)
+        self.assertEqual(resposta.json()["aceitos"], 3)
+        self.assertEqual(cliente.get("/api/v1/telemetria/viagens/1/trilha", headers=sul).json()["total_pontos"], 3)
+        self.assertEqual(cliente.get("/api/v1/telemetria/viagens/1/trilha").json()["total_pontos"], 0)
+        self.assertEqual(app.state.armazem_posicoes.estatisticas().viagens_abertas, 0)
+
+        # Tenant não registrado: nenhum banco é criado pela requisição
+        oeste = {"X-Tenant-ID": "oeste"}
+        self.assertEqual(cliente.get("/api/v1/veiculos/1", headers=oeste).status_code, 404)
+        resposta = cliente.post("/api/v1/telemetria/posicoes", json={"trechos": [trecho]}, headers=oeste)
+        self.assertEqual(resposta.status_code, 404)
+        self.assertFalse(os.path.exists(self.roteador.caminho("oeste")))
+        self.assertEqual([tenant for tenant, _ in app.state.telemetria_tenants.armazens()], ["sul"])
+
+if __name__ == "__main__":
+    unittest.main()